@@ -0,0 +1,66 @@
+"""add ai usage counters
+
+Revision ID: 18211b2140f4
+Revises: a1c105982f22
+Create Date: 2026-02-11 09:03:27.512930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '18211b2140f4'
+down_revision: Union[str, Sequence[str], None] = 'a1c105982f22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "ai_usage_counters",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("feature", sa.String(length=64), nullable=False),
+        sa.Column("utc_day", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "feature", "utc_day"),
+        sa.CheckConstraint("count >= 0", name="ck_ai_usage_counters_count_nonneg"),
+    )
+    op.create_table(
+        "ai_club_usage_counters",
+        sa.Column("club_id", sa.Integer(), sa.ForeignKey("clubs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("feature", sa.String(length=64), nullable=False),
+        sa.Column("utc_day", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("club_id", "feature", "utc_day"),
+        sa.CheckConstraint("count >= 0", name="ck_ai_club_usage_counters_count_nonneg"),
+    )
+
+    # backfill today's counters from the usage log so the switch doesn't reset quotas mid-day
+    op.execute(
+        """
+        INSERT INTO ai_usage_counters (user_id, feature, utc_day, count)
+        SELECT user_id, feature, (created_at AT TIME ZONE 'UTC')::date, COUNT(*)
+        FROM ai_usage
+        WHERE (created_at AT TIME ZONE 'UTC')::date = (now() AT TIME ZONE 'UTC')::date
+        GROUP BY user_id, feature, (created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ai_club_usage_counters (club_id, feature, utc_day, count)
+        SELECT club_id, feature, (created_at AT TIME ZONE 'UTC')::date, COUNT(*)
+        FROM ai_usage
+        WHERE (created_at AT TIME ZONE 'UTC')::date = (now() AT TIME ZONE 'UTC')::date
+        GROUP BY club_id, feature, (created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("ai_club_usage_counters")
+    op.drop_table("ai_usage_counters")
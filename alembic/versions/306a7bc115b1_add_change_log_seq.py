@@ -0,0 +1,41 @@
+"""add change_log seq
+
+Revision ID: 306a7bc115b1
+Revises: c9298c812765
+Create Date: 2026-03-09 10:12:41.508114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '306a7bc115b1'
+down_revision: Union[str, Sequence[str], None] = 'c9298c812765'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("change_log", sa.Column("seq", sa.BigInteger(), nullable=True))
+    # existing rows keep their id as cursor, so clients' stored cursors stay valid
+    op.execute("UPDATE change_log SET seq = id")
+    op.drop_index("ix_change_log_club_id_id", table_name="change_log")
+    op.create_index("ix_change_log_club_id_seq", "change_log", ["club_id", "seq"])
+    op.create_index("ix_change_log_seq", "change_log", ["seq"], unique=True)
+    op.create_index(
+        "ix_change_log_unsequenced", "change_log", ["id"],
+        postgresql_where=sa.text("seq IS NULL"), sqlite_where=sa.text("seq IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_change_log_unsequenced", table_name="change_log")
+    op.drop_index("ix_change_log_seq", table_name="change_log")
+    op.drop_index("ix_change_log_club_id_seq", table_name="change_log")
+    op.create_index("ix_change_log_club_id_id", "change_log", ["club_id", "id"])
+    op.drop_column("change_log", "seq")
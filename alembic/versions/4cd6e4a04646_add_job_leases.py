@@ -0,0 +1,30 @@
+"""add job leases
+
+Revision ID: 4cd6e4a04646
+Revises: 306a7bc115b1
+Create Date: 2026-03-16 14:05:27.381946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4cd6e4a04646'
+down_revision: Union[str, Sequence[str], None] = '306a7bc115b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("jobs", sa.Column("locked_by", sa.String(length=128), nullable=True))
+    op.add_column("jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("jobs", "heartbeat_at")
+    op.drop_column("jobs", "locked_by")
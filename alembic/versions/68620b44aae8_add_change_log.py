@@ -0,0 +1,40 @@
+"""add change_log
+
+Revision ID: 68620b44aae8
+Revises: ae5980b7490e
+Create Date: 2026-02-16 08:22:07.640311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '68620b44aae8'
+down_revision: Union[str, Sequence[str], None] = 'ae5980b7490e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("club_id", sa.Integer(), nullable=False),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=8), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.CheckConstraint("op IN ('upsert', 'delete')", name="ck_change_log_op"),
+    )
+    op.create_index("ix_change_log_club_id_id", "change_log", ["club_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_change_log_club_id_id", table_name="change_log")
+    op.drop_table("change_log")
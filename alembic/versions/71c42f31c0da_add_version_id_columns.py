@@ -0,0 +1,35 @@
+"""add version_id columns for optimistic concurrency
+
+Revision ID: 71c42f31c0da
+Revises: dc9ae128e487
+Create Date: 2026-02-19 14:05:37.402911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71c42f31c0da'
+down_revision: Union[str, Sequence[str], None] = 'dc9ae128e487'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("clubs", "sessions", "workout_plans", "workout_plan_items", "workout_plan_exercises")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("version_id", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_column(table, "version_id")
@@ -0,0 +1,62 @@
+"""add jobs table
+
+Revision ID: a1c105982f22
+Revises: 3cd36bd66c7b
+Create Date: 2026-02-09 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c105982f22'
+down_revision: Union[str, Sequence[str], None] = '3cd36bd66c7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+job_status = postgresql.ENUM("queued", "running", "succeeded", "failed", name="jobstatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    job_status.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("job_type", sa.String(length=64), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="jobstatus", create_type=False),
+            nullable=False,
+            server_default="queued",
+        ),
+        sa.Column("club_id", sa.Integer(), sa.ForeignKey("clubs.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("created_by_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("progress", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("progress >= 0 AND progress <= 100", name="ck_jobs_progress_range"),
+    )
+    op.create_index("ix_jobs_status_job_type", "jobs", ["status", "job_type"])
+    op.create_index("ix_jobs_created_by_id", "jobs", ["created_by_id"])
+    op.create_index("ix_jobs_club_id", "jobs", ["club_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_club_id", table_name="jobs")
+    op.drop_index("ix_jobs_created_by_id", table_name="jobs")
+    op.drop_index("ix_jobs_status_job_type", table_name="jobs")
+    op.drop_table("jobs")
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,51 @@
+"""plan_assignments: add workout_plan_id
+
+Revision ID: ae5980b7490e
+Revises: 18211b2140f4
+Create Date: 2026-02-13 10:41:52.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae5980b7490e'
+down_revision: Union[str, Sequence[str], None] = '18211b2140f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "plan_assignments",
+        sa.Column(
+            "workout_plan_id",
+            sa.Integer(),
+            sa.ForeignKey("workout_plans.id", ondelete="CASCADE", name="fk_plan_assignments_workout_plan_id"),
+            nullable=True,
+        ),
+    )
+    op.alter_column("plan_assignments", "plan_id", existing_type=sa.Integer(), nullable=True)
+    op.create_check_constraint(
+        "ck_plan_assignment_one_plan",
+        "plan_assignments",
+        "(plan_id IS NOT NULL) <> (workout_plan_id IS NOT NULL)",
+    )
+    op.create_unique_constraint(
+        "uq_plan_assignees_workout_plan_user", "plan_assignments", ["workout_plan_id", "user_id"]
+    )
+    op.create_index("ix_plan_assignments_workout_plan_id", "plan_assignments", ["workout_plan_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM plan_assignments WHERE workout_plan_id IS NOT NULL")
+    op.drop_index("ix_plan_assignments_workout_plan_id", table_name="plan_assignments")
+    op.drop_constraint("uq_plan_assignees_workout_plan_user", "plan_assignments", type_="unique")
+    op.drop_constraint("ck_plan_assignment_one_plan", "plan_assignments", type_="check")
+    op.alter_column("plan_assignments", "plan_id", existing_type=sa.Integer(), nullable=False)
+    op.drop_column("plan_assignments", "workout_plan_id")
@@ -0,0 +1,58 @@
+"""add template link columns to exercises and sessions
+
+Revision ID: c9298c812765
+Revises: e3ec1c441772
+Create Date: 2026-02-24 09:31:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9298c812765'
+down_revision: Union[str, Sequence[str], None] = 'e3ec1c441772'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+link_mode = postgresql.ENUM("snapshot", "linked", name="linkmode")
+TABLES = ("exercises", "sessions")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    link_mode.create(op.get_bind(), checkfirst=True)
+
+    for table in TABLES:
+        op.add_column(table, sa.Column("is_template", sa.Boolean(), nullable=False, server_default=sa.text("false")))
+        op.add_column(table, sa.Column("template_id", sa.Integer(), sa.ForeignKey(f"{table}.id"), nullable=True))
+        op.add_column(
+            table,
+            sa.Column(
+                "link_mode",
+                postgresql.ENUM(name="linkmode", create_type=False),
+                nullable=False,
+                server_default="snapshot",
+            ),
+        )
+        op.add_column(table, sa.Column("template_version_used", sa.Integer(), nullable=True))
+        op.create_index(f"ix_{table}_template_id", table, ["template_id"])
+
+    # sessions got theirs with the ETags (71c42f31c0da)
+    op.add_column("exercises", sa.Column("version_id", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("exercises", "version_id")
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_template_id", table_name=table)
+        op.drop_column(table, "template_version_used")
+        op.drop_column(table, "link_mode")
+        op.drop_column(table, "template_id")
+        op.drop_column(table, "is_template")
+    link_mode.drop(op.get_bind(), checkfirst=True)
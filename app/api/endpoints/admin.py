@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query, Response, status
+
+from app.auth.deps import require_roles
+from app.core.dependencies import get_request_profile_service
+from app.db.query_stats import query_stats
+from app.models.models import UserRole
+from app.schemas.admin import QueryStatRead, RequestProfileRead
+from app.services.request_profile import RequestProfileService
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+
+
+@router.get("/query-stats", response_model=list[QueryStatRead])
+def list_query_stats(limit: int = Query(default=20, ge=1, le=500)):
+    """Top statements of this worker by total time since start (or the last reset)."""
+    return query_stats.top(limit)
+
+
+@router.delete("/query-stats", status_code=status.HTTP_204_NO_CONTENT)
+def reset_query_stats():
+    """Start measuring from zero, e.g. before a load test."""
+    query_stats.reset()
+
+
+@router.get("/profiles", response_model=list[RequestProfileRead])
+def list_profiles(
+    limit: int = Query(default=50, ge=1, le=500),
+    service: RequestProfileService = Depends(get_request_profile_service),
+):
+    """Recent request profiles (send `X-Profile: 1` as an admin to record one), newest first."""
+    return service.list_profiles(limit=limit)
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: int,
+    service: RequestProfileService = Depends(get_request_profile_service),
+):
+    """The profile as speedscope JSON (open it at https://www.speedscope.app)."""
+    return Response(
+        content=service.get_report(profile_id),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+    )
@@ -1,8 +1,28 @@
-from fastapi import APIRouter, Depends, status
-from app.auth.deps import get_current_user
-from app.schemas.attendance import AttendanceRead, AttendanceCreate, AttendanceUpdate
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.deps import get_current_user, user_from_token
+from app.db.deps import get_db
+from app.exceptions.base import DomainError
+from app.realtime.attendance import attendance_channel
+from app.realtime.pubsub import Broker, Subscription, get_broker
+from app.schemas.attendance import (
+    AttendanceRead,
+    AttendanceCreate,
+    AttendanceUpdate,
+    CheckInCodeRead,
+    SelfCheckIn,
+    SelfCheckInRead,
+)
 from app.services.attendance import AttendanceService
-from app.core.dependencies import get_attendance_service
+from app.services.checkin import SelfCheckInService
+from app.core.dependencies import get_attendance_service, get_self_checkin_service
+
+BOARD_SNAPSHOT_LIMIT = 500
 
 router = APIRouter(
     prefix="/clubs/{club_id}/sessions/{session_id}/attendances",
@@ -29,6 +49,27 @@ def list_attendances_ep(
 ):
     return service.list_by_session(club_id=club_id, session_id=session_id, me_id=me.id, skip=0, limit=50)
 
+@router.get("/checkin-code", response_model=CheckInCodeRead)
+def get_checkin_code_ep(
+    club_id: int,
+    session_id: int,
+    service: SelfCheckInService = Depends(get_self_checkin_service),
+    me=Depends(get_current_user),
+):
+    """Coach/owner: short-lived code for the door QR display; fetch a new one before `expires_at`."""
+    return service.issue_code(club_id=club_id, session_id=session_id, me_id=me.id)
+
+@router.post("/checkin", response_model=SelfCheckInRead)
+def self_checkin_ep(
+    club_id: int,
+    session_id: int,
+    payload: SelfCheckIn,
+    service: SelfCheckInService = Depends(get_self_checkin_service),
+    me=Depends(get_current_user),
+):
+    """Check myself in with the scanned code. Idempotent: scanning twice keeps the first check-in time."""
+    return service.check_in(club_id=club_id, session_id=session_id, me_id=me.id, code=payload.code)
+
 @router.get("/{attendance_id}", response_model=AttendanceRead, response_model_exclude_none=True)
 def get_attendance_ep(
     club_id: int,
@@ -49,3 +90,81 @@ def update_attendance_ep(
     me=Depends(get_current_user),
 ):
     return service.update(club_id=club_id, attendance_id=attendance_id, session_id=session_id, me_id=me.id, data=payload)
+
+@router.websocket("/live")
+async def attendance_board_ws(
+    websocket: WebSocket,
+    club_id: int,
+    session_id: int,
+    token: Optional[str] = Query(default=None),
+    service: AttendanceService = Depends(get_attendance_service),
+    db: Session = Depends(get_db),
+    broker: Broker = Depends(get_broker),
+):
+    """
+    Live attendance board (coach/owner): one {"type": "snapshot"} message with the
+    current attendances, then {"type": "attendance.created" | "attendance.updated"}
+    events as changes are committed. Auth via `?token=<jwt>` or a Bearer header.
+    Closed with 1013 when the client falls too far behind; reconnect to resync.
+    """
+    # subscribe before loading the snapshot so nothing committed in between is missed
+    sub = broker.subscribe(attendance_channel(session_id))
+    try:
+        try:
+            snapshot = await run_in_threadpool(
+                _board_snapshot, websocket, db, service, club_id=club_id, session_id=session_id, token=token
+            )
+        except (DomainError, HTTPException):
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        finally:
+            db.close()  # don't hold a pooled connection for the lifetime of the socket
+
+        await websocket.accept()
+        await websocket.send_json({"type": "snapshot", "attendances": snapshot})
+        await _pump(websocket, sub)
+    finally:
+        broker.unsubscribe(sub)
+
+
+def _board_snapshot(
+    websocket: WebSocket,
+    db: Session,
+    service: AttendanceService,
+    *,
+    club_id: int,
+    session_id: int,
+    token: Optional[str],
+) -> list[dict]:
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    me = user_from_token(db, token)
+    rows = service.list_by_session(
+        club_id=club_id, session_id=session_id, me_id=me.id, skip=0, limit=BOARD_SNAPSHOT_LIMIT
+    )
+    return [AttendanceRead.model_validate(row).model_dump(mode="json", exclude_none=True) for row in rows]
+
+
+async def _pump(websocket: WebSocket, sub: Subscription) -> None:
+    """Forward events until the client disconnects; client messages are ignored."""
+    receive = asyncio.ensure_future(websocket.receive())
+    get = asyncio.ensure_future(sub.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receive, get}, return_when=asyncio.FIRST_COMPLETED)
+            if receive in done and receive.result()["type"] == "websocket.disconnect":
+                return
+            # both can finish in the same round: forward the event before reading the client again
+            if get in done:
+                message = get.result()
+                if message is None:  # overflowed
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                    return
+                await websocket.send_json(message)
+                get = asyncio.ensure_future(sub.get())
+            if receive in done:
+                receive = asyncio.ensure_future(websocket.receive())
+    finally:
+        receive.cancel()
+        get.cancel()
@@ -1,6 +1,8 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Response, status, Query
+
+from app.api.etag import if_match_version, set_etag
 
 from app.core.dependencies import get_club_service
 from app.models.models import User
@@ -43,20 +45,26 @@ def my_clubs(club_service: ClubService = Depends(get_club_service), me: User = D
 
 
 @router.get("/{club_id}", response_model=ClubRead)
-def get_club_endpoint(club_id: int, club_service: ClubService = Depends(get_club_service)):
-    return club_service.get_club_service(club_id)
+def get_club_endpoint(club_id: int, response: Response, club_service: ClubService = Depends(get_club_service)):
+    return set_etag(response, club_service.get_club_service(club_id))
 
 
 @router.patch("/{club_id}", response_model=ClubRead)
 def update_club_endpoint(
     club_id: int,
     payload: ClubUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     club_service: ClubService = Depends(get_club_service),
     membership_service: MembershipService = Depends(get_membership_service),
     me: User = Depends(get_current_active_user),
 ):
+    """Send the club's ETag as If-Match to avoid overwriting a concurrent edit (412)."""
     membership_service.require_owner_of_club(user_id=me.id, club_id=club_id)
-    return club_service.update_club_service(user=me, club_id=club_id, club_update=payload)
+    club = club_service.update_club_service(
+        user=me, club_id=club_id, club_update=payload, expected_version=expected_version
+    )
+    return set_etag(response, club)
 
 
 @router.delete("/{club_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from app.schemas.job import JobRead
+from app.services.job import JobService
+from app.core.dependencies import get_job_service
+from app.auth.deps import get_current_user
+from app.models.models import User
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(
+    job_id: int,
+    service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user),
+):
+    """Poll the status/progress/result of a background job."""
+    return service.get_job(job_id=job_id, user_id=user.id)
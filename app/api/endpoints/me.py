@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.deps import get_current_user
+from app.core.dependencies import get_agenda_service
+from app.models.models import User
+from app.schemas.agenda import AgendaRead
+from app.services.agenda import AgendaService
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.get("/agenda", response_model=AgendaRead)
+def get_my_agenda(
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    service: AgendaService = Depends(get_agenda_service),
+    user: User = Depends(get_current_user),
+):
+    """
+    Sessions (with my attendance) and assigned workout plan days across all my clubs.
+    Defaults to the next 7 days from today (UTC); `to` is exclusive.
+    """
+    return service.get_agenda(user_id=user.id, start=start, end=end)
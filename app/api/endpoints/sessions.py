@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app.api.etag import if_match_version, set_etag
 from app.auth.deps import get_current_user
 from app.schemas.session import SessionRead, SessionCreate, SessionUpdate
 from app.services.session import SessionService
@@ -41,12 +42,14 @@ def get_session_ep(
     club_id: int,
     plan_id: int,
     session_id: int,
+    response: Response,
     service: SessionService = Depends(get_session_service),
     me=Depends(get_current_user),
 ):
-    return service.get_session(
+    session = service.get_session(
         club_id=club_id, plan_id=plan_id, session_id=session_id, user_id=me.id
     )
+    return set_etag(response, session)
 
 
 @router.patch("/{session_id}", response_model=SessionRead)
@@ -55,16 +58,21 @@ def update_session_ep(
     plan_id: int,
     session_id: int,
     data: SessionUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     service: SessionService = Depends(get_session_service),
     me=Depends(get_current_user),
 ):
-    return service.update_session(
+    """Send the session's ETag as If-Match to avoid overwriting a concurrent edit (412)."""
+    session = service.update_session(
         club_id=club_id,
         plan_id=plan_id,
         session_id=session_id,
         user_id=me.id,
         data=data,
+        expected_version=expected_version,
     )
+    return set_etag(response, session)
 
 
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,26 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.deps import get_current_user
+from app.core.dependencies import get_sync_service
+from app.models.models import User
+from app.schemas.sync import SyncRead
+from app.services.sync import SyncService
+
+router = APIRouter(prefix="/clubs/{club_id}", tags=["sync"])
+
+
+@router.get("/sync", response_model=SyncRead)
+def sync_club(
+    club_id: int,
+    since: Optional[int] = Query(default=None, ge=0),
+    limit: Optional[int] = Query(default=None, ge=1),
+    service: SyncService = Depends(get_sync_service),
+    user: User = Depends(get_current_user),
+):
+    """
+    Changes in the club since `since` (the `cursor` of the previous response).
+    Without `since`, a full snapshot; keep calling while `has_more` is true.
+    """
+    return service.sync(club_id=club_id, user_id=user.id, since=since, limit=limit)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.etag import if_match_version, set_etag
 
 from app.schemas.workout_plan import (
     WorkoutPlanCreate,
+    WorkoutPlanInstantiate,
     WorkoutPlanUpdate,
     WorkoutPlanRead,
     WorkoutPlanReadNested,
@@ -15,9 +20,12 @@ from app.schemas.workout_plan import (
     WorkoutPlanExerciseRead,
 )
 
+from app.schemas.job import JobRead, WorkoutPlanImport
+from app.services.job import JobService
 from app.services.workout_plan import WorkoutPlanService
+from app.jobs.handlers import JOB_WORKOUT_PLAN_EXPORT, JOB_WORKOUT_PLAN_IMPORT
 
-from app.core.dependencies import get_workout_plan_service
+from app.core.dependencies import get_workout_plan_service, get_job_service
 from app.auth.deps import get_current_user
 from app.models.models import User
 
@@ -57,6 +65,70 @@ def create_workout_plan(
 
 
 
+@router.post(
+    "/clubs/{club_id}/workout-plans/import",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def import_workout_plan(
+    club_id: int,
+    payload: WorkoutPlanImport,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user),
+):
+    return job_service.enqueue(
+        job_type=JOB_WORKOUT_PLAN_IMPORT,
+        user_id=user.id,
+        club_id=club_id,
+        payload={"plan": payload.model_dump(mode="json")},
+    )
+
+
+@router.post(
+    "/clubs/{club_id}/workout-plans/{plan_id}/export",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def export_workout_plan(
+    club_id: int,
+    plan_id: int,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user),
+):
+    return job_service.enqueue(
+        job_type=JOB_WORKOUT_PLAN_EXPORT,
+        user_id=user.id,
+        club_id=club_id,
+        payload={"plan_id": plan_id},
+    )
+
+
+
+@router.post(
+    "/clubs/{club_id}/workout-plans/{plan_id}/instantiate",
+    response_model=WorkoutPlanRead,
+    status_code=status.HTTP_201_CREATED,
+)
+def instantiate_workout_plan(
+    club_id: int,
+    plan_id: int,
+    data: WorkoutPlanInstantiate,
+    response: Response,
+    service: WorkoutPlanService = Depends(get_workout_plan_service),
+    user: User = Depends(get_current_user),
+):
+    """Copy a template plan; the copy can be assigned to members/groups right away (coach/owner)."""
+    plan = service.instantiate_template(
+        club_id=club_id,
+        plan_id=plan_id,
+        user_id=user.id,
+        name=data.name,
+        user_ids=data.user_ids,
+        group_ids=data.group_ids,
+    )
+    return set_etag(response, plan)
+
+
 @router.get(
     "/clubs/{club_id}/workout-plans/{plan_id}",
     response_model=WorkoutPlanReadNested,
@@ -64,10 +136,13 @@ def create_workout_plan(
 def get_workout_plan_nested(
     club_id: int,
     plan_id: int,
+    response: Response,
     service: WorkoutPlanService = Depends(get_workout_plan_service),
     user: User = Depends(get_current_user),
 ):
-    return service.get_plan(club_id=club_id, plan_id=plan_id, user_id=user.id, nested=True)
+    """The ETag is the plan's own version; items and exercises carry their own version_id."""
+    plan = service.get_plan(club_id=club_id, plan_id=plan_id, user_id=user.id, nested=True)
+    return set_etag(response, plan)
 
 
 @router.patch(
@@ -78,11 +153,16 @@ def update_workout_plan(
     club_id: int,
     plan_id: int,
     payload: WorkoutPlanUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     service: WorkoutPlanService = Depends(get_workout_plan_service),
     user: User = Depends(get_current_user),
 ):
     patch = payload.model_dump(exclude_unset=True)
-    return service.update_plan(club_id=club_id, plan_id=plan_id, user_id=user.id, patch=patch)
+    plan = service.update_plan(
+        club_id=club_id, plan_id=plan_id, user_id=user.id, patch=patch, expected_version=expected_version
+    )
+    return set_etag(response, plan)
 
 
 
@@ -148,17 +228,21 @@ def update_item(
     plan_id: int,
     item_id: int,
     payload: WorkoutPlanItemUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     service: WorkoutPlanService = Depends(get_workout_plan_service),
     user: User = Depends(get_current_user),
 ):
     patch = payload.model_dump(exclude_unset=True)
-    return service.update_item(
+    item = service.update_item(
             club_id=club_id,
             plan_id=plan_id,
             item_id=item_id,
             user_id=user.id,
             patch=patch,
+            expected_version=expected_version,
         )
+    return set_etag(response, item)
 
 
 @router.delete(
@@ -235,18 +319,22 @@ def update_exercise(
     item_id: int,
     exercise_id: int,
     payload: WorkoutPlanExerciseUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
     service: WorkoutPlanService = Depends(get_workout_plan_service),
     user: User = Depends(get_current_user),
 ):
     patch = payload.model_dump(exclude_unset=True)
-    return service.update_exercise(
+    exercise = service.update_exercise(
             club_id=club_id,
             plan_id=plan_id,
             item_id=item_id,
             exercise_id=exercise_id,
             user_id=user.id,
             patch=patch,
+            expected_version=expected_version,
         )
+    return set_etag(response, exercise)
 
 
 @router.delete(
@@ -1,10 +1,20 @@
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 
+from app.schemas.job import JobRead
 from app.schemas.workout_plan import WorkoutPlanReadNested
-from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest, WorkoutPlanGroupAIDraftRequest
+from app.services.job import JobService
 from app.services.workout_plan_ai import WorkoutPlanAIService
+from app.services.workout_plan_group_ai import WorkoutPlanGroupAIService
+from app.services.workout_plan_ai_stream import encode_sse
+from app.jobs.handlers import JOB_WORKOUT_PLAN_AI_DRAFT, JOB_WORKOUT_PLAN_GROUP_AI_DRAFT
 
-from app.core.dependencies import get_workout_plan_ai_service
+from app.core.dependencies import (
+    get_job_service,
+    get_workout_plan_ai_service,
+    get_workout_plan_group_ai_service,
+)
 from app.auth.deps import get_current_user
 from app.models.models import User
 
@@ -28,3 +38,76 @@ def create_workout_plan_ai_draft(
         user_id=user.id,
         req=payload,
     )
+
+
+@router.post(
+    "/clubs/{club_id}/workout-plans/ai-draft/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+def stream_workout_plan_ai_draft(
+    club_id: int,
+    payload: WorkoutPlanAIDraftRequest,
+    ai_service: WorkoutPlanAIService = Depends(get_workout_plan_ai_service),
+    user: User = Depends(get_current_user),
+):
+    """
+    Same as ai-draft, but streams progress as Server-Sent Events
+    (delta / exercise / item, then plan or error).
+    """
+    events = ai_service.start_draft_stream(
+        club_id=club_id,
+        user_id=user.id,
+        req=payload,
+    )
+    return StreamingResponse(
+        encode_sse(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/clubs/{club_id}/workout-plans/ai-draft/jobs",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def enqueue_workout_plan_ai_draft(
+    club_id: int,
+    payload: WorkoutPlanAIDraftRequest,
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user),
+):
+    """Same as ai-draft, but runs in the background; poll GET /jobs/{id}."""
+    return job_service.enqueue(
+        job_type=JOB_WORKOUT_PLAN_AI_DRAFT,
+        user_id=user.id,
+        club_id=club_id,
+        payload={"request": payload.model_dump(mode="json")},
+    )
+
+
+@router.post(
+    "/clubs/{club_id}/groups/{group_id}/workout-plans/ai-draft/jobs",
+    response_model=JobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def enqueue_group_workout_plan_ai_drafts(
+    club_id: int,
+    group_id: int,
+    payload: WorkoutPlanGroupAIDraftRequest,
+    group_ai_service: WorkoutPlanGroupAIService = Depends(get_workout_plan_group_ai_service),
+    job_service: JobService = Depends(get_job_service),
+    user: User = Depends(get_current_user),
+):
+    """
+    One AI draft per athlete of the group, created and assigned in the background
+    (coach/owner only; charged to the club's AI quota). Poll GET /jobs/{id}.
+    """
+    group_ai_service.require_can_generate(club_id=club_id, group_id=group_id, user_id=user.id, req=payload)
+    return job_service.enqueue(
+        job_type=JOB_WORKOUT_PLAN_GROUP_AI_DRAFT,
+        user_id=user.id,
+        club_id=club_id,
+        payload={"group_id": group_id, "request": payload.model_dump(mode="json")},
+    )
@@ -0,0 +1,49 @@
+"""
+ETags for optimistic concurrency.
+
+Versioned models (version_id_col) expose their version as a strong ETag,
+e.g. `ETag: "3"`. Clients send it back in `If-Match` on PATCH; the
+repository compares it with the current version and SQLAlchemy re-checks
+it in the UPDATE's WHERE clause, so a concurrent write in between is
+caught too. Both surface as 412 Precondition Failed.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import Header, Response
+
+# never equal to a real version: unparseable or weak tags can't match (If-Match is strong)
+NO_MATCH = -1
+
+
+def etag_for(version_id: int) -> str:
+    return f'"{version_id}"'
+
+
+def set_etag(response: Response, obj: Any) -> Any:
+    """Set the ETag header from obj.version_id; returns obj for `return set_etag(...)`."""
+    version_id = getattr(obj, "version_id", None)
+    if version_id is not None:
+        response.headers["ETag"] = etag_for(version_id)
+    return obj
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """Expected version from an If-Match header; None when absent or `*`."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith('"') and value.endswith('"') and len(value) >= 2:
+        try:
+            return int(value[1:-1])
+        except ValueError:
+            return NO_MATCH
+    return NO_MATCH
+
+
+def if_match_version(if_match: Optional[str] = Header(default=None)) -> Optional[int]:
+    """Dependency: the version the client expects to update (see parse_if_match)."""
+    return parse_if_match(if_match)
@@ -0,0 +1,58 @@
+"""
+Route class for every API route: times the endpoint function itself.
+
+Its time is the "app" phase of Server-Timing (service logic, minus SQL and
+membership checks), and its return marks the start of "serialization"
+(response model validation and JSON encoding). See app.core.request_timing.
+The endpoint routers stay plain APIRouters; main.py includes them all through
+one TimedRouter.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute, APIRouter, request_response
+
+from app.core.request_timing import mark_endpoint_done, timed
+
+
+def _timed_endpoint(call: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args: Any, **kwargs: Any) -> Any:
+            with timed("app"):
+                result = await call(*args, **kwargs)
+            mark_endpoint_done()
+            return result
+    else:
+        @functools.wraps(call)
+        def endpoint(*args: Any, **kwargs: Any) -> Any:
+            with timed("app"):
+                result = call(*args, **kwargs)
+            mark_endpoint_done()
+            return result
+    return endpoint
+
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        # wrap after the dependant is built, so parameters and annotations are read from the real endpoint
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+        self.app = request_response(self.get_route_handler())
+
+
+class TimedRouter(APIRouter):
+    """A router whose routes, including those of the routers it includes, are TimedRoutes."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(route_class=TimedRoute, **kwargs)
+
+    def add_api_route(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        # include_router() rebuilds each route with its own class; make that class timed
+        override = kwargs.get("route_class_override")
+        if override is not None and not issubclass(override, TimedRoute):
+            kwargs["route_class_override"] = TimedRoute
+        super().add_api_route(path, endpoint, **kwargs)
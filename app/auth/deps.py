@@ -5,6 +5,7 @@ from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.auth.jwt_utils import decode_token
+from app.core.request_timing import timed
 from app.db.deps import get_db
 from app.models.models import UserRole, User
 
@@ -34,6 +35,21 @@ def get_current_user(
     :return: user instance
     :raises HTTPException 401: if the token is invalid or user not found/inactive
     """
+    with timed("auth"):
+        return user_from_token(db, token)
+
+
+def user_from_token(db: Session, token: str | None) -> User:
+    """
+    Resolve a JWT access token to an active user (also used for WebSockets,
+    which can't go through the OAuth2 bearer dependency)
+    :param db: SQLAlchemy Session
+    :param token: the raw JWT
+    :return: user instance
+    :raises HTTPException 401: if the token is invalid or user not found/inactive
+    """
+    if not token:
+        raise _cred_exception()
     try:
         payload = decode_token(token)
         sub = (
@@ -43,3 +43,15 @@ def decode_token(token: str) -> TokenPayload:
         raise AuthError("token_expired") from e
     except JWTError as e:
         raise AuthError("invalid_token") from e
+
+
+def subject_from_authorization(authorization: str | None) -> str | None:
+    """The subject of a valid Bearer token in an Authorization header, or None (no DB lookup)."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode_token(token)
+    except Exception:
+        return None
+    return payload.sub or None
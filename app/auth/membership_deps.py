@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 
+from app.core.request_timing import timed
 from app.models.models import Membership, MembershipRole
 
 def _get_membership(db: Session, user_id: int, club_id: int) -> Membership | None:
@@ -14,6 +15,7 @@ def _get_membership(db: Session, user_id: int, club_id: int) -> Membership | Non
         )
     ).scalar_one_or_none()
 
+@timed("membership")
 def assert_has_any_role_of_club(
     db: Session,
     user_id: int,
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.core.metrics import observe_ai_call
+from app.exceptions.base import AIBusyError, AIUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# transient upstream problems worth another attempt; everything else (400, 401, ...) is final
+_RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+@dataclass
+class _StreamState:
+    emitted: bool = False  # a delta reached the reader: retrying would repeat it
+    usage: Any = None
+
+
+class AIClient:
+    """Process-wide OpenAI access.
+
+    - One AsyncOpenAI client with a pooled httpx.AsyncClient, living on a
+      dedicated event-loop thread (created lazily on first call).
+    - Explicit connect/read timeouts and retries with full-jitter backoff.
+    - A semaphore caps in-flight upstream calls; callers that cannot get a
+      slot within `queue_timeout` fail fast with AIUnavailableError instead of
+      parking a request thread behind a slow upstream.
+
+    Sync callers (endpoints/services running in the threadpool, job workers)
+    use create_response(); async callers can await acreate_response().
+    stream_text() yields output text deltas as they arrive.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str | None,
+        model: str,
+        base_url: str | None = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        max_concurrency: int = 8,
+        queue_timeout: float = 2.0,
+        max_connections: int = 20,
+    ) -> None:
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: AsyncOpenAI | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+
+    # ---------- lifecycle ----------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="ai-client-loop", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _get_client(self) -> AsyncOpenAI:
+        # only ever called on the client loop
+        if self._client is None:
+            if not self.api_key:
+                raise AIUnavailableError("AI is not configured (OPENAI_API_KEY missing)")
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,  # retries are ours (with jitter + semaphore awareness)
+                timeout=self.timeout,
+                http_client=httpx.AsyncClient(timeout=self.timeout, limits=self.limits),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+            self._semaphore = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._drain(client), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+
+    @staticmethod
+    async def _drain(client: AsyncOpenAI | None) -> None:
+        # calls still in flight would never finish on a stopped loop: cancel them
+        # here, so their callers get AIUnavailableError and their slots are released
+        current = asyncio.current_task()
+        while pending := [task for task in asyncio.all_tasks() if task is not current]:
+            for task in pending:
+                task.cancel()  # repeated: 3.11's wait_for() can swallow one that races its result
+            await asyncio.wait(pending)
+        if client is not None:
+            await client.close()
+
+    # ---------- calls ----------
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _acquire(self, kind: str) -> asyncio.Semaphore:
+        """Take an upstream slot or fail fast with AIBusyError; returns the semaphore to release."""
+        sem = self._semaphore  # close() drops the attribute; release the one we took
+        try:
+            await asyncio.wait_for(sem.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            observe_ai_call(kind, "busy", self.queue_timeout)
+            raise AIBusyError()
+        return sem
+
+    async def _retrying(
+        self, kind: str, call: Callable[[], Awaitable[Any]], *, may_retry: Callable[[], bool] = lambda: True
+    ) -> Any:
+        """Await call(), retrying transient upstream errors with backoff; AIUnavailableError when out of attempts."""
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries or not may_retry():
+                    logger.warning("OpenAI %s failed after %s attempts: %s", kind, attempt + 1, e)
+                    raise AIUnavailableError() from e
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+    async def _create_response(self, kwargs: dict[str, Any]):
+        client = self._get_client()
+        kwargs.setdefault("model", self.model)
+        sem = await self._acquire("create")
+
+        started = time.perf_counter()
+        outcome, usage = "error", None
+        try:
+            response = await self._retrying("create", lambda: client.responses.create(**kwargs))
+            outcome, usage = "ok", getattr(response, "usage", None)
+            return response
+        finally:
+            sem.release()
+            observe_ai_call(
+                "create", outcome, time.perf_counter() - started, model=kwargs.get("model"), usage=usage
+            )
+
+    @staticmethod
+    async def _forward(stream, out: queue.Queue, state: _StreamState) -> None:
+        """Put the stream's text deltas into `out` as they arrive."""
+        try:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    state.emitted = True
+                    out.put(("delta", event.delta))
+                elif event.type == "response.completed":
+                    state.usage = getattr(event.response, "usage", None)
+                elif event.type in ("response.failed", "error"):
+                    raise AIUnavailableError("AI generation failed. Please try again.")
+        finally:
+            await stream.close()
+
+    async def _stream_into(self, kwargs: dict[str, Any], out: queue.Queue) -> None:
+        """Push ("delta", text) items into `out`, then ("done", None) or ("error", exc)."""
+        try:
+            client = self._get_client()
+            kwargs.setdefault("model", self.model)
+            sem = await self._acquire("stream")
+        except AIUnavailableError as e:
+            out.put(("error", e))
+            return
+
+        async def attempt() -> None:
+            await self._forward(await client.responses.create(stream=True, **kwargs), out, state)
+
+        started = time.perf_counter()
+        outcome, state = "error", _StreamState()
+        try:
+            # only retry while nothing has been forwarded yet
+            await self._retrying("stream", attempt, may_retry=lambda: not state.emitted)
+            outcome = "ok"
+            out.put(("done", None))
+        except asyncio.CancelledError:
+            out.put(("error", AIUnavailableError()))  # closed under us (or the reader is gone)
+            raise
+        except Exception as e:
+            out.put(("error", e))
+        finally:
+            sem.release()
+            observe_ai_call(
+                "stream", outcome, time.perf_counter() - started, model=kwargs.get("model"), usage=state.usage
+            )
+
+    def stream_text(self, **kwargs: Any) -> Iterator[str]:
+        """
+        Blocking iterator over `responses.create(stream=True)` text deltas.
+        Closing the iterator early (client went away) cancels the upstream call.
+        """
+        loop = self._ensure_loop()
+        out: queue.Queue = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream_into(dict(kwargs), out), loop)
+        try:
+            while True:
+                kind, value = out.get()
+                if kind == "delta":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    def _submit(self, kwargs: dict[str, Any]):
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._create_response(dict(kwargs)), loop)
+
+    def create_response(self, **kwargs: Any):
+        """Blocking call to `responses.create` (for threadpool/worker code)."""
+        try:
+            return self._submit(kwargs).result()
+        except concurrent.futures.CancelledError:  # the client was closed mid-call
+            raise AIUnavailableError() from None
+
+    async def acreate_response(self, **kwargs: Any):
+        """Awaitable call to `responses.create` from any event loop."""
+        try:
+            return await asyncio.wrap_future(self._submit(kwargs))
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # our caller was cancelled
+            raise AIUnavailableError() from None
+
+
+# ---------- process-wide client ----------
+
+_client: AIClient | None = None
+_client_lock = threading.Lock()
+
+
+def build_ai_client() -> AIClient:
+    from app.core.config import settings
+
+    return AIClient(
+        api_key=settings.OPENAI_API_KEY,
+        model=settings.OPENAI_MODEL,
+        base_url=settings.OPENAI_BASE_URL,
+        connect_timeout=settings.OPENAI_CONNECT_TIMEOUT,
+        read_timeout=settings.OPENAI_READ_TIMEOUT,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        backoff_base=settings.OPENAI_RETRY_BACKOFF_BASE,
+        backoff_max=settings.OPENAI_RETRY_BACKOFF_MAX,
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+        queue_timeout=settings.OPENAI_QUEUE_TIMEOUT,
+        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+    )
+
+
+def get_ai_client() -> AIClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_ai_client()
+    return _client
+
+
+def close_ai_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
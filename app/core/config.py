@@ -1,6 +1,8 @@
 # app/core/config.py
 from __future__ import annotations
 import os
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -12,6 +14,31 @@ class Settings(BaseSettings):
     # DB (universal; works for Postgres or SQLite)
     DATABASE_URL: str = Field(default="sqlite+pysqlite:///:memory:")
 
+    # Read replicas for GET/HEAD requests (see app.db.routing); env JSON '["postgresql+psycopg2://..."]'
+    DATABASE_REPLICA_URLS: list[str] = Field(default_factory=list)
+    REPLICA_EJECT_SECONDS: float = 30.0       # a replica whose connection failed is skipped this long
+    READ_YOUR_WRITES_SECONDS: float = 5.0     # after a write, the user's reads stay on the primary this long
+
+    # Prometheus metrics at GET /metrics (per worker process; see app.core.metrics)
+    METRICS_ENABLED: bool = True
+
+    # Server-Timing response header (auth, membership, db, app, serialization; see app.core.request_timing)
+    SERVER_TIMING_ENABLED: bool = True        # turn off where timings shouldn't be visible to clients
+
+    # Request profiler: admins send `X-Profile: 1`, reports at GET /admin/profiles/{id} (app.core.profiler)
+    PROFILER_ENABLED: bool = True
+    PROFILER_INTERVAL_MS: float = 2.0         # sampling interval
+    PROFILER_MAX_SECONDS: float = 30.0        # stop sampling after this long
+    PROFILER_RETENTION_DAYS: float = 7.0      # older reports are purged
+
+    # Slow query log (see app.db.query_stats; every statement is timed for GET /admin/query-stats)
+    SLOW_QUERY_MS: float | None = 200.0       # log statements at least this slow; None/0 = no log
+    SLOW_QUERY_EXPLAIN: bool = True           # attach the EXPLAIN plan to slow query log entries
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False  # EXPLAIN ANALYZE (re-runs slow SELECTs; Postgres only)
+    SLOW_QUERY_LOG_FILE: str | None = None    # rotating file; default: the app's logging config
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+
     # Auth
     SECRET_KEY: str = "test-secret"          # override in prod
     ALGORITHM: str = "HS256"
@@ -20,6 +47,78 @@ class Settings(BaseSettings):
     # Optional extras
     DEMO_API_KEY: str | None = None
 
+    # OpenAI (one shared, pooled client per process; see app.core.ai_client)
+    OPENAI_API_KEY: str | None = None
+    OPENAI_MODEL: str = "gpt-5.2"
+    OPENAI_BASE_URL: str | None = None     # e.g. a local stub server in tests/load tests
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_READ_TIMEOUT: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_RETRY_BACKOFF_BASE: float = 0.5   # seconds; full jitter, doubled per attempt
+    OPENAI_RETRY_BACKOFF_MAX: float = 8.0
+    OPENAI_MAX_CONCURRENCY: int = 8          # in-flight upstream calls per process
+    OPENAI_QUEUE_TIMEOUT: float = 2.0        # wait for a free slot before failing with 503
+    OPENAI_MAX_CONNECTIONS: int = 20
+
+    # AI draft providers
+    AI_DRAFT_PROVIDER: Literal["openai", "local"] = "openai"   # "local" = rule-based only (offline/load tests)
+    AI_DRAFT_FALLBACK: bool = True            # serve rule-based drafts when OpenAI fails or the circuit is open
+    AI_DRAFT_FALLBACK_ON_QUOTA: bool = False  # ... and instead of 429 once the daily AI quota is used up
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = 3     # consecutive upstream failures before the circuit opens
+    AI_CIRCUIT_RESET_SECONDS: float = 30.0    # open -> half-open (one trial call)
+
+    # AI quotas (per UTC day and feature; counters in ai_usage_counters / ai_club_usage_counters)
+    AI_DAILY_LIMIT: int = 3                        # per user
+    AI_CLUB_DAILY_LIMIT: int | None = None         # default per club; None = unlimited
+    AI_CLUB_DAILY_LIMITS: dict[int, int] = Field(default_factory=dict)  # per club id; env JSON '{"12": 50}'
+
+    # Group AI drafts (one job per group; distinct athlete profiles generated in parallel)
+    AI_GROUP_DRAFT_CONCURRENCY: int = 4       # draft calls in flight per group job
+
+    # AI draft cache (in-process; hits skip the model call and the daily quota)
+    AI_DRAFT_CACHE_ENABLED: bool = True
+    AI_DRAFT_CACHE_TTL_SECONDS: float = 24 * 3600
+    AI_DRAFT_CACHE_MAX_ENTRIES: int = 512
+    AI_DRAFT_CACHE_SIMILARITY_THRESHOLD: float | None = 0.8  # Jaccard on goal/constraints; None = exact only
+
+    # GET /me/agenda (cross-club "my week"; short per-user cache)
+    AGENDA_CACHE_TTL_SECONDS: float = 30.0    # 0 disables the cache
+    AGENDA_CACHE_MAX_ENTRIES: int = 2048
+    AGENDA_MAX_DAYS: int = 31
+
+    # GET /clubs/{id}/sync (delta sync from change_log)
+    SYNC_PAGE_SIZE: int = 500                 # max change_log rows per response
+
+    # Live views (WebSocket attendance board)
+    PUBSUB_BACKEND: str = "local"             # "local" (single worker) or "postgres" (LISTEN/NOTIFY across workers)
+    PUBSUB_DATABASE_URL: str | None = None    # defaults to DATABASE_URL
+    PUBSUB_QUEUE_SIZE: int = 100              # per watcher; slower watchers are disconnected to resync
+
+    # Self check-in (HMAC door codes, batched attendance upserts)
+    CHECKIN_CODE_TTL_SECONDS: int = 120
+    CHECKIN_BATCH_WINDOW_MS: float = 5.0      # how long the writer collects check-ins per upsert
+    CHECKIN_BATCH_MAX: int = 200
+
+    # Linked template copies (sessions/exercises): background sync after template edits
+    TEMPLATE_SYNC_INTERVAL_SECONDS: float = 15.0  # 0 disables the sweep
+
+    # Idempotency-Key for POSTs (stored responses, replayed to retries)
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0    # how long a concurrent duplicate waits for the first response
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: float = 300.0  # in-progress claims older than this are taken over
+
+    # Background jobs (in-process runner, no broker)
+    JOB_DEFAULT_CONCURRENCY: int = 2
+    JOB_LEASE_SECONDS: float = 60.0  # jobs of a runner that stopped beating for this long are taken over
+    JOB_CONCURRENCY: dict[str, int] = Field(
+        default_factory=lambda: {
+            "workout_plan_ai_draft": 2,
+            "workout_plan_group_ai_draft": 1,
+            "workout_plan_export": 4,
+            "workout_plan_import": 2,
+        }
+    )  # per job type; env as JSON, e.g. '{"workout_plan_ai_draft": 4}'
+
     # pydantic-settings v2 config
     model_config = SettingsConfigDict(
         env_file=".env",             # default; can be overridden at init
@@ -2,30 +2,45 @@ from fastapi import Depends
 from sqlalchemy.orm import Session
 
 from app.db.deps import get_db
+from app.core.config import settings
+from app.jobs.runner import JobRunner, get_job_runner
+from app.repositories.agenda import AgendaRepository
+from app.repositories.ai_quota import AIQuotaRepository
 from app.repositories.ai_usage import AIUsageRepository
 from app.repositories.attendance import AttendanceRepository
 from app.repositories.club import ClubRepository
 from app.repositories.exercise import ExerciseRepository
 from app.repositories.group import GroupRepository
 from app.repositories.group_membership import GroupMembershipRepository
+from app.repositories.job import JobRepository
 from app.repositories.membership import MembershipRepository
 from app.repositories.plan import PlanRepository
 from app.repositories.plan_assignment import PlanAssignmentRepository
+from app.repositories.request_profile import RequestProfileRepository
 from app.repositories.session import SessionRepository
+from app.repositories.sync import SyncRepository
 from app.repositories.user import UserRepository
 from app.repositories.workout_plan import WorkoutPlanRepository
+from app.services.agenda import AgendaService, get_agenda_cache
+from app.services.ai_quota import AIQuotaService
 from app.services.attendance import AttendanceService
+from app.services.checkin import CheckInBatcher, SelfCheckInService, get_checkin_batcher
+from app.services.draft_providers import get_quota_fallback_provider
 from app.services.club import ClubService
 from app.services.exercise import ExerciseService
 from app.services.group import GroupService
 from app.services.group_membership import GroupMembershipService
+from app.services.job import JobService
 from app.services.membership import MembershipService
 from app.services.plan import PlanService
 from app.services.plan_assignment import PlanAssignmentService
+from app.services.request_profile import RequestProfileService
 from app.services.session import SessionService
+from app.services.sync import SyncService
 from app.services.user import UserService
 from app.services.workout_plan import WorkoutPlanService
 from app.services.workout_plan_ai import WorkoutPlanAIService
+from app.services.workout_plan_group_ai import WorkoutPlanGroupAIService
 
 
 #---- Dependency injection functions ----
@@ -102,6 +117,19 @@ def get_attendance_service(
 ) -> AttendanceService:
     return AttendanceService(attendance_repo=attendance_repo, membership_service=membership_service)
 
+def get_self_checkin_service(
+    attendance_repo: AttendanceRepository = Depends(get_attendance_repository),
+    membership_service: MembershipService = Depends(get_membership_service),
+    batcher: CheckInBatcher = Depends(get_checkin_batcher),
+) -> SelfCheckInService:
+    return SelfCheckInService(
+        attendance_repo=attendance_repo,
+        membership_service=membership_service,
+        batcher=batcher,
+        secret=settings.SECRET_KEY,
+        code_ttl_seconds=settings.CHECKIN_CODE_TTL_SECONDS,
+    )
+
 
 # plan assignments
 def get_plan_assignment_repository(db: Session = Depends(get_db)) -> PlanAssignmentRepository:
@@ -153,16 +181,102 @@ def get_ai_usage_repository(db: Session = Depends(get_db)) -> AIUsageRepository:
     return AIUsageRepository(db)
 
 
+# ---- AI Quota ----
+def get_ai_quota_repository(db: Session = Depends(get_db)) -> AIQuotaRepository:
+    return AIQuotaRepository(db)
+
+
+def get_ai_quota_service(
+    repo: AIQuotaRepository = Depends(get_ai_quota_repository),
+) -> AIQuotaService:
+    return AIQuotaService(
+        repo,
+        daily_limit=settings.AI_DAILY_LIMIT,
+        default_club_limit=settings.AI_CLUB_DAILY_LIMIT,
+        club_limits=settings.AI_CLUB_DAILY_LIMITS,
+    )
+
+
 # ---- workout plan ai ----
 def get_workout_plan_ai_service(
     workout_plan_service: WorkoutPlanService = Depends(get_workout_plan_service),
     ai_usage_repo: AIUsageRepository = Depends(get_ai_usage_repository),
     club_repo: ClubRepository = Depends(get_club_repository),
+    quota_service: AIQuotaService = Depends(get_ai_quota_service),
+    db: Session = Depends(get_db),
 ) -> WorkoutPlanAIService:
     return WorkoutPlanAIService(
         workout_plan_service=workout_plan_service,
         ai_usage_repo=ai_usage_repo,
         club_repo=club_repo,
-        daily_limit=3,
+        quota_service=quota_service,
+        quota_fallback=get_quota_fallback_provider(),
+        db=db,
     )
 
+
+def get_workout_plan_group_ai_service(
+    workout_plan_repo: WorkoutPlanRepository = Depends(get_workout_plan_repository),
+    gm_repo: GroupMembershipRepository = Depends(get_group_membership_repository),
+    membership_service: MembershipService = Depends(get_membership_service),
+    club_repo: ClubRepository = Depends(get_club_repository),
+    ai_usage_repo: AIUsageRepository = Depends(get_ai_usage_repository),
+    quota_service: AIQuotaService = Depends(get_ai_quota_service),
+    db: Session = Depends(get_db),
+) -> WorkoutPlanGroupAIService:
+    return WorkoutPlanGroupAIService(
+        workout_plan_repo=workout_plan_repo,
+        group_membership_repo=gm_repo,
+        membership_service=membership_service,
+        club_repo=club_repo,
+        ai_usage_repo=ai_usage_repo,
+        quota_service=quota_service,
+        quota_fallback=get_quota_fallback_provider(),
+        concurrency=settings.AI_GROUP_DRAFT_CONCURRENCY,
+        db=db,
+    )
+
+
+# ---- Agenda ----
+def get_agenda_repository(db: Session = Depends(get_db)) -> AgendaRepository:
+    return AgendaRepository(db)
+
+
+def get_agenda_service(repo: AgendaRepository = Depends(get_agenda_repository)) -> AgendaService:
+    return AgendaService(repo, cache=get_agenda_cache(), max_days=settings.AGENDA_MAX_DAYS)
+
+
+# ---- Sync ----
+def get_sync_repository(db: Session = Depends(get_db)) -> SyncRepository:
+    return SyncRepository(db)
+
+
+def get_sync_service(
+    repo: SyncRepository = Depends(get_sync_repository),
+    membership_service: MembershipService = Depends(get_membership_service),
+) -> SyncService:
+    return SyncService(repo, membership_service, page_size=settings.SYNC_PAGE_SIZE)
+
+
+# ---- Jobs ----
+def get_job_repository(db: Session = Depends(get_db)) -> JobRepository:
+    return JobRepository(db)
+
+
+def get_job_service(
+    job_repo: JobRepository = Depends(get_job_repository),
+    membership_service: MembershipService = Depends(get_membership_service),
+    runner: JobRunner = Depends(get_job_runner),
+) -> JobService:
+    return JobService(job_repo=job_repo, membership_service=membership_service, runner=runner)
+
+
+# ---- Admin ----
+def get_request_profile_repository(db: Session = Depends(get_db)) -> RequestProfileRepository:
+    return RequestProfileRepository(db)
+
+
+def get_request_profile_service(
+    repo: RequestProfileRepository = Depends(get_request_profile_repository),
+) -> RequestProfileService:
+    return RequestProfileService(repo)
@@ -0,0 +1,266 @@
+"""
+Idempotency-Key support for POST requests (ASGI middleware).
+
+A client that retries a POST with the same Idempotency-Key gets the stored
+first response back (with `Idempotent-Replayed: true`) instead of running
+the handler again: no 409 from a second INSERT, no second paid AI call.
+
+- Keys are scoped per caller (the JWT subject, or "anon") and bound to the
+  request: reusing a key for a different method/path/body is a 422.
+- The unique (scope, key) row is the lock. A concurrent duplicate finds the
+  in-progress row and waits (polling) for the response; after wait_seconds
+  it gets a 409 and can retry later.
+- 5xx, 429 and streaming (SSE) responses aren't stored: the claim is
+  released so a retry runs the handler again. Claims left behind by a
+  crashed worker are taken over after lock_timeout_seconds.
+- Rows expire after ttl_seconds and are purged opportunistically.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+import anyio
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.jwt_utils import subject_from_authorization
+from app.db.deps import primary_session
+from app.repositories.idempotency import IdempotencyRepository
+
+logger = logging.getLogger(__name__)
+
+HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _principal(headers: Headers) -> str:
+    sub = subject_from_authorization(headers.get("authorization"))
+    return f"user:{sub}" if sub else "anon"
+
+
+def _request_hash(scope: Scope, body: bytes) -> str:
+    h = hashlib.sha256()
+    for part in (scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1")):
+        h.update(part.encode())
+        h.update(b"\0")
+    h.update(body)
+    return h.hexdigest()
+
+
+@dataclass
+class _Decision:
+    kind: str  # "run" | "replay" | "wait" | "mismatch"
+    row_id: int | None = None
+    status_code: int | None = None
+    headers: list[list[str]] = field(default_factory=list)
+    body: bytes = b""
+
+
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        session_factory: Callable[[], Session] | None = None,
+        ttl_seconds: float = 24 * 3600,
+        wait_seconds: float = 10.0,
+        poll_seconds: float = 0.05,
+        lock_timeout_seconds: float = 300.0,
+        purge_interval_seconds: float = 60.0,
+    ) -> None:
+        self.app = app
+        self.session_factory = session_factory  # None: the primary, or the app's get_db override (tests)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self.lock_timeout = timedelta(seconds=lock_timeout_seconds)
+        self.purge_interval_seconds = purge_interval_seconds
+        self._next_purge = 0.0
+        self._purge_lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        key = headers.get(HEADER)
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"}, status_code=400
+            )(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        principal = _principal(headers)
+        request_hash = _request_hash(scope, body)
+
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            decision = await run_in_threadpool(self._try_claim, scope, principal, key, request_hash)
+            if decision.kind != "wait":
+                break
+            if time.monotonic() >= deadline:
+                await JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    status_code=409,
+                    headers={"Retry-After": "1"},
+                )(scope, receive, send)
+                return
+            await anyio.sleep(self.poll_seconds)
+
+        if decision.kind == "mismatch":
+            await JSONResponse(
+                {"detail": "Idempotency-Key was already used for a different request"}, status_code=422
+            )(scope, receive, send)
+            return
+        if decision.kind == "replay":
+            await _replay(decision, send)
+            return
+        await self._run(scope, _replay_body(body, receive), send, decision.row_id)
+
+    # ---------- first request ----------
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, row_id: int) -> None:
+        status_code = 500
+        response_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+        storable = True
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code, response_headers, storable
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+                content_type = dict(response_headers).get(b"content-type", b"")
+                storable = not content_type.startswith(b"text/event-stream")
+            elif message["type"] == "http.response.body" and storable:
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        except BaseException:
+            await run_in_threadpool(self._release, scope, row_id)
+            raise
+
+        if storable and status_code < 500 and status_code != 429:
+            stored = [[k.decode("latin-1"), v.decode("latin-1")] for k, v in response_headers]
+            await run_in_threadpool(self._complete, scope, row_id, status_code, stored, b"".join(chunks))
+        else:
+            await run_in_threadpool(self._release, scope, row_id)
+
+    # ---------- DB steps (threadpool) ----------
+
+    @contextmanager
+    def _session(self, scope: Scope) -> Iterator[Session]:
+        if self.session_factory is not None:
+            db = self.session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+            return
+        with primary_session(scope) as db:  # claims always go to the primary
+            yield db
+
+    def _try_claim(self, scope: Scope, principal: str, key: str, request_hash: str) -> _Decision:
+        now = datetime.now(timezone.utc)
+        with self._session(scope) as db:
+            repo = IdempotencyRepository(db)
+            self._maybe_purge(repo, now)
+
+            row = repo.claim(scope=principal, key=key, request_hash=request_hash, now=now, expires_at=now + self.ttl)
+            if row is not None:
+                return _Decision("run", row_id=row.id)
+
+            existing = repo.get(scope=principal, key=key)
+            if existing is None:  # released in the meantime: try again
+                return _Decision("wait")
+            expired = _as_utc(existing.expires_at) <= now
+            abandoned = existing.status_code is None and _as_utc(existing.locked_at) <= now - self.lock_timeout
+            if expired or abandoned:
+                if repo.take_over(existing, request_hash=request_hash, now=now, expires_at=now + self.ttl):
+                    return _Decision("run", row_id=existing.id)
+                return _Decision("wait")
+            if existing.request_hash != request_hash:
+                return _Decision("mismatch")
+            if existing.status_code is None:
+                return _Decision("wait")
+            return _Decision(
+                "replay",
+                status_code=existing.status_code,
+                headers=existing.response_headers or [],
+                body=existing.response_body or b"",
+            )
+
+    def _complete(self, scope: Scope, row_id: int, status_code: int, headers: list[list[str]], body: bytes) -> None:
+        with self._session(scope) as db:
+            IdempotencyRepository(db).complete(row_id, status_code=status_code, headers=headers, body=body)
+
+    def _release(self, scope: Scope, row_id: int) -> None:
+        try:
+            with self._session(scope) as db:
+                IdempotencyRepository(db).release(row_id)
+        except Exception:
+            logger.warning("could not release idempotency key %s", row_id, exc_info=True)
+
+    def _maybe_purge(self, repo: IdempotencyRepository, now: datetime) -> None:
+        with self._purge_lock:
+            if time.monotonic() < self._next_purge:
+                return
+            self._next_purge = time.monotonic() + self.purge_interval_seconds
+        try:
+            repo.purge_expired(now=now)
+        except Exception:
+            logger.warning("could not purge expired idempotency keys", exc_info=True)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """Hand the already-read body to the app, then pass through (disconnects)."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _replay(decision: _Decision, send: Send) -> None:
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in decision.headers]
+    headers.append((REPLAYED_HEADER, b"true"))
+    await send({"type": "http.response.start", "status": decision.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": decision.body})
@@ -0,0 +1,328 @@
+"""
+Prometheus metrics (text exposition format), served at GET /metrics.
+
+A small in-process registry instead of prometheus_client: counters,
+gauges and histograms are a dict lookup and an add under a lock, cheap
+enough to run on every request and every SQL statement. Values are per
+worker process; scrape each worker (or run one worker per container).
+
+Sources:
+- MetricsMiddleware: request latency, status codes, in-flight requests,
+  and DB statements/time per request (route = the path template)
+- app.db.query_stats (cursor events): statement time, via observe_statement()
+- app.db.database.TimedQueuePool: connection pool checkout wait
+- app.core.ai_client: AI call latency and token usage
+- scrape time: pool usage of every engine, threadpool saturation
+"""
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Callable, Iterable, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_timing import begin_request, current_timing, end_request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; web requests and SQL statements are mostly well below 1s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+AI_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Counter that can go down; with a callback, the values are read at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        callback: Callable[[], Iterable[tuple[tuple, float]]] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        if self.callback is not None:
+            values = list(self.callback())
+            with self._lock:
+                self._values = dict(values)
+        return super().render()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple, list] = {}  # labels -> [per-bucket counts (+Inf last), sum, count]
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return entry[2] if entry else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(labels, list(counts), total, n) for labels, (counts, total, n) in self._values.items()]
+        lines = self._header()
+        for labels, counts, total, n in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------- HTTP ----------
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response is sent.", ("method", "route")
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("method",)
+))
+HTTP_DB_STATEMENTS = REGISTRY.register(Histogram(
+    "http_request_db_statements", "SQL statements per HTTP request.", ("method", "route"), buckets=COUNT_BUCKETS
+))
+HTTP_DB_TIME = REGISTRY.register(Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ("method", "route")
+))
+
+# ---------- database ----------
+
+DB_STATEMENT_TIME = REGISTRY.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time."
+))
+DB_POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a connection from the pool."
+))
+
+# ---------- AI ----------
+
+AI_LATENCY = REGISTRY.register(Histogram(
+    "ai_request_duration_seconds", "OpenAI call latency (incl. retries).", ("kind", "outcome"),
+    buckets=AI_LATENCY_BUCKETS,
+))
+AI_TOKENS = REGISTRY.register(Counter(
+    "ai_tokens_total", "OpenAI tokens used.", ("model", "type")
+))
+
+
+# ---------- recording ----------
+
+def observe_statement(seconds: float) -> None:
+    """Called for every SQL statement (app.db.query_stats)."""
+    DB_STATEMENT_TIME.observe(seconds)
+    timing = current_timing()
+    if timing is not None:
+        timing.add_statement(seconds)
+
+
+def observe_ai_call(kind: str, outcome: str, seconds: float, *, model: str | None = None, usage=None) -> None:
+    """Latency of one OpenAI call; usage is the response's usage object (input/output tokens), if any."""
+    AI_LATENCY.observe(seconds, kind, outcome)
+    if usage is None:
+        return
+    for kind_, attr in (("input", "input_tokens"), ("output", "output_tokens")):
+        tokens = getattr(usage, attr, None)
+        if tokens:
+            AI_TOKENS.inc(model or "", kind_, amount=tokens)
+
+
+class MetricsMiddleware:
+    """Request count/latency/in-flight and per-request DB totals, labelled with the route template."""
+
+    def __init__(self, app: ASGIApp, *, exclude_paths: Sequence[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"  # unless a response starts
+        timing, token = begin_request()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            end_request(token)
+            HTTP_IN_FLIGHT.dec(method)
+            route = scope.get("route")
+            # the template keeps the label set small; unmatched paths are one bucket
+            label = getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
+            HTTP_REQUESTS.inc(method, label, status)
+            HTTP_LATENCY.observe(elapsed, method, label)
+            HTTP_DB_STATEMENTS.observe(timing.db_statements, method, label)
+            HTTP_DB_TIME.observe(timing.db_seconds, method, label)
+
+
+# ---------- scrape-time gauges ----------
+
+_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def track_engine(engine) -> None:
+    """Report the engine's pool usage at scrape time (pools without a size are skipped)."""
+    _engines.add(engine)
+
+
+def _pool_values(read: Callable) -> Iterable[tuple[tuple, float]]:
+    for engine in list(_engines):
+        pool = engine.pool
+        if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+            yield (engine.url.render_as_string(hide_password=True),), read(pool)
+
+
+REGISTRY.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out.", ("database",),
+    callback=lambda: _pool_values(lambda pool: pool.checkedout()),
+))
+REGISTRY.register(Gauge(
+    "db_pool_size", "Configured pool size (without overflow).", ("database",),
+    callback=lambda: _pool_values(lambda pool: pool.size()),
+))
+
+THREADPOOL_BUSY = REGISTRY.register(Gauge(
+    "threadpool_threads_busy", "Worker threads running sync endpoints/dependencies."
+))
+THREADPOOL_LIMIT = REGISTRY.register(Gauge(
+    "threadpool_threads_limit", "Size of the threadpool for sync endpoints/dependencies."
+))
+THREADPOOL_WAITING = REGISTRY.register(Gauge(
+    "threadpool_tasks_waiting", "Sync calls waiting for a free worker thread."
+))
+
+
+def render_metrics() -> str:
+    """The exposition text; call on the event loop (the threadpool limiter lives there)."""
+    from anyio.to_thread import current_default_thread_limiter
+
+    limiter = current_default_thread_limiter()
+    THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+    THREADPOOL_LIMIT.set(limiter.total_tokens)
+    THREADPOOL_WAITING.set(limiter.statistics().tasks_waiting)
+    return REGISTRY.render()
@@ -0,0 +1,245 @@
+"""
+On-demand sampling profiler for single requests.
+
+An admin sends `X-Profile: 1`; the response carries `X-Profile-Id` and the
+report (speedscope JSON, open it at https://www.speedscope.app) can be
+downloaded from GET /admin/profiles/{id}. The header is ignored for
+everyone else.
+
+While the request runs, a sampler thread reads the stacks of the threads
+working on it every interval_ms (sys._current_frames, no tracing, so the
+handler runs at close to normal speed). Those are the threads inside a
+timed() phase of the request (auth, membership checks, the endpoint; see
+app.core.request_timing), which covers the sync handlers and services.
+Time outside those phases (routing, response validation) isn't sampled, and
+neither is async code: the event loop thread runs every other request's
+coroutines too, so its stacks wouldn't belong to this request. A profile
+that skipped async code says so in its name.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.jwt_utils import subject_from_authorization
+from app.core.request_timing import begin_request, end_request
+from app.db.deps import primary_session
+from app.models.models import User, UserRole
+from app.repositories.request_profile import RequestProfileRepository
+
+logger = logging.getLogger(__name__)
+
+HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+_ENABLED_VALUES = frozenset({"1", "true", "yes"})
+
+Frame = tuple[str, str, int]  # (function, file, first line)
+
+
+class Sampler:
+    """Samples the stacks of the threads registered with enter_thread() until stopped."""
+
+    def __init__(self, *, interval_ms: float = 2.0, max_seconds: float = 30.0) -> None:
+        self.interval = max(0.0005, interval_ms / 1000)
+        self.max_seconds = max_seconds
+        self.stacks: Counter[tuple[Frame, ...]] = Counter()
+        self.sample_count = 0
+        self.skipped_async = False  # an async phase ran on the event loop, unsampled
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._threads: dict[int, int] = {}  # thread id -> nesting depth
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ---------- threads working on the request ----------
+
+    def enter_thread(self) -> None:
+        if _on_event_loop():
+            self.skipped_async = True
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def exit_thread(self) -> None:
+        if _on_event_loop():
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth > 0:
+                self._threads[ident] = depth
+            else:
+                self._threads.pop(ident, None)
+
+    # ---------- sampling ----------
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        deadline = self.started + self.max_seconds
+        while not self._stop.wait(self.interval) and time.perf_counter() < deadline:
+            self.sample()
+
+    def sample(self) -> None:
+        with self._lock:
+            idents = list(self._threads)
+        if not idents:
+            return
+        frames = sys._current_frames()
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks[_stack(frame)] += 1
+                self.sample_count += 1
+
+    # ---------- report ----------
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        """The samples as a speedscope "sampled" profile (weights in milliseconds)."""
+        if self.skipped_async:
+            name = f"{name} (async code not sampled)"
+        index: dict[Frame, int] = {}
+        samples, weights = [], []
+        for stack, count in self.stacks.most_common():
+            samples.append([index.setdefault(frame, len(index)) for frame in stack])
+            weights.append(round(count * self.interval * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "clubconnect",
+            "shared": {"frames": [{"name": f, "file": file, "line": line} for f, file, line in index]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _stack(frame) -> tuple[Frame, ...]:
+    """Root-first (function, file, line) of a thread's current stack."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class ProfilerMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        interval_ms: float = 2.0,
+        max_seconds: float = 30.0,
+        retention_days: float = 7.0,
+    ) -> None:
+        self.app = app
+        self.interval_ms = interval_ms
+        self.max_seconds = max_seconds
+        self.retention = timedelta(days=retention_days)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get(HEADER, "").strip().lower() not in _ENABLED_VALUES:
+            await self.app(scope, receive, send)
+            return
+        sub = subject_from_authorization(headers.get("authorization"))
+        profile_id = await run_in_threadpool(self._start, scope, sub) if sub else None
+        if profile_id is None:  # not an admin: an ordinary request
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send, profile_id)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, profile_id: int) -> None:
+        sampler = Sampler(interval_ms=self.interval_ms, max_seconds=self.max_seconds)
+        timing, token = begin_request()
+        timing.profiler = sampler
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, str(profile_id))
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            timing.profiler = None
+            end_request(token)
+            await run_in_threadpool(self._finish, scope, profile_id, sampler, status_code)
+
+    # ---------- DB steps (threadpool) ----------
+
+    def _start(self, scope: Scope, sub: str) -> int | None:
+        try:
+            user_id = int(sub)
+        except ValueError:
+            return None
+        with primary_session(scope) as db:
+            user = db.get(User, user_id)
+            if user is None or not user.is_active or user.role != UserRole.admin:
+                return None
+            repo = RequestProfileRepository(db)
+            repo.purge(before=datetime.now(timezone.utc) - self.retention)
+            return repo.start(user_id=user_id, method=scope["method"], path=scope["path"][:2048])
+
+    def _finish(self, scope: Scope, profile_id: int, sampler: Sampler, status_code: int) -> None:
+        name = f"{scope['method']} {scope['path']}"
+        report = json.dumps(sampler.speedscope(name), separators=(",", ":")).encode()
+        try:
+            with primary_session(scope) as db:
+                RequestProfileRepository(db).finish(
+                    profile_id,
+                    status_code=status_code,
+                    duration_ms=round(sampler.elapsed * 1000),
+                    sample_count=sampler.sample_count,
+                    report=report,
+                )
+        except Exception:  # the response is already out; don't turn a lost report into a 500
+            logger.exception("Could not store request profile %s", profile_id)
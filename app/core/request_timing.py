@@ -0,0 +1,145 @@
+"""
+Where a request's time goes, for the Server-Timing header and /metrics.
+
+A RequestTiming object lives in a context variable for the duration of an
+HTTP request (set by the metrics, Server-Timing or profiler middleware). Sync
+endpoints and dependencies run in the threadpool with a copy of the context
+that still points at the same object, so timings from there land in it too.
+
+Phases are exclusive: time spent in SQL statements or in a nested phase
+is not counted again in the enclosing one, so the entries add up.
+Outside a request (jobs, WebSockets, tests) everything here is a no-op.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass
+class RequestTiming:
+    started: float = field(default_factory=time.perf_counter)
+    db_statements: int = 0
+    db_seconds: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)  # exclusive seconds per phase
+    endpoint_done: tuple[float, float] | None = None  # (time, db_seconds) when the endpoint returned
+    profiler: Any = None  # app.core.profiler.Sampler for X-Profile requests: samples threads inside timed()
+    _nested: list[float] = field(default_factory=list)  # per open phase: time spent in nested phases/SQL
+
+    def add_statement(self, seconds: float) -> None:
+        self.db_statements += 1
+        self.db_seconds += seconds
+        self._credit(seconds)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def _credit(self, seconds: float) -> None:
+        if self._nested:
+            self._nested[-1] += seconds
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> RequestTiming | None:
+    return _current.get()
+
+
+def begin_request() -> tuple[RequestTiming, Token | None]:
+    """The request's timing, created unless an outer middleware already did (then the token is None)."""
+    timing = _current.get()
+    if timing is not None:
+        return timing, None
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def end_request(token: Token | None) -> None:
+    if token is not None:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Time a block (or, as a decorator, a function) as `phase`."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    profiler = timing.profiler
+    if profiler is not None:
+        profiler.enter_thread()
+    timing._nested.append(0.0)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        timing.add_phase(phase, max(0.0, elapsed - timing._nested.pop()))
+        timing._credit(elapsed)
+        if profiler is not None:
+            profiler.exit_thread()
+
+
+def mark_endpoint_done() -> None:
+    """Called when the endpoint function returns; what follows until the response starts is serialization."""
+    timing = _current.get()
+    if timing is not None:
+        timing.endpoint_done = (time.perf_counter(), timing.db_seconds)
+
+
+# ---------- Server-Timing ----------
+
+PHASE_ORDER = ("auth", "membership", "app", "serialization")
+
+
+def server_timing_header(timing: RequestTiming, now: float | None = None) -> str:
+    """e.g. `auth;dur=1.9, membership;dur=0.4, db;dur=3.2;desc="4 queries", app;dur=1.1, total;dur=8.0`"""
+    now = time.perf_counter() if now is None else now
+    phases = dict(timing.phases)
+    if timing.endpoint_done is not None:
+        done_at, db_at = timing.endpoint_done
+        # the dependency teardown (commit) is SQL and already counted under db
+        phases["serialization"] = max(0.0, now - done_at - (timing.db_seconds - db_at))
+
+    entries = [f"{name};dur={phases[name] * 1000:.1f}" for name in PHASE_ORDER[:2] if name in phases]
+    if timing.db_statements:
+        entries.append(f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.db_statements} queries"')
+    entries += [f"{name};dur={phases[name] * 1000:.1f}" for name in PHASE_ORDER[2:] if name in phases]
+    entries.append(f"total;dur={(now - timing.started) * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header (and Timing-Allow-Origin, so browsers expose it cross-origin)."""
+
+    def __init__(self, app: ASGIApp, *, allow_origins: tuple[str, ...] | list[str] = ()) -> None:
+        self.app = app
+        self.allow_origins = ", ".join(allow_origins)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing, token = begin_request()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing_header(timing))
+                if self.allow_origins:
+                    headers.append("Timing-Allow-Origin", self.allow_origins)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request(token)
@@ -1,3 +1,7 @@
+import base64
+import hashlib
+import hmac
+
 from passlib.context import CryptContext
 
 # setup how passwords are hashed/verified
@@ -11,3 +15,28 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # checks if plain matches the stored hash
     return pwd_ctx.verify(plain_password, hashed_password)
+
+
+# ---- self check-in codes ----
+# "<expiry, unix seconds, hex>.<truncated HMAC-SHA256>", short enough for a QR code.
+# Bound to club + session, so a code can't be replayed against another session.
+
+def _checkin_signature(secret: str, club_id: int, session_id: int, expires: int) -> str:
+    msg = f"checkin:{club_id}:{session_id}:{expires}".encode()
+    digest = hmac.new(secret.encode(), msg, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode().rstrip("=")
+
+
+def make_checkin_code(secret: str, *, club_id: int, session_id: int, expires: int) -> str:
+    return f"{expires:x}.{_checkin_signature(secret, club_id, session_id, expires)}"
+
+
+def verify_checkin_code(secret: str, code: str, *, club_id: int, session_id: int, now: float) -> bool:
+    expires_hex, _, signature = code.partition(".")
+    try:
+        expires = int(expires_hex, 16)
+    except ValueError:
+        return False
+    if expires < now:
+        return False
+    return hmac.compare_digest(signature, _checkin_signature(secret, club_id, session_id, expires))
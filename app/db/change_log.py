@@ -0,0 +1,225 @@
+"""
+Change tracking for delta sync.
+
+Session hooks turn every ORM insert/update/delete of a synced model into a
+change_log row, written on the flushing connection, i.e. in the same
+transaction as the change. Deletes also leave tombstones for the synced
+children the database cascades (a club's groups, a session's attendances),
+so clients never have to infer them from a parent's tombstone. Repositories don't need to do anything; code
+that bypasses the unit of work (bulk INSERT statements) calls
+record_changes() itself.
+
+Rows get their sync cursor (seq) in a before_commit hook, under a lock that
+is held until the commit is visible (Postgres: an advisory xact lock;
+SQLite: the database write lock), so seq follows commit order and a reader
+never serves a cursor past a change that is still in flight.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.orm import Session, aliased, sessionmaker
+
+from app.models.models import (
+    Attendance,
+    ChangeLog,
+    Club,
+    Group,
+    Plan,
+    Session as TrainingSession,
+    WorkoutPlan,
+)
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+# model -> entity name used in change_log and in the sync payload
+SYNCED_ENTITIES: dict[type, str] = {
+    Club: "club",
+    Group: "group",
+    Plan: "plan",
+    TrainingSession: "session",
+    Attendance: "attendance",
+    WorkoutPlan: "workout_plan",
+}
+
+# synced rows the database deletes along with a parent (ON DELETE CASCADE)
+# that the ORM never loads, e.g. a club's groups: parent table -> children
+_DB_CASCADES: dict[str, list[tuple[type, sa.Column]]] = {}
+for _model in SYNCED_ENTITIES:
+    for _fk in _model.__table__.foreign_keys:
+        if _fk.ondelete == "CASCADE":
+            _DB_CASCADES.setdefault(_fk.column.table.name, []).append((_model, _fk.parent))
+
+_TOMBSTONES_KEY = "change_log_tombstones"
+_UNSEQUENCED_KEY = "change_log_unsequenced"
+_SEQUENCE_LOCK_ID = 0x6368616E67656C6F  # pg_advisory_xact_lock key, "changelo"
+
+
+def _club_id(conn, obj: Any) -> int | None:
+    if isinstance(obj, Club):
+        return obj.id
+    if isinstance(obj, Attendance):
+        if "session" in obj.__dict__ and obj.session is not None:
+            return obj.session.club_id
+        return conn.execute(
+            sa.select(TrainingSession.club_id).where(TrainingSession.id == obj.session_id)
+        ).scalar_one_or_none()
+    return obj.club_id
+
+
+def _row(conn, obj: Any, op: str, now: datetime) -> dict[str, Any] | None:
+    club_id = _club_id(conn, obj)
+    if club_id is None or obj.id is None:
+        return None
+    return {
+        "club_id": club_id,
+        "entity": SYNCED_ENTITIES[type(obj)],
+        "entity_id": obj.id,
+        "op": op,
+        "user_id": obj.user_id if isinstance(obj, Attendance) else None,
+        "changed_at": now,
+    }
+
+
+def _cascaded_tombstones(conn, deleted: list[Any], now: datetime) -> list[dict[str, Any]]:
+    """Tombstones for synced rows that go with `deleted` through ON DELETE CASCADE only."""
+    seen = {(type(obj), obj.id) for obj in deleted if type(obj) in SYNCED_ENTITIES}
+    parents: dict[str, set[int]] = {}
+    for obj in deleted:
+        if obj.__table__.name in _DB_CASCADES and getattr(obj, "id", None) is not None:
+            parents.setdefault(obj.__table__.name, set()).add(obj.id)
+
+    rows = []
+    while parents:
+        children: dict[str, set[int]] = {}
+        for table, ids in parents.items():
+            for model, column in _DB_CASCADES[table]:
+                if model is Attendance:
+                    stmt = sa.select(Attendance.id, TrainingSession.club_id, Attendance.user_id).join(
+                        TrainingSession, TrainingSession.id == Attendance.session_id
+                    )
+                else:
+                    stmt = sa.select(model.id, model.club_id, sa.null())
+                for entity_id, club_id, owner in conn.execute(stmt.where(column.in_(ids))):
+                    if (model, entity_id) in seen:
+                        continue
+                    seen.add((model, entity_id))
+                    children.setdefault(model.__table__.name, set()).add(entity_id)
+                    rows.append({
+                        "club_id": club_id,
+                        "entity": SYNCED_ENTITIES[model],
+                        "entity_id": entity_id,
+                        "op": OP_DELETE,
+                        "user_id": owner,
+                        "changed_at": now,
+                    })
+        parents = {table: ids for table, ids in children.items() if table in _DB_CASCADES}
+    return rows
+
+
+def _before_flush(session: Session, _flush_context, _instances) -> None:
+    # tombstones need the parent rows (session -> club) that the flush may delete
+    if not session.deleted:
+        return
+    conn = session.connection()
+    now = datetime.now(timezone.utc)
+    deleted = list(session.deleted)
+    rows = session.info.setdefault(_TOMBSTONES_KEY, [])
+    rows.extend(
+        r for r in (_row(conn, obj, OP_DELETE, now) for obj in deleted if type(obj) in SYNCED_ENTITIES)
+        if r is not None
+    )
+    rows.extend(_cascaded_tombstones(conn, deleted, now))
+
+
+def _after_flush(session: Session, _flush_context) -> None:
+    # new/dirty still hold the pre-flush sets here, but new objects now have ids
+    conn = session.connection()
+    now = datetime.now(timezone.utc)
+    rows = session.info.pop(_TOMBSTONES_KEY, [])
+    for obj in (*session.new, *session.dirty):
+        if type(obj) not in SYNCED_ENTITIES:
+            continue
+        if obj not in session.new and not session.is_modified(obj, include_collections=False):
+            continue
+        row = _row(conn, obj, OP_UPSERT, now)
+        if row is not None:
+            rows.append(row)
+    if rows:
+        conn.execute(sa.insert(ChangeLog), rows)
+        session.info[_UNSEQUENCED_KEY] = True
+
+
+def _sequence(conn) -> None:
+    """
+    Number this transaction's change rows after everything committed so far.
+    Commits that log changes queue on the lock for the last moments of their
+    transaction; the lock goes away only once the commit is visible, so the
+    next holder's max(seq) (a fresh READ COMMITTED snapshot) already sees it.
+    """
+    if conn.dialect.name == "postgresql":
+        conn.execute(sa.select(sa.func.pg_advisory_xact_lock(_SEQUENCE_LOCK_ID)))
+    log = aliased(ChangeLog)
+    first = sa.select(sa.func.min(log.id)).where(log.seq.is_(None)).scalar_subquery()
+    base = sa.select(sa.func.coalesce(sa.func.max(log.seq), 0)).scalar_subquery()
+    # one statement, the subqueries run once; gaps are fine, the order within the transaction is kept
+    conn.execute(
+        sa.update(ChangeLog).where(ChangeLog.seq.is_(None)).values(seq=ChangeLog.id - first + base + 1)
+    )
+
+
+def _before_commit(session: Session) -> None:
+    # runs ahead of commit's own final flush, and for SAVEPOINTs too
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    if session.info.pop(_UNSEQUENCED_KEY, False):
+        _sequence(session.connection())
+
+
+def _after_rollback(session: Session) -> None:
+    # also fires for a rolled back SAVEPOINT, so the sequencing flag stays: the
+    # outer transaction may still hold change rows (and a stale flag is a no-op)
+    session.info.pop(_TOMBSTONES_KEY, None)
+
+
+def track_changes(target: sessionmaker | type[Session]) -> None:
+    """Install the change_log hooks on a sessionmaker (or Session class)."""
+    # a flag on the target, not event.contains(): the event registry is keyed by
+    # id(), so a new sessionmaker at a collected one's address looked installed
+    if getattr(target, "_change_log_tracked", False):
+        return
+    event.listen(target, "before_flush", _before_flush)
+    event.listen(target, "after_flush", _after_flush)
+    event.listen(target, "before_commit", _before_commit)
+    event.listen(target, "after_rollback", _after_rollback)
+    target._change_log_tracked = True
+
+
+def record_changes(
+    session: Session,
+    *,
+    club_id: int,
+    entity: str,
+    entity_ids: Iterable[int],
+    op: str = OP_UPSERT,
+    user_ids: Iterable[int | None] | None = None,
+) -> None:
+    """
+    Log changes made with Core statements (e.g. bulk inserts), in the caller's transaction.
+    user_ids (parallel to entity_ids) is the owning user of attendances, for member filtering.
+    """
+    now = datetime.now(timezone.utc)
+    entity_ids = list(entity_ids)
+    owners = list(user_ids) if user_ids is not None else [None] * len(entity_ids)
+    rows = [
+        {"club_id": club_id, "entity": entity, "entity_id": entity_id, "op": op, "user_id": owner, "changed_at": now}
+        for entity_id, owner in zip(entity_ids, owners)
+    ]
+    if rows:
+        session.execute(sa.insert(ChangeLog), rows)
+        session.info[_UNSEQUENCED_KEY] = True
@@ -1,15 +1,50 @@
+import time
 from typing import Optional
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core.metrics import DB_POOL_WAIT, track_engine
+from app.db.query_stats import configure_slow_query_log, instrument_engine
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited (db_pool_checkout_wait_seconds)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
 
 def build_engine(url: str | None = None):
-    # Only import settings if we actually need the default
+    from app.core.config import settings  # lazy import!
+
     if url is None:
-        from app.core.config import settings  # lazy import!
         url = settings.DATABASE_URL
 
+    engine = _create_engine(url)
+    # statement timing for /admin/query-stats and the slow query log
+    instrument_engine(
+        engine,
+        slow_ms=settings.SLOW_QUERY_MS,
+        explain_plans=settings.SLOW_QUERY_EXPLAIN,
+        explain_analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+    )
+    track_engine(engine)  # pool usage on /metrics
+    configure_slow_query_log(
+        settings.SLOW_QUERY_LOG_FILE,
+        max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backups=settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+    return engine
+
+
+def _create_engine(url: str):
     if url.startswith("sqlite"):
         engine = create_engine(
             url,
@@ -24,10 +59,21 @@ def build_engine(url: str | None = None):
                 pass
         return engine
 
-    return create_engine(url, pool_pre_ping=True)
+    return create_engine(url, pool_pre_ping=True, poolclass=TimedQueuePool)
+
+
+def redact_url(url: str) -> str:
+    """The URL without its password, for logs."""
+    return make_url(url).render_as_string(hide_password=True)
 
 
 def build_session_maker(url: Optional[str] = None) -> sessionmaker[Session]:
+    from app.db.change_log import track_changes  # imports the models
+    from app.realtime.attendance import track_attendance_events
+
     engine = build_engine(url)
-    return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    maker = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    track_changes(maker)  # change_log rows for delta sync, same transaction as the change
+    track_attendance_events(maker)  # live attendance board, published after commit
+    return maker
 
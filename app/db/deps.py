@@ -1,13 +1,67 @@
+from contextlib import contextmanager
 from typing import Iterator
 from sqlalchemy.orm import Session
-from app.db.database import build_session_maker
+from starlette.requests import HTTPConnection
+from starlette.types import Scope
+
+from app.auth.jwt_utils import subject_from_authorization
+from app.core.config import settings
+from app.db.database import build_session_maker, redact_url
+from app.db.routing import READ_METHODS, Replica, ReplicaRouter
+from app.db.unit_of_work import transaction
 
 # Default sessionmaker uses DATABASE_URL from env/.env (Postgres in dev/prod)
 SessionLocal = build_session_maker()
 
-def get_db() -> Iterator[Session]:
-    db = SessionLocal()
+# GET/HEAD requests read from DATABASE_REPLICA_URLS when configured
+db_router = ReplicaRouter(
+    SessionLocal,
+    [Replica(redact_url(url), build_session_maker(url)) for url in settings.DATABASE_REPLICA_URLS],
+    eject_seconds=settings.REPLICA_EJECT_SECONDS,
+    pin_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+def get_db(conn: HTTPConnection) -> Iterator[Session]:
+    """
+    One session and one transaction per request: committed after the
+    endpoint returns (before the response is sent), rolled back if it raises.
+
+    GET/HEAD requests are routed to a read replica (see app.db.routing);
+    a successful write request pins its user to the primary for a moment.
+    """
+    is_http = conn.scope["type"] == "http"
+    read_only = is_http and conn.scope["method"] in READ_METHODS
+    principal = None
+    if db_router.replicas:
+        sub = subject_from_authorization(conn.headers.get("authorization"))
+        principal = f"user:{sub}" if sub else None
+
+    db = db_router.session(read_only=read_only, principal=principal)
     try:
-        yield db
+        with transaction(db):
+            yield db
+        if is_http and not read_only:
+            db_router.record_write(principal)
     finally:
         db.close()
+
+
+@contextmanager
+def primary_session(scope: Scope) -> Iterator[Session]:
+    """
+    A session for ASGI middleware, outside get_db's routing and transaction:
+    on the primary, or from the app's get_db override (tests).
+    """
+    provider = getattr(scope.get("app"), "dependency_overrides", {}).get(get_db)
+    if provider is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+    gen = provider()
+    try:
+        yield next(gen)
+    finally:
+        gen.close()
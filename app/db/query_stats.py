@@ -0,0 +1,246 @@
+"""
+Statement timing for every engine built by build_engine.
+
+- every statement is timed; totals per SQL text (bound parameters are
+  placeholders, so one entry per query shape) are kept in memory for
+  GET /admin/query-stats
+- statements slower than SLOW_QUERY_MS are logged to the
+  "app.db.slow_queries" logger (a rotating file when SLOW_QUERY_LOG_FILE is
+  set) with the parameter shape (types, never values), the repository
+  method that ran them and an EXPLAIN plan
+
+EXPLAIN ANALYZE runs the statement a second time, so it's opt-in
+(SLOW_QUERY_EXPLAIN_ANALYZE) and only used for plain SELECTs (no row locks,
+no sequence or advisory lock calls). On Postgres the EXPLAIN runs in a
+SAVEPOINT that is always rolled back: a failing EXPLAIN would otherwise abort
+the request's transaction.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from logging.handlers import RotatingFileHandler
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import observe_statement
+
+slow_query_logger = logging.getLogger("app.db.slow_queries")
+
+_START_KEY = "query_stats_started"
+_EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+_CALLER_MODULES = ("app.repositories.", "app.services.", "app.core.", "app.db.")
+_SKIP_MODULES = ("app.db.query_stats", "app.db.unit_of_work")
+# SELECTs that change something when run again (never EXPLAIN ANALYZEd)
+_SIDE_EFFECTS = re.compile(
+    r"\bfor\s+(?:no\s+key\s+update|key\s+share|update|share)\b"
+    r"|\b(?:nextval|setval|pg_(?:try_)?advisory\w*|pg_notify|set_config)\s*\(",
+    re.IGNORECASE,
+)
+_SAVEPOINT = "query_stats_explain"
+
+
+@dataclass
+class StatementStats:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    caller: str | None = None  # last repository method seen running it
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryStats:
+    """Per-statement totals, bounded: once full, new statements evict the cheapest one."""
+
+    def __init__(self, max_statements: int = 500) -> None:
+        self.max_statements = max_statements
+        self._stats: dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed_ms: float, caller: str | None = None) -> None:
+        with self._lock:
+            entry = self._stats.get(statement)
+            if entry is None:
+                if len(self._stats) >= self.max_statements:
+                    cheapest = min(self._stats.values(), key=lambda s: s.total_ms)
+                    del self._stats[cheapest.statement]
+                entry = self._stats[statement] = StatementStats(statement)
+            entry.calls += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            if caller is not None:
+                entry.caller = caller
+
+    def top(self, limit: int = 20) -> list[StatementStats]:
+        """The statements with the highest total time, slowest first."""
+        with self._lock:
+            return sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_stats = QueryStats()
+
+
+# ---------- slow statement details ----------
+
+def find_caller(skip: int = 2) -> str | None:
+    """
+    "Class.method" (or "module.function") of the innermost app frame outside
+    app.db.* below the SQLAlchemy call, preferring repositories.
+    """
+    frame = sys._getframe(skip)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_CALLER_MODULES) and not module.startswith(_SKIP_MODULES):
+            owner = frame.f_locals.get("self")
+            name = (
+                f"{type(owner).__name__}.{frame.f_code.co_name}"
+                if owner is not None
+                else f"{module}.{frame.f_code.co_name}"
+            )
+            if module.startswith("app.repositories."):
+                return name
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Parameter names and types, without the values (which may be personal data)."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def explain(cursor, dialect_name: str, statement: str, parameters: Any, *, analyze: bool = False) -> str | None:
+    """
+    The plan of a statement, run on the statement's own DBAPI connection
+    (same transaction, so it sees uncommitted rows). None for statements that
+    can't be explained (DDL, PRAGMA, ...).
+    """
+    verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    if verb not in _EXPLAINABLE:
+        return None
+    if dialect_name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect_name == "postgresql":
+        analyze = analyze and verb == "select" and not _SIDE_EFFECTS.search(statement)
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    else:
+        prefix = "EXPLAIN "
+    dbapi_conn = cursor.connection
+    # an error aborts a Postgres transaction, and ANALYZE's run must leave nothing behind
+    savepoint = dialect_name == "postgresql" and not getattr(dbapi_conn, "autocommit", False)
+    plan_cursor = dbapi_conn.cursor()
+    try:
+        if savepoint:
+            plan_cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            plan_cursor.execute(prefix + statement, parameters)
+            rows = plan_cursor.fetchall()
+        finally:
+            if savepoint:
+                plan_cursor.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT}")
+                plan_cursor.execute(f"RELEASE SAVEPOINT {_SAVEPOINT}")
+    except Exception as exc:  # a plan is nice to have; never fail the request over it
+        return f"EXPLAIN failed: {exc.__class__.__name__}: {exc}"
+    finally:
+        plan_cursor.close()
+    # sqlite: (id, parent, notused, detail); postgres/mysql: one text column per line
+    return "\n".join(str(row[-1]) if dialect_name == "sqlite" else " | ".join(map(str, row)) for row in rows)
+
+
+# ---------- engine hooks ----------
+
+def instrument_engine(
+    engine: Engine,
+    *,
+    stats: QueryStats | None = None,
+    slow_ms: float | None = None,
+    explain_plans: bool = True,
+    explain_analyze: bool = False,
+) -> None:
+    """
+    Time every statement on the engine into stats (default: the process-wide
+    query_stats); log statements slower than slow_ms (None/0 = no log).
+    """
+    stats = stats if stats is not None else query_stats
+    # a flag on the engine: event.contains() is keyed by id() and can see a disposed engine's hooks
+    if getattr(engine, "_query_stats_instrumented", False):
+        return
+    engine._query_stats_instrumented = True
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop(_START_KEY, None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        observe_statement(elapsed_ms / 1000)
+        slow = bool(slow_ms) and elapsed_ms >= slow_ms
+        caller = find_caller() if slow else None
+        stats.record(statement, elapsed_ms, caller)
+        if not slow:
+            return
+        plan = None
+        if explain_plans and not executemany:
+            plan = explain(cursor, conn.dialect.name, statement, parameters, analyze=explain_analyze)
+        slow_query_logger.warning(
+            "slow query %.1f ms in %s\n%s\nparameters: %s%s",
+            elapsed_ms,
+            caller or "?",
+            statement,
+            parameter_shape(parameters, executemany),
+            f"\nplan:\n{plan}" if plan else "",
+            extra={
+                "elapsed_ms": elapsed_ms,
+                "statement": statement,
+                "caller": caller,
+                "plan": plan,
+            },
+        )
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # EXPLAIN goes through the raw DBAPI cursor, so statements never nest here
+    conn.info[_START_KEY] = time.perf_counter()
+
+
+_log_file_lock = threading.Lock()
+
+
+def configure_slow_query_log(path: str | None, *, max_bytes: int, backups: int) -> None:
+    """Send the slow query log to a rotating file (once per process and path)."""
+    if not path:
+        return
+    path = os.path.abspath(path)
+    with _log_file_lock:
+        for handler in slow_query_logger.handlers:
+            if isinstance(handler, RotatingFileHandler) and handler.baseFilename == path:
+                return
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.setLevel(logging.WARNING)
@@ -0,0 +1,118 @@
+"""
+Read-replica routing.
+
+GET/HEAD requests get a session on a read replica, everything else (and
+all background work) stays on the primary:
+
+- replicas are used round-robin
+- a replica whose connection fails is ejected for eject_seconds, then tried
+  again; with every replica ejected, reads fall back to the primary
+- read-your-writes: after a user's write request, that user's reads go to
+  the primary for pin_seconds, long enough to cover replication lag
+
+Pins live in the worker's memory. With several workers a user's next read
+can land on a worker that hasn't seen the write; keep pin_seconds above the
+usual replica lag so that only slow replication is visible there.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+@dataclass
+class Replica:
+    name: str
+    maker: sessionmaker[Session]
+    ejected_until: float = 0.0
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: sessionmaker[Session],
+        replicas: Sequence[Replica] = (),
+        *,
+        eject_seconds: float = 30.0,
+        pin_seconds: float = 5.0,
+        max_pins: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.eject_seconds = eject_seconds
+        self.pin_seconds = pin_seconds
+        self.max_pins = max_pins
+        self.clock = clock
+        self._next = 0
+        self._pins: dict[str, float] = {}
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            self._watch(replica)
+
+    # ---------- sessions ----------
+
+    def session(self, *, read_only: bool, principal: str | None = None) -> Session:
+        """A primary session, or for reads of unpinned callers a connected replica session."""
+        if not read_only or not self.replicas or self.is_pinned(principal):
+            return self.primary()
+        for replica in self._healthy_in_turn():
+            db = replica.maker()
+            try:
+                db.connection()  # checkout (with pre-ping): a dead replica fails here, not mid-request
+            except DBAPIError:
+                db.close()
+                self.eject(replica)
+                continue
+            return db
+        return self.primary()
+
+    def _healthy_in_turn(self) -> list[Replica]:
+        now = self.clock()
+        with self._lock:
+            start = self._next
+            self._next = (start + 1) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [r for r in ordered if r.ejected_until <= now]
+
+    # ---------- health ----------
+
+    def eject(self, replica: Replica) -> None:
+        replica.ejected_until = self.clock() + self.eject_seconds
+        logger.warning("read replica %s ejected for %.0fs", replica.name, self.eject_seconds)
+
+    def _watch(self, replica: Replica) -> None:
+        # connections lost mid-request (replica restarted, network) eject the replica too
+        @event.listens_for(replica.maker.kw["bind"], "handle_error")
+        def _on_error(context) -> None:
+            if context.is_disconnect:
+                self.eject(replica)
+
+    # ---------- read-your-writes ----------
+
+    def record_write(self, principal: str | None) -> None:
+        """Pin the caller to the primary for pin_seconds."""
+        if principal is None or not self.replicas or self.pin_seconds <= 0:
+            return
+        now = self.clock()
+        with self._lock:
+            self._pins[principal] = now + self.pin_seconds
+            if len(self._pins) > self.max_pins:
+                self._pins = {p: until for p, until in self._pins.items() if until > now}
+
+    def is_pinned(self, principal: str | None) -> bool:
+        if principal is None:
+            return False
+        until = self._pins.get(principal)
+        return until is not None and until > self.clock()
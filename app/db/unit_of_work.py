@@ -0,0 +1,36 @@
+"""
+Unit of work: one transaction per request (or per job / background write).
+
+Repositories add, change and delete objects and flush() so ids and
+constraint errors show up right away, but they don't commit. Whoever owns
+the session commits once at the end:
+
+- requests: get_db (app.db.deps) wraps the endpoint in transaction()
+- jobs: the runner commits with the job's final status
+- streams and background writers: transaction(db) around their writes
+
+A repository method whose failure the caller handles and recovers from
+(e.g. retrying an insert under another name) flushes inside
+db.begin_nested(), so only that SAVEPOINT is rolled back, not the request.
+
+A few repositories commit on their own because their rows must be visible
+to other sessions immediately (idempotency claims, job status, AI quota
+reservations); see their docstrings.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def transaction(db: Session) -> Iterator[Session]:
+    """Commit when the block completes, roll back if it raises."""
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
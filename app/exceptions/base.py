@@ -26,6 +26,10 @@ class ConflictError(DomainError):
     status_code = 409
     detail = "Conflict"
 
+class PreconditionFailedError(DomainError):
+    status_code = 412
+    detail = "The resource was modified by someone else. Reload it and retry."
+
 
 # user exceptions
 class EmailExistsError(ConflictError):
@@ -120,6 +124,13 @@ class AttendanceNotFoundError(NotFoundError):
 class AttendanceExistsError(ConflictError):
     detail = "Attendance record already exists."
 
+class InvalidCheckInCode(PermissionDeniedError):
+    detail = "Check-in code is invalid or expired."
+
+class CheckInBusyError(DomainError):
+    status_code = 503
+    detail = "Check-in is busy. Please try again."
+
 
 # groups
 class GroupNotFoundError(NotFoundError):
@@ -141,6 +152,29 @@ class GroupMembershipExistsError(ConflictError):
 class WorkoutNotFoundError(NotFoundError):
     detail = "Workout not found"
 
+class WorkoutPlanNotTemplateError(ConflictError):
+    detail = "Workout plan is not a template"
+
 class RateLimitError(DomainError):
     status_code = 429
-    detail = "Daily AI quota reached. Please try again later."
\ No newline at end of file
+    detail = "Daily AI quota reached. Please try again later."
+
+class AIUnavailableError(DomainError):
+    status_code = 503
+    detail = "AI service temporarily unavailable. Please try again later."
+
+class AIBusyError(AIUnavailableError):
+    """All upstream AI slots in this process are taken (local overload, not an upstream failure)."""
+    detail = "AI service is busy. Please try again shortly."
+
+# jobs
+class JobNotFoundError(NotFoundError):
+    detail = "Job not found"
+
+class UnknownJobTypeError(DomainError):
+    status_code = 400
+    detail = "Unknown job type"
+
+# admin
+class ProfileNotFoundError(NotFoundError):
+    detail = "Profile not found"
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.jobs.runner import JobContext, JobRunner
+from app.repositories.ai_quota import AIQuotaRepository
+from app.repositories.ai_usage import AIUsageRepository
+from app.repositories.club import ClubRepository
+from app.repositories.group_membership import GroupMembershipRepository
+from app.repositories.membership import MembershipRepository
+from app.repositories.user import UserRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from app.schemas.job import WorkoutPlanImport
+from app.schemas.workout_plan import WorkoutPlanReadNested
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest, WorkoutPlanGroupAIDraftRequest
+from app.services.ai_quota import AIQuotaService
+from app.services.draft_providers import get_quota_fallback_provider
+from app.services.membership import MembershipService
+from app.services.workout_plan import WorkoutPlanService
+from app.services.workout_plan_ai import WorkoutPlanAIService, persist_draft
+from app.services.workout_plan_group_ai import WorkoutPlanGroupAIService
+
+
+JOB_WORKOUT_PLAN_AI_DRAFT = "workout_plan_ai_draft"
+JOB_WORKOUT_PLAN_GROUP_AI_DRAFT = "workout_plan_group_ai_draft"
+JOB_WORKOUT_PLAN_EXPORT = "workout_plan_export"
+JOB_WORKOUT_PLAN_IMPORT = "workout_plan_import"
+
+
+# ---------- service wiring (mirrors app.core.dependencies, but on the job Session) ----------
+
+def _workout_plan_service(db: Session) -> WorkoutPlanService:
+    return WorkoutPlanService(repo=WorkoutPlanRepository(db=db), membership_service=_membership_service(db))
+
+
+def _membership_service(db: Session) -> MembershipService:
+    return MembershipService(
+        MembershipRepository(db),
+        user_repo=UserRepository(db),
+        club_repo=ClubRepository(db),
+    )
+
+
+def _quota_service(db: Session) -> AIQuotaService:
+    return AIQuotaService(
+        AIQuotaRepository(db),
+        daily_limit=settings.AI_DAILY_LIMIT,
+        default_club_limit=settings.AI_CLUB_DAILY_LIMIT,
+        club_limits=settings.AI_CLUB_DAILY_LIMITS,
+    )
+
+
+def _workout_plan_ai_service(db: Session) -> WorkoutPlanAIService:
+    return WorkoutPlanAIService(
+        workout_plan_service=_workout_plan_service(db),
+        ai_usage_repo=AIUsageRepository(db),
+        club_repo=ClubRepository(db),
+        quota_service=_quota_service(db),
+        quota_fallback=get_quota_fallback_provider(),
+        db=db,
+    )
+
+
+def _workout_plan_group_ai_service(db: Session) -> WorkoutPlanGroupAIService:
+    return WorkoutPlanGroupAIService(
+        workout_plan_repo=WorkoutPlanRepository(db=db),
+        group_membership_repo=GroupMembershipRepository(db),
+        membership_service=_membership_service(db),
+        club_repo=ClubRepository(db),
+        ai_usage_repo=AIUsageRepository(db),
+        quota_service=_quota_service(db),
+        quota_fallback=get_quota_fallback_provider(),
+        concurrency=settings.AI_GROUP_DRAFT_CONCURRENCY,
+        db=db,
+    )
+
+
+# ---------- handlers ----------
+
+def run_workout_plan_ai_draft(ctx: JobContext) -> dict[str, Any]:
+    req = WorkoutPlanAIDraftRequest.model_validate(ctx.payload["request"])
+    ctx.report_progress(10)
+    plan = _workout_plan_ai_service(ctx.db).generate_and_create_plan(
+        club_id=ctx.club_id,
+        user_id=ctx.created_by_id,
+        req=req,
+    )
+    return {"plan_id": plan.id}
+
+
+def run_workout_plan_group_ai_draft(ctx: JobContext) -> dict[str, Any]:
+    req = WorkoutPlanGroupAIDraftRequest.model_validate(ctx.payload["request"])
+    return _workout_plan_group_ai_service(ctx.db).generate_for_group(
+        club_id=ctx.club_id,
+        group_id=ctx.payload["group_id"],
+        user_id=ctx.created_by_id,
+        req=req,
+        progress=ctx.report_progress,
+    )
+
+
+def run_workout_plan_export(ctx: JobContext) -> dict[str, Any]:
+    plan = _workout_plan_service(ctx.db).get_plan(
+        club_id=ctx.club_id,
+        plan_id=ctx.payload["plan_id"],
+        user_id=ctx.created_by_id,
+        nested=True,
+    )
+    return {"plan": WorkoutPlanReadNested.model_validate(plan).model_dump(mode="json")}
+
+
+def run_workout_plan_import(ctx: JobContext) -> dict[str, Any]:
+    document = WorkoutPlanImport.model_validate(ctx.payload["plan"])
+    plan = persist_draft(
+        _workout_plan_service(ctx.db),
+        club_id=ctx.club_id,
+        user_id=ctx.created_by_id,
+        draft=document,
+    )
+    return {"plan_id": plan.id}
+
+
+def register_default_handlers(runner: JobRunner) -> None:
+    runner.register(JOB_WORKOUT_PLAN_AI_DRAFT, run_workout_plan_ai_draft)
+    runner.register(JOB_WORKOUT_PLAN_GROUP_AI_DRAFT, run_workout_plan_group_ai_draft)
+    runner.register(JOB_WORKOUT_PLAN_EXPORT, run_workout_plan_export)
+    runner.register(JOB_WORKOUT_PLAN_IMPORT, run_workout_plan_import)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Mapping
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.repositories.job import JobRepository
+from app.exceptions.base import UnknownJobTypeError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobContext:
+    """Everything a handler gets to do its work.
+
+    - db is a fresh Session owned by the runner (closed after the handler).
+    - report_progress() persists 0..100 so GET /jobs/{id} can show it.
+    """
+
+    db: Session
+    job_id: int
+    job_type: str
+    created_by_id: int
+    club_id: int | None
+    payload: dict[str, Any] = field(default_factory=dict)
+    _repo: JobRepository | None = None
+
+    def report_progress(self, progress: int) -> None:
+        if self._repo is None:
+            return
+        self._repo.set_progress(self._repo.get(self.job_id), progress)
+
+
+JobHandler = Callable[[JobContext], "dict[str, Any] | None"]
+
+
+class JobRunner:
+    """In-process job runner (no external broker).
+
+    - One bounded ThreadPoolExecutor per job type, so a burst of slow AI
+      drafts cannot starve exports/imports.
+    - Job state lives in the `jobs` table; the pools only hold job ids.
+    - Handlers run with their own Session and never see the request Session.
+    - Every API worker process has a runner: a job row names the runner that
+      holds it (locked_by) and that runner keeps beating while the job is in
+      its pool, so another process only takes over jobs whose lease ran out.
+      Running a job starts with an atomic queued -> running claim, so a job
+      in two pools still runs once.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] | Callable[[], Session],
+        *,
+        concurrency: Mapping[str, int] | None = None,
+        default_concurrency: int = 2,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = max(1, default_concurrency)
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._handlers: dict[str, JobHandler] = {}
+        self._pools: dict[str, ThreadPoolExecutor] = {}
+        self._held: set[int] = set()  # job ids in our pools, under lease
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stop = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    # ---------- registration ----------
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        self._handlers[job_type] = handler
+
+    def has_handler(self, job_type: str) -> bool:
+        return job_type in self._handlers
+
+    # ---------- scheduling ----------
+
+    def _pool_for(self, job_type: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(job_type)
+            if pool is None:
+                workers = max(1, self.concurrency.get(job_type, self.default_concurrency))
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"job-{job_type}")
+                self._pools[job_type] = pool
+            return pool
+
+    def submit(self, job_id: int, job_type: str) -> Future:
+        """Schedule an already persisted job. Returns the pool Future (mainly for tests)."""
+        if not self.has_handler(job_type):
+            raise UnknownJobTypeError(f"No handler registered for job type '{job_type}'")
+        if self._closed:
+            raise RuntimeError("JobRunner is shut down")
+        with self._lock:
+            self._held.add(job_id)
+        self._start_heartbeat()
+        return self._pool_for(job_type).submit(self._run, job_id)
+
+    def recover(self) -> int:
+        """
+        Re-schedule unfinished jobs whose runner is gone (no lease, or it ran
+        out). Jobs another live process holds, queued or running, are left alone.
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        db = self.session_factory()
+        try:
+            adopted = JobRepository(db).adopt_orphans(self.worker_id, list(self._handlers), stale_before)
+        finally:
+            db.close()
+        for job_id, job_type in adopted:
+            self.submit(job_id, job_type)
+        return len(adopted)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._closed = True
+        self._stop.set()
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    # ---------- leases ----------
+
+    def _start_heartbeat(self) -> None:
+        with self._lock:
+            if self._heartbeat is not None:
+                return
+            self._heartbeat = threading.Thread(target=self._beat, name="job-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                held = list(self._held)
+            if not held:
+                continue
+            db = self.session_factory()
+            try:
+                JobRepository(db).heartbeat(held, self.worker_id)
+            except Exception:
+                logger.warning("could not renew job leases", exc_info=True)
+            finally:
+                db.close()
+
+    # ---------- execution ----------
+
+    def _run(self, job_id: int) -> None:
+        db = self.session_factory()
+        try:
+            repo = JobRepository(db)
+            if not repo.claim(job_id, self.worker_id):
+                return  # finished or taken by another runner (e.g. after its recover)
+
+            job = repo.get(job_id)
+            ctx = JobContext(
+                db=db,
+                job_id=job.id,
+                job_type=job.job_type,
+                created_by_id=job.created_by_id,
+                club_id=job.club_id,
+                payload=dict(job.payload or {}),
+                _repo=repo,
+            )
+            handler = self._handlers[job.job_type]
+
+            try:
+                result = handler(ctx)
+            except Exception as exc:  # handler failures end up on the job row
+                db.rollback()
+                logger.exception("job %s (%s) failed", job_id, job.job_type)
+                repo.mark_failed(repo.get(job_id), f"{type(exc).__name__}: {exc}")
+                return
+
+            repo.mark_succeeded(repo.get(job_id), result)
+        except Exception:
+            logger.exception("job %s could not be processed", job_id)
+        finally:
+            with self._lock:
+                self._held.discard(job_id)
+            db.close()
+
+
+# ---------- process-wide runner ----------
+
+_runner: JobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Lazily build the shared runner (also used as a FastAPI dependency)."""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                from app.core.config import settings
+                from app.db.deps import SessionLocal
+                from app.jobs.handlers import register_default_handlers
+
+                runner = JobRunner(
+                    SessionLocal,
+                    concurrency=settings.JOB_CONCURRENCY,
+                    default_concurrency=settings.JOB_DEFAULT_CONCURRENCY,
+                    lease_seconds=settings.JOB_LEASE_SECONDS,
+                )
+                register_default_handlers(runner)
+                try:
+                    runner.recover()
+                except Exception:
+                    logger.warning("could not recover pending jobs", exc_info=True)
+                _runner = runner
+    return _runner
+
+
+def shutdown_job_runner(wait: bool = False) -> None:
+    global _runner
+    with _runner_lock:
+        if _runner is not None:
+            _runner.shutdown(wait=wait)
+            _runner = None
@@ -1,16 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.routing import TimedRouter
 from app.auth.routes import router as auth_router
+from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.core.profiler import ProfilerMiddleware
+from app.core.request_timing import ServerTimingMiddleware
 from app.exceptions.base import DomainError
+from app.core.ai_client import close_ai_client
+from app.jobs.runner import shutdown_job_runner
+from app.realtime.pubsub import shutdown_broker
+from app.services.checkin import shutdown_checkin_batcher
+from app.services.template_links import shutdown_template_sync_sweeper, start_template_sync_sweeper
 from app.api.endpoints import (
+    admin,
     clubs,
     plans,
     plan_assignments,
     attendances,
     workout_plan,
     workout_plan_ai,
+    jobs,
+    me,
+    sync,
 )
 from app.api.endpoints import users, exercises, group_memberships, groups, memberships, sessions
 def register_exception_handlers(app: FastAPI) -> None:
@@ -22,14 +39,46 @@ def register_exception_handlers(app: FastAPI) -> None:
         )
 
 
-app = FastAPI(title="ClubTrack API")
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    start_template_sync_sweeper()
+    yield
+    shutdown_template_sync_sweeper(wait=True)
+    # let running jobs finish in their threads; don't block shutdown on them
+    shutdown_job_runner(wait=False)
+    shutdown_checkin_batcher(wait=True)  # flush queued check-ins
+    shutdown_broker()
+    close_ai_client()
+
+
+app = FastAPI(title="ClubTrack API", lifespan=lifespan)
+
+CORS_ORIGINS = ["http://localhost:5173"]
 
+# inside CORS, so replayed responses get CORS headers too
+app.add_middleware(
+    IdempotencyMiddleware,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+    lock_timeout_seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173"],
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.PROFILER_ENABLED:
+    app.add_middleware(
+        ProfilerMiddleware,
+        interval_ms=settings.PROFILER_INTERVAL_MS,
+        max_seconds=settings.PROFILER_MAX_SECONDS,
+        retention_days=settings.PROFILER_RETENTION_DAYS,
+    )
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware, allow_origins=CORS_ORIGINS)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)  # outermost: times everything, replays included
 
 register_exception_handlers(app)
 
@@ -38,6 +87,13 @@ def healthz():
     return {"ok": True}
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # async on purpose: runs on the event loop, where the threadpool limiter lives
+        return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/", response_class=HTMLResponse)
 def welcome():
     return """
@@ -72,20 +128,26 @@ def welcome():
 """
 
 
-app.include_router(clubs.router)
-app.include_router(auth_router)
-app.include_router(users.router)
-app.include_router(memberships.clubs_memberships_router)
-app.include_router(memberships.memberships_router)
-app.include_router(plans.router)
-app.include_router(sessions.router)
-app.include_router(exercises.exercises_router)
-app.include_router(plan_assignments.router)
-app.include_router(groups.router)
-app.include_router(group_memberships.router)
-app.include_router(attendances.router)
-app.include_router(workout_plan.router)
-app.include_router(workout_plan_ai.router)
+api_router = TimedRouter()  # times every endpoint for Server-Timing
+api_router.include_router(clubs.router)
+api_router.include_router(auth_router)
+api_router.include_router(users.router)
+api_router.include_router(memberships.clubs_memberships_router)
+api_router.include_router(memberships.memberships_router)
+api_router.include_router(plans.router)
+api_router.include_router(sessions.router)
+api_router.include_router(exercises.exercises_router)
+api_router.include_router(plan_assignments.router)
+api_router.include_router(groups.router)
+api_router.include_router(group_memberships.router)
+api_router.include_router(attendances.router)
+api_router.include_router(workout_plan.router)
+api_router.include_router(workout_plan_ai.router)
+api_router.include_router(jobs.router)
+api_router.include_router(me.router)
+api_router.include_router(sync.router)
+api_router.include_router(admin.router)
+app.include_router(api_router)
 
 # to run from project root: python -m uvicorn ClubConnect.app.main:app --reload
 # to run from git root: python -m uvicorn app.main:app --reload
@@ -1,9 +1,11 @@
 from datetime import datetime, timezone
 import enum
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
+    Date,
     ForeignKey,
     Enum,
     DateTime,
@@ -11,7 +13,9 @@ from sqlalchemy import (
     Index,
     Text,
     Boolean,
-    text, func, CheckConstraint,
+    JSON,
+    LargeBinary,
+    func, CheckConstraint,
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -66,6 +70,13 @@ class LinkMode(enum.Enum):
     linked = "linked"
 
 
+class JobStatus(enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
 # –––––––––– Models –––––––––––
 
 
@@ -151,12 +162,16 @@ class Club(Base, TimestampMixin):
     founded_year: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     slug: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")  # ETag
 
     plans = relationship("Plan", back_populates="club", cascade="all, delete-orphan")
     memberships = relationship(
         "Membership", back_populates="club", cascade="all, delete-orphan"
     )
 
+    # optimistic concurrency: UPDATEs check and bump version_id, see app.api.etag
+    __mapper_args__ = {"version_id_col": version_id}
+
 
 class Membership(Base, TimestampMixin):
     __tablename__ = "memberships"
@@ -227,13 +242,16 @@ class Exercise(Base, TimestampMixin):
     template_id = Column(Integer, ForeignKey("exercises.id"), nullable=True)
     link_mode = Column(Enum(LinkMode, name="linkmode"), nullable=False, server_default="snapshot")
     template_version_used = Column(Integer, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")  # template version
 
     plan = relationship("Plan", back_populates="exercises")
 
     __table_args__ = (
         Index("ix_exercises_plan_id", "plan_id"),
+        Index("ix_exercises_template_id", "template_id"),
         UniqueConstraint("plan_id", "position", name="uq_exercises_plan_position"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
 class Session(Base, TimestampMixin):
@@ -256,6 +274,7 @@ class Session(Base, TimestampMixin):
     template_id = Column(Integer, ForeignKey("sessions.id"), nullable=True)
     link_mode = Column(Enum(LinkMode, name="linkmode"), nullable=False, server_default="snapshot")
     template_version_used = Column(Integer, nullable=True)
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")  # ETag, template version
 
     user = relationship(
         "User", back_populates="sessions", foreign_keys="Session.created_by"
@@ -265,7 +284,11 @@ class Session(Base, TimestampMixin):
         "Attendance", back_populates="session", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (Index("ix_sessions_plan_id_starts_at", "plan_id", "starts_at"),)
+    __table_args__ = (
+        Index("ix_sessions_plan_id_starts_at", "plan_id", "starts_at"),
+        Index("ix_sessions_template_id", "template_id"),
+    )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
 class PlanAssignee(Base):
@@ -273,7 +296,11 @@ class PlanAssignee(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     plan_id = Column(
-        Integer, ForeignKey("plans.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("plans.id", ondelete="CASCADE"), nullable=True
+    )
+    # exactly one of plan_id / workout_plan_id (e.g. AI drafts generated for a group's athletes)
+    workout_plan_id = Column(
+        Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=True
     )
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="RESTRICT"), nullable=True
@@ -286,11 +313,12 @@ class PlanAssignee(Base):
         Integer, ForeignKey("users.id", ondelete="RESTRICT"), nullable=False
     )
     created_at = Column(
-        DateTime(timezone=True), server_default=text("now()"), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
     # Relationships (no back_populates yet to avoid touching other models right now)
     plan = relationship("Plan")
+    workout_plan = relationship("WorkoutPlan")
     user = relationship("User", foreign_keys=[user_id], back_populates="plan_assignments_as_target",
         lazy="selectin",)
     assigned_by = relationship("User", foreign_keys=[assigned_by_id], back_populates="assigned_plan_assignments", lazy="selectin")
@@ -300,13 +328,20 @@ class PlanAssignee(Base):
         UniqueConstraint("plan_id", "user_id", name="uq_plan_assignees_plan_user"),
         UniqueConstraint("plan_id", "group_id", name="uq_plan_assignees_plan_group"),
         UniqueConstraint("plan_id", "user_id", "role", name="uq_plan_assignees_plan_role"),
+        UniqueConstraint("workout_plan_id", "user_id", name="uq_plan_assignees_workout_plan_user"),
         CheckConstraint(
             "(user_id IS NOT NULL) <> (group_id IS NOT NULL)",
             name="ck_plan_assignment_one_target",
         ),
+        CheckConstraint(
+            "(plan_id IS NOT NULL) <> (workout_plan_id IS NOT NULL)",
+            name="ck_plan_assignment_one_plan",
+        ),
 
         Index("ix_plan_assignments_plan_id", "plan_id"),
         Index("ix_plan_assignments_user_id", "user_id"),
+        Index("ix_plan_assignments_workout_plan_id", "workout_plan_id"),
+        Index("ix_plan_assignments_group_id", "group_id"),
     )
 
 PlanAssignment = PlanAssignee
@@ -350,6 +385,9 @@ class Group(Base):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
+    # fetch the server-side updated_at with UPDATE ... RETURNING instead of a SELECT on next access
+    __mapper_args__ = {"eager_defaults": True}
+
     memberships = relationship(
         "GroupMembership",
         back_populates="group",
@@ -370,6 +408,9 @@ class GroupMembership(Base):
     user: Mapped["User"] = relationship("User", back_populates="group_memberships", lazy="selectin")
     group: Mapped["Group"] = relationship("Group", back_populates="memberships", lazy="selectin")
 
+    # the PK leads with group_id; "which groups is this user in" needs its own index
+    __table_args__ = (Index("ix_group_memberships_user_id", "user_id"),)
+
 
 class WorkoutPlan(Base, TimestampMixin):
     __tablename__ = "workout_plans"
@@ -387,6 +428,7 @@ class WorkoutPlan(Base, TimestampMixin):
     duration_weeks = Column(Integer, nullable=True)
 
     is_template = Column(Boolean, nullable=False, default=False)
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")  # ETag
 
     club = relationship("Club", lazy="selectin")
     created_by = relationship("User", foreign_keys=[created_by_id], lazy="selectin")
@@ -403,6 +445,7 @@ class WorkoutPlan(Base, TimestampMixin):
         Index("ix_workout_plans_club_id", "club_id"),
         Index("ix_workout_plans_created_by_id", "created_by_id"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
 class WorkoutPlanItem(Base, TimestampMixin):
@@ -417,6 +460,7 @@ class WorkoutPlanItem(Base, TimestampMixin):
     order_index = Column(Integer, nullable=False, default=0)
 
     title = Column(String(120), nullable=True)  # z.B. "Upper Body"
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")  # ETag
 
     plan = relationship("WorkoutPlan", back_populates="items", lazy="selectin")
 
@@ -436,6 +480,7 @@ class WorkoutPlanItem(Base, TimestampMixin):
         CheckConstraint("week_number IS NULL OR week_number >= 1", name="ck_workout_plan_items_week_number_ge_1"),
         Index("ix_workout_plan_items_plan_id", "plan_id"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
 class WorkoutPlanExercise(Base, TimestampMixin):
@@ -457,6 +502,7 @@ class WorkoutPlanExercise(Base, TimestampMixin):
     weight_kg = Column(Integer, nullable=True)
 
     position = Column(Integer, nullable=False, default=0)
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")  # ETag
 
     item = relationship("WorkoutPlanItem", back_populates="exercises", lazy="selectin")
 
@@ -465,6 +511,7 @@ class WorkoutPlanExercise(Base, TimestampMixin):
         CheckConstraint("position >= 0", name="ck_workout_plan_exercises_position_nonneg"),
         Index("ix_workout_plan_exercises_item_id", "item_id"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
 class AIUsage(Base):
@@ -491,4 +538,150 @@ class AIUsage(Base):
     __table_args__ = (
         Index("ix_ai_usage_user_feature_created_at", "user_id", "feature", "created_at"),
         Index("ix_ai_usage_club_feature_created_at", "club_id", "feature", "created_at"),
-    )
\ No newline at end of file
+    )
+
+class AIUsageCounter(Base):
+    """Per-user daily AI quota counter; one row per (user, feature, UTC day)."""
+
+    __tablename__ = "ai_usage_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    feature = Column(String(64), primary_key=True)
+    utc_day = Column(Date, primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("count >= 0", name="ck_ai_usage_counters_count_nonneg"),
+    )
+
+
+class AIClubUsageCounter(Base):
+    """Per-club daily AI quota counter; one row per (club, feature, UTC day)."""
+
+    __tablename__ = "ai_club_usage_counters"
+
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), primary_key=True)
+    feature = Column(String(64), primary_key=True)
+    utc_day = Column(Date, primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint("count >= 0", name="ck_ai_club_usage_counters_count_nonneg"),
+    )
+
+
+class Job(Base, TimestampMixin):
+    """Persistent record of a background job run by the in-process JobRunner."""
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    job_type = Column(String(64), nullable=False)
+    status = Column(Enum(JobStatus, name="jobstatus"), nullable=False, default=JobStatus.queued)
+
+    club_id = Column(Integer, ForeignKey("clubs.id", ondelete="CASCADE"), nullable=True)
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    payload = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Integer, nullable=False, default=0)  # 0..100
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # runner that holds the job (in its pool or running it); its lease lasts while it keeps beating
+    locked_by = Column(String(128), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("progress >= 0 AND progress <= 100", name="ck_jobs_progress_range"),
+        Index("ix_jobs_status_job_type", "status", "job_type"),
+        Index("ix_jobs_created_by_id", "created_by_id"),
+        Index("ix_jobs_club_id", "club_id"),
+    )
+
+
+class ChangeLog(Base):
+    """
+    Append-only change log for delta sync (GET /clubs/{id}/sync?since=<cursor>).
+
+    Written by app.db.change_log in the same transaction as the change itself.
+    `seq` is the sync cursor: it's assigned right before the transaction
+    commits, in commit order (ids are handed out at insert time, so a
+    transaction holding a lower id can commit after a higher one was served).
+    Rows of in-flight transactions have seq NULL. op "delete" rows are
+    tombstones. club_id is not a foreign key so a club's own tombstone
+    survives the club.
+    """
+
+    __tablename__ = "change_log"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    club_id = Column(Integer, nullable=False)
+    entity = Column(String(32), nullable=False)     # "club", "group", "plan", "session", "attendance", "workout_plan"
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(8), nullable=False)          # "upsert" | "delete"
+    user_id = Column(Integer, nullable=True)        # owner for per-user entities (attendances)
+    changed_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("op IN ('upsert', 'delete')", name="ck_change_log_op"),
+        Index("ix_change_log_club_id_seq", "club_id", "seq"),
+        Index("ix_change_log_seq", "seq", unique=True),
+        Index("ix_change_log_unsequenced", "id", postgresql_where=seq.is_(None), sqlite_where=seq.is_(None)),
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    Stored POST responses for Idempotency-Key replays (app.core.idempotency).
+
+    The unique (scope, key) row is the lock: the first request inserts it with
+    status_code NULL (in progress), duplicates wait for the response to land.
+    Rows are purged after expires_at.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scope = Column(String(64), nullable=False)          # "user:<id>" or "anon"
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)   # sha256 of method, path, query and body
+    status_code = Column(Integer, nullable=True)        # NULL while the first request is running
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+
+
+class RequestProfile(Base):
+    """
+    Sampling-profiler report of one request, recorded for an admin who sent
+    `X-Profile: 1` (app.core.profiler). report is speedscope JSON, NULL while
+    the request is still running. Rows are purged after PROFILE_RETENTION_DAYS.
+    """
+
+    __tablename__ = "request_profiles"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    method = Column(String(10), nullable=False)
+    path = Column(String(2048), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    sample_count = Column(Integer, nullable=True)
+    report = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (Index("ix_request_profiles_created_at", "created_at"),)
@@ -0,0 +1,80 @@
+"""
+Attendance events for the live board.
+
+Session hooks collect created/updated attendances on flush and publish them
+only after the transaction commits, so watchers never see a check-in that
+was rolled back. Code that writes attendances with Core statements calls
+queue_attendance_event() itself.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.models import Attendance
+
+EVENT_CREATED = "attendance.created"
+EVENT_UPDATED = "attendance.updated"
+
+_PENDING_KEY = "attendance_events"
+
+
+def attendance_channel(session_id: int) -> str:
+    return f"attendance:session:{session_id}"
+
+
+def attendance_payload(att: Any) -> dict[str, Any]:
+    """Compact, JSON-ready row (works for Attendance objects and Core result rows)."""
+    status = att.status
+    return {
+        "id": att.id,
+        "session_id": att.session_id,
+        "user_id": att.user_id,
+        "status": getattr(status, "value", status),
+        "checked_in_at": att.checked_in_at.isoformat() if att.checked_in_at else None,
+        "checked_out_at": att.checked_out_at.isoformat() if att.checked_out_at else None,
+    }
+
+
+def queue_attendance_event(session: Session, event_type: str, attendance: Any) -> None:
+    """Publish `attendance` to its session's channel once `session` commits."""
+    session.info.setdefault(_PENDING_KEY, []).append(
+        (attendance_channel(attendance.session_id), {"type": event_type, "attendance": attendance_payload(attendance)})
+    )
+
+
+def _after_flush(session: Session, _flush_context) -> None:
+    for obj in session.new:
+        if isinstance(obj, Attendance):
+            queue_attendance_event(session, EVENT_CREATED, obj)
+    for obj in session.dirty:
+        if isinstance(obj, Attendance) and session.is_modified(obj, include_collections=False):
+            queue_attendance_event(session, EVENT_UPDATED, obj)
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    from app.realtime.pubsub import get_broker
+
+    broker = get_broker()
+    for channel, message in pending:
+        broker.publish(channel, message)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def track_attendance_events(target: sessionmaker | type[Session]) -> None:
+    """Install the publish-on-commit hooks on a sessionmaker (or Session class)."""
+    # a flag on the target: event.contains() is keyed by id() and can see a collected maker's hooks
+    if getattr(target, "_attendance_events_tracked", False):
+        return
+    event.listen(target, "after_flush", _after_flush)
+    event.listen(target, "after_commit", _after_commit)
+    event.listen(target, "after_rollback", _after_rollback)
+    target._attendance_events_tracked = True
@@ -0,0 +1,238 @@
+"""
+In-process pub/sub fan-out for live views (e.g. the attendance board).
+
+Publishers call Broker.publish() from any thread (request handlers run in
+the threadpool, session hooks fire there too). The backend carries the
+message to every worker process; each worker then fans it out once to all
+of its local subscribers. A hundred watchers of one session cost one
+message per change, not a hundred polls.
+
+Backends:
+- LocalBackend: single process, delivers directly (default, tests).
+- PostgresNotifyBackend: NOTIFY on publish, one LISTEN connection per
+  worker. No extra infrastructure; payloads must stay under Postgres'
+  8000 byte NOTIFY limit, so publish ids and small rows, not documents.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+Message = dict[str, Any]
+Deliver = Callable[[str, Message], None]
+
+
+class PubSubBackend(Protocol):
+    def start(self, deliver: Deliver) -> None: ...
+
+    def publish(self, channel: str, message: Message) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class LocalBackend:
+    """Same-process delivery only."""
+
+    def __init__(self) -> None:
+        self._deliver: Deliver | None = None
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, channel: str, message: Message) -> None:
+        if self._deliver is not None:
+            self._deliver(channel, message)
+
+    def close(self) -> None:
+        self._deliver = None
+
+
+class PostgresNotifyBackend:
+    """Cross-worker delivery over Postgres LISTEN/NOTIFY (psycopg2)."""
+
+    def __init__(self, dsn: str, *, pg_channel: str = "clubconnect_events", poll_seconds: float = 1.0) -> None:
+        self.dsn = dsn
+        self.pg_channel = pg_channel
+        self.poll_seconds = poll_seconds
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, deliver: Deliver) -> None:
+        self._thread = threading.Thread(
+            target=self._listen, args=(deliver,), name="pubsub-listen", daemon=True
+        )
+        self._thread.start()
+
+    def _listen(self, deliver: Deliver) -> None:
+        import select
+
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(f'LISTEN "{self.pg_channel}"')
+                    while not self._stop.is_set():
+                        if select.select([conn], [], [], self.poll_seconds) == ([], [], []):
+                            continue
+                        conn.poll()
+                        while conn.notifies:
+                            notify = conn.notifies.pop(0)
+                            data = json.loads(notify.payload)
+                            deliver(data["channel"], data["message"])
+                finally:
+                    conn.close()
+            except Exception:
+                logger.warning("pub/sub listener lost its connection, reconnecting", exc_info=True)
+                self._stop.wait(self.poll_seconds)
+
+    def publish(self, channel: str, message: Message) -> None:
+        payload = json.dumps({"channel": channel, "message": message}, default=str)
+        with self._publish_lock:
+            for attempt in (1, 2):
+                try:
+                    if self._publish_conn is None or self._publish_conn.closed:
+                        self._publish_conn = self._connect()
+                    with self._publish_conn.cursor() as cur:
+                        cur.execute("SELECT pg_notify(%s, %s)", (self.pg_channel, payload))
+                    return
+                except Exception:
+                    self._publish_conn = None
+                    if attempt == 2:
+                        raise
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds * 2)
+        with self._publish_lock:
+            if self._publish_conn is not None:
+                self._publish_conn.close()
+                self._publish_conn = None
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue, bound to the event loop it was created on.
+    A subscriber that falls queue_size messages behind is cut off: get()
+    returns None and it should reload a snapshot.
+    """
+
+    def __init__(self, channel: str, loop: asyncio.AbstractEventLoop, queue_size: int) -> None:
+        self.channel = channel
+        self.loop = loop
+        self.queue_size = queue_size
+        self.overflowed = False
+        self._queue: asyncio.Queue[Message | None] = asyncio.Queue()
+
+    def _put(self, message: Message) -> None:  # runs on self.loop
+        if self.overflowed:
+            return
+        if self._queue.qsize() >= self.queue_size:
+            self.overflowed = True
+            self._queue.put_nowait(None)
+            return
+        self._queue.put_nowait(message)
+
+    async def get(self) -> Message | None:
+        return await self._queue.get()
+
+
+class Broker:
+    """Channel -> local subscribers, fed by a PubSubBackend."""
+
+    def __init__(self, backend: PubSubBackend | None = None, *, queue_size: int = 100) -> None:
+        self.backend = backend or LocalBackend()
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self.backend.start(self._deliver)
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Call from the event loop that will consume the subscription."""
+        sub = Subscription(channel, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.channel)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+    def publish(self, channel: str, message: Message) -> None:
+        """Thread-safe; never raises (live views are best effort, the DB is the truth)."""
+        try:
+            self.backend.publish(channel, message)
+        except Exception:
+            logger.warning("could not publish to %s", channel, exc_info=True)
+
+    def _deliver(self, channel: str, message: Message) -> None:
+        with self._lock:
+            subs = list(self._subscribers.get(channel, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, message)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(sub)
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+# ---------- process-wide broker ----------
+
+_broker: Broker | None = None
+_broker_lock = threading.Lock()
+
+
+def _build_backend() -> PubSubBackend:
+    from app.core.config import settings
+
+    if settings.PUBSUB_BACKEND == "postgres":
+        from sqlalchemy.engine import make_url
+
+        url = make_url(settings.PUBSUB_DATABASE_URL or settings.DATABASE_URL).set(drivername="postgresql")
+        return PostgresNotifyBackend(url.render_as_string(hide_password=False))
+    return LocalBackend()
+
+
+def get_broker() -> Broker:
+    """Lazily build the shared broker (also used as a FastAPI dependency)."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                from app.core.config import settings
+
+                _broker = Broker(_build_backend(), queue_size=settings.PUBSUB_QUEUE_SIZE)
+    return _broker
+
+
+def shutdown_broker() -> None:
+    global _broker
+    with _broker_lock:
+        if _broker is not None:
+            _broker.close()
+            _broker = None
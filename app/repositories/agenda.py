@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, lazyload, selectinload
+
+from app.models.models import (
+    Attendance,
+    Club,
+    GroupMembership,
+    Membership,
+    PlanAssignee,
+    Session as TrainingSession,
+    WorkoutPlan,
+    WorkoutPlanItem,
+)
+
+
+class AgendaRepository:
+    """
+    Read-only, cross-club queries for a user's agenda.
+
+    Every query starts from memberships.user_id (ix_memberships_user_id), so
+    the number of statements doesn't grow with the number of clubs.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def list_sessions(self, *, user_id: int, start: datetime, end: datetime) -> Sequence[Any]:
+        """
+        Sessions overlapping [start, end) in every club the user belongs to,
+        with the club name and the user's own attendance (if any), in one query.
+        """
+        stmt = (
+            sa.select(
+                TrainingSession.id,
+                TrainingSession.club_id,
+                Club.name.label("club_name"),
+                TrainingSession.plan_id,
+                TrainingSession.name,
+                TrainingSession.starts_at,
+                TrainingSession.ends_at,
+                TrainingSession.location,
+                Attendance.status.label("attendance_status"),
+                Attendance.checked_in_at,
+            )
+            .join(
+                Membership,
+                sa.and_(Membership.club_id == TrainingSession.club_id, Membership.user_id == user_id),
+            )
+            .join(Club, Club.id == TrainingSession.club_id)
+            .outerjoin(
+                Attendance,
+                sa.and_(Attendance.session_id == TrainingSession.id, Attendance.user_id == user_id),
+            )
+            .where(
+                TrainingSession.is_template.is_(False),
+                TrainingSession.starts_at < end,
+                TrainingSession.ends_at > start,
+            )
+            .order_by(TrainingSession.starts_at.asc(), TrainingSession.id.asc())
+        )
+        return self.db.execute(stmt).all()
+
+    def list_assigned_workout_plans(self, *, user_id: int) -> list[tuple[datetime, WorkoutPlan]]:
+        """
+        Workout plans assigned to the user directly or via one of their groups,
+        in clubs they're still a member of, with items and exercises eager-loaded.
+        Returns (first assignment time, plan) pairs; the plan's calendar starts
+        in the week of its first assignment.
+        """
+        direct = sa.select(
+            PlanAssignee.workout_plan_id.label("workout_plan_id"),
+            PlanAssignee.created_at.label("assigned_at"),
+        ).where(PlanAssignee.user_id == user_id, PlanAssignee.workout_plan_id.is_not(None))
+        via_group = (
+            sa.select(
+                PlanAssignee.workout_plan_id.label("workout_plan_id"),
+                PlanAssignee.created_at.label("assigned_at"),
+            )
+            .join(GroupMembership, GroupMembership.group_id == PlanAssignee.group_id)
+            .where(GroupMembership.user_id == user_id, PlanAssignee.workout_plan_id.is_not(None))
+        )
+        assigned = sa.union_all(direct, via_group).subquery()
+        first_assigned = (
+            sa.select(
+                assigned.c.workout_plan_id,
+                sa.func.min(assigned.c.assigned_at).label("assigned_at"),
+            )
+            .group_by(assigned.c.workout_plan_id)
+            .subquery()
+        )
+
+        stmt = (
+            sa.select(first_assigned.c.assigned_at, WorkoutPlan)
+            .join(WorkoutPlan, WorkoutPlan.id == first_assigned.c.workout_plan_id)
+            .join(
+                Membership,
+                sa.and_(Membership.club_id == WorkoutPlan.club_id, Membership.user_id == user_id),
+            )
+            .options(
+                lazyload(WorkoutPlan.created_by),  # User's selectin relationships would cascade
+                selectinload(WorkoutPlan.club),
+                selectinload(WorkoutPlan.items).selectinload(WorkoutPlanItem.exercises),
+            )
+            .order_by(WorkoutPlan.id.asc())
+        )
+        return [(assigned_at, plan) for assigned_at, plan in self.db.execute(stmt).all()]
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import AIClubUsageCounter, AIUsageCounter
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class AIQuotaRepository:
+    """
+    Daily AI quota counters (per user and per club).
+
+    Reservations are a single atomic UPSERT per counter:
+        INSERT ... VALUES (..., 1)
+        ON CONFLICT (pk) DO UPDATE SET count = count + 1 WHERE count < :limit
+        RETURNING count
+    No row back means the limit is reached. Concurrent requests serialize on
+    the counter row, so the limit can't be overshot.
+
+    Reservations and refunds commit right away instead of waiting for the
+    request's unit of work: other requests must see them, and the counter row
+    must not stay locked while the model call runs. Callers that write to
+    the same session between reserve and refund do it in a SAVEPOINT
+    (db.begin_nested()), so a failed write is rolled back, not committed
+    by the refund.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    # ---------- helpers ----------
+
+    def _insert(self, model):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(model)
+        if dialect == "sqlite":
+            return sqlite.insert(model)
+        raise NotImplementedError(f"AI quota counters are not supported on {dialect}")
+
+    def _increment(self, model, key: dict, limit: int) -> bool:
+        if limit <= 0:
+            return False
+        stmt = self._insert(model).values(**key, count=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={"count": model.count + 1},
+            where=model.count < limit,
+        ).returning(model.count)
+        return self.db.execute(stmt).first() is not None
+
+    def _decrement(self, model, key: dict, units: int = 1) -> None:
+        self.db.execute(
+            sa.update(model)
+            .where(*(getattr(model, k) == v for k, v in key.items()), model.count > 0)
+            .values(count=sa.case((model.count > units, model.count - units), else_=0))
+        )
+
+    # ---------- queries ----------
+
+    def get_user_count(self, *, user_id: int, feature: str, day: date | None = None) -> int:
+        row = self.db.get(AIUsageCounter, (user_id, feature, day or utc_today()))
+        return row.count if row else 0
+
+    def get_club_count(self, *, club_id: int, feature: str, day: date | None = None) -> int:
+        row = self.db.get(AIClubUsageCounter, (club_id, feature, day or utc_today()))
+        return row.count if row else 0
+
+    # ---------- reservations ----------
+
+    def try_reserve(
+        self,
+        *,
+        user_id: int,
+        club_id: int,
+        feature: str,
+        user_limit: int,
+        club_limit: int | None = None,
+        day: date,
+    ) -> str | None:
+        """
+        Reserve one unit for user (and club, if club_limit is set) on `day`.
+        Returns None on success, or "user" / "club" naming the exhausted limit
+        (nothing is reserved in that case).
+        """
+        try:
+            if not self._increment(
+                AIUsageCounter, {"user_id": user_id, "feature": feature, "utc_day": day}, user_limit
+            ):
+                self.db.rollback()
+                return "user"
+            if club_limit is not None and not self._increment(
+                AIClubUsageCounter, {"club_id": club_id, "feature": feature, "utc_day": day}, club_limit
+            ):
+                self.db.rollback()  # also undoes the user increment
+                return "club"
+            self.db.commit()
+            return None
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def refund(
+        self,
+        *,
+        user_id: int,
+        club_id: int,
+        feature: str,
+        day: date,
+        club: bool = False,
+    ) -> None:
+        """Give back a reservation made on `day` (the failed call didn't cost anything)."""
+        try:
+            self._decrement(AIUsageCounter, {"user_id": user_id, "feature": feature, "utc_day": day})
+            if club:
+                self._decrement(AIClubUsageCounter, {"club_id": club_id, "feature": feature, "utc_day": day})
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def try_reserve_club(
+        self,
+        *,
+        club_id: int,
+        feature: str,
+        units: int,
+        limit: int | None = None,
+        day: date,
+    ) -> bool:
+        """
+        Reserve `units` on the club counter only (group jobs are charged to the
+        club, not to the coach who started them). All or nothing; limit=None
+        still counts the units but never refuses.
+        """
+        if units <= 0:
+            return True
+        if limit is not None and units > limit:
+            return False
+        model = AIClubUsageCounter
+        key = {"club_id": club_id, "feature": feature, "utc_day": day}
+        stmt = self._insert(model).values(**key, count=units)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={"count": model.count + units},
+            where=(model.count + units <= limit) if limit is not None else None,
+        ).returning(model.count)
+        try:
+            reserved = self.db.execute(stmt).first() is not None
+            self.db.commit()
+            return reserved
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def refund_club(self, *, club_id: int, feature: str, units: int, day: date) -> None:
+        """Give back `units` of a club reservation made on `day`."""
+        if units <= 0:
+            return
+        try:
+            self._decrement(
+                AIClubUsageCounter, {"club_id": club_id, "feature": feature, "utc_day": day}, units
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
@@ -56,16 +56,14 @@ class AIUsageRepository:
         feature: str,
     ) -> AIUsage:
         """
-        Insert a usage row. Commit/rollback mirrors repo patterns.
+        Insert a usage row. Flush mirrors repo patterns.
         IntegrityError is unlikely here (no unique constraint), but keep the pattern.
         """
         usage = AIUsage(user_id=user_id, club_id=club_id, feature=feature)
 
         try:
             self.db.add(usage)
-            self.db.commit()
-            self.db.refresh(usage)
+            self.db.flush()
             return usage
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError("Could not record AI usage") from e
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+import sqlalchemy as sa
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.db.change_log import record_changes
 from app.models.models import Attendance, Session as SessionModel, Plan, AttendanceStatus
+from app.realtime.attendance import EVENT_CREATED, EVENT_UPDATED, queue_attendance_event
 from app.schemas.attendance import AttendanceUpdate
 from app.exceptions.base import (
     AttendanceNotFoundError,
@@ -17,7 +24,7 @@ class AttendanceRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
 
-    def _session_in_club_exists(self, *, club_id: int, session_id: int) -> bool:
+    def session_in_club_exists(self, *, club_id: int, session_id: int) -> bool:
         stmt = (
             select(SessionModel.id)
             .join(Plan, Plan.id == SessionModel.plan_id)
@@ -47,12 +54,10 @@ class AttendanceRepository:
         )
         self.db.add(att)
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             # Handle uq_attendance_session_user
             raise AttendanceExistsError() from e
-        self.db.refresh(att)
         return att
 
     def list_by_session_in_club(
@@ -63,7 +68,7 @@ class AttendanceRepository:
         skip: int = 0,
         limit: int = 50,
     ) -> list[Attendance]:
-        if not self._session_in_club_exists(club_id=club_id, session_id=session_id):
+        if not self.session_in_club_exists(club_id=club_id, session_id=session_id):
             raise SessionNotFound()
 
         stmt = (
@@ -98,9 +103,82 @@ class AttendanceRepository:
             setattr(attendance, field, value)
 
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             raise AttendanceExistsError() from e
-        self.db.refresh(attendance)
         return attendance
+
+    def upsert_checkins(self, checkins: Sequence[dict[str, Any]]) -> list[Any]:
+        """
+        Self check-ins as one multi-row upsert (the caller commits).
+
+        checkins: dicts with club_id, session_id, user_id, checked_in_at; at
+        most one per (session_id, user_id). New rows are "present". Existing
+        rows keep their first checked_in_at, and keep their status unless a
+        coach had marked the athlete absent. Returns one row per check-in with
+        a `created` flag; logs change_log rows and queues live board events
+        (the Core statement bypasses the session hooks).
+        """
+        if not checkins:
+            return []
+        now = datetime.now(timezone.utc)
+        values = [
+            {
+                "session_id": c["session_id"],
+                "user_id": c["user_id"],
+                "status": AttendanceStatus.present,
+                "checked_in_at": c["checked_in_at"],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for c in checkins
+        ]
+
+        insert = self._insert(Attendance).values(values)
+        stmt = insert.on_conflict_do_update(
+            index_elements=[Attendance.session_id, Attendance.user_id],
+            set_={
+                "checked_in_at": sa.func.coalesce(Attendance.checked_in_at, insert.excluded.checked_in_at),
+                "status": sa.case(
+                    (Attendance.status == AttendanceStatus.absent, insert.excluded.status),
+                    else_=Attendance.status,
+                ),
+                "updated_at": insert.excluded.updated_at,
+            },
+        ).returning(
+            Attendance.id,
+            Attendance.session_id,
+            Attendance.user_id,
+            Attendance.status,
+            Attendance.checked_in_at,
+            Attendance.checked_out_at,
+            (Attendance.created_at == now).label("created"),
+        )
+        try:
+            rows = self.db.execute(stmt).all()
+
+            club_of = {(c["session_id"], c["user_id"]): c["club_id"] for c in checkins}
+            by_club: dict[int, list[Any]] = defaultdict(list)
+            for row in rows:
+                by_club[club_of[(row.session_id, row.user_id)]].append(row)
+                queue_attendance_event(self.db, EVENT_CREATED if row.created else EVENT_UPDATED, row)
+            for club_id, club_rows in by_club.items():
+                record_changes(
+                    self.db,
+                    club_id=club_id,
+                    entity="attendance",
+                    entity_ids=[r.id for r in club_rows],
+                    user_ids=[r.user_id for r in club_rows],
+                )
+        except IntegrityError as e:
+            # FK: the session (or user) was deleted after the code was issued
+            raise SessionNotFound() from e
+        return rows
+
+    def _insert(self, model):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(model)
+        if dialect == "sqlite":
+            return sqlite.insert(model)
+        raise NotImplementedError(f"Check-in upserts are not supported on {dialect}")
@@ -1,9 +1,16 @@
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy import select
 
-from app.exceptions.base import MembershipExistsError, DuplicateSlugError, ClubNotFoundError
+from app.exceptions.base import (
+    MembershipExistsError,
+    DuplicateSlugError,
+    ClubNotFoundError,
+    PreconditionFailedError,
+)
 from app.models.models import Club, Membership
+from app.repositories.versioning import check_version
 
 
 class ClubRepository:
@@ -15,12 +22,10 @@ class ClubRepository:
         membership = Membership(user_id=user_id, club_id=club_id, role=role)
         try:
             self.db.add(membership)
-            self.db.commit()
-            self.db.refresh(membership)
+            self.db.flush()
             return membership
         except IntegrityError as e:
-            self.db.rollback()
-            raise MembershipExistsError
+            raise MembershipExistsError from e
 
 
     def create_club(self, **kwargs) -> Club | None:
@@ -31,9 +36,9 @@ class ClubRepository:
             self.db.flush()
             return club
         except IntegrityError as e:
-            self.db.rollback()
             if "duplicate key value violates unique constraint" in str(e):
-                raise DuplicateSlugError
+                raise DuplicateSlugError from e
+            raise
 
     def get_club(self, club_id: int) -> Club | None:
         """Get a club by its ID."""
@@ -64,19 +69,23 @@ class ClubRepository:
         )
 
 
-    def update_club(self, club: Club, **kwargs) -> Club | None:
-        """Update a club's name."""
+    def update_club(self, club: Club, *, expected_version: int | None = None, **kwargs) -> Club | None:
+        """Update a club's name (412 if expected_version is stale)."""
+        check_version(club, expected_version)
         try:
             for key, value in kwargs.items():
                 setattr(club, key, value)
-            self.db.commit()
+            self.db.flush()
             return club
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
             if "duplicate key value violates unique constraint" in str(e):
-                raise DuplicateSlugError
+                raise DuplicateSlugError from e
+            raise
 
 
     def delete_club(self, club: Club) -> Club | None:
         """Delete a club."""
         self.db.delete(club)
-        self.db.commit()
+        self.db.flush()
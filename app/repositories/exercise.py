@@ -3,15 +3,18 @@ from __future__ import annotations
 import sqlalchemy as sa
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.models.models import Exercise, Plan
-from app.models.models import DayLabel
+from app.models.models import DayLabel, LinkMode
 from app.exceptions.base import (
     PlanNotFoundError,
     ExerciseNotFoundError,
     PositionConflictError,
     ConflictError,
+    PreconditionFailedError,
 )
+from app.repositories.template_links import EXERCISE_LINKED_FIELDS, linked_refresh_statement
 
 
 def _is_unique_violation(e: IntegrityError) -> bool:
@@ -52,6 +55,21 @@ class ExerciseRepository:
             raise ExerciseNotFoundError()
         return exercise
 
+    def _get_template_in_club(self, *, club_id: int, template_id: int) -> Exercise:
+        stmt = (
+            sa.select(Exercise)
+            .join(Plan, Plan.id == Exercise.plan_id)
+            .where(
+                Exercise.id == template_id,
+                Exercise.is_template.is_(True),
+                Plan.club_id == club_id,
+            )
+        )
+        template = self.db.execute(stmt).scalar_one_or_none()
+        if not template:
+            raise ExerciseNotFoundError("Template exercise not found.")
+        return template
+
     def _next_position(self, *, plan_id: int) -> int:
         # returns 0 if no exercises yet
         stmt = sa.select(sa.func.coalesce(sa.func.max(Exercise.position) + 1, 0)).where(
@@ -90,6 +108,9 @@ class ExerciseRepository:
         repetitions: int | None,
         position: int | None,
         day_label: DayLabel | None,
+        is_template: bool = False,
+        template_id: int | None = None,
+        link_mode: LinkMode = LinkMode.snapshot,
         _retries: int = 3,
     ) -> Exercise:
         self._get_plan_in_club(club_id=club_id, plan_id=plan_id)
@@ -101,7 +122,15 @@ class ExerciseRepository:
             sets=sets,
             repetitions=repetitions,
             day_label=day_label,
+            is_template=is_template,
+            template_id=template_id,
+            link_mode=link_mode,
         )
+        if template_id is not None:
+            template = self._get_template_in_club(club_id=club_id, template_id=template_id)
+            payload["template_version_used"] = template.version_id
+            # every copy starts out as the template's content; only linked ones follow later edits
+            payload.update({field: getattr(template, field) for field in EXERCISE_LINKED_FIELDS})
 
         desired_pos = position
 
@@ -113,12 +142,11 @@ class ExerciseRepository:
                 exercise = Exercise(**payload, position=pos)
 
                 try:
-                    self.db.add(exercise)
-                    self.db.commit()
-                    self.db.refresh(exercise)
+                    # SAVEPOINT: a lost race only undoes this attempt, not the request
+                    with self.db.begin_nested():
+                        self.db.add(exercise)
                     return exercise
                 except IntegrityError as e:
-                    self.db.rollback()
                     last_err = e
                     if _is_unique_violation(e):
                         # race on position -> try next
@@ -133,11 +161,9 @@ class ExerciseRepository:
 
         try:
             self.db.add(exercise)
-            self.db.commit()
-            self.db.refresh(exercise)
+            self.db.flush()
             return exercise
         except IntegrityError as e:
-            self.db.rollback()
             if _is_unique_violation(e):
                 raise PositionConflictError() from e
             raise ConflictError() from e
@@ -158,11 +184,11 @@ class ExerciseRepository:
             setattr(exercise, key, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(exercise)
+            self.db.flush()
             return exercise
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
-            self.db.rollback()
             if _is_unique_violation(e) and "position" in updates:
                 raise PositionConflictError() from e
             raise ConflictError() from e
@@ -174,7 +200,11 @@ class ExerciseRepository:
 
         try:
             self.db.delete(exercise)
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError() from e
+
+    def refresh_linked(self, *, template_ids: list[int] | None = None) -> int:
+        """Sync linked copies with their (newer) templates; one UPDATE for all of them."""
+        stmt = linked_refresh_statement(Exercise, EXERCISE_LINKED_FIELDS, template_ids=template_ids)
+        return self.db.execute(stmt).rowcount
@@ -30,11 +30,9 @@ class GroupRepository:
         )
         self.db.add(group)
         try:
-            self.db.commit()
-            self.db.refresh(group)
+            self.db.flush()
             return group
         except IntegrityError as e:
-            self.db.rollback()
             # uq_group_name_per_club
             if "uq_group_name_per_club" in str(e.orig):
                 raise GroupNameExistsError() from e
@@ -81,11 +79,9 @@ class GroupRepository:
             group.description = description
 
         try:
-            self.db.commit()
-            self.db.refresh(group)
+            self.db.flush()
             return group
         except IntegrityError as e:
-            self.db.rollback()
             if "uq_group_name_per_club" in str(e.orig):
                 raise GroupNameExistsError() from e
             raise
@@ -93,4 +89,4 @@ class GroupRepository:
     def delete(self, *, club_id: int, group_id: int) -> None:
         group = self.get_by_id(club_id=club_id, group_id=group_id)
         self.db.delete(group)
-        self.db.commit()
+        self.db.flush()
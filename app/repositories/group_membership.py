@@ -59,11 +59,9 @@ class GroupMembershipRepository:
         gm = GroupMembership(group_id=group_id, user_id=user_id, role=role)
         self.db.add(gm)
         try:
-            self.db.commit()
-            self.db.refresh(gm)
+            self.db.flush()
             return gm
         except IntegrityError as e:
-            self.db.rollback()
             # likely PK conflict (group_id,user_id)
             raise GroupMembershipExistsError() from e
 
@@ -77,8 +75,7 @@ class GroupMembershipRepository:
     ) -> GroupMembership:
         gm = self.get(club_id=club_id, group_id=group_id, user_id=user_id)
         gm.role = role
-        self.db.commit()
-        self.db.refresh(gm)
+        self.db.flush()
         return gm
 
     def remove(self, *, club_id: int, group_id: int, user_id: int) -> None:
@@ -91,7 +88,4 @@ class GroupMembershipRepository:
         )
         res = self.db.execute(stmt)
         if res.rowcount == 0:
-            self.db.rollback()
             raise GroupMembershipNotFoundError()
-
-        self.db.commit()
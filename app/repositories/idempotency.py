@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import IdempotencyKey
+
+
+class IdempotencyRepository:
+    """
+    Claims and stored responses for Idempotency-Key. Every method commits on
+    its own: a claim has to be visible to concurrent duplicates right away.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def claim(
+        self,
+        *,
+        scope: str,
+        key: str,
+        request_hash: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> IdempotencyKey | None:
+        """Insert the in-progress row; None if (scope, key) is already taken."""
+        row = IdempotencyKey(
+            scope=scope, key=key, request_hash=request_hash, locked_at=now, expires_at=expires_at
+        )
+        self.db.add(row)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return None
+        return row
+
+    def get(self, *, scope: str, key: str) -> IdempotencyKey | None:
+        stmt = sa.select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        row = self.db.execute(stmt).scalar_one_or_none()
+        self.db.commit()  # end the read so the next poll sees fresh data
+        return row
+
+    def take_over(self, row: IdempotencyKey, *, request_hash: str, now: datetime, expires_at: datetime) -> bool:
+        """
+        Re-claim an expired or abandoned row. Compare-and-set on locked_at, so
+        only one of several waiting duplicates wins.
+        """
+        result = self.db.execute(
+            sa.update(IdempotencyKey)
+            .where(IdempotencyKey.id == row.id, IdempotencyKey.locked_at == row.locked_at)
+            .values(
+                request_hash=request_hash,
+                status_code=None,
+                response_headers=None,
+                response_body=None,
+                locked_at=now,
+                expires_at=expires_at,
+            )
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def complete(self, row_id: int, *, status_code: int, headers: list[list[str]], body: bytes) -> None:
+        self.db.execute(
+            sa.update(IdempotencyKey)
+            .where(IdempotencyKey.id == row_id)
+            .values(status_code=status_code, response_headers=headers, response_body=body)
+        )
+        self.db.commit()
+
+    def release(self, row_id: int) -> None:
+        """Drop a claim whose request failed, so a retry runs the handler again."""
+        self.db.execute(sa.delete(IdempotencyKey).where(IdempotencyKey.id == row_id))
+        self.db.commit()
+
+    def purge_expired(self, *, now: datetime, limit: int = 1000) -> int:
+        expired = (
+            sa.select(IdempotencyKey.id).where(IdempotencyKey.expires_at < now).limit(limit).scalar_subquery()
+        )
+        result = self.db.execute(sa.delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired)))
+        self.db.commit()
+        return result.rowcount
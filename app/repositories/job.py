@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Collection, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models.models import Job, JobStatus
+from app.exceptions.base import JobNotFoundError
+
+
+class JobRepository:
+    """
+    Persistence-only access for background jobs.
+
+    Unlike other repositories, mutations commit on their own: the runner
+    thread and pollers (GET /jobs/{id}) read job rows from other sessions.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    # ---------- queries ----------
+
+    def get(self, job_id: int) -> Job:
+        job = self.db.get(Job, job_id)
+        if not job:
+            raise JobNotFoundError()
+        return job
+
+    def list_by_status(self, statuses: Sequence[JobStatus]) -> list[Job]:
+        stmt = (
+            sa.select(Job)
+            .where(Job.status.in_(list(statuses)))
+            .order_by(Job.id.asc())
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    # ---------- mutations (commit inside) ----------
+
+    def create(
+        self,
+        *,
+        job_type: str,
+        created_by_id: int,
+        club_id: int | None,
+        payload: dict[str, Any],
+        locked_by: str | None = None,
+    ) -> Job:
+        job = Job(
+            job_type=job_type,
+            status=JobStatus.queued,
+            created_by_id=created_by_id,
+            club_id=club_id,
+            payload=payload,
+            progress=0,
+            locked_by=locked_by,
+            heartbeat_at=datetime.now(timezone.utc) if locked_by else None,
+        )
+        self.db.add(job)
+        self.db.commit()
+        return job
+
+    def claim(self, job_id: int, worker: str) -> bool:
+        """Atomically move a queued job to running for `worker`; False if someone else got it."""
+        now = datetime.now(timezone.utc)
+        stmt = (
+            sa.update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.queued)
+            .values(status=JobStatus.running, started_at=now, heartbeat_at=now, locked_by=worker, error=None)
+            .returning(Job.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = self.db.execute(stmt).first() is not None
+        self.db.commit()
+        return claimed
+
+    def heartbeat(self, job_ids: Collection[int], worker: str) -> None:
+        """Extend `worker`'s lease on the jobs it still holds."""
+        if not job_ids:
+            return
+        stmt = (
+            sa.update(Job)
+            .where(Job.id.in_(list(job_ids)), Job.locked_by == worker)
+            .values(heartbeat_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def set_progress(self, job: Job, progress: int) -> Job:
+        job.progress = max(0, min(100, int(progress)))
+        self.db.commit()
+        return job
+
+    def mark_succeeded(self, job: Job, result: dict[str, Any] | None) -> Job:
+        job.status = JobStatus.succeeded
+        job.result = result
+        job.progress = 100
+        job.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return job
+
+    def mark_failed(self, job: Job, error: str) -> Job:
+        job.status = JobStatus.failed
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return job
+
+    def adopt_orphans(
+        self, worker: str, job_types: Collection[str], stale_before: datetime
+    ) -> list[tuple[int, str]]:
+        """
+        Take over unfinished jobs nobody holds a live lease on: running ones go
+        back to queued. Returns (id, job_type) of the jobs `worker` now holds.
+        """
+        stmt = (
+            sa.update(Job)
+            .where(
+                Job.status.in_([JobStatus.queued, JobStatus.running]),
+                Job.job_type.in_(list(job_types)),
+                sa.or_(
+                    Job.locked_by.is_(None),
+                    Job.heartbeat_at.is_(None),
+                    Job.heartbeat_at < stale_before,
+                ),
+            )
+            .values(
+                status=JobStatus.queued,
+                started_at=None,
+                locked_by=worker,
+                heartbeat_at=datetime.now(timezone.utc),
+            )
+            .returning(Job.id, Job.job_type)
+            .execution_options(synchronize_session=False)
+        )
+        adopted = [(job_id, job_type) for job_id, job_type in self.db.execute(stmt)]
+        self.db.commit()
+        return sorted(adopted)
@@ -45,7 +45,7 @@ class MembershipRepository:
         return list(self.db.execute(stmt).scalars().all())
 
 
-    # ---- Mutations (commit inside) ----
+    # ---- Mutations (flush only; the caller's unit of work commits) ----
     def create(
         self,
         club_id: int,
@@ -53,15 +53,13 @@ class MembershipRepository:
         role: MembershipRole,
     ) -> Membership:
         """
-        Create a membership and commit.
+        Create a membership.
 
         DB-level unique (club_id, user_id) violation → MembershipExistsError.
         """
         membership = Membership(club_id=club_id, user_id=user_id, role=role)
         self.db.add(membership)
-        self._commit_with_membership_guard()
-        # Ensure we have fresh state (e.g. timestamps, defaults)
-        self.db.refresh(membership)
+        self._flush_with_membership_guard()
         return membership
 
     def update_role(
@@ -69,16 +67,15 @@ class MembershipRepository:
         membership: Membership,
         new_role: MembershipRole,
     ) -> Membership:
-        """Update the role of a membership and commit."""
+        """Update the role of a membership."""
         membership.role = new_role
-        self._commit_with_membership_guard()
-        self.db.refresh(membership)
+        self._flush_with_membership_guard()
         return membership
 
     def delete(self, membership: Membership) -> None:
-        """Delete a membership and commit."""
+        """Delete a membership."""
         self.db.delete(membership)
-        self._commit_with_membership_guard()
+        self._flush_with_membership_guard()
 
 
     # ---- Counts / helpers for business rules ----
@@ -111,19 +108,18 @@ class MembershipRepository:
         return int(count or 0)
 
 
-    # ---- Internal: commit + integrity mapping ----
-    def _commit_with_membership_guard(self) -> None:
+    # ---- Internal: flush + integrity mapping ----
+    def _flush_with_membership_guard(self) -> None:
         """
-        Commit and map DB integrity errors to domain errors.
+        Flush and map DB integrity errors to domain errors.
 
         - uq_membership_club_user → MembershipExistsError
 
         All other IntegrityErrors are re-raised.
         """
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             msg = str(getattr(e.orig, "args", e.orig) or e).lower()
             # Depending on how postgres+sqlalchemy report the error, we look for
             # the constraint name or parts of the message.
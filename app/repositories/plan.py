@@ -1,10 +1,10 @@
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, union
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as SASession
 
-from app.models.models import Plan, PlanAssignee, PlanAssigneeRole
+from app.models.models import GroupMembership, Plan, PlanAssignee, PlanAssigneeRole
 from app.exceptions.base import PlanNotFoundError, PlanNameExistsError
 from app.schemas.plan import PlanCreate, PlanUpdate
 
@@ -45,15 +45,13 @@ class PlanRepository:
         )
         self.db.add(plan)
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as exc:
-            self.db.rollback()
             # Optional: inspect exc.orig / string to detect unique violations
             # For now we assume a (club_id, name) uniqueness mapped to PlanNameExistsError
             raise PlanNameExistsError(
                 f"A plan named '{data.name}' already exists in this club."
             ) from exc
-        self.db.refresh(plan)
         return plan
 
     def get_plan_in_club(self, *, club_id: int, plan_id: int) -> Plan:
@@ -73,19 +71,30 @@ class PlanRepository:
         role: Optional[PlanAssigneeRole] = None,
     ) -> List[Plan]:
         """
-        List all plans in a club assigned to the given user,
-        optionally filtered by PlanAssigneeRole.
+        List all plans in a club assigned to the given user, directly or via
+        one of their groups, optionally filtered by PlanAssigneeRole.
+
+        One query: plan ids from direct assignments (ix_plan_assignments_user_id)
+        UNION plan ids from group assignments of the user's groups
+        (ix_group_memberships_user_id -> ix_plan_assignments_group_id).
+        UNION also dedupes plans reached both ways.
         """
+        direct = select(PlanAssignee.plan_id).where(PlanAssignee.user_id == user_id)
+        via_group = (
+            select(PlanAssignee.plan_id)
+            .join(GroupMembership, GroupMembership.group_id == PlanAssignee.group_id)
+            .where(GroupMembership.user_id == user_id)
+        )
+        if role is not None:
+            direct = direct.where(PlanAssignee.role == role)
+            via_group = via_group.where(PlanAssignee.role == role)
+
+        assigned = union(direct, via_group).subquery()
         stmt = (
             select(Plan)
-            .join(PlanAssignee, PlanAssignee.plan_id == Plan.id)
-            .where(Plan.club_id == club_id, PlanAssignee.user_id == user_id)
+            .where(Plan.club_id == club_id, Plan.id.in_(select(assigned.c.plan_id)))
             .order_by(Plan.name.asc())
         )
-
-        if role is not None:
-            stmt = stmt.where(PlanAssignee.role == role)
-
         return list(self.db.execute(stmt).scalars().all())
 
     def update_plan(self, plan: Plan, data: PlanUpdate) -> Plan:
@@ -95,24 +104,18 @@ class PlanRepository:
             setattr(plan, field, value)
 
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as exc:
-            self.db.rollback()
             if "uq_plans_club_name" in str(exc.orig):
                 raise PlanNameExistsError(
                     f"A plan named '{payload.get('name')}' already exists in this club."
                 ) from exc
             raise
 
-        self.db.refresh(plan)
         return plan
 
     def delete_plan(self, plan: Plan) -> None:
         """Delete a plan by ID within a club."""
         self.db.delete(plan)
-        try:
-            self.db.commit()
-        except IntegrityError as exc:
-            self.db.rollback()
-            # Maby want a "PlanInUseError" later
-            raise
+        # Maby want a "PlanInUseError" later (IntegrityError on flush)
+        self.db.flush()
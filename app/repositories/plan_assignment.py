@@ -3,8 +3,8 @@ import sqlalchemy as sa
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.models import Plan, PlanAssignee, PlanAssigneeRole
-from app.exceptions.base import PlanNotFoundError, PlanAssignmentExistsError
+from app.models.models import Group, Plan, PlanAssignee, PlanAssigneeRole
+from app.exceptions.base import GroupNotFoundError, PlanNotFoundError, PlanAssignmentExistsError
 
 class PlanAssignmentRepository:
     def __init__(self, db: Session) -> None:
@@ -17,6 +17,13 @@ class PlanAssignmentRepository:
             raise PlanNotFoundError()
         return plan
 
+    def get_group_in_club(self, *, club_id: int, group_id: int) -> Group:
+        stmt = sa.select(Group).where(Group.id == group_id, Group.club_id == club_id)
+        group = self.db.execute(stmt).scalar_one_or_none()
+        if not group:
+            raise GroupNotFoundError()
+        return group
+
     def list_for_plan(self, *, plan_id: int) -> list[PlanAssignee]:
         stmt = (
             sa.select(PlanAssignee)
@@ -40,13 +47,31 @@ class PlanAssignmentRepository:
             role=role,
             assigned_by_id=assigned_by_id,
         )
+        return self._insert(obj)
+
+    def create_group_assignee(
+        self,
+        *,
+        plan_id: int,
+        group_id: int,
+        role: PlanAssigneeRole,
+        assigned_by_id: int,
+    ) -> PlanAssignee:
+        obj = PlanAssignee(
+            plan_id=plan_id,
+            user_id=None,
+            group_id=group_id,
+            role=role,
+            assigned_by_id=assigned_by_id,
+        )
+        return self._insert(obj)
+
+    def _insert(self, obj: PlanAssignee) -> PlanAssignee:
         self.db.add(obj)
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             raise PlanAssignmentExistsError() from e
-        self.db.refresh(obj)
         return obj
 
     def get(self, *, assignee_id: int) -> PlanAssignee | None:
@@ -54,4 +79,4 @@ class PlanAssignmentRepository:
 
     def delete(self, obj: PlanAssignee) -> None:
         self.db.delete(obj)
-        self.db.commit()
+        self.db.flush()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, defer
+
+from app.models.models import RequestProfile
+
+
+class RequestProfileRepository:
+    """
+    Request profiler reports. Like idempotency claims, these are written by
+    middleware outside the request's unit of work, so every write commits.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def start(self, *, user_id: int, method: str, path: str) -> int:
+        row = RequestProfile(created_by_id=user_id, method=method, path=path)
+        self.db.add(row)
+        self.db.commit()
+        return row.id
+
+    def finish(
+        self,
+        profile_id: int,
+        *,
+        status_code: int,
+        duration_ms: int,
+        sample_count: int,
+        report: bytes,
+    ) -> None:
+        self.db.execute(
+            sa.update(RequestProfile)
+            .where(RequestProfile.id == profile_id)
+            .values(status_code=status_code, duration_ms=duration_ms, sample_count=sample_count, report=report)
+        )
+        self.db.commit()
+
+    def purge(self, *, before: datetime) -> int:
+        result = self.db.execute(sa.delete(RequestProfile).where(RequestProfile.created_at < before))
+        self.db.commit()
+        return result.rowcount or 0
+
+    def list_recent(self, *, limit: int) -> Sequence[RequestProfile]:
+        stmt = (
+            sa.select(RequestProfile)
+            .options(defer(RequestProfile.report))
+            .order_by(RequestProfile.id.desc())
+            .limit(limit)
+        )
+        return self.db.execute(stmt).scalars().all()
+
+    def get(self, profile_id: int) -> RequestProfile | None:
+        return self.db.get(RequestProfile, profile_id)
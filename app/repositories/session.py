@@ -3,13 +3,18 @@ from __future__ import annotations
 import sqlalchemy as sa
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.models.models import Session as SessionModel, Plan
+from app.models.models import LinkMode, Session as SessionModel, Plan
 from app.exceptions.base import (
     PlanNotFoundError,
     SessionNotFound,
     ConflictError,
+    PreconditionFailedError,
 )
+from app.db.change_log import record_changes
+from app.repositories.template_links import SESSION_LINKED_FIELDS, linked_refresh_statement
+from app.repositories.versioning import check_version
 
 
 class SessionRepository:
@@ -45,6 +50,17 @@ class SessionRepository:
             raise SessionNotFound()
         return session
 
+    def _get_template_in_club(self, *, club_id: int, template_id: int) -> SessionModel:
+        stmt = sa.select(SessionModel).where(
+            SessionModel.id == template_id,
+            SessionModel.is_template.is_(True),
+            SessionModel.club_id == club_id,
+        )
+        template = self.db.execute(stmt).scalar_one_or_none()
+        if not template:
+            raise SessionNotFound("Template session not found")
+        return template
+
     # ---------- public API ----------
 
     def list_in_plan(self, *, club_id: int, plan_id: int) -> list[SessionModel]:
@@ -77,6 +93,9 @@ class SessionRepository:
         ends_at,
         location: str,
         note: str | None,
+        is_template: bool = False,
+        template_id: int | None = None,
+        link_mode: LinkMode = LinkMode.snapshot,
     ) -> SessionModel:
         self._get_plan_in_club(club_id=club_id, plan_id=plan_id)
 
@@ -90,15 +109,22 @@ class SessionRepository:
             ends_at=ends_at,
             location=location,
             note=note,
+            is_template=is_template,
+            template_id=template_id,
+            link_mode=link_mode,
         )
+        if template_id is not None:
+            template = self._get_template_in_club(club_id=club_id, template_id=template_id)
+            session.template_version_used = template.version_id
+            # every copy starts out as the template's content; only linked ones follow later edits
+            for field in SESSION_LINKED_FIELDS:
+                setattr(session, field, getattr(template, field))
 
         try:
             self.db.add(session)
-            self.db.commit()
-            self.db.refresh(session)
+            self.db.flush()
             return session
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError() from e
 
     def update_in_plan(
@@ -108,20 +134,22 @@ class SessionRepository:
         plan_id: int,
         session_id: int,
         updates: dict,
+        expected_version: int | None = None,
     ) -> SessionModel:
         session = self._get_session_in_plan(
             club_id=club_id, plan_id=plan_id, session_id=session_id
         )
+        check_version(session, expected_version)
 
         for key, value in updates.items():
             setattr(session, key, value)
 
         try:
-            self.db.commit()
-            self.db.refresh(session)
+            self.db.flush()
             return session
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError() from e
 
     def delete_in_plan(
@@ -133,7 +161,19 @@ class SessionRepository:
 
         try:
             self.db.delete(session)
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError() from e
+
+    def refresh_linked(self, *, template_ids: list[int] | None = None) -> int:
+        """Sync linked copies with their (newer) templates; one UPDATE for all of them."""
+        stmt = linked_refresh_statement(SessionModel, SESSION_LINKED_FIELDS, template_ids=template_ids)
+        rows = self.db.execute(stmt.returning(SessionModel.id, SessionModel.club_id)).all()
+
+        # bulk UPDATEs bypass the session's change tracking
+        by_club: dict[int, list[int]] = {}
+        for session_id, club_id in rows:
+            by_club.setdefault(club_id, []).append(session_id)
+        for club_id, session_ids in by_club.items():
+            record_changes(self.db, club_id=club_id, entity="session", entity_ids=session_ids)
+        return len(rows)
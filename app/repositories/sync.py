@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    Attendance,
+    ChangeLog,
+    Club,
+    Group,
+    Plan,
+    Session as TrainingSession,
+    WorkoutPlan,
+)
+
+# compact wire format per synced entity: just the columns a client renders offline
+SYNC_COLUMNS: dict[str, tuple[sa.ColumnElement, ...]] = {
+    "club": (
+        Club.id, Club.name, Club.description, Club.sport, Club.city, Club.country,
+        Club.version_id, Club.updated_at,
+    ),
+    "group": (Group.id, Group.name, Group.description, Group.updated_at),
+    "plan": (Plan.id, Plan.name, Plan.plan_type, Plan.description, Plan.updated_at),
+    "session": (
+        TrainingSession.id, TrainingSession.plan_id, TrainingSession.name, TrainingSession.starts_at,
+        TrainingSession.ends_at, TrainingSession.location, TrainingSession.note, TrainingSession.version_id,
+        TrainingSession.updated_at,
+    ),
+    "attendance": (
+        Attendance.id, Attendance.session_id, Attendance.user_id, Attendance.status,
+        Attendance.checked_in_at, Attendance.checked_out_at, Attendance.updated_at,
+    ),
+    "workout_plan": (
+        WorkoutPlan.id, WorkoutPlan.name, WorkoutPlan.goal, WorkoutPlan.level,
+        WorkoutPlan.duration_weeks, WorkoutPlan.is_template, WorkoutPlan.version_id,
+        WorkoutPlan.updated_at,
+    ),
+}
+
+
+class SyncRepository:
+    """Reads for delta sync: the club's change_log and compact entity rows."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def latest_cursor(self, *, club_id: int) -> int:
+        stmt = sa.select(sa.func.max(ChangeLog.seq)).where(ChangeLog.club_id == club_id)
+        return int(self.db.execute(stmt).scalar_one() or 0)
+
+    def list_changes(
+        self,
+        *,
+        club_id: int,
+        since: int,
+        limit: int,
+        user_id: int | None = None,
+    ) -> Sequence[Any]:
+        """
+        Committed change rows after `since` in cursor (commit) order; user_id
+        limits attendances to that user's.
+        """
+        stmt = (
+            sa.select(ChangeLog.seq.label("cursor"), ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op)
+            .where(ChangeLog.club_id == club_id, ChangeLog.seq > since)
+            .order_by(ChangeLog.seq.asc())
+            .limit(limit)
+        )
+        if user_id is not None:
+            stmt = stmt.where(sa.or_(ChangeLog.entity != "attendance", ChangeLog.user_id == user_id))
+        return self.db.execute(stmt).all()
+
+    def load(
+        self,
+        entity: str,
+        *,
+        club_id: int,
+        ids: Iterable[int] | None = None,
+        user_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Current rows of one entity type in the club (all, or just `ids`), one query."""
+        columns = SYNC_COLUMNS[entity]
+        model = columns[0].class_
+        stmt = sa.select(*columns)
+        if model is Club:
+            stmt = stmt.where(Club.id == club_id)
+        elif model is Attendance:
+            stmt = stmt.join(TrainingSession, TrainingSession.id == Attendance.session_id).where(
+                TrainingSession.club_id == club_id
+            )
+            if user_id is not None:
+                stmt = stmt.where(Attendance.user_id == user_id)
+        else:
+            stmt = stmt.where(model.club_id == club_id)
+        if ids is not None:
+            stmt = stmt.where(model.id.in_(list(ids)))
+        stmt = stmt.order_by(model.id.asc())
+        return [row._asdict() for row in self.db.execute(stmt).all()]
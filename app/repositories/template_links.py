@@ -0,0 +1,51 @@
+"""
+Linked template copies (sessions and plan exercises).
+
+A copy made from a template starts out with the template's content; with
+link_mode=linked it also follows later edits (snapshots never change):
+template_version_used is the template's version_id it was last synced
+from, and every edit of the template bumps that version (the mapper's
+version counter). refresh_linked() brings all stale copies up to date with
+one UPDATE ... FROM the same table, however many copies there are
+(built by linked_refresh_statement(), run by the repositories);
+app.services.template_links runs it in the background.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import Update, or_, update
+from sqlalchemy.orm import aliased
+
+from app.models.models import LinkMode
+
+# content a linked copy takes over from its template; placement (plan, time, position) stays its own
+SESSION_LINKED_FIELDS = ("name", "description", "location", "note")
+EXERCISE_LINKED_FIELDS = ("name", "description", "sets", "repetitions")
+
+
+def linked_refresh_statement(model, fields: Iterable[str], *, template_ids: Iterable[int] | None = None) -> Update:
+    """UPDATE copying `fields` from each template (all, or template_ids) to its stale linked copies."""
+    template = aliased(model, name="template")
+    stmt = (
+        update(model)
+        .where(
+            model.template_id == template.id,
+            model.link_mode == LinkMode.linked,
+            template.is_template.is_(True),
+            or_(model.template_version_used.is_(None), model.template_version_used != template.version_id),
+        )
+        .values(
+            {
+                **{field: getattr(template, field) for field in fields},
+                "template_version_used": template.version_id,
+                # bulk UPDATEs skip the mapper's version counter; copies carry ETags too
+                "version_id": model.version_id + 1,
+            }
+        )
+        # objects already loaded in the session keep their old values; the sweep runs in its own session
+        .execution_options(synchronize_session=False)
+    )
+    if template_ids is not None:
+        stmt = stmt.where(template.id.in_(set(template_ids)))
+    return stmt
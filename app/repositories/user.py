@@ -49,12 +49,11 @@ class UserRepository:
 
     # --- helpers ---
 
-    def _commit_with_email_guard(self, user: User) -> User:
-        """Commit and refresh user, mapping unique email errors."""
+    def _flush_with_email_guard(self, user: User) -> User:
+        """Flush the user, mapping unique email errors."""
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             orig = getattr(e, "orig", None)
 
             # ---- Postgres: unique_violation ----
@@ -69,7 +68,6 @@ class UserRepository:
                 raise EmailExistsError from e
 
             raise
-        self.db.refresh(user)
         return user
 
     # --- create & update ---
@@ -78,24 +76,24 @@ class UserRepository:
         """Create a new user."""
         user = User(**kwargs)
         self.db.add(user)
-        return self._commit_with_email_guard(user)
+        return self._flush_with_email_guard(user)
 
     def update_fields(self, user: User, updates: Mapping[str, Any]) -> User:
         """Apply partial updates to a user and persist."""
         for field, value in updates.items():
             setattr(user, field, value)
         self.db.add(user)
-        return self._commit_with_email_guard(user)
+        return self._flush_with_email_guard(user)
 
     def set_active(self, user: User, is_active: bool) -> User:
         """Toggle is_active and persist."""
         user.is_active = is_active
         self.db.add(user)
-        return self._commit_with_email_guard(user)
+        return self._flush_with_email_guard(user)
 
     # --- delete ---
 
     def delete_user(self, user: User) -> None:
         """Delete an existing user."""
         self.db.delete(user)
-        self.db.commit()
+        self.db.flush()
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.exceptions.base import PreconditionFailedError
+
+
+def check_version(obj: Any, expected_version: int | None) -> None:
+    """Raise 412 if the client's If-Match version isn't the current one."""
+    if expected_version is not None and obj.version_id != expected_version:
+        raise PreconditionFailedError()
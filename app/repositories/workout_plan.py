@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, false, func, insert, literal, null, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.models.models import WorkoutPlan, WorkoutPlanItem, WorkoutPlanExercise
+from app.db.change_log import record_changes
+from app.models.models import (
+    Group,
+    Membership,
+    PlanAssignee,
+    PlanAssigneeRole,
+    WorkoutPlan,
+    WorkoutPlanItem,
+    WorkoutPlanExercise,
+)
 
-from app.exceptions.base import WorkoutNotFoundError, ConflictError
+from app.exceptions.base import WorkoutNotFoundError, ConflictError, PreconditionFailedError
+from app.repositories.versioning import check_version
 
 
 class WorkoutPlanRepository:
@@ -33,16 +45,197 @@ class WorkoutPlanRepository:
             created_by_id=created_by_id,
             **data,
         )
-        self.db.add(plan)
         try:
-            self.db.commit()
+            # SAVEPOINT: callers retry name conflicts under another name (see workout_plan_ai)
+            with self.db.begin_nested():
+                self.db.add(plan)
         except IntegrityError as e:
-            self.db.rollback()
             # e.g. uq_workout_plans_club_name
             raise ConflictError("WorkoutPlan conflict") from e
-        self.db.refresh(plan)
         return plan
 
+    def existing_plan_names(self, club_id: int, names: Sequence[str]) -> set[str]:
+        if not names:
+            return set()
+        stmt = select(WorkoutPlan.name).where(
+            WorkoutPlan.club_id == club_id,
+            WorkoutPlan.name.in_(set(names)),
+        )
+        return set(self.db.execute(stmt).scalars().all())
+
+    def bulk_create_plans(self, club_id: int, created_by_id: int, plans: Sequence[dict]) -> list[int]:
+        """
+        Insert many nested plans: one multi-row INSERT ... RETURNING
+        per table (plans, items, exercises, assignees) instead of a round trip per row.
+
+        Each entry holds the plan columns plus
+          "items":     [{item columns..., "exercises": [{exercise columns...}]}]
+          "assignees": [user_id, ...]  -> athlete PlanAssignee rows on the new plan
+        Returns the new plan ids in input order.
+        """
+        if not plans:
+            return []
+        try:
+            plan_ids = self.db.scalars(
+                insert(WorkoutPlan).returning(WorkoutPlan.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "club_id": club_id,
+                        "created_by_id": created_by_id,
+                        **{k: v for k, v in plan.items() if k not in ("items", "assignees")},
+                    }
+                    for plan in plans
+                ],
+            ).all()
+
+            item_rows, item_exercises = [], []
+            for plan_id, plan in zip(plan_ids, plans):
+                for item in plan.get("items", []):
+                    item_rows.append(
+                        {"plan_id": plan_id, **{k: v for k, v in item.items() if k != "exercises"}}
+                    )
+                    item_exercises.append(item.get("exercises", []))
+
+            exercise_rows = []
+            if item_rows:
+                item_ids = self.db.scalars(
+                    insert(WorkoutPlanItem).returning(WorkoutPlanItem.id, sort_by_parameter_order=True),
+                    item_rows,
+                ).all()
+                for item_id, exercises in zip(item_ids, item_exercises):
+                    exercise_rows.extend({"item_id": item_id, **ex} for ex in exercises)
+            if exercise_rows:
+                self.db.execute(insert(WorkoutPlanExercise), exercise_rows)
+
+            assignee_rows = [
+                {
+                    "workout_plan_id": plan_id,
+                    "user_id": user_id,
+                    "role": PlanAssigneeRole.athlete,
+                    "assigned_by_id": created_by_id,
+                }
+                for plan_id, plan in zip(plan_ids, plans)
+                for user_id in plan.get("assignees", [])
+            ]
+            if assignee_rows:
+                self.db.execute(insert(PlanAssignee), assignee_rows)
+
+            # bulk INSERTs bypass the session's change tracking
+            record_changes(self.db, club_id=club_id, entity="workout_plan", entity_ids=plan_ids)
+        except IntegrityError as e:
+            raise ConflictError("WorkoutPlan conflict") from e
+        return list(plan_ids)
+
+    # -------------------------
+    # Template instantiation (set-based copies)
+    # -------------------------
+
+    def instantiate_template(
+        self, club_id: int, template_id: int, created_by_id: int, name: str
+    ) -> WorkoutPlan:
+        """
+        Deep-copy a plan inside the database: one INSERT ... SELECT each for
+        the plan, its items and their exercises, whatever the plan's size.
+        The copy is a regular plan (not a template) at version 1.
+
+        Copied items get their ids in the template's id order, so the n-th
+        item of the copy is the copy of the n-th template item; exercises are
+        re-parented by that rank (item keys may repeat when week/day are NULL).
+        """
+        now = literal(datetime.now(timezone.utc), DateTime(timezone=True))
+        plan_cols = ("description", "goal", "level", "duration_weeks")
+        try:
+            with self.db.begin_nested():
+                plan = self.db.scalars(
+                    insert(WorkoutPlan)
+                    .from_select(
+                        ["club_id", "created_by_id", "name", *plan_cols, "is_template", "version_id",
+                         "created_at", "updated_at"],
+                        select(
+                            WorkoutPlan.club_id, literal(created_by_id), literal(name),
+                            *(WorkoutPlan.__table__.c[c] for c in plan_cols), false(), literal(1), now, now,
+                        ).where(WorkoutPlan.club_id == club_id, WorkoutPlan.id == template_id),
+                    )
+                    .returning(WorkoutPlan)
+                ).first()
+        except IntegrityError as e:
+            # uq_workout_plans_club_name
+            raise ConflictError("WorkoutPlan conflict") from e
+        if plan is None:
+            raise WorkoutNotFoundError("WorkoutPlan not found")
+
+        items, exercises = WorkoutPlanItem.__table__, WorkoutPlanExercise.__table__
+        item_cols = ("week_number", "day_label", "order_index", "title")
+        self.db.execute(
+            insert(items).from_select(
+                ["plan_id", *item_cols, "version_id", "created_at", "updated_at"],
+                select(literal(plan.id), *(items.c[c] for c in item_cols), literal(1), now, now)
+                .where(items.c.plan_id == template_id)
+                .order_by(items.c.id),
+            )
+        )
+
+        def ranked(plan_id: int, name: str):
+            return (
+                select(items.c.id, func.row_number().over(order_by=items.c.id).label("rank"))
+                .where(items.c.plan_id == plan_id)
+                .subquery(name)
+            )
+
+        source, copy = ranked(template_id, "source_items"), ranked(plan.id, "copied_items")
+        exercise_cols = ("name", "description", "sets", "repetitions", "rest_seconds", "tempo", "weight_kg", "position")
+        self.db.execute(
+            insert(exercises).from_select(
+                ["item_id", *exercise_cols, "version_id", "created_at", "updated_at"],
+                select(copy.c.id, *(exercises.c[c] for c in exercise_cols), literal(1), now, now)
+                .select_from(
+                    exercises.join(source, exercises.c.item_id == source.c.id)
+                    .join(copy, copy.c.rank == source.c.rank)
+                ),
+            )
+        )
+
+        # Core INSERTs bypass the session's change tracking
+        record_changes(self.db, club_id=club_id, entity="workout_plan", entity_ids=[plan.id])
+        return plan
+
+    def assign_members(
+        self, club_id: int, workout_plan_id: int, user_ids: Sequence[int], assigned_by_id: int
+    ) -> int:
+        """Assign the plan to those of user_ids who are members of the club (one INSERT ... SELECT); returns the count."""
+        return self._assign(
+            workout_plan_id,
+            assigned_by_id,
+            user_id=Membership.user_id,
+            group_id=null(),
+            where=(Membership.club_id == club_id, Membership.user_id.in_(set(user_ids))),
+        )
+
+    def assign_groups(
+        self, club_id: int, workout_plan_id: int, group_ids: Sequence[int], assigned_by_id: int
+    ) -> int:
+        """Assign the plan to those of group_ids that belong to the club (one INSERT ... SELECT); returns the count."""
+        return self._assign(
+            workout_plan_id,
+            assigned_by_id,
+            user_id=null(),
+            group_id=Group.id,
+            where=(Group.club_id == club_id, Group.id.in_(set(group_ids))),
+        )
+
+    def _assign(self, workout_plan_id: int, assigned_by_id: int, *, user_id, group_id, where) -> int:
+        assignees = PlanAssignee.__table__
+        role = literal(PlanAssigneeRole.athlete, assignees.c.role.type)
+        stmt = insert(assignees).from_select(
+            ["workout_plan_id", "user_id", "group_id", "role", "assigned_by_id"],
+            select(literal(workout_plan_id), user_id, group_id, role, literal(assigned_by_id)).where(*where),
+        )
+        try:
+            return self.db.execute(stmt).rowcount
+        except IntegrityError as e:
+            # uq_plan_assignees_workout_plan_user
+            raise ConflictError("PlanAssignee conflict") from e
+
     def get_plan(self, club_id: int, plan_id: int) -> WorkoutPlan:
         stmt = select(WorkoutPlan).where(
             WorkoutPlan.club_id == club_id,
@@ -60,28 +253,33 @@ class WorkoutPlanRepository:
             .options(
                 selectinload(WorkoutPlan.items).selectinload(WorkoutPlanItem.exercises)
             )
+            # the plan is usually already in the identity map (just created); reload its collections
+            .execution_options(populate_existing=True)
         )
         plan = self.db.execute(stmt).scalars().first()
         if not plan:
             raise WorkoutNotFoundError("WorkoutPlan not found")
         return plan
 
-    def update_plan(self, club_id: int, plan_id: int, patch: dict) -> WorkoutPlan:
+    def update_plan(
+        self, club_id: int, plan_id: int, patch: dict, expected_version: int | None = None
+    ) -> WorkoutPlan:
         plan = self.get_plan(club_id=club_id, plan_id=plan_id)
+        check_version(plan, expected_version)
         for k, v in patch.items():
             setattr(plan, k, v)
         try:
-            self.db.commit()
+            self.db.flush()
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError("WorkoutPlan conflict") from e
-        self.db.refresh(plan)
         return plan
 
     def delete_plan(self, club_id: int, plan_id: int) -> None:
         plan = self.get_plan(club_id=club_id, plan_id=plan_id)
         self.db.delete(plan)
-        self.db.commit()
+        self.db.flush()
 
     # -------------------------
     # Items (club-scoped via join to plan)
@@ -104,12 +302,10 @@ class WorkoutPlanRepository:
         item = WorkoutPlanItem(plan_id=plan_id, **data)
         self.db.add(item)
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             # uq_workout_plan_items_plan_week_day_order
             raise ConflictError("WorkoutPlanItem conflict") from e
-        self.db.refresh(item)
         return item
 
     def get_item(self, club_id: int, plan_id: int, item_id: int) -> WorkoutPlanItem:
@@ -125,22 +321,25 @@ class WorkoutPlanRepository:
             raise WorkoutNotFoundError("WorkoutPlanItem not found")
         return item
 
-    def update_item(self, club_id: int, plan_id: int, item_id: int, patch: dict) -> WorkoutPlanItem:
+    def update_item(
+        self, club_id: int, plan_id: int, item_id: int, patch: dict, expected_version: int | None = None
+    ) -> WorkoutPlanItem:
         item = self.get_item(club_id=club_id, plan_id=plan_id, item_id=item_id)
+        check_version(item, expected_version)
         for k, v in patch.items():
             setattr(item, k, v)
         try:
-            self.db.commit()
+            self.db.flush()
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError("WorkoutPlanItem conflict") from e
-        self.db.refresh(item)
         return item
 
     def delete_item(self, club_id: int, plan_id: int, item_id: int) -> None:
         item = self.get_item(club_id=club_id, plan_id=plan_id, item_id=item_id)
         self.db.delete(item)
-        self.db.commit()
+        self.db.flush()
 
     # -------------------------
     # Exercises (club-scoped via join chain plan->item->exercise)
@@ -163,12 +362,10 @@ class WorkoutPlanRepository:
         ex = WorkoutPlanExercise(item_id=item_id, **data)
         self.db.add(ex)
         try:
-            self.db.commit()
+            self.db.flush()
         except IntegrityError as e:
-            self.db.rollback()
             # uq_workout_plan_exercises_item_position
             raise ConflictError("WorkoutPlanExercise conflict") from e
-        self.db.refresh(ex)
         return ex
 
     def get_exercise(self, club_id: int, plan_id: int, item_id: int, exercise_id: int) -> WorkoutPlanExercise:
@@ -190,6 +387,7 @@ class WorkoutPlanRepository:
         item_id: int,
         exercise_id: int,
         patch: dict,
+        expected_version: int | None = None,
     ) -> WorkoutPlanExercise:
         ex = self.get_exercise(
             club_id=club_id,
@@ -197,16 +395,17 @@ class WorkoutPlanRepository:
             item_id=item_id,
             exercise_id=exercise_id,
         )
+        check_version(ex, expected_version)
         for k, v in patch.items():
             setattr(ex, k, v)
 
         try:
-            self.db.commit()
+            self.db.flush()
+        except StaleDataError as e:
+            raise PreconditionFailedError() from e
         except IntegrityError as e:
-            self.db.rollback()
             raise ConflictError("WorkoutPlanExercise conflict") from e
 
-        self.db.refresh(ex)
         return ex
 
     def delete_exercise(self, club_id: int, plan_id: int, item_id: int, exercise_id: int) -> None:
@@ -217,4 +416,4 @@ class WorkoutPlanRepository:
             exercise_id=exercise_id,
         )
         self.db.delete(ex)
-        self.db.commit()
+        self.db.flush()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class QueryStatRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    statement: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    caller: Optional[str] = None  # repository method, known once the statement was slow
+
+
+class RequestProfileRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    created_by_id: int
+    method: str
+    path: str
+    status_code: Optional[int] = None  # None while the request is still running
+    duration_ms: Optional[int] = None
+    sample_count: Optional[int] = None
+    created_at: datetime
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import datetime as dt
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.models import AttendanceStatus, DayLabel
+
+
+class AgendaSession(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    club_id: int
+    club_name: str
+    plan_id: int
+    name: str
+    starts_at: datetime
+    ends_at: datetime
+    location: str
+    attendance_status: Optional[AttendanceStatus] = None  # None = nothing recorded yet
+    checked_in_at: Optional[datetime] = None
+
+
+class AgendaWorkoutItem(BaseModel):
+    """One assigned workout plan day, placed on a calendar date."""
+
+    date: dt.date  # the field name shadows a bare `date` in the class body
+    club_id: int
+    club_name: str
+    workout_plan_id: int
+    plan_name: str
+    item_id: int
+    week_number: Optional[int] = None
+    day_label: Optional[DayLabel] = None
+    title: Optional[str] = None
+    exercises: List[str] = Field(default_factory=list)
+
+
+class AgendaRead(BaseModel):
+    start: datetime
+    end: datetime
+    sessions: List[AgendaSession] = Field(default_factory=list)
+    workout_items: List[AgendaWorkoutItem] = Field(default_factory=list)
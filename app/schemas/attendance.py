@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from app.models.models import AttendanceStatus  # dein Enum
 
 class AttendanceCreate(BaseModel):
@@ -27,3 +27,20 @@ class AttendanceRead(BaseModel):
     note: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+
+
+class CheckInCodeRead(BaseModel):
+    code: str
+    expires_at: datetime
+
+class SelfCheckIn(BaseModel):
+    code: str = Field(min_length=3, max_length=64)
+
+class SelfCheckInRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    session_id: int
+    user_id: int
+    status: AttendanceStatus
+    checked_in_at: datetime | None = None
+    created: bool  # False when the athlete was already on the list
@@ -29,5 +29,6 @@ class ClubRead(ClubBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    version_id: Optional[int] = None  # ETag / If-Match value
     created_at: datetime
     updated_at: datetime
@@ -1,6 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, field_validator, Field
-from app.models.models import DayLabel
+from app.models.models import DayLabel, LinkMode
 
 _MAX_NAME = 100
 _MAX_DESCRIPTION = 1000
@@ -24,6 +24,11 @@ class ExerciseRead(BaseModel):
     repetitions: Optional[int] = None
     position: int
     day_label: Optional[DayLabel] = None
+    is_template: bool = False
+    template_id: Optional[int] = None
+    link_mode: LinkMode = LinkMode.snapshot
+    template_version_used: Optional[int] = None  # the template's version_id this copy was made/synced from
+    version_id: Optional[int] = None
 
 
 class ExerciseCreate(BaseModel):
@@ -34,6 +39,9 @@ class ExerciseCreate(BaseModel):
     repetitions: Optional[int] = None
     position: Optional[int] = None  # None = auto-append (max+1)
     day_label: Optional[DayLabel] = None
+    is_template: bool = False
+    template_id: Optional[int] = None  # copy of this template exercise (same club), starting from its content
+    link_mode: LinkMode = LinkMode.snapshot  # linked: name/description/sets/repetitions keep following the template
 
     @field_validator("name")
     @classmethod
@@ -68,3 +76,5 @@ class ExerciseCreate(BaseModel):
 
 class ExerciseUpdate(ExerciseCreate):
     name: Optional[str] = None
+    is_template: Optional[bool] = None
+    link_mode: Optional[LinkMode] = None  # snapshot: stop following the template
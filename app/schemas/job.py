@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.models import JobStatus
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraft
+
+
+class JobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    job_type: str
+    status: JobStatus
+    club_id: Optional[int] = None
+    created_by_id: int
+    progress: int
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class WorkoutPlanImport(WorkoutPlanAIDraft):
+    """Nested workout plan document accepted by the import job (same shape as an AI draft)."""
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, model_validator
 from app.models.models import PlanAssigneeRole
 
 
@@ -8,13 +10,22 @@ class PlanAssigneeRead(BaseModel):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
     id: int
     plan_id: int
-    user_id: int
+    user_id: Optional[int] = None
+    group_id: Optional[int] = None
     role: PlanAssigneeRole
     assigned_by_id: int
     created_at: datetime
 
 
 class PlanAssigneeCreate(BaseModel):
+    """Assign a plan to one user or to a whole group (exactly one of user_id / group_id)."""
     model_config = ConfigDict(extra="forbid")
-    user_id: int
+    user_id: Optional[int] = None
+    group_id: Optional[int] = None
     role: PlanAssigneeRole
+
+    @model_validator(mode="after")
+    def _one_target(self) -> "PlanAssigneeCreate":
+        if (self.user_id is None) == (self.group_id is None):
+            raise ValueError("Provide exactly one of user_id or group_id")
+        return self
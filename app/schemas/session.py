@@ -9,6 +9,8 @@ from pydantic import (
     field_serializer,
 )
 
+from app.models.models import LinkMode
+
 # limits for MVP; adjust if UI needs different caps
 _MAX_NAME = 100
 _MAX_LOCATION = 100
@@ -37,6 +39,11 @@ class SessionRead(BaseModel):
     location: str
     note: Optional[str] = None
     created_by: int
+    is_template: bool = False
+    template_id: Optional[int] = None
+    link_mode: LinkMode = LinkMode.snapshot
+    template_version_used: Optional[int] = None  # the template's version_id this copy was made/synced from
+    version_id: Optional[int] = None  # ETag / If-Match value
     created_at: datetime
     updated_at: datetime
 
@@ -56,6 +63,9 @@ class SessionCreate(BaseModel):
     ends_at: datetime
     location: str
     note: Optional[str] = None
+    is_template: bool = False
+    template_id: Optional[int] = None  # copy of this template session (same club), starting from its content
+    link_mode: LinkMode = LinkMode.snapshot  # linked: name/description/location/note keep following the template
 
     @field_validator("name")
     def _v_create(cls, v: str) -> str:
@@ -98,6 +108,8 @@ class SessionUpdate(BaseModel):
     ends_at: Optional[datetime] = None
     location: Optional[str] = None
     note: Optional[str] = None
+    is_template: Optional[bool] = None
+    link_mode: Optional[LinkMode] = None  # snapshot: stop following the template
 
     @field_validator("name")
     def _v_update(cls, v: Optional[str]) -> Optional[str]:
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class SyncRead(BaseModel):
+    """
+    One page of club changes for offline clients.
+
+    Pass `cursor` back as `since` for the next page. With `full`, `changes`
+    is a complete snapshot and replaces the client's copy of the club. A
+    deleted "club" means the whole club is gone (its rows cascade away
+    without tombstones of their own).
+    """
+
+    cursor: int
+    full: bool = False
+    has_more: bool = False
+    changes: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)  # entity -> compact rows
+    deleted: Dict[str, List[int]] = Field(default_factory=dict)  # entity -> ids
@@ -71,6 +71,7 @@ class WorkoutPlanExerciseUpdate(BaseModel):
 class WorkoutPlanExerciseRead(UTCBaseSchema, WorkoutPlanExerciseBase):
     id: int
     item_id: int
+    version_id: Optional[int] = None  # ETag / If-Match value
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -100,6 +101,7 @@ class WorkoutPlanItemUpdate(BaseModel):
 class WorkoutPlanItemRead(UTCBaseSchema, WorkoutPlanItemBase):
     id: int
     plan_id: int
+    version_id: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -138,10 +140,20 @@ class WorkoutPlanUpdate(BaseModel):
     is_template: Optional[bool] = None
 
 
+class WorkoutPlanInstantiate(BaseModel):
+    """Copy a template (items and exercises included) into a new plan, optionally assigned to athletes."""
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = Field(default=None, min_length=1, max_length=120)  # default: "<template name> (2)", ...
+    user_ids: List[int] = Field(default_factory=list, max_length=500)
+    group_ids: List[int] = Field(default_factory=list, max_length=100)
+
+
 class WorkoutPlanRead(UTCBaseSchema, WorkoutPlanBase):
     id: int
     club_id: int
     created_by_id: int
+    version_id: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -25,6 +25,27 @@ class WorkoutPlanAIDraftRequest(BaseModel):
     style: Optional[Literal["simple", "detailed"]] = "simple"
 
 
+class AthleteDraftProfile(BaseModel):
+    """Per-athlete overrides on top of the group request (unset fields inherit it)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    user_id: int
+    level: Optional[str] = Field(default=None, max_length=40)
+    equipment: Optional[List[str]] = Field(default=None, max_length=20)
+    constraints: Optional[List[str]] = Field(default=None, max_length=20)
+    notes: Optional[str] = Field(default=None, max_length=2000)
+
+
+class WorkoutPlanGroupAIDraftRequest(BaseModel):
+    """One draft per athlete of a group; athletes with identical profiles share a draft."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    request: WorkoutPlanAIDraftRequest
+    athletes: List[AthleteDraftProfile] = Field(default_factory=list, max_length=200)
+
+
 # ---------- AI Output (validated JSON) ----------
 
 class AIDraftExercise(BaseModel):
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator
+
+from app.exceptions.base import InvalidTimeRange
+from app.models.models import DayLabel, WorkoutPlan, WorkoutPlanItem
+from app.repositories.agenda import AgendaRepository
+from app.schemas.agenda import AgendaRead, AgendaSession, AgendaWorkoutItem
+from app.utils.cache import TTLCache
+
+_WEEKDAY = {label: index for index, label in enumerate(DayLabel)}  # monday=0 .. sunday=6
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def item_dates(
+    item: WorkoutPlanItem,
+    *,
+    plan_start: date,
+    duration_weeks: int | None,
+    first: date,
+    last: date,
+) -> Iterator[date]:
+    """
+    Calendar dates of a workout plan item within [first, last].
+
+    Week 1 is the week (Monday based) the plan was assigned in. Items with a
+    week_number happen once; items without one repeat every week (for
+    duration_weeks, if set). Items without a day_label aren't scheduled.
+    """
+    if item.day_label is None:
+        return
+    offset = _WEEKDAY[item.day_label]
+    if item.week_number is not None:
+        weeks = range(item.week_number, item.week_number + 1)
+    else:
+        last_week = (last - plan_start).days // 7 + 1
+        if duration_weeks:
+            last_week = min(last_week, duration_weeks)
+        weeks = range(max(1, (first - plan_start).days // 7 + 1), last_week + 1)
+    for week in weeks:
+        day = plan_start + timedelta(weeks=week - 1, days=offset)
+        if first <= day <= last:
+            yield day
+
+
+class AgendaService:
+    """
+    "My week" across all clubs of the current user: sessions with the user's
+    attendance, plus assigned workout plan days placed on the calendar.
+
+    Built from a fixed number of set-based queries (see AgendaRepository),
+    and cached per (user, range) for a few seconds: the agenda is polled on
+    every app launch and a slightly stale attendance status is acceptable.
+    """
+
+    def __init__(
+        self,
+        repo: AgendaRepository,
+        *,
+        cache: TTLCache | None = None,
+        default_days: int = 7,
+        max_days: int = 31,
+    ) -> None:
+        self.repo = repo
+        self.cache = cache
+        self.default_days = default_days
+        self.max_days = max_days
+
+    def get_agenda(
+        self,
+        *,
+        user_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> AgendaRead:
+        if start is None:
+            start = datetime.combine(datetime.now(timezone.utc).date(), time.min, tzinfo=timezone.utc)
+        start = _as_utc(start)
+        end = _as_utc(end) if end is not None else start + timedelta(days=self.default_days)
+        if end <= start:
+            raise InvalidTimeRange("'to' must be after 'from'")
+        if end - start > timedelta(days=self.max_days):
+            raise InvalidTimeRange(f"Agenda range is limited to {self.max_days} days")
+
+        key = (user_id, start, end)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        agenda = AgendaRead(
+            start=start,
+            end=end,
+            sessions=[
+                AgendaSession.model_validate(row)
+                for row in self.repo.list_sessions(user_id=user_id, start=start, end=end)
+            ],
+            workout_items=self._workout_items(user_id=user_id, start=start, end=end),
+        )
+        if self.cache is not None:
+            self.cache.set(key, agenda)
+        return agenda
+
+    def _workout_items(self, *, user_id: int, start: datetime, end: datetime) -> list[AgendaWorkoutItem]:
+        first = start.date()
+        last = (end - timedelta(microseconds=1)).date()
+
+        items = []
+        for assigned_at, plan in self.repo.list_assigned_workout_plans(user_id=user_id):
+            assigned_day = _as_utc(assigned_at).date()
+            plan_start = assigned_day - timedelta(days=assigned_day.weekday())
+            for item in plan.items:
+                for day in item_dates(
+                    item, plan_start=plan_start, duration_weeks=plan.duration_weeks, first=first, last=last
+                ):
+                    items.append(self._to_agenda_item(plan, item, day))
+
+        items.sort(key=lambda i: (i.date, i.workout_plan_id, i.item_id))
+        return items
+
+    @staticmethod
+    def _to_agenda_item(plan: WorkoutPlan, item: WorkoutPlanItem, day: date) -> AgendaWorkoutItem:
+        return AgendaWorkoutItem(
+            date=day,
+            club_id=plan.club_id,
+            club_name=plan.club.name,
+            workout_plan_id=plan.id,
+            plan_name=plan.name,
+            item_id=item.id,
+            week_number=item.week_number,
+            day_label=item.day_label,
+            title=item.title,
+            exercises=[ex.name for ex in sorted(item.exercises, key=lambda e: e.position)],
+        )
+
+
+# ---------- process-wide cache ----------
+
+_agenda_cache: TTLCache | None = None
+_agenda_cache_lock = threading.Lock()
+
+
+def get_agenda_cache() -> TTLCache | None:
+    """Shared per-user agenda cache, or None when AGENDA_CACHE_TTL_SECONDS is 0."""
+    global _agenda_cache
+    from app.core.config import settings
+
+    if settings.AGENDA_CACHE_TTL_SECONDS <= 0:
+        return None
+    if _agenda_cache is None:
+        with _agenda_cache_lock:
+            if _agenda_cache is None:
+                _agenda_cache = TTLCache(
+                    ttl_seconds=settings.AGENDA_CACHE_TTL_SECONDS,
+                    max_entries=settings.AGENDA_CACHE_MAX_ENTRIES,
+                )
+    return _agenda_cache
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from app.exceptions.base import RateLimitError
+from app.repositories.ai_quota import AIQuotaRepository, utc_today
+
+
+@dataclass(frozen=True)
+class QuotaReservation:
+    user_id: int
+    club_id: int
+    feature: str
+    day: date
+    club_counted: bool
+
+
+@dataclass(frozen=True)
+class ClubQuotaReservation:
+    club_id: int
+    feature: str
+    day: date
+    units: int
+
+
+class AIQuotaService:
+    """
+    Daily AI quotas with reserve/refund semantics.
+
+    - reserve() takes one unit up front (before the model is called) and raises
+      RateLimitError if the user's or the club's daily limit is reached.
+    - refund() gives the unit back when the call or its persistence fails.
+    - reserve_club()/refund_club() do the same for N units on the club counter
+      only (group generation jobs are charged to the club, not the coach).
+    Club limits: club_limits[club_id], else default_club_limit; None = unlimited.
+    """
+
+    def __init__(
+        self,
+        repo: AIQuotaRepository,
+        *,
+        daily_limit: int,
+        default_club_limit: int | None = None,
+        club_limits: dict[int, int] | None = None,
+    ) -> None:
+        self.repo = repo
+        self.daily_limit = daily_limit
+        self.default_club_limit = default_club_limit
+        self.club_limits = club_limits or {}
+
+    def club_limit(self, club_id: int) -> int | None:
+        return self.club_limits.get(club_id, self.default_club_limit)
+
+    def remaining(self, *, user_id: int, feature: str) -> int:
+        used = self.repo.get_user_count(user_id=user_id, feature=feature)
+        return max(0, self.daily_limit - used)
+
+    def reserve(self, *, user_id: int, club_id: int, feature: str) -> QuotaReservation:
+        day = utc_today()
+        club_limit = self.club_limit(club_id)
+        exhausted = self.repo.try_reserve(
+            user_id=user_id,
+            club_id=club_id,
+            feature=feature,
+            user_limit=self.daily_limit,
+            club_limit=club_limit,
+            day=day,
+        )
+        if exhausted == "user":
+            raise RateLimitError(
+                detail=f"Daily AI quota reached ({self.daily_limit}/day). Try again tomorrow."
+            )
+        if exhausted == "club":
+            raise RateLimitError(
+                detail=f"Your club's daily AI quota is used up ({club_limit}/day). Try again tomorrow."
+            )
+        return QuotaReservation(
+            user_id=user_id,
+            club_id=club_id,
+            feature=feature,
+            day=day,
+            club_counted=club_limit is not None,
+        )
+
+    def refund(self, reservation: QuotaReservation) -> None:
+        self.repo.refund(
+            user_id=reservation.user_id,
+            club_id=reservation.club_id,
+            feature=reservation.feature,
+            day=reservation.day,
+            club=reservation.club_counted,
+        )
+
+    def reserve_club(self, *, club_id: int, feature: str, units: int) -> ClubQuotaReservation:
+        day = utc_today()
+        club_limit = self.club_limit(club_id)
+        if not self.repo.try_reserve_club(
+            club_id=club_id, feature=feature, units=units, limit=club_limit, day=day
+        ):
+            used = self.repo.get_club_count(club_id=club_id, feature=feature, day=day)
+            raise RateLimitError(
+                detail=(
+                    f"Your club's daily AI quota can't cover {units} drafts "
+                    f"({used}/{club_limit} used today). Try again tomorrow."
+                )
+            )
+        return ClubQuotaReservation(club_id=club_id, feature=feature, day=day, units=units)
+
+    def refund_club(self, reservation: ClubQuotaReservation, units: int | None = None) -> None:
+        """Refund `units` (default: the whole reservation)."""
+        self.repo.refund_club(
+            club_id=reservation.club_id,
+            feature=reservation.feature,
+            units=reservation.units if units is None else min(units, reservation.units),
+            day=reservation.day,
+        )
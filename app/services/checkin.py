@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.security import make_checkin_code, verify_checkin_code
+from app.db.unit_of_work import transaction
+from app.exceptions.base import CheckInBusyError, InvalidCheckInCode, SessionNotFound
+from app.repositories.attendance import AttendanceRepository
+from app.services.membership import MembershipService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CheckIn:
+    club_id: int
+    session_id: int
+    user_id: int
+    checked_in_at: datetime
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return self.session_id, self.user_id
+
+
+class CheckInBatcher:
+    """
+    Write-behind queue for self check-ins.
+
+    A single writer thread collects check-ins for up to `window_seconds`
+    (or `max_batch` items) and writes them with one multi-row upsert and one
+    commit, instead of a transaction per athlete. Callers block on a Future
+    until their batch is committed, so the response still reflects the
+    stored row. If a batch fails, its check-ins are retried one by one so a
+    single bad row (e.g. a deleted session) only fails its own request.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] | Callable[[], Session],
+        *,
+        window_seconds: float = 0.005,
+        max_batch: int = 200,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0  # number of upserts written, for observability/tests
+
+    def submit(self, checkin: CheckIn) -> Future:
+        if self._closed:
+            raise RuntimeError("CheckInBatcher is shut down")
+        self._ensure_thread()
+        future: Future = Future()
+        self._queue.put((checkin, future))
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._closed = True
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(self._STOP)
+            if wait:
+                thread.join()
+
+    # ---------- writer thread ----------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="checkin-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple[CheckIn, Future]]) -> None:
+        waiting: dict[tuple[int, int], list[Future]] = {}
+        unique: dict[tuple[int, int], CheckIn] = {}
+        for checkin, future in batch:
+            if future.set_running_or_notify_cancel():
+                waiting.setdefault(checkin.key, []).append(future)
+                unique.setdefault(checkin.key, checkin)  # the first scan wins
+        if not unique:
+            return
+
+        try:
+            self._write(list(unique.values()), waiting)
+        except Exception:
+            if len(unique) == 1:
+                return  # the error is already on the futures
+            logger.warning("check-in batch of %s failed, retrying one by one", len(unique), exc_info=True)
+            for checkin in unique.values():
+                try:
+                    self._write([checkin], waiting)
+                except Exception:
+                    pass  # the error is already on the futures
+
+    def _write(self, checkins: list[CheckIn], waiting: dict[tuple[int, int], list[Future]]) -> None:
+        db = self.session_factory()
+        try:
+            with transaction(db):
+                rows = AttendanceRepository(db).upsert_checkins(
+                    [
+                        {
+                            "club_id": c.club_id,
+                            "session_id": c.session_id,
+                            "user_id": c.user_id,
+                            "checked_in_at": c.checked_in_at,
+                        }
+                        for c in checkins
+                    ]
+                )
+            self.batches += 1
+        except Exception as exc:
+            if len(checkins) == 1:
+                for future in waiting[checkins[0].key]:
+                    future.set_exception(exc)
+            raise
+        finally:
+            db.close()
+        for row in rows:
+            for future in waiting[(row.session_id, row.user_id)]:
+                future.set_result(row)
+
+
+class SelfCheckInService:
+    """
+    Athletes check themselves in by scanning a code shown at the door.
+
+    The code is an HMAC over (club, session, expiry) minted for a coach, so
+    checking in needs no coach lookup: just the code, the athlete's own
+    membership, and a slot in the CheckInBatcher.
+    """
+
+    def __init__(
+        self,
+        attendance_repo: AttendanceRepository,
+        membership_service: MembershipService,
+        batcher: CheckInBatcher,
+        *,
+        secret: str,
+        code_ttl_seconds: int = 120,
+        write_timeout_seconds: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.attendances = attendance_repo
+        self.memberships = membership_service
+        self.batcher = batcher
+        self.secret = secret
+        self.code_ttl_seconds = code_ttl_seconds
+        self.write_timeout_seconds = write_timeout_seconds
+        self._clock = clock
+
+    def issue_code(self, *, club_id: int, session_id: int, me_id: int) -> dict[str, Any]:
+        """Coach/owner: a fresh code for the door display (refresh before it expires)."""
+        self.memberships.require_coach_or_owner_of_club(me_id, club_id)
+        if not self.attendances.session_in_club_exists(club_id=club_id, session_id=session_id):
+            raise SessionNotFound()
+        expires = int(self._clock()) + self.code_ttl_seconds
+        return {
+            "code": make_checkin_code(self.secret, club_id=club_id, session_id=session_id, expires=expires),
+            "expires_at": datetime.fromtimestamp(expires, tz=timezone.utc),
+        }
+
+    def check_in(self, *, club_id: int, session_id: int, me_id: int, code: str) -> Any:
+        if not verify_checkin_code(self.secret, code, club_id=club_id, session_id=session_id, now=self._clock()):
+            raise InvalidCheckInCode()
+        self.memberships.require_member_of_club(me_id, club_id)
+
+        checked_in_at = datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+        future = self.batcher.submit(
+            CheckIn(club_id=club_id, session_id=session_id, user_id=me_id, checked_in_at=checked_in_at)
+        )
+        try:
+            return future.result(timeout=self.write_timeout_seconds)
+        except FutureTimeout:
+            raise CheckInBusyError()
+
+
+# ---------- process-wide batcher ----------
+
+_batcher: CheckInBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def get_checkin_batcher() -> CheckInBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                from app.core.config import settings
+                from app.db.deps import SessionLocal
+
+                _batcher = CheckInBatcher(
+                    SessionLocal,
+                    window_seconds=settings.CHECKIN_BATCH_WINDOW_MS / 1000,
+                    max_batch=settings.CHECKIN_BATCH_MAX,
+                )
+    return _batcher
+
+
+def shutdown_checkin_batcher(wait: bool = True) -> None:
+    global _batcher
+    with _batcher_lock:
+        if _batcher is not None:
+            _batcher.shutdown(wait=wait)
+            _batcher = None
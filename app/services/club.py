@@ -12,6 +12,7 @@ class ClubService:
 
 
     def create_club_and_owner(self, club_create: ClubCreate, membership_create: MembershipCreate, user: User):
+        """Club and owner membership share the request's transaction: both are created or neither."""
         slug = generate_club_slug([club_create.name, club_create.country, club_create.city, club_create.sport])
 
         club_data = club_create.model_dump(exclude_unset=True)
@@ -51,7 +52,7 @@ class ClubService:
 
 
 
-    def update_club_service(self, user, club_id: int, club_update: ClubUpdate):
+    def update_club_service(self, user, club_id: int, club_update: ClubUpdate, expected_version: int | None = None):
         club = self.club_repo.get_club(club_id)
         if not club:
             raise ClubNotFoundError()
@@ -82,7 +83,7 @@ class ClubService:
         update_data["slug"] = new_slug
 
         # call repo to update club
-        updated_club = self.club_repo.update_club(club, **update_data)
+        updated_club = self.club_repo.update_club(club, expected_version=expected_version, **update_data)
 
         return updated_club
 
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Protocol
+
+from app.core.ai_client import AIClient, get_ai_client
+from app.exceptions.base import AIBusyError, AIUnavailableError
+from app.models.models import Club
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraft, WorkoutPlanAIDraftRequest
+from app.services.rule_based_draft import RuleBasedDraftGenerator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GeneratedDraft:
+    draft: WorkoutPlanAIDraft
+    provider: str
+    billable: bool  # False: no paid model call happened -> quota is refunded, draft isn't cached
+
+
+@dataclass(frozen=True)
+class DraftStream:
+    chunks: Iterator[str]  # raw WorkoutPlanAIDraft JSON text
+    provider: str
+    billable: bool
+
+
+class DraftProvider(Protocol):
+    """Produces WorkoutPlanAIDraft documents, either whole or as streamed JSON text."""
+
+    name: str
+
+    def generate(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> GeneratedDraft: ...
+
+    def stream(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> DraftStream: ...
+
+
+# ---------- OpenAI ----------
+
+class OpenAIDraftProvider:
+    name = "openai"
+
+    def __init__(self, client: AIClient) -> None:
+        self.client = client
+
+    def generate(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> GeneratedDraft:
+        resp = self.client.create_response(**self.request_kwargs(req, club=club))
+
+        json_text = resp.output_text
+        draft = WorkoutPlanAIDraft.model_validate_json(json_text)
+        return GeneratedDraft(draft=draft, provider=self.name, billable=True)
+
+    def stream(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> DraftStream:
+        chunks = self.client.stream_text(**self.request_kwargs(req, club=club))
+        return DraftStream(chunks=chunks, provider=self.name, billable=True)
+
+    @staticmethod
+    def request_kwargs(req: WorkoutPlanAIDraftRequest, *, club: Club) -> dict[str, Any]:
+        schema: dict[str, Any] = WorkoutPlanAIDraft.model_json_schema()
+
+        club_name = club.name or "your club"
+        sports_area = club.sport or "general fitness"
+
+        prompt = (
+            f"You are an sports expert for the Club {club_name} in the sports area {sports_area} "
+            "you have expertise in creating workout plans for different goals, levels, and constraints. "
+            "Based on the user's input, generate a workout plan draft "
+            "that includes structured weeks and days with exercises.\n"
+            "Return ONLY valid JSON that matches the provided JSON Schema.\n"
+            "Rules:\n"
+            "- Provide structured weeks and days_per_week.\n"
+            "- Use concise exercise names.\n"
+            "- Positions/order_index start at 0 and increase.\n"
+            "- Day labels must be one of: monday..sunday when used.\n"
+            "- Keep it realistic for the given level.\n"
+        )
+
+        user_input = {
+            "goal": req.goal,
+            "level": req.level,
+            "duration_weeks": req.duration_weeks,
+            "days_per_week": req.days_per_week,
+            "equipment": req.equipment,
+            "constraints": req.constraints,
+            "notes": req.notes,
+            "style": req.style,
+        }
+
+        return {
+            "input": [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": f"Input:\n{user_input}"},
+            ],
+            "text": {
+                "format": {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "WorkoutPlanAIDraft",
+                        "schema": schema,
+                        "strict": True,
+                    },
+                }
+            },
+        }
+
+
+# ---------- local rules ----------
+
+class RuleBasedDraftProvider:
+    """Offline drafts from RuleBasedDraftGenerator (milliseconds, no quota)."""
+
+    name = "local"
+
+    def __init__(self, builder: RuleBasedDraftGenerator | None = None, chunk_size: int = 512) -> None:
+        self.builder = builder or RuleBasedDraftGenerator()
+        self.chunk_size = chunk_size
+
+    def generate(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> GeneratedDraft:
+        return GeneratedDraft(draft=self.builder.build(req, club=club), provider=self.name, billable=False)
+
+    def stream(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> DraftStream:
+        text = self.builder.build(req, club=club).model_dump_json()
+        chunks = (text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size))
+        return DraftStream(chunks=iter(chunks), provider=self.name, billable=False)
+
+
+# ---------- circuit breaker ----------
+
+class CircuitBreaker:
+    """
+    closed -> (failure_threshold consecutive failures) -> open
+    open   -> (reset_timeout elapsed) -> half-open: one trial call allowed
+    half-open trial success -> closed, failure -> open again
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("AI circuit opened after %s failures", self._failures)
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Call finished without telling us anything about upstream health (e.g. local overload)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class FallbackDraftProvider:
+    """
+    Remote provider behind a circuit breaker, with a local fallback.
+
+    Upstream failures (timeouts, 5xx, connection errors, missing key) count
+    against the breaker; while it is open the fallback answers immediately.
+    Local overload (AIBusyError) also falls back but doesn't trip the breaker.
+    Streams can only fall back before the first chunk has been forwarded.
+    """
+
+    def __init__(self, primary: DraftProvider, fallback: DraftProvider, breaker: CircuitBreaker) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker
+        self.name = primary.name
+
+    def generate(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> GeneratedDraft:
+        if not self.breaker.allow():
+            return self.fallback.generate(req, club=club)
+        try:
+            result = self.primary.generate(req, club=club)
+        except AIBusyError:
+            self.breaker.release()
+            return self.fallback.generate(req, club=club)
+        except AIUnavailableError as e:
+            self.breaker.record_failure()
+            logger.info("Falling back to %s draft provider: %s", self.fallback.name, e)
+            return self.fallback.generate(req, club=club)
+        except Exception:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def stream(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> DraftStream:
+        if not self.breaker.allow():
+            return self.fallback.stream(req, club=club)
+
+        upstream = self.primary.stream(req, club=club)
+        try:
+            first = next(upstream.chunks)
+        except StopIteration:
+            self.breaker.record_success()
+            return upstream
+        except AIBusyError:
+            self.breaker.release()
+            return self.fallback.stream(req, club=club)
+        except AIUnavailableError as e:
+            self.breaker.record_failure()
+            logger.info("Falling back to %s draft provider: %s", self.fallback.name, e)
+            return self.fallback.stream(req, club=club)
+        except Exception:
+            self.breaker.release()
+            raise
+
+        return DraftStream(
+            chunks=self._rest(first, upstream.chunks),
+            provider=upstream.provider,
+            billable=upstream.billable,
+        )
+
+    def _rest(self, first: str, chunks: Iterator[str]) -> Iterator[str]:
+        yield first
+        try:
+            yield from chunks
+        except AIUnavailableError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:  # consumer went away, or an unrelated error
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+
+
+# ---------- process-wide provider ----------
+
+_provider: DraftProvider | None = None
+_provider_lock = threading.Lock()
+
+
+def build_draft_provider() -> DraftProvider:
+    from app.core.config import settings
+
+    local = RuleBasedDraftProvider()
+    if settings.AI_DRAFT_PROVIDER == "local":
+        return local
+
+    remote = OpenAIDraftProvider(get_ai_client())
+    if not settings.AI_DRAFT_FALLBACK:
+        return remote
+    return FallbackDraftProvider(
+        remote,
+        local,
+        CircuitBreaker(
+            failure_threshold=settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.AI_CIRCUIT_RESET_SECONDS,
+        ),
+    )
+
+
+def get_draft_provider() -> DraftProvider:
+    """Shared provider (one circuit breaker per process)."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = build_draft_provider()
+    return _provider
+
+
+def get_quota_fallback_provider() -> DraftProvider | None:
+    """Rule-based provider to use instead of a 429 when AI_DRAFT_FALLBACK_ON_QUOTA is on."""
+    from app.core.config import settings
+
+    return RuleBasedDraftProvider() if settings.AI_DRAFT_FALLBACK_ON_QUOTA else None
@@ -3,6 +3,7 @@ from __future__ import annotations
 from app.repositories.exercise import ExerciseRepository
 from app.services.membership import MembershipService
 from app.schemas.exercise import ExerciseCreate, ExerciseUpdate
+from app.models.models import LinkMode
 
 
 class ExerciseService:
@@ -36,6 +37,9 @@ class ExerciseService:
             repetitions=data.repetitions,
             position=data.position,
             day_label=data.day_label,
+            is_template=data.is_template,
+            template_id=data.template_id,
+            link_mode=data.link_mode,
         )
 
     def update_exercise(
@@ -51,9 +55,14 @@ class ExerciseService:
 
         updates = data.model_dump(exclude_unset=True)
 
-        # protect: don't allow "position": None to overwrite existing position
-        if updates.get("position") is None:
-            updates.pop("position", None)
+        # protect: don't allow an explicit None to overwrite position / template flags
+        for key in ("position", "is_template", "link_mode"):
+            if updates.get(key) is None:
+                updates.pop(key, None)
+        # a copy's template is fixed when it is created
+        updates.pop("template_id", None)
+        if updates.get("link_mode") == LinkMode.linked:
+            updates["template_version_used"] = None  # the next template sweep syncs it
 
         return self.exercise_repo.update_in_plan(
             club_id=club_id,
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.jobs.runner import JobRunner
+from app.models.models import Job, MembershipRole
+from app.repositories.job import JobRepository
+from app.services.membership import MembershipService
+from app.exceptions.base import JobNotFoundError, MembershipNotFoundError, UnknownJobTypeError
+
+
+class JobService:
+    """Business logic for background jobs.
+
+    - Enqueue: caller must be a member of the club the job runs in.
+    - Read: the job's creator, or a coach/owner of the job's club.
+      Everyone else gets 404 (don't leak job ids).
+    """
+
+    def __init__(
+        self,
+        job_repo: JobRepository,
+        membership_service: MembershipService,
+        runner: JobRunner,
+    ) -> None:
+        self.jobs = job_repo
+        self.memberships = membership_service
+        self.runner = runner
+
+    def enqueue(
+        self,
+        *,
+        job_type: str,
+        user_id: int,
+        club_id: int,
+        payload: dict[str, Any],
+    ) -> Job:
+        self.memberships.require_member_of_club(user_id, club_id)
+
+        if not self.runner.has_handler(job_type):
+            raise UnknownJobTypeError()
+
+        job = self.jobs.create(
+            job_type=job_type,
+            created_by_id=user_id,
+            club_id=club_id,
+            payload=payload,
+            locked_by=self.runner.worker_id,
+        )
+        self.runner.submit(job.id, job.job_type)
+        return job
+
+    def get_job(self, *, job_id: int, user_id: int) -> Job:
+        job = self.jobs.get(job_id)
+        if job.created_by_id == user_id:
+            return job
+
+        if job.club_id is not None:
+            try:
+                membership = self.memberships.get_membership_for_user_in_club(
+                    club_id=job.club_id, user_id=user_id
+                )
+            except MembershipNotFoundError:
+                raise JobNotFoundError()
+            if membership.role in (MembershipRole.coach, MembershipRole.owner):
+                return job
+
+        raise JobNotFoundError()
@@ -1,5 +1,6 @@
 from typing import List
 
+from app.core.request_timing import timed
 from app.models.models import Membership, MembershipRole
 from app.repositories.membership import MembershipRepository
 from app.repositories.user import UserRepository
@@ -149,6 +150,7 @@ class MembershipService:
 
 
     # Guard helpers (replacing membership_deps logic)
+    @timed("membership")
     def require_member_of_club(self, user_id: int, club_id: int) -> Membership:
         """
         Ensure the user is at least a member of the club.
@@ -160,6 +162,7 @@ class MembershipService:
             raise NotClubMember()
         return membership
 
+    @timed("membership")
     def require_coach_of_club(self, user_id: int, club_id: int) -> Membership:
         """Ensure the user is a coach of the club."""
         membership = self.memberships.get_by_club_and_user(club_id=club_id, user_id=user_id)
@@ -169,6 +172,7 @@ class MembershipService:
             raise CoachRequiredError()
         return membership
 
+    @timed("membership")
     def require_owner_of_club(self, user_id: int, club_id: int) -> Membership:
         """Ensure the user is an owner of the club."""
         membership = self.memberships.get_by_club_and_user(club_id=club_id, user_id=user_id)
@@ -178,6 +182,7 @@ class MembershipService:
             raise OwnerRequiredError()
         return membership
 
+    @timed("membership")
     def require_coach_or_owner_of_club(self, user_id: int, club_id: int) -> Membership:
         """Ensure the user is either a coach or an owner of the club."""
         membership = self.memberships.get_by_club_and_user(club_id=club_id, user_id=user_id)
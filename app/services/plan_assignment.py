@@ -19,7 +19,16 @@ class PlanAssignmentService:
         self.memberships.require_coach_or_owner_of_club(me_id, club_id)
         self.repo.get_plan_in_club(club_id=club_id, plan_id=plan_id)
 
-        # user-assignees only for now:
+        if data.group_id is not None:
+            # group members see the plan via "my assigned plans" without per-user rows
+            self.repo.get_group_in_club(club_id=club_id, group_id=data.group_id)
+            return self.repo.create_group_assignee(
+                plan_id=plan_id,
+                group_id=data.group_id,
+                role=data.role,
+                assigned_by_id=me_id,
+            )
+
         try:
             self.memberships.require_member_of_club(data.user_id, club_id)
         except NotClubMember:
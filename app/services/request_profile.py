@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from app.exceptions.base import ProfileNotFoundError
+from app.models.models import RequestProfile
+from app.repositories.request_profile import RequestProfileRepository
+
+
+class RequestProfileService:
+    """Stored request profiles (X-Profile: 1); the admin router restricts access to admins."""
+
+    def __init__(self, repo: RequestProfileRepository) -> None:
+        self.profiles = repo
+
+    def list_profiles(self, *, limit: int = 50) -> Sequence[RequestProfile]:
+        return self.profiles.list_recent(limit=limit)
+
+    def get_report(self, profile_id: int) -> bytes:
+        """The speedscope JSON; 404 while the profiled request is still running."""
+        profile = self.profiles.get(profile_id)
+        if profile is None or profile.report is None:
+            raise ProfileNotFoundError()
+        return profile.report
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from app.models.models import Club, DayLabel
+from app.schemas.workout_plan_ai import (
+    AIDraftExercise,
+    AIDraftItem,
+    WorkoutPlanAIDraft,
+    WorkoutPlanAIDraftRequest,
+)
+
+
+# ---------- exercise catalog ----------
+
+@dataclass(frozen=True)
+class CatalogExercise:
+    name: str
+    pattern: str                        # squat | hinge | lunge | push | pull | core | carry | conditioning
+    equipment: frozenset[str] = frozenset()   # empty = bodyweight
+    tags: frozenset[str] = frozenset()        # knee | spine | overhead | impact
+    description: str | None = None
+
+
+def _ex(name, pattern, equipment=(), tags=(), description=None) -> CatalogExercise:
+    return CatalogExercise(name, pattern, frozenset(equipment), frozenset(tags), description)
+
+
+EXERCISE_CATALOG: tuple[CatalogExercise, ...] = (
+    # squat
+    _ex("Back Squat", "squat", {"barbell"}, {"knee", "spine"}),
+    _ex("Goblet Squat", "squat", {"dumbbell"}, {"knee"}),
+    _ex("Kettlebell Goblet Squat", "squat", {"kettlebell"}, {"knee"}),
+    _ex("Leg Press", "squat", {"machine"}, {"knee"}),
+    _ex("Bodyweight Squat", "squat", (), {"knee"}),
+    _ex("Box Squat to Bench", "squat", {"bench"}, set(), "Sit back to a bench, controlled depth."),
+    _ex("Wall Sit", "squat"),
+    # hinge
+    _ex("Romanian Deadlift", "hinge", {"barbell"}, {"spine"}),
+    _ex("Dumbbell Romanian Deadlift", "hinge", {"dumbbell"}, {"spine"}),
+    _ex("Kettlebell Swing", "hinge", {"kettlebell"}, {"spine", "impact"}),
+    _ex("Glute Bridge", "hinge"),
+    _ex("Single-Leg Glute Bridge", "hinge"),
+    _ex("Band Pull-Through", "hinge", {"band"}),
+    # lunge
+    _ex("Dumbbell Reverse Lunge", "lunge", {"dumbbell"}, {"knee"}),
+    _ex("Bulgarian Split Squat", "lunge", {"bench"}, {"knee"}),
+    _ex("Reverse Lunge", "lunge", (), {"knee"}),
+    _ex("Step-Up", "lunge", {"bench"}, {"knee"}),
+    _ex("Lateral Band Walk", "lunge", {"band"}),
+    # push
+    _ex("Bench Press", "push", {"barbell", "bench"}),
+    _ex("Dumbbell Bench Press", "push", {"dumbbell", "bench"}),
+    _ex("Overhead Press", "push", {"barbell"}, {"overhead", "spine"}),
+    _ex("Dumbbell Shoulder Press", "push", {"dumbbell"}, {"overhead"}),
+    _ex("Push-Up", "push"),
+    _ex("Incline Push-Up", "push", {"bench"}),
+    _ex("Band Chest Press", "push", {"band"}),
+    # pull
+    _ex("Pull-Up", "pull", {"pullup_bar"}, {"overhead"}),
+    _ex("Barbell Row", "pull", {"barbell"}, {"spine"}),
+    _ex("One-Arm Dumbbell Row", "pull", {"dumbbell", "bench"}),
+    _ex("Cable Row", "pull", {"machine"}),
+    _ex("Band Row", "pull", {"band"}),
+    _ex("Inverted Row", "pull", {"pullup_bar"}),
+    _ex("Prone Y-T-W Raise", "pull", (), set(), "Lie face down, lift arms in Y, T and W shapes."),
+    # core
+    _ex("Plank", "core"),
+    _ex("Dead Bug", "core"),
+    _ex("Side Plank", "core"),
+    _ex("Bird Dog", "core"),
+    _ex("Pallof Press", "core", {"band"}),
+    _ex("Hanging Knee Raise", "core", {"pullup_bar"}),
+    # carry
+    _ex("Farmer's Carry", "carry", {"dumbbell"}),
+    _ex("Kettlebell Suitcase Carry", "carry", {"kettlebell"}),
+    _ex("Bear Crawl", "carry", (), {"knee"}),
+    # conditioning
+    _ex("Jumping Jacks", "conditioning", (), {"impact"}),
+    _ex("Burpee", "conditioning", (), {"impact", "knee"}),
+    _ex("Mountain Climber", "conditioning"),
+    _ex("Bike Intervals", "conditioning", {"bike"}),
+    _ex("Rowing Intervals", "conditioning", {"rower"}),
+    _ex("Brisk Walk / Easy Jog", "conditioning"),
+)
+
+
+# ---------- normalization of free-text inputs ----------
+
+_EQUIPMENT_SYNONYMS: dict[str, str] = {
+    "barbell": "barbell", "barbells": "barbell", "rack": "barbell", "squat rack": "barbell",
+    "dumbbell": "dumbbell", "dumbbells": "dumbbell", "db": "dumbbell",
+    "kettlebell": "kettlebell", "kettlebells": "kettlebell", "kb": "kettlebell",
+    "band": "band", "bands": "band", "resistance band": "band", "resistance bands": "band",
+    "pull up bar": "pullup_bar", "pullup bar": "pullup_bar", "pull-up bar": "pullup_bar", "bar": "pullup_bar",
+    "bench": "bench",
+    "machine": "machine", "machines": "machine", "cable": "machine", "cables": "machine", "gym": "gym",
+    "bike": "bike", "spin bike": "bike", "rower": "rower", "rowing machine": "rower",
+}
+
+# constraint keyword -> catalog tags to avoid
+_CONSTRAINT_TAGS: tuple[tuple[str, str], ...] = (
+    ("knee", "knee"),
+    ("back", "spine"),
+    ("spine", "spine"),
+    ("shoulder", "overhead"),
+    ("overhead", "overhead"),
+    ("jump", "impact"),
+    ("impact", "impact"),
+    ("joint", "impact"),
+)
+
+_GOAL_KEYWORDS: tuple[tuple[str, str], ...] = (
+    ("strength", "strength"), ("strong", "strength"), ("power", "strength"),
+    ("muscle", "hypertrophy"), ("hypertrophy", "hypertrophy"), ("size", "hypertrophy"),
+    ("endurance", "endurance"), ("stamina", "endurance"), ("cardio", "endurance"), ("run", "endurance"),
+    ("fat", "conditioning"), ("weight loss", "conditioning"), ("lean", "conditioning"),
+    ("mobility", "mobility"), ("flexib", "mobility"), ("rehab", "mobility"),
+)
+
+# goal -> (sets, reps, rest_seconds, tempo)
+_SCHEMES: dict[str, tuple[int, int, int, str | None]] = {
+    "strength": (4, 5, 150, "2-0-1"),
+    "hypertrophy": (3, 10, 90, "3-0-1"),
+    "endurance": (2, 15, 45, None),
+    "conditioning": (3, 12, 45, None),
+    "mobility": (2, 10, 30, "2-1-2"),
+    "general": (3, 10, 75, None),
+}
+
+_LEVEL_EXTRA_SETS = {"beginner": -1, "intermediate": 0, "advanced": 1}
+_LEVEL_EXERCISES = {"beginner": 4, "intermediate": 5, "advanced": 6}
+
+_DAY_LABELS: dict[int, tuple[DayLabel, ...]] = {
+    1: (DayLabel.wednesday,),
+    2: (DayLabel.monday, DayLabel.thursday),
+    3: (DayLabel.monday, DayLabel.wednesday, DayLabel.friday),
+    4: (DayLabel.monday, DayLabel.tuesday, DayLabel.thursday, DayLabel.friday),
+    5: (DayLabel.monday, DayLabel.tuesday, DayLabel.wednesday, DayLabel.friday, DayLabel.saturday),
+    6: (DayLabel.monday, DayLabel.tuesday, DayLabel.wednesday, DayLabel.thursday, DayLabel.friday,
+        DayLabel.saturday),
+    7: tuple(DayLabel),
+}
+
+# (title, movement patterns in order)
+_FULL_BODY = ("Full Body", ("squat", "push", "hinge", "pull", "core", "lunge", "carry"))
+_UPPER = ("Upper Body", ("push", "pull", "push", "pull", "core", "carry"))
+_LOWER = ("Lower Body", ("squat", "hinge", "lunge", "core", "hinge", "carry"))
+_CONDITIONING = ("Conditioning", ("conditioning", "core", "lunge", "conditioning", "carry", "core"))
+
+_SPLITS: dict[int, tuple[tuple[str, tuple[str, ...]], ...]] = {
+    1: (_FULL_BODY,),
+    2: (_FULL_BODY, _FULL_BODY),
+    3: (_FULL_BODY, _FULL_BODY, _FULL_BODY),
+    4: (_UPPER, _LOWER, _UPPER, _LOWER),
+    5: (_UPPER, _LOWER, _CONDITIONING, _UPPER, _LOWER),
+    6: (_UPPER, _LOWER, _CONDITIONING, _UPPER, _LOWER, _CONDITIONING),
+    7: (_UPPER, _LOWER, _CONDITIONING, _UPPER, _LOWER, _CONDITIONING, _FULL_BODY),
+}
+
+
+def _norm(value: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9\- ]", " ", value.lower()).split())
+
+
+def _available_equipment(equipment: list[str]) -> set[str]:
+    available: set[str] = set()
+    for raw in equipment:
+        value = _norm(raw)
+        mapped = _EQUIPMENT_SYNONYMS.get(value) or _EQUIPMENT_SYNONYMS.get(value.rstrip("s"))
+        if mapped == "gym":
+            available |= {"barbell", "dumbbell", "kettlebell", "band", "pullup_bar", "bench", "machine", "bike", "rower"}
+        elif mapped:
+            available.add(mapped)
+    return available
+
+
+def _avoided_tags(constraints: list[str]) -> set[str]:
+    avoided: set[str] = set()
+    for raw in constraints:
+        value = _norm(raw)
+        for keyword, tag in _CONSTRAINT_TAGS:
+            if keyword in value:
+                avoided.add(tag)
+    return avoided
+
+
+def _goal_kind(goal: str) -> str:
+    value = _norm(goal)
+    for keyword, kind in _GOAL_KEYWORDS:
+        if keyword in value:
+            return kind
+    return "general"
+
+
+def _level(level: str | None) -> str:
+    value = _norm(level or "")
+    if value.startswith(("adv", "expert", "elite")):
+        return "advanced"
+    if value.startswith(("inter", "medium")):
+        return "intermediate"
+    return "beginner"
+
+
+class RuleBasedDraftGenerator:
+    """
+    Deterministic, offline draft generator (no network, a few milliseconds).
+
+    Same request -> same draft. Picks a split from days_per_week, a set/rep
+    scheme from goal + level, and exercises from EXERCISE_CATALOG that fit the
+    available equipment and avoid anything the constraints rule out (knees,
+    back, shoulders, impact). Variations rotate week to week; reps progress
+    slightly and every 4th week is a lighter week for non-beginners.
+    """
+
+    def __init__(self, catalog: tuple[CatalogExercise, ...] = EXERCISE_CATALOG) -> None:
+        self.catalog = catalog
+
+    def build(self, req: WorkoutPlanAIDraftRequest, *, club: Club | None = None) -> WorkoutPlanAIDraft:
+        goal_kind = _goal_kind(req.goal)
+        level = _level(req.level)
+        equipment = _available_equipment(req.equipment)
+        avoided = _avoided_tags(req.constraints)
+        candidates = self._candidates(equipment, avoided)
+
+        days = _DAY_LABELS[req.days_per_week]
+        split = _SPLITS[req.days_per_week]
+        per_day = _LEVEL_EXERCISES[level]
+        sets, reps, rest, tempo = _SCHEMES[goal_kind]
+        sets = max(1, sets + _LEVEL_EXTRA_SETS[level])
+
+        items: list[AIDraftItem] = []
+        for week in range(1, req.duration_weeks + 1):
+            deload = level != "beginner" and week % 4 == 0
+            week_sets = max(1, sets - 1) if deload else sets
+            week_reps = reps + min((week - 1) // 2, 4) if not deload else reps
+
+            for slot, (label, (title, patterns)) in enumerate(zip(days, split)):
+                exercises: list[AIDraftExercise] = []
+                used: set[str] = set()
+                for position, pattern in enumerate(patterns[:per_day]):
+                    choice = self._pick(candidates.get(pattern, ()), week + slot + position, used)
+                    if choice is None:
+                        continue
+                    used.add(choice.name)
+                    timed = choice.name.endswith(("Plank", "Carry", "Wall Sit"))
+                    exercises.append(
+                        AIDraftExercise(
+                            name=choice.name,
+                            description=choice.description or ("Timed: repetitions are seconds." if timed else None),
+                            sets=week_sets,
+                            repetitions=min(100, week_reps),
+                            rest_seconds=rest,
+                            tempo=tempo if pattern not in ("conditioning", "carry") else None,
+                            position=len(exercises),
+                        )
+                    )
+                items.append(
+                    AIDraftItem(
+                        week_number=week,
+                        day_label=label,
+                        order_index=slot,
+                        title=f"{title}{' (light)' if deload else ''}",
+                        exercises=exercises,
+                    )
+                )
+
+        sport = f" for {club.sport}" if club is not None and club.sport else ""
+        return WorkoutPlanAIDraft(
+            name=f"{req.goal.strip()[:80]} - {req.duration_weeks} weeks",
+            description=(
+                f"{level.capitalize()} {goal_kind} plan{sport}: {req.days_per_week} days/week, "
+                f"{req.duration_weeks} weeks. Generated from the exercise catalog."
+            ),
+            goal=req.goal,
+            level=req.level,
+            duration_weeks=req.duration_weeks,
+            items=items,
+        )
+
+    def _candidates(self, equipment: set[str], avoided: set[str]) -> dict[str, tuple[CatalogExercise, ...]]:
+        by_pattern: dict[str, list[CatalogExercise]] = {}
+        for ex in self.catalog:
+            if ex.equipment <= equipment and not (ex.tags & avoided):
+                by_pattern.setdefault(ex.pattern, []).append(ex)
+        # fall back to bodyweight moves of a neighbouring pattern when a constraint empties one
+        for pattern, alternative in (("squat", "hinge"), ("lunge", "hinge"), ("pull", "core"),
+                                     ("push", "core"), ("conditioning", "core"), ("carry", "core")):
+            if not by_pattern.get(pattern) and by_pattern.get(alternative):
+                by_pattern[pattern] = by_pattern[alternative]
+        # loaded variations first; rotation below walks through them
+        return {p: tuple(sorted(v, key=lambda e: (-len(e.equipment), e.name))) for p, v in by_pattern.items()}
+
+    @staticmethod
+    def _pick(options: tuple[CatalogExercise, ...], seed: int, used: set[str]) -> CatalogExercise | None:
+        if not options:
+            return None
+        # stay on the primary lift most weeks, rotate accessories
+        for offset in range(len(options)):
+            choice = options[(seed // 2 + offset) % len(options)]
+            if choice.name not in used:
+                return choice
+        return None
@@ -4,6 +4,7 @@ from app.repositories.session import SessionRepository
 from app.services.membership import MembershipService
 from app.schemas.session import SessionCreate, SessionUpdate
 from app.exceptions.base import InvalidTimeRange
+from app.models.models import LinkMode
 
 
 class SessionService:
@@ -62,6 +63,9 @@ class SessionService:
             ends_at=data.ends_at,
             location=data.location,
             note=data.note,
+            is_template=data.is_template,
+            template_id=data.template_id,
+            link_mode=data.link_mode,
         )
 
     def update_session(
@@ -72,12 +76,18 @@ class SessionService:
         session_id: int,
         user_id: int,
         data: SessionUpdate,
+        expected_version: int | None = None,
     ):
         self.membership_service.require_coach_or_owner_of_club(
             club_id=club_id, user_id=user_id
         )
 
         updates = data.model_dump(exclude_unset=True)
+        for key in ("is_template", "link_mode"):
+            if updates.get(key) is None:
+                updates.pop(key, None)
+        if updates.get("link_mode") == LinkMode.linked:
+            updates["template_version_used"] = None  # the next template sweep syncs it
 
         # business rule: validate final time range
         if "starts_at" in updates or "ends_at" in updates:
@@ -96,6 +106,7 @@ class SessionService:
             plan_id=plan_id,
             session_id=session_id,
             updates=updates,
+            expected_version=expected_version,
         )
 
     def delete_session(
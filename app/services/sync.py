@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from app.db.change_log import OP_DELETE, SYNCED_ENTITIES
+from app.models.models import MembershipRole
+from app.repositories.sync import SyncRepository
+from app.schemas.sync import SyncRead
+from app.services.membership import MembershipService
+
+ENTITIES = tuple(SYNCED_ENTITIES.values())
+
+
+class SyncService:
+    """
+    Delta sync of a club for offline clients, driven by the change_log.
+
+    - since=None: full snapshot, plus the cursor to continue from. The cursor
+      is read first, so changes committed while the snapshot loads are
+      replayed on the next call rather than lost. Cursors follow commit
+      order (ChangeLog.seq), so a slow transaction can't commit behind one.
+    - since=N: the next page of change_log rows after N, collapsed to the
+      last operation per entity, with upserts loaded in compact form (one
+      query per entity type). An upserted row that's gone by now is reported
+      as deleted.
+    Members only; plain members just see their own attendances.
+    """
+
+    def __init__(
+        self,
+        repo: SyncRepository,
+        membership_service: MembershipService,
+        *,
+        page_size: int = 500,
+    ) -> None:
+        self.repo = repo
+        self.memberships = membership_service
+        self.page_size = page_size
+
+    def sync(self, *, club_id: int, user_id: int, since: int | None = None, limit: int | None = None) -> SyncRead:
+        membership = self.memberships.require_member_of_club(user_id, club_id)
+        only_user = None if membership.role in (MembershipRole.coach, MembershipRole.owner) else user_id
+
+        if since is None:
+            return self._snapshot(club_id=club_id, only_user=only_user)
+
+        limit = min(limit or self.page_size, self.page_size)
+        rows = list(self.repo.list_changes(club_id=club_id, since=since, limit=limit + 1, user_id=only_user))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        last_op: dict[tuple[str, int], str] = {}
+        for row in rows:
+            last_op[(row.entity, row.entity_id)] = row.op
+
+        upserts: dict[str, list[int]] = {}
+        deleted: dict[str, list[int]] = {}
+        for (entity, entity_id), op in last_op.items():
+            (deleted if op == OP_DELETE else upserts).setdefault(entity, []).append(entity_id)
+
+        changes = {}
+        for entity, ids in upserts.items():
+            loaded = self.repo.load(entity, club_id=club_id, ids=ids, user_id=only_user)
+            if loaded:
+                changes[entity] = loaded
+            gone = set(ids) - {row["id"] for row in loaded}
+            if gone:
+                deleted.setdefault(entity, []).extend(sorted(gone))
+
+        return SyncRead(
+            cursor=rows[-1].cursor if rows else since,
+            has_more=has_more,
+            changes=changes,
+            deleted=deleted,
+        )
+
+    def _snapshot(self, *, club_id: int, only_user: int | None) -> SyncRead:
+        cursor = self.repo.latest_cursor(club_id=club_id)
+        changes = {entity: self.repo.load(entity, club_id=club_id, user_id=only_user) for entity in ENTITIES}
+        return SyncRead(cursor=cursor, full=True, changes=changes)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.unit_of_work import transaction
+from app.repositories.exercise import ExerciseRepository
+from app.repositories.session import SessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateSyncSweeper:
+    """
+    Background sync of linked template copies.
+
+    Editing a template only bumps its version; every `interval_seconds` a
+    single thread brings the linked copies of all changed templates up to
+    date with one UPDATE per table (see app.repositories.template_links),
+    so a template edit stays one row write however many copies it has.
+    Copies are at most one interval behind their template. Running a
+    sweeper in every worker is fine: a copy that is already in sync is not
+    touched again.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] | Callable[[], Session],
+        *,
+        interval_seconds: float = 15.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.sweeps = 0  # completed sweeps, for observability/tests
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="template-sync", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._stop.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+
+    def sweep(self) -> dict[str, int]:
+        """Sync all stale linked copies now; returns the number of updated copies per table."""
+        db = self.session_factory()
+        try:
+            with transaction(db):
+                synced = {
+                    "sessions": SessionRepository(db).refresh_linked(),
+                    "exercises": ExerciseRepository(db).refresh_linked(),
+                }
+        finally:
+            db.close()
+        self.sweeps += 1
+        if any(synced.values()):
+            logger.info("Synced linked template copies: %s", synced)
+        return synced
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.sweep()
+            except Exception:  # keep sweeping; the next run retries the same copies
+                logger.exception("Template sync sweep failed")
+
+
+# ---------- process-wide sweeper ----------
+
+_sweeper: TemplateSyncSweeper | None = None
+_sweeper_lock = threading.Lock()
+
+
+def start_template_sync_sweeper() -> TemplateSyncSweeper | None:
+    """Start the sweeper unless TEMPLATE_SYNC_INTERVAL_SECONDS is 0."""
+    global _sweeper
+    from app.core.config import settings
+    from app.db.deps import SessionLocal
+
+    if settings.TEMPLATE_SYNC_INTERVAL_SECONDS <= 0:
+        return None
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = TemplateSyncSweeper(SessionLocal, interval_seconds=settings.TEMPLATE_SYNC_INTERVAL_SECONDS)
+            _sweeper.start()
+    return _sweeper
+
+
+def shutdown_template_sync_sweeper(wait: bool = True) -> None:
+    global _sweeper
+    with _sweeper_lock:
+        if _sweeper is not None:
+            _sweeper.shutdown(wait=wait)
+            _sweeper = None
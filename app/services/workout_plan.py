@@ -5,7 +5,16 @@ from app.repositories.workout_plan import WorkoutPlanRepository
 from app.services.membership import MembershipService
 from app.models.models import MembershipRole
 
-from app.exceptions.base import CoachOrOwnerRequiredError
+from app.exceptions.base import (
+    CoachOrOwnerRequiredError,
+    ConflictError,
+    GroupNotFoundError,
+    UserNotClubMember,
+    WorkoutPlanNotTemplateError,
+)
+
+# a template's copies are named "<name> (2)", "<name> (3)", ... unless the caller picks a name
+_MAX_COPY_NUMBER = 100
 
 
 class WorkoutPlanService:
@@ -16,6 +25,7 @@ class WorkoutPlanService:
     - Update/Delete plan + Items/Exercises write:
         - coach/owner: allowed for any plan
         - athlete/member: only allowed if plan.created_by_id == user_id
+    - Instantiate a template: any club member; assigning the copy: coach/owner
     """
 
     def __init__(self, repo: WorkoutPlanRepository, membership_service: MembershipService):
@@ -54,9 +64,12 @@ class WorkoutPlanService:
         self._require_read(club_id, user_id)
         return self.repo.list_plans(club_id)
 
-    def create_plan(self, club_id: int, user_id: int, data: dict):
+    def require_can_create_plan(self, club_id: int, user_id: int) -> None:
         # Athletes/members are allowed to create their own plans
         self._require_read(club_id, user_id)
+
+    def create_plan(self, club_id: int, user_id: int, data: dict):
+        self.require_can_create_plan(club_id, user_id)
         return self.repo.create_plan(club_id=club_id, created_by_id=user_id, data=data)
 
     def get_plan(self, club_id: int, plan_id: int, user_id: int, nested: bool = False):
@@ -65,16 +78,63 @@ class WorkoutPlanService:
             return self.repo.get_plan_nested(club_id=club_id, plan_id=plan_id)
         return self.repo.get_plan(club_id=club_id, plan_id=plan_id)
 
-    def update_plan(self, club_id: int, plan_id: int, user_id: int, patch: dict):
+    def update_plan(
+        self, club_id: int, plan_id: int, user_id: int, patch: dict, expected_version: int | None = None
+    ):
         plan = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
         self._require_write_plan(club_id, user_id, plan)
-        return self.repo.update_plan(club_id=club_id, plan_id=plan_id, patch=patch)
+        return self.repo.update_plan(
+            club_id=club_id, plan_id=plan_id, patch=patch, expected_version=expected_version
+        )
 
     def delete_plan(self, club_id: int, plan_id: int, user_id: int) -> None:
         plan = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
         self._require_write_plan(club_id, user_id, plan)
         self.repo.delete_plan(club_id=club_id, plan_id=plan_id)
 
+    def instantiate_template(
+        self,
+        club_id: int,
+        plan_id: int,
+        user_id: int,
+        name: str | None = None,
+        user_ids: list[int] | None = None,
+        group_ids: list[int] | None = None,
+    ):
+        """
+        Copy a template plan with its items and exercises (set-based, see
+        WorkoutPlanRepository.instantiate_template) and assign the copy to
+        the given club members and/or groups.
+        """
+        self._require_read(club_id, user_id)
+        user_ids, group_ids = set(user_ids or ()), set(group_ids or ())
+        if user_ids or group_ids:
+            self.membership_service.require_coach_or_owner_of_club(user_id=user_id, club_id=club_id)
+
+        template = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
+        if not template.is_template:
+            raise WorkoutPlanNotTemplateError()
+
+        plan = self.repo.instantiate_template(
+            club_id=club_id, template_id=plan_id, created_by_id=user_id, name=name or self._copy_name(template)
+        )
+        if user_ids and self.repo.assign_members(club_id, plan.id, user_ids, user_id) != len(user_ids):
+            raise UserNotClubMember()
+        if group_ids and self.repo.assign_groups(club_id, plan.id, group_ids, user_id) != len(group_ids):
+            raise GroupNotFoundError()
+        return plan
+
+    def _copy_name(self, template) -> str:
+        candidates = []
+        for number in range(2, _MAX_COPY_NUMBER + 1):
+            suffix = f" ({number})"
+            candidates.append(template.name[: 120 - len(suffix)] + suffix)
+        taken = self.repo.existing_plan_names(template.club_id, candidates)
+        for candidate in candidates:
+            if candidate not in taken:
+                return candidate
+        raise ConflictError("WorkoutPlan conflict")
+
     # -------------------------
     # Items (read is member, write is plan-owner/coach)
     # -------------------------
@@ -88,10 +148,20 @@ class WorkoutPlanService:
         self._require_write_plan(club_id, user_id, plan)
         return self.repo.create_item(club_id=club_id, plan_id=plan_id, data=data)
 
-    def update_item(self, club_id: int, plan_id: int, item_id: int, user_id: int, patch: dict):
+    def update_item(
+        self,
+        club_id: int,
+        plan_id: int,
+        item_id: int,
+        user_id: int,
+        patch: dict,
+        expected_version: int | None = None,
+    ):
         plan = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
         self._require_write_plan(club_id, user_id, plan)
-        return self.repo.update_item(club_id=club_id, plan_id=plan_id, item_id=item_id,patch=patch)
+        return self.repo.update_item(
+            club_id=club_id, plan_id=plan_id, item_id=item_id, patch=patch, expected_version=expected_version
+        )
 
     def delete_item(self, club_id: int, plan_id: int, item_id: int, user_id: int) -> None:
         plan = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
@@ -119,6 +189,7 @@ class WorkoutPlanService:
         exercise_id: int,
         user_id: int,
         patch: dict,
+        expected_version: int | None = None,
     ):
         plan = self.repo.get_plan(club_id=club_id, plan_id=plan_id)
         self._require_write_plan(club_id, user_id, plan)
@@ -128,6 +199,7 @@ class WorkoutPlanService:
             item_id=item_id,
             exercise_id=exercise_id,
             patch=patch,
+            expected_version=expected_version,
         )
 
     def delete_exercise(self, club_id: int, plan_id: int, item_id: int, exercise_id: int, user_id: int) -> None:
@@ -1,19 +1,110 @@
 from __future__ import annotations
 
-import os
-from typing import Any
+import logging
+from contextlib import nullcontext
+from typing import Any, Iterator
 
-from openai import OpenAI
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.db.unit_of_work import transaction
 
 from app.repositories.ai_usage import AIUsageRepository
+from app.schemas.workout_plan import WorkoutPlanReadNested
 from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest, WorkoutPlanAIDraft
+from app.services.ai_quota import AIQuotaService, QuotaReservation
+from app.services.draft_providers import DraftProvider, get_draft_provider
 from app.services.workout_plan import WorkoutPlanService
-from app.exceptions.base import RateLimitError
+from app.services.workout_plan_ai_cache import (
+    DraftCacheKey,
+    WorkoutPlanDraftCache,
+    get_draft_cache,
+    make_draft_cache_key,
+)
+from app.services.workout_plan_ai_stream import DraftStreamParser
+from app.exceptions.base import ClubNotFoundError, ConflictError, DomainError, RateLimitError
 from app.repositories.club import ClubRepository
 from app.models.models import Club
 
 
+logger = logging.getLogger(__name__)
+
 FEATURE_WORKOUTPLAN_DRAFT = "workout_plan_draft"
+# cache hits are logged under their own feature: they show up in hit-rate queries but never reserve quota
+FEATURE_WORKOUTPLAN_DRAFT_CACHED = "workout_plan_draft_cached"
+# drafts from the rule-based fallback (no model call, no quota)
+FEATURE_WORKOUTPLAN_DRAFT_LOCAL = "workout_plan_draft_local"
+
+_MAX_NAME_ATTEMPTS = 5
+
+
+def persist_draft(
+    workout_plan_service: WorkoutPlanService,
+    *,
+    club_id: int,
+    user_id: int,
+    draft: WorkoutPlanAIDraft,
+    req: WorkoutPlanAIDraftRequest | None = None,
+):
+    """
+    Create plan, items and exercises for a validated draft.
+    Shared by the AI path and the workout plan import job (no AI client needed).
+    """
+    data = {
+        "name": draft.name,
+        "description": draft.description,
+        "goal": draft.goal or (req.goal if req else None),
+        "level": draft.level or (req.level if req else None),
+        "duration_weeks": draft.duration_weeks or (req.duration_weeks if req else None),
+        "is_template": False,
+    }
+    # plan names are unique per club; cached/imported drafts often reuse one -> suffix " (2)", " (3)", ...
+    for attempt in range(1, _MAX_NAME_ATTEMPTS + 1):
+        name = draft.name
+        if attempt > 1:
+            suffix = f" ({attempt})"
+            name = draft.name[: 120 - len(suffix)] + suffix
+        try:
+            plan = workout_plan_service.create_plan(
+                club_id=club_id, user_id=user_id, data={**data, "name": name}
+            )
+            break
+        except ConflictError:
+            if attempt == _MAX_NAME_ATTEMPTS:
+                raise
+
+    for item in draft.items:
+        created_item = workout_plan_service.create_item(
+            club_id=club_id,
+            plan_id=plan.id,
+            user_id=user_id,
+            data={
+                "week_number": item.week_number,
+                "day_label": item.day_label,
+                "order_index": item.order_index,
+                "title": item.title,
+            },
+        )
+
+        for ex in item.exercises:
+            workout_plan_service.create_exercise(
+                club_id=club_id,
+                plan_id=plan.id,
+                item_id=created_item.id,
+                user_id=user_id,
+                data={
+                    "name": ex.name,
+                    "description": ex.description,
+                    "sets": ex.sets,
+                    "repetitions": ex.repetitions,
+                    "rest_seconds": ex.rest_seconds,
+                    "tempo": ex.tempo,
+                    "weight_kg": ex.weight_kg,
+                    "position": ex.position,
+                },
+            )
+
+    return plan
 
 
 class WorkoutPlanAIService:
@@ -22,15 +113,27 @@ class WorkoutPlanAIService:
         workout_plan_service: WorkoutPlanService,
         ai_usage_repo: AIUsageRepository,
         club_repo: ClubRepository,
+        quota_service: AIQuotaService,
         *,
-        daily_limit: int = 3,
+        provider: DraftProvider | None = None,
+        quota_fallback: DraftProvider | None = None,
+        cache: WorkoutPlanDraftCache | None = None,
+        db: Session | None = None,
     ):
         self.workout_plan_service = workout_plan_service
         self.ai_usage_repo = ai_usage_repo
         self.club_repo = club_repo
-        self.daily_limit = daily_limit
+        self.quota = quota_service
 
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # shared process-wide provider (OpenAI behind a circuit breaker, rule-based fallback)
+        self.provider = provider or get_draft_provider()
+        # optional provider used instead of a 429 once the daily quota is used up
+        self.quota_fallback = quota_fallback
+        # shared draft cache; None when disabled via settings
+        self.cache = cache if cache is not None else get_draft_cache()
+        # the request's (or job's) session: drafts are persisted in a SAVEPOINT so a failed save leaves it
+        # usable for the quota refund; streams outlive the request's transaction and commit their plan themselves
+        self.db = db
 
     def generate_and_create_plan(
         self,
@@ -39,128 +142,188 @@ class WorkoutPlanAIService:
         user_id: int,
         req: WorkoutPlanAIDraftRequest,
     ):
-        # 1) Quota check BEFORE paying for an AI call
-        used_today = self.ai_usage_repo.count_today(
-            user_id=user_id,
-            feature=FEATURE_WORKOUTPLAN_DRAFT,
-        )
-        if used_today >= self.daily_limit:
-            raise RateLimitError(
-                detail=f"Daily AI quota reached ({self.daily_limit}/day). Try again tomorrow."
+        club = self._get_club(club_id)
+
+        # 1) Cache lookup: identical/similar requests reuse a stored draft (no model call, no quota)
+        cache_key, cached = self._lookup_cache(req, club=club)
+        if cached is not None:
+            return self._persist_and_record(
+                club_id=club_id, user_id=user_id, req=req, draft=cached,
+                feature=FEATURE_WORKOUTPLAN_DRAFT_CACHED,
             )
 
-        # 2) Generate draft JSON via Structured Outputs
-        club = self.club_repo.get_club(club_id)
+        # 2) Reserve quota BEFORE paying for an AI call (atomic; refunded unless a paid draft is saved)
+        reservation, provider = self._reserve(user_id=user_id, club_id=club_id)
+        keep_reservation = False
+        try:
+            # 3) Generate draft (Structured Outputs, or the rule-based fallback)
+            result = provider.generate(req, club=club)
+            if result.billable and cache_key is not None:
+                self.cache.put(cache_key, result.draft)
 
-        # 3) Draft generieren
-        draft = self._generate_draft(req, club=club)
-    
+            # 4) Persist, record usage, return nested read for UI
+            with self._savepoint():
+                plan = self._persist_and_record(
+                    club_id=club_id, user_id=user_id, req=req, draft=result.draft,
+                    feature=self._feature(result.billable),
+                )
+            keep_reservation = result.billable
+            return plan
+        finally:
+            if reservation is not None and not keep_reservation:
+                self.quota.refund(reservation)
 
-        # 3) Persist using existing service rules (created_by_id = user)
-        plan = self.workout_plan_service.create_plan(
-            club_id=club_id,
-            user_id=user_id,
-            data={
-                "name": draft.name,
-                "description": draft.description,
-                "goal": draft.goal or req.goal,
-                "level": draft.level or req.level,
-                "duration_weeks": draft.duration_weeks or req.duration_weeks,
-                "is_template": False,
-            },
+    def start_draft_stream(
+        self,
+        *,
+        club_id: int,
+        user_id: int,
+        req: WorkoutPlanAIDraftRequest,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Streaming variant of generate_and_create_plan.
+
+        Membership, cache and quota are checked eagerly so they still fail as
+        regular HTTP errors; the returned iterator then yields SSE events:
+          start     {"source": "openai" | "local" | "cache"}
+          delta     raw model output chunk
+          exercise  an exercise object completed and validated
+          item      a plan item (day) completed and validated
+          plan      the persisted nested plan (terminal)
+          error     {"status", "detail"} (terminal)
+        The plan is only persisted once the complete draft validates.
+        """
+        club = self._get_club(club_id)
+        self.workout_plan_service.require_can_create_plan(club_id=club_id, user_id=user_id)
+
+        cache_key, cached = self._lookup_cache(req, club=club)
+        reservation, provider = None, self.provider
+        if cached is None:
+            reservation, provider = self._reserve(user_id=user_id, club_id=club_id)
+
+        return self._draft_events(
+            club=club, user_id=user_id, req=req, cache_key=cache_key, cached=cached,
+            reservation=reservation, provider=provider,
         )
 
-        for item in draft.items:
-            created_item = self.workout_plan_service.create_item(
-                club_id=club_id,
-                plan_id=plan.id,
-                user_id=user_id,
-                data={
-                    "week_number": item.week_number,
-                    "day_label": item.day_label,
-                    "order_index": item.order_index,
-                    "title": item.title,
-                },
-            )
+    def _draft_events(
+        self,
+        *,
+        club: Club,
+        user_id: int,
+        req: WorkoutPlanAIDraftRequest,
+        cache_key: DraftCacheKey | None,
+        cached: WorkoutPlanAIDraft | None,
+        reservation: QuotaReservation | None,
+        provider: DraftProvider,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        keep_reservation = False
+        try:
+            if cached is not None:
+                yield "start", {"source": "cache"}
+                draft = cached
+                for index, item in enumerate(draft.items):
+                    yield "item", {"item_index": index, "item": item.model_dump(mode="json")}
+                feature, billable = FEATURE_WORKOUTPLAN_DRAFT_CACHED, False
+            else:
+                stream = provider.stream(req, club=club)
+                yield "start", {"source": stream.provider}
+                parser = DraftStreamParser()
+                for delta in stream.chunks:
+                    yield "delta", {"text": delta}
+                    yield from parser.feed(delta)
+
+                draft = WorkoutPlanAIDraft.model_validate_json(parser.text)
+                if stream.billable and cache_key is not None:
+                    self.cache.put(cache_key, draft)
+                feature, billable = self._feature(stream.billable), stream.billable
 
-            for ex in item.exercises:
-                self.workout_plan_service.create_exercise(
-                    club_id=club_id,
-                    plan_id=plan.id,
-                    item_id=created_item.id,
-                    user_id=user_id,
-                    data={
-                        "name": ex.name,
-                        "description": ex.description,
-                        "sets": ex.sets,
-                        "repetitions": ex.repetitions,
-                        "rest_seconds": ex.rest_seconds,
-                        "tempo": ex.tempo,
-                        "weight_kg": ex.weight_kg,
-                        "position": ex.position,
-                    },
+            with transaction(self.db) if self.db is not None else nullcontext():
+                plan = self._persist_and_record(
+                    club_id=club.id, user_id=user_id, req=req, draft=draft, feature=feature
                 )
+            keep_reservation = billable
+            yield "plan", WorkoutPlanReadNested.model_validate(plan).model_dump(mode="json")
+        except ValidationError:
+            logger.warning("Streamed AI draft for club %s did not validate", club.id)
+            yield "error", {"status": 502, "detail": "AI returned an invalid workout plan draft"}
+        except DomainError as e:
+            yield "error", {"status": e.status_code, "detail": e.detail}
+        finally:
+            # failed, invalid, abandoned (client disconnected) or unpaid drafts don't consume quota
+            if reservation is not None and not keep_reservation:
+                self.quota.refund(reservation)
+
+    # -------------------------
+    # Helpers
+    # -------------------------
+
+    def _get_club(self, club_id: int) -> Club:
+        club = self.club_repo.get_club(club_id)
+        if club is None:
+            raise ClubNotFoundError()
+        return club
+
+    def _reserve(self, *, user_id: int, club_id: int) -> tuple[QuotaReservation | None, DraftProvider]:
+        try:
+            reservation = self.quota.reserve(
+                user_id=user_id, club_id=club_id, feature=FEATURE_WORKOUTPLAN_DRAFT
+            )
+        except RateLimitError:
+            if self.quota_fallback is None:
+                raise
+            return None, self.quota_fallback
+        return reservation, self.provider
+
+    def _savepoint(self):
+        # the refund commits the session: a failed save must be rolled back first, not committed with it
+        return self.db.begin_nested() if self.db is not None else nullcontext()
 
-        # 4) Record usage AFTER success (so failed calls don't consume quota)
+    @staticmethod
+    def _feature(billable: bool) -> str:
+        return FEATURE_WORKOUTPLAN_DRAFT if billable else FEATURE_WORKOUTPLAN_DRAFT_LOCAL
+
+    def _lookup_cache(
+        self, req: WorkoutPlanAIDraftRequest, *, club: Club
+    ) -> tuple[DraftCacheKey | None, WorkoutPlanAIDraft | None]:
+        if self.cache is None:
+            return None, None
+        cache_key = make_draft_cache_key(req, sport=club.sport)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        draft, match = cached
+        logger.info("AI draft cache %s hit for club %s", match, club.id)
+        return cache_key, draft
+
+    def _persist_and_record(
+        self,
+        *,
+        club_id: int,
+        user_id: int,
+        req: WorkoutPlanAIDraftRequest,
+        draft: WorkoutPlanAIDraft,
+        feature: str,
+    ):
+        # Persist using existing service rules (created_by_id = user)
+        plan = persist_draft(
+            self.workout_plan_service,
+            club_id=club_id,
+            user_id=user_id,
+            draft=draft,
+            req=req,
+        )
+
+        # Record usage AFTER success (so failed calls don't consume quota)
         self.ai_usage_repo.record(
             user_id=user_id,
             club_id=club_id,
-            feature=FEATURE_WORKOUTPLAN_DRAFT,
+            feature=feature,
         )
 
-        # 5) Return nested read for UI
         return self.workout_plan_service.get_plan(
             club_id=club_id,
             plan_id=plan.id,
             user_id=user_id,
             nested=True,
         )
-
-    def _generate_draft(self, req: WorkoutPlanAIDraftRequest, *, club: Club) -> WorkoutPlanAIDraft:
-        schema: dict[str, Any] = WorkoutPlanAIDraft.model_json_schema()
-
-        club_name = club.name or "your club"
-        sports_area = club.sport or "general fitness"
-        
-        prompt = (
-            f"You are an sports expert for the Club {club_name} in the sports area {sports_area} you have expertise in creating workout plans for different goals, levels, and constraints. Based on the user's input, generate a workout plan draft that includes structured weeks and days with exercises.\n"
-            "Return ONLY valid JSON that matches the provided JSON Schema.\n"
-            "Rules:\n"
-            "- Provide structured weeks and days_per_week.\n"
-            "- Use concise exercise names.\n"
-            "- Positions/order_index start at 0 and increase.\n"
-            "- Day labels must be one of: monday..sunday when used.\n"
-            "- Keep it realistic for the given level.\n"
-        )
-
-        user_input = {
-            "goal": req.goal,
-            "level": req.level,
-            "duration_weeks": req.duration_weeks,
-            "days_per_week": req.days_per_week,
-            "equipment": req.equipment,
-            "constraints": req.constraints,
-            "notes": req.notes,
-            "style": req.style,
-        }
-
-        resp = self.client.responses.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-5.2"),
-            input=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": f"Input:\n{user_input}"},
-            ],
-            text={  # type: ignore[arg-type]
-                "format": {
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "WorkoutPlanAIDraft",
-                        "schema": schema,
-                        "strict": True,
-                    },
-                }
-            },
-        )
-
-        json_text = resp.output_text
-        return WorkoutPlanAIDraft.model_validate_json(json_text)
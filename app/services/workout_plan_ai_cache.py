@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraft, WorkoutPlanAIDraftRequest
+from app.utils.cache import TTLCache
+
+
+_STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "the", "to", "with", "my", "i", "want"})
+
+
+def _normalize_text(value: str | None) -> str:
+    if not value:
+        return ""
+    value = re.sub(r"[^a-z0-9\s]", " ", value.lower())
+    return " ".join(value.split())
+
+
+def _normalize_list(values: list[str]) -> tuple[str, ...]:
+    return tuple(sorted({v for v in (_normalize_text(x) for x in values) if v}))
+
+
+def _terms(goal: str, constraints: tuple[str, ...]) -> frozenset[str]:
+    words = goal.split() + [w for c in constraints for w in c.split()]
+    return frozenset(w for w in words if w not in _STOPWORDS)
+
+
+@dataclass(frozen=True)
+class DraftCacheKey:
+    """
+    Normalized identity of a draft request.
+
+    `bucket` holds everything that must match exactly (sport, level, shape of
+    the plan, equipment, notes, style); goal/constraints are compared either
+    exactly or by term overlap.
+    """
+
+    bucket: tuple[Any, ...]
+    goal: str
+    constraints: tuple[str, ...]
+
+    @property
+    def terms(self) -> frozenset[str]:
+        return _terms(self.goal, self.constraints)
+
+
+def make_draft_cache_key(req: WorkoutPlanAIDraftRequest, *, sport: str | None) -> DraftCacheKey:
+    return DraftCacheKey(
+        bucket=(
+            _normalize_text(sport),
+            _normalize_text(req.level),
+            req.duration_weeks,
+            req.days_per_week,
+            _normalize_list(req.equipment),
+            _normalize_text(req.notes),
+            req.style or "simple",
+        ),
+        goal=_normalize_text(req.goal),
+        constraints=_normalize_list(req.constraints),
+    )
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class WorkoutPlanDraftCache:
+    """
+    Cache of validated AI drafts, shared across users (drafts contain no user data).
+
+    - Exact hit: same normalized request + club sport.
+    - Similar hit (optional): same bucket and Jaccard(goal+constraints terms)
+      >= similarity_threshold. None disables similarity matching.
+    - Values are the draft's JSON dump, re-validated on the way out.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        similarity_threshold: float | None = None,
+    ) -> None:
+        self._cache: TTLCache[DraftCacheKey, dict[str, Any]] = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def get(self, key: DraftCacheKey) -> tuple[WorkoutPlanAIDraft, str] | None:
+        """Return (draft, "exact" | "similar") or None."""
+        data = self._cache.get(key)
+        if data is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return WorkoutPlanAIDraft.model_validate(data), "exact"
+
+        if self.similarity_threshold is not None:
+            match = self._find_similar(key)
+            if match is not None:
+                with self._lock:
+                    self.similar_hits += 1
+                return WorkoutPlanAIDraft.model_validate(match), "similar"
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: DraftCacheKey, draft: WorkoutPlanAIDraft) -> None:
+        self._cache.set(key, draft.model_dump(mode="json"))
+
+    def _find_similar(self, key: DraftCacheKey) -> dict[str, Any] | None:
+        wanted = key.terms
+        best_key, best_data, best_score = None, None, 0.0
+        for other, data in self._cache.items():
+            if other.bucket != key.bucket:
+                continue
+            score = _jaccard(wanted, other.terms)
+            if score >= best_score:
+                best_key, best_data, best_score = other, data, score
+        if best_key is None or best_score < self.similarity_threshold:
+            return None
+        self._cache.touch(best_key)
+        return best_data
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            total = hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self.exact_hits = self.similar_hits = self.misses = 0
+
+
+# ---------- process-wide cache ----------
+
+_draft_cache: WorkoutPlanDraftCache | None = None
+_draft_cache_lock = threading.Lock()
+
+
+def get_draft_cache() -> WorkoutPlanDraftCache | None:
+    """Shared cache, or None when AI_DRAFT_CACHE_ENABLED is off."""
+    global _draft_cache
+    from app.core.config import settings
+
+    if not settings.AI_DRAFT_CACHE_ENABLED:
+        return None
+    if _draft_cache is None:
+        with _draft_cache_lock:
+            if _draft_cache is None:
+                _draft_cache = WorkoutPlanDraftCache(
+                    ttl_seconds=settings.AI_DRAFT_CACHE_TTL_SECONDS,
+                    max_entries=settings.AI_DRAFT_CACHE_MAX_ENTRIES,
+                    similarity_threshold=settings.AI_DRAFT_CACHE_SIMILARITY_THRESHOLD,
+                )
+    return _draft_cache
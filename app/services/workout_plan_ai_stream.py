@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from pydantic import ValidationError
+
+from app.schemas.workout_plan_ai import AIDraftExercise, AIDraftItem
+
+
+@dataclass
+class _Frame:
+    kind: str  # "obj" | "arr"
+    start: int
+    path: tuple[Any, ...]
+    key: str | None = None
+    expect_key: bool = True
+    index: int = 0
+
+    def child_path(self) -> tuple[Any, ...]:
+        return self.path + ((self.key,) if self.kind == "obj" else (self.index,))
+
+
+@dataclass
+class DraftStreamParser:
+    """
+    Incremental scanner over the streamed WorkoutPlanAIDraft JSON.
+
+    feed() accepts raw text chunks and returns events for every object that
+    completed inside the chunk:
+      ("exercise", {"item_index", "exercise_index", "exercise"})  items[i].exercises[j]
+      ("item",     {"item_index", "item"})                        items[i]
+    Objects are validated with the draft schemas; invalid ones are skipped
+    here and surface when the full document is validated at the end.
+    """
+
+    text: str = ""
+    _pos: int = 0
+    _stack: list[_Frame] = field(default_factory=list)
+    _in_string: bool = False
+    _escape: bool = False
+    _string_start: int = 0
+
+    def feed(self, chunk: str) -> list[tuple[str, dict[str, Any]]]:
+        self.text += chunk
+        events: list[tuple[str, dict[str, Any]]] = []
+
+        text = self.text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    top = self._stack[-1] if self._stack else None
+                    if top is not None and top.kind == "obj" and top.expect_key:
+                        top.key = json.loads(text[self._string_start:i + 1])
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                path = self._stack[-1].child_path() if self._stack else ()
+                self._stack.append(_Frame(kind="obj" if c == "{" else "arr", start=i, path=path))
+            elif c == ":" and self._stack:
+                self._stack[-1].expect_key = False
+            elif c == "," and self._stack:
+                top = self._stack[-1]
+                if top.kind == "obj":
+                    top.expect_key = True
+                else:
+                    top.index += 1
+            elif c in "}]" and self._stack:
+                frame = self._stack.pop()
+                if frame.kind == "obj":
+                    event = self._completed(frame.path, text[frame.start:i + 1])
+                    if event is not None:
+                        events.append(event)
+
+        self._pos = len(text)
+        return events
+
+    @staticmethod
+    def _completed(path: tuple[Any, ...], raw: str) -> tuple[str, dict[str, Any]] | None:
+        try:
+            if len(path) == 2 and path[0] == "items":
+                item = AIDraftItem.model_validate_json(raw)
+                return "item", {"item_index": path[1], "item": item.model_dump(mode="json")}
+            if len(path) == 4 and path[0] == "items" and path[2] == "exercises":
+                exercise = AIDraftExercise.model_validate_json(raw)
+                return "exercise", {
+                    "item_index": path[1],
+                    "exercise_index": path[3],
+                    "exercise": exercise.model_dump(mode="json"),
+                }
+        except ValidationError:
+            return None
+        return None
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    """One Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def encode_sse(events: Iterable[tuple[str, dict[str, Any]]]) -> Iterable[str]:
+    for event, data in events:
+        yield format_sse(event, data)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.exceptions.base import ClubNotFoundError, DomainError, GroupMembershipNotFoundError, RateLimitError
+from app.models.models import Club, GroupMembership
+from app.repositories.ai_usage import AIUsageRepository
+from app.repositories.club import ClubRepository
+from app.repositories.group_membership import GroupMembershipRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from app.schemas.workout_plan_ai import (
+    WorkoutPlanAIDraft,
+    WorkoutPlanAIDraftRequest,
+    WorkoutPlanGroupAIDraftRequest,
+)
+from app.services.ai_quota import AIQuotaService, ClubQuotaReservation
+from app.services.draft_providers import DraftProvider, get_draft_provider
+from app.services.membership import MembershipService
+from app.services.workout_plan_ai import (
+    FEATURE_WORKOUTPLAN_DRAFT,
+    FEATURE_WORKOUTPLAN_DRAFT_CACHED,
+    FEATURE_WORKOUTPLAN_DRAFT_LOCAL,
+)
+from app.services.workout_plan_ai_cache import (
+    DraftCacheKey,
+    WorkoutPlanDraftCache,
+    get_draft_cache,
+    make_draft_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+_MAX_NAME_LENGTH = 120
+_COACH_ROLE = "coach"
+
+
+@dataclass
+class DraftProfile:
+    """One distinct athlete profile of a group job and the athletes sharing it."""
+
+    key: DraftCacheKey
+    req: WorkoutPlanAIDraftRequest
+    user_ids: list[int] = field(default_factory=list)
+    draft: WorkoutPlanAIDraft | None = None
+    source: str | None = None  # provider name, or "cache"
+    billable: bool = False
+    error: str | None = None
+
+
+def build_profiles(
+    group_req: WorkoutPlanGroupAIDraftRequest,
+    user_ids: list[int],
+    *,
+    sport: str | None,
+) -> list[DraftProfile]:
+    """
+    Merge per-athlete overrides into the group request and dedupe: athletes whose
+    effective requests normalize to the same draft cache key share one profile.
+    """
+    overrides = {a.user_id: a for a in group_req.athletes}
+    profiles: dict[DraftCacheKey, DraftProfile] = {}
+    for user_id in user_ids:
+        req = group_req.request
+        override = overrides.get(user_id)
+        if override is not None:
+            req = req.model_copy(update=override.model_dump(exclude_none=True, exclude={"user_id"}))
+        key = make_draft_cache_key(req, sport=sport)
+        profile = profiles.get(key)
+        if profile is None:
+            profile = profiles[key] = DraftProfile(key=key, req=req)
+        profile.user_ids.append(user_id)
+    return list(profiles.values())
+
+
+class WorkoutPlanGroupAIService:
+    """
+    Individual AI drafts for every athlete of a group, run as a background job.
+
+    - Identical athlete profiles are generated once and shared.
+    - Distinct profiles fan out to the draft provider with bounded concurrency.
+    - Quota is charged to the club (one unit per billable draft), not to the
+      coach's personal daily limit; unused units are refunded at the end.
+    - All plans, items, exercises and athlete PlanAssignee rows are written
+      with bulk inserts in a single transaction.
+    Coaches/owners only.
+    """
+
+    def __init__(
+        self,
+        workout_plan_repo: WorkoutPlanRepository,
+        group_membership_repo: GroupMembershipRepository,
+        membership_service: MembershipService,
+        club_repo: ClubRepository,
+        ai_usage_repo: AIUsageRepository,
+        quota_service: AIQuotaService,
+        *,
+        provider: DraftProvider | None = None,
+        quota_fallback: DraftProvider | None = None,
+        cache: WorkoutPlanDraftCache | None = None,
+        concurrency: int = 4,
+        db: Session | None = None,
+    ) -> None:
+        self.plans = workout_plan_repo
+        self.group_members = group_membership_repo
+        self.memberships = membership_service
+        self.club_repo = club_repo
+        self.ai_usage_repo = ai_usage_repo
+        self.quota = quota_service
+
+        self.provider = provider or get_draft_provider()
+        self.quota_fallback = quota_fallback
+        self.cache = cache if cache is not None else get_draft_cache()
+        self.concurrency = max(1, concurrency)
+        # the request's/job's session: plans are written in a SAVEPOINT so a failed save leaves it usable for the refund
+        self.db = db
+
+    def require_can_generate(
+        self,
+        *,
+        club_id: int,
+        group_id: int,
+        user_id: int,
+        req: WorkoutPlanGroupAIDraftRequest | None = None,
+    ) -> list[GroupMembership]:
+        """Coach/owner check plus payload validation; returns the group's athletes."""
+        self.memberships.require_coach_or_owner_of_club(user_id, club_id)
+        athletes = [
+            m for m in self.group_members.list_for_group(club_id=club_id, group_id=group_id)
+            if (m.role or "").lower() != _COACH_ROLE
+        ]
+        if req is not None:
+            athlete_ids = {m.user_id for m in athletes}
+            for override in req.athletes:
+                if override.user_id not in athlete_ids:
+                    raise GroupMembershipNotFoundError(
+                        detail=f"User {override.user_id} is not an athlete in this group"
+                    )
+        return athletes
+
+    def generate_for_group(
+        self,
+        *,
+        club_id: int,
+        group_id: int,
+        user_id: int,
+        req: WorkoutPlanGroupAIDraftRequest,
+        progress: Callable[[int], None] | None = None,
+    ) -> dict[str, Any]:
+        report = progress or (lambda _: None)
+
+        athletes = self.require_can_generate(club_id=club_id, group_id=group_id, user_id=user_id, req=req)
+        club = self._get_club(club_id)
+        profiles = build_profiles(req, [m.user_id for m in athletes], sport=club.sport)
+        report(5)
+
+        pending = [p for p in profiles if not self._from_cache(p)]
+        reservation, provider = self._reserve(club_id=club_id, units=len(pending))
+        kept = 0
+        try:
+            self._generate(pending, provider=provider, club=club, report=report)
+            for p in pending:
+                if p.billable and self.cache is not None:
+                    self.cache.put(p.key, p.draft)
+
+            names = {m.user_id: m.user.name for m in athletes}
+            # the refund commits the session: a failed save must be rolled back first, not committed with it
+            with self.db.begin_nested() if self.db is not None else nullcontext():
+                plan_ids = self._persist(club_id=club_id, user_id=user_id, profiles=profiles, names=names)
+            kept = sum(1 for p in pending if p.billable)
+        finally:
+            # failed, unpaid (local fallback) or unsaved drafts don't consume club quota
+            if reservation is not None and reservation.units > kept:
+                self.quota.refund_club(reservation, reservation.units - kept)
+
+        for p in profiles:
+            if p.draft is not None:
+                self.ai_usage_repo.record(user_id=user_id, club_id=club_id, feature=self._feature(p))
+        report(100)
+
+        return {
+            "group_id": group_id,
+            "profiles": len(profiles),
+            "plans": [{"user_id": uid, "plan_id": pid} for uid, pid in plan_ids],
+            "sources": dict(Counter(p.source for p in profiles if p.source is not None)),
+            "failed": [{"user_ids": p.user_ids, "detail": p.error} for p in profiles if p.error],
+        }
+
+    # -------------------------
+    # Helpers
+    # -------------------------
+
+    def _get_club(self, club_id: int) -> Club:
+        club = self.club_repo.get_club(club_id)
+        if club is None:
+            raise ClubNotFoundError()
+        return club
+
+    def _from_cache(self, profile: DraftProfile) -> bool:
+        if self.cache is None:
+            return False
+        cached = self.cache.get(profile.key)
+        if cached is None:
+            return False
+        profile.draft, profile.source = cached[0], "cache"
+        return True
+
+    def _reserve(self, *, club_id: int, units: int) -> tuple[ClubQuotaReservation | None, DraftProvider]:
+        if units == 0:
+            return None, self.provider
+        try:
+            reservation = self.quota.reserve_club(
+                club_id=club_id, feature=FEATURE_WORKOUTPLAN_DRAFT, units=units
+            )
+        except RateLimitError:
+            if self.quota_fallback is None:
+                raise
+            return None, self.quota_fallback
+        return reservation, self.provider
+
+    def _generate(
+        self,
+        pending: list[DraftProfile],
+        *,
+        provider: DraftProvider,
+        club: Club,
+        report: Callable[[int], None],
+    ) -> None:
+        """Fan out to the provider; progress 10..90 as profiles complete."""
+        if not pending:
+            return
+        workers = min(self.concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="group-draft") as pool:
+            futures = {pool.submit(provider.generate, p.req, club=club): p for p in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                profile = futures[future]
+                try:
+                    result = future.result()
+                except ValidationError:
+                    logger.warning("AI draft for club %s did not validate", club.id)
+                    profile.error = "AI returned an invalid workout plan draft"
+                except DomainError as e:
+                    profile.error = e.detail
+                else:
+                    profile.draft = result.draft
+                    profile.source = result.provider
+                    profile.billable = result.billable
+                report(10 + 80 * done // len(pending))
+
+    def _persist(
+        self,
+        *,
+        club_id: int,
+        user_id: int,
+        profiles: list[DraftProfile],
+        names: dict[int, str],
+    ) -> list[tuple[int, int]]:
+        """One plan per athlete (named "<draft> - <athlete>"); returns (athlete id, plan id) pairs."""
+        entries = [(p, uid) for p in profiles if p.draft is not None for uid in p.user_ids]
+        wanted = [_plan_name(p.draft.name, names.get(uid) or f"#{uid}") for p, uid in entries]
+        taken = self.plans.existing_plan_names(club_id, wanted)
+
+        rows = []
+        for (profile, athlete_id), name in zip(entries, wanted):
+            name = _unique_name(name, taken)
+            taken.add(name)
+            rows.append(_plan_row(profile.draft, profile.req, name=name, assignees=[athlete_id]))
+
+        plan_ids = self.plans.bulk_create_plans(club_id=club_id, created_by_id=user_id, plans=rows)
+        return [(athlete_id, plan_id) for (_, athlete_id), plan_id in zip(entries, plan_ids)]
+
+    @staticmethod
+    def _feature(profile: DraftProfile) -> str:
+        if profile.source == "cache":
+            return FEATURE_WORKOUTPLAN_DRAFT_CACHED
+        return FEATURE_WORKOUTPLAN_DRAFT if profile.billable else FEATURE_WORKOUTPLAN_DRAFT_LOCAL
+
+
+def _plan_name(draft_name: str, athlete_name: str) -> str:
+    suffix = f" - {athlete_name}"[: _MAX_NAME_LENGTH // 2]
+    return draft_name[: _MAX_NAME_LENGTH - len(suffix)] + suffix
+
+
+def _unique_name(name: str, taken: set[str]) -> str:
+    attempt = 1
+    candidate = name
+    while candidate in taken:
+        attempt += 1
+        suffix = f" ({attempt})"
+        candidate = name[: _MAX_NAME_LENGTH - len(suffix)] + suffix
+    return candidate
+
+
+def _plan_row(
+    draft: WorkoutPlanAIDraft,
+    req: WorkoutPlanAIDraftRequest,
+    *,
+    name: str,
+    assignees: list[int],
+) -> dict[str, Any]:
+    return {
+        "name": name,
+        "description": draft.description,
+        "goal": draft.goal or req.goal,
+        "level": draft.level or req.level,
+        "duration_weeks": draft.duration_weeks or req.duration_weeks,
+        "is_template": False,
+        "items": [
+            {
+                "week_number": item.week_number,
+                "day_label": item.day_label,
+                "order_index": item.order_index,
+                "title": item.title,
+                "exercises": [ex.model_dump() for ex in item.exercises],
+            }
+            for item in draft.items
+        ],
+        "assignees": assignees,
+    }
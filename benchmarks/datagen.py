@@ -0,0 +1,509 @@
+"""
+Synthetic data for load tests and benchmarks: users, clubs, memberships,
+groups, plans, sessions, attendances and nested workout plans.
+
+    python -m benchmarks.datagen --url sqlite+pysqlite:///bench.db --scale medium
+    python -m benchmarks.datagen --url postgresql+psycopg2://... --scale large --reset
+    python -m benchmarks.datagen --url ... --scale small --users 20000 --weeks 26
+
+Rows go in with Core INSERTs in batches (no ORM objects, no change_log
+rows) and explicit ids after the current maximum, so a run can also add to
+an existing database. Every user has the email user<id>@bench.local and
+the password PASSWORD, so load tests can log in as anyone.
+
+Distributions (the same seed gives the same data):
+- club sizes follow a Zipf law: a few clubs with thousands of members and a
+  long tail of small ones; most users are in one club, some in two or three
+- the first member owns the club, about 1 in 15 members is a coach
+- athletes train in groups of about group_size with two or three sessions
+  a week over `weeks` weeks, half of them in the past
+- past sessions have attendance: each athlete has their own show-up rate
+  (beta distributed around attendance_rate), with late/excused/absent rows
+- workout plans (a quarter of them templates) have 4-12 weeks of three
+  training days with 4-6 exercises each; the others are assigned to a group
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.security import hash_password
+from app.db.base import Base
+from app.models.models import (
+    Attendance,
+    AttendanceStatus,
+    Club,
+    DayLabel,
+    Exercise,
+    Group,
+    GroupMembership,
+    Membership,
+    MembershipRole,
+    Plan,
+    PlanAssignee,
+    PlanAssigneeRole,
+    PlanType,
+    Session,
+    User,
+    UserRole,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutPlanItem,
+)
+
+PASSWORD = "bench-password"
+EMAIL = "user{id}@bench.local"
+
+# parents before children: a batch is inserted in this order
+TABLES: tuple[sa.Table, ...] = tuple(
+    model.__table__
+    for model in (
+        User, Club, Membership, Group, GroupMembership, Plan, Exercise, Session, Attendance,
+        WorkoutPlan, WorkoutPlanItem, WorkoutPlanExercise, PlanAssignee,
+    )
+)
+
+FIRST_NAMES = ("Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Lea",
+               "Leon", "Lina", "Luca", "Marie", "Mia", "Noah", "Paul", "Sofia", "Tim", "Zoe")
+LAST_NAMES = ("Becker", "Fischer", "Hoffmann", "Klein", "Koch", "Meyer", "Müller", "Neumann", "Richter",
+              "Schmidt", "Schneider", "Schulz", "Wagner", "Weber", "Wolf", "Zimmermann")
+CITIES = (("Berlin", "DE"), ("Hamburg", "DE"), ("München", "DE"), ("Köln", "DE"), ("Wien", "AT"),
+          ("Zürich", "CH"), ("Amsterdam", "NL"), ("Kopenhagen", "DK"), ("Lyon", "FR"), ("Mailand", "IT"))
+SPORTS = ("athletics", "football", "handball", "rowing", "swimming", "triathlon", "volleyball", "weightlifting")
+LEVELS = ("Beginners", "Juniors", "Seniors", "Masters", "Performance", "Youth")
+EXERCISES = ("Back Squat", "Bench Press", "Deadlift", "Pull-up", "Push-up", "Plank", "Lunge", "Row",
+             "Burpee", "Box Jump", "Sprint 100m", "Tempo Run", "Interval 400m", "Mobility Flow")
+GOALS = ("strength", "endurance", "speed", "hypertrophy", "technique", "return to play")
+TRAINING_DAYS = ((DayLabel.monday, DayLabel.wednesday, DayLabel.friday),
+                 (DayLabel.tuesday, DayLabel.thursday, DayLabel.saturday))
+WEEKDAYS = tuple(DayLabel)
+
+COACH_SHARE = 1 / 15
+SESSION_MINUTES = 90
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    clubs: int
+    weeks: int = 12  # weeks of sessions, half in the past
+    group_size: int = 20
+    attendance_rate: float = 0.75
+    club_skew: float = 1.1  # Zipf exponent of club sizes
+
+
+SCALES: dict[str, Scale] = {
+    "tiny": Scale(users=300, clubs=5, weeks=4),
+    "small": Scale(users=5_000, clubs=50),
+    "medium": Scale(users=50_000, clubs=300),
+    "large": Scale(users=500_000, clubs=2_000),
+}
+
+
+class _Loader:
+    """Buffers rows per table and inserts them in batches, parents before children."""
+
+    def __init__(self, conn: Connection, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers: dict[sa.Table, list[dict[str, Any]]] = {table: [] for table in TABLES}
+        self.counts: Counter[str] = Counter()
+        self._ids = {
+            table: itertools.count((conn.execute(sa.select(sa.func.max(table.c.id))).scalar() or 0) + 1)
+            for table in TABLES
+            if "id" in table.c
+        }
+
+    def next_id(self, table: sa.Table) -> int:
+        return next(self._ids[table])
+
+    def add(self, table: sa.Table, row: dict[str, Any]) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table, rows in self.buffers.items():
+            if rows:
+                self.conn.execute(table.insert(), rows)
+                self.counts[table.name] += len(rows)
+                rows.clear()
+
+
+@dataclass
+class Dataset:
+    counts: dict[str, int]
+    seconds: float
+    password: str = PASSWORD
+
+    @property
+    def rows(self) -> int:
+        return sum(self.counts.values())
+
+
+def generate(engine: Engine, scale: Scale, *, seed: int = 1, batch_size: int = 5_000) -> Dataset:
+    """Insert a dataset of the given scale (tables must exist) and return the row counts."""
+    if scale.users < scale.clubs:
+        raise ValueError("need at least one user per club (its owner)")
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")  # throwaway data; the commit still happens
+        loader = _Loader(conn, batch_size)
+        _Generator(loader, scale, random.Random(seed)).run()
+        loader.flush()
+        if conn.dialect.name == "postgresql":
+            _sync_sequences(conn)
+    return Dataset(counts=dict(loader.counts), seconds=time.perf_counter() - started)
+
+
+def _sync_sequences(conn: Connection) -> None:
+    # explicit ids don't advance the serial sequences; later ORM inserts would collide
+    for table in TABLES:
+        if "id" in table.c:
+            conn.execute(
+                sa.text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"coalesce((SELECT max(id) FROM {table.name}), 0) + 1, false)")
+            )
+
+
+class _Generator:
+    def __init__(self, loader: _Loader, scale: Scale, rng: random.Random) -> None:
+        self.loader = loader
+        self.scale = scale
+        self.rng = rng
+        self.today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.password_hash = hash_password(PASSWORD)  # bcrypt is slow; one hash for everyone
+        self.clubs: list[int] = []
+        self.athletes: list[list[int]] = []  # per club index
+        self.staff: list[list[int]] = []  # owner first, then coaches
+
+    def run(self) -> None:
+        self.add_clubs()
+        self.add_users()
+        for index, club_id in enumerate(self.clubs):
+            groups = self.add_groups(index, club_id)
+            plans = self.add_plans(index, club_id)
+            self.add_sessions(index, club_id, groups, plans)
+            self.add_workout_plans(index, club_id, groups)
+
+    # ---------- helpers ----------
+
+    def past(self, max_days: int, min_days: int = 0) -> datetime:
+        return self.today - timedelta(days=self.rng.randint(min_days, max_days), minutes=self.rng.randint(0, 1439))
+
+    def stamps(self, created: datetime) -> dict[str, datetime]:
+        return {"created_at": created, "updated_at": created}
+
+    def coach(self, index: int) -> int:
+        return self.rng.choice(self.staff[index])
+
+    # ---------- clubs, users, memberships ----------
+
+    def add_clubs(self) -> None:
+        loader, rng = self.loader, self.rng
+        table = Club.__table__
+        for _ in range(self.scale.clubs):
+            club_id = loader.next_id(table)
+            city, country = rng.choice(CITIES)
+            sport = rng.choice(SPORTS)
+            loader.add(table, {
+                "id": club_id,
+                "name": f"{city} {sport.title()} Club {club_id}",
+                "description": None,
+                "country": country,
+                "city": city,
+                "sport": sport,
+                "founded_year": rng.randint(1890, 2024),
+                "slug": f"club-{club_id}",
+                **self.stamps(self.past(3650, 400)),
+            })
+            self.clubs.append(club_id)
+            self.athletes.append([])
+            self.staff.append([])
+
+    def add_users(self) -> None:
+        loader, rng = self.loader, self.rng
+        users, memberships = User.__table__, Membership.__table__
+        n_clubs = len(self.clubs)
+        cum_weights = list(itertools.accumulate(1 / rank ** self.scale.club_skew for rank in range(1, n_clubs + 1)))
+        total = cum_weights[-1]
+
+        for n in range(self.scale.users):
+            user_id = loader.next_id(users)
+            clubs = {n} if n < n_clubs else set()  # every club gets an owner
+            for _ in range(1 + (rng.random() < 0.15) + (rng.random() < 0.03)):
+                clubs.add(bisect.bisect_left(cum_weights, rng.random() * total))
+            joined = self.past(1000, 1)
+            roles = {}
+            for index in clubs:
+                if not self.staff[index]:
+                    roles[index] = MembershipRole.owner
+                elif rng.random() < COACH_SHARE:
+                    roles[index] = MembershipRole.coach
+                else:
+                    roles[index] = MembershipRole.member
+                (self.athletes if roles[index] == MembershipRole.member else self.staff)[index].append(user_id)
+
+            staff = any(role != MembershipRole.member for role in roles.values())
+            loader.add(users, {
+                "id": user_id,
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": EMAIL.format(id=user_id),
+                "password_hash": self.password_hash,
+                "role": UserRole.trainer if staff else UserRole.athlete,
+                "is_active": rng.random() > 0.02,
+                **self.stamps(joined),
+            })
+            for index, role in roles.items():
+                loader.add(memberships, {
+                    "id": loader.next_id(memberships),
+                    "club_id": self.clubs[index],
+                    "user_id": user_id,
+                    "role": role,
+                    **self.stamps(joined),
+                })
+
+    # ---------- groups ----------
+
+    def add_groups(self, index: int, club_id: int) -> list[tuple[int, list[int]]]:
+        """(group id, athlete ids) per group of the club."""
+        loader, rng = self.loader, self.rng
+        groups, group_memberships = Group.__table__, GroupMembership.__table__
+        athletes = list(self.athletes[index])
+        rng.shuffle(athletes)
+        size = self.scale.group_size
+        result = []
+        for n, start in enumerate(range(0, max(len(athletes), 1), size), start=1):
+            group_id = loader.next_id(groups)
+            coach = self.coach(index)
+            loader.add(groups, {
+                "id": group_id,
+                "club_id": club_id,
+                "name": f"{rng.choice(LEVELS)} {n}",
+                "description": None,
+                "created_by_id": coach,
+            })
+            members = athletes[start:start + size]
+            loader.add(group_memberships, {"group_id": group_id, "user_id": coach, "role": "coach"})
+            for user_id in members:
+                loader.add(group_memberships, {"group_id": group_id, "user_id": user_id, "role": "member"})
+            result.append((group_id, members))
+        return result
+
+    # ---------- plans, sessions, attendance ----------
+
+    def add_plans(self, index: int, club_id: int) -> list[int]:
+        loader, rng = self.loader, self.rng
+        plans, exercises = Plan.__table__, Exercise.__table__
+        result = []
+        for _ in range(1 + len(self.staff[index]) // 3):
+            plan_id = loader.next_id(plans)
+            created = self.past(700, 60)
+            loader.add(plans, {
+                "id": plan_id,
+                "name": f"Plan {plan_id}",  # plan names are unique across clubs
+                "plan_type": PlanType.club,
+                "club_id": club_id,
+                "description": None,
+                "created_by_id": self.coach(index),
+                **self.stamps(created),
+            })
+            for position in range(rng.randint(3, 8)):
+                loader.add(exercises, {
+                    "id": loader.next_id(exercises),
+                    "plan_id": plan_id,
+                    "name": rng.choice(EXERCISES),
+                    "sets": rng.randint(2, 5),
+                    "repetitions": rng.choice((5, 8, 10, 12, 15)),
+                    "position": position,
+                    "day_label": rng.choice(WEEKDAYS),
+                    **self.stamps(created),
+                })
+            result.append(plan_id)
+        return result
+
+    def add_sessions(self, index: int, club_id: int, groups: list[tuple[int, list[int]]], plans: list[int]) -> None:
+        loader, rng, scale = self.loader, self.rng, self.scale
+        sessions, attendances = Session.__table__, Attendance.__table__
+        first_monday = self.today - timedelta(days=self.today.weekday(), weeks=scale.weeks // 2)
+        for n, (_group_id, members) in enumerate(groups):
+            coach = self.coach(index)
+            plan_id = plans[n % len(plans)]
+            weekdays = sorted(rng.sample(range(6), rng.choice((2, 2, 3))))
+            hour = rng.choice((7, 17, 18, 19))
+            rates = {user_id: rng.betavariate(6 * scale.attendance_rate, 6 * (1 - scale.attendance_rate))
+                     for user_id in members}
+            for week in range(scale.weeks):
+                for weekday in weekdays:
+                    starts_at = first_monday + timedelta(weeks=week, days=weekday, hours=hour)
+                    session_id = loader.next_id(sessions)
+                    loader.add(sessions, {
+                        "id": session_id,
+                        "plan_id": plan_id,
+                        "name": f"{WEEKDAYS[weekday].value.title()} training",
+                        "description": None,
+                        "starts_at": starts_at,
+                        "ends_at": starts_at + timedelta(minutes=SESSION_MINUTES),
+                        "location": f"Hall {rng.randint(1, 4)}",
+                        "created_by": coach,
+                        "club_id": club_id,
+                        **self.stamps(starts_at - timedelta(days=rng.randint(7, 30))),
+                    })
+                    if starts_at < self.today:
+                        self.add_attendance(session_id, starts_at, coach, rates, attendances)
+
+    def add_attendance(self, session_id: int, starts_at: datetime, coach: int,
+                       rates: dict[int, float], table: sa.Table) -> None:
+        loader, rng = self.loader, self.rng
+        for user_id, rate in rates.items():
+            r = rng.random()
+            if r < rate:
+                status = AttendanceStatus.late if rng.random() < 0.08 else AttendanceStatus.present
+                checked_in_at = starts_at + timedelta(minutes=rng.randint(-15, 20 if status is AttendanceStatus.late else 0))
+            elif r < rate + (1 - rate) / 2:
+                status = AttendanceStatus.excused if rng.random() < 0.6 else AttendanceStatus.absent
+                checked_in_at = None
+            else:
+                continue  # nobody recorded anything
+            loader.add(table, {
+                "id": loader.next_id(table),
+                "session_id": session_id,
+                "user_id": user_id,
+                "status": status,
+                "checked_in_at": checked_in_at,
+                "recorded_by_id": coach if checked_in_at is None or rng.random() < 0.5 else None,
+                **self.stamps(checked_in_at or starts_at),
+            })
+
+    # ---------- workout plans ----------
+
+    def add_workout_plans(self, index: int, club_id: int, groups: list[tuple[int, list[int]]]) -> None:
+        loader, rng = self.loader, self.rng
+        plans, items = WorkoutPlan.__table__, WorkoutPlanItem.__table__
+        exercises, assignments = WorkoutPlanExercise.__table__, PlanAssignee.__table__
+        n_plans = min(30, 1 + len(self.athletes[index]) // 40)
+        for n in range(1, n_plans + 1):
+            plan_id = loader.next_id(plans)
+            coach = self.coach(index)
+            weeks = rng.randint(4, 12)
+            is_template = rng.random() < 0.25
+            created = self.past(365, 1)
+            goal = rng.choice(GOALS)
+            loader.add(plans, {
+                "id": plan_id,
+                "club_id": club_id,
+                "created_by_id": coach,
+                "name": f"{goal.title()} block {n}",
+                "description": None,
+                "goal": goal,
+                "level": rng.choice(LEVELS).lower(),
+                "duration_weeks": weeks,
+                "is_template": is_template,
+                **self.stamps(created),
+            })
+            days = rng.choice(TRAINING_DAYS)
+            for week in range(1, weeks + 1):
+                for day in days:
+                    item_id = loader.next_id(items)
+                    loader.add(items, {
+                        "id": item_id,
+                        "plan_id": plan_id,
+                        "week_number": week,
+                        "day_label": day,
+                        "order_index": 0,
+                        "title": f"Week {week} {day.value.title()}",
+                        **self.stamps(created),
+                    })
+                    for position in range(rng.randint(4, 6)):
+                        loader.add(exercises, {
+                            "id": loader.next_id(exercises),
+                            "item_id": item_id,
+                            "name": rng.choice(EXERCISES),
+                            "description": None,
+                            "sets": rng.randint(2, 5),
+                            "repetitions": rng.choice((3, 5, 8, 10, 12)),
+                            "rest_seconds": rng.choice((60, 90, 120, 180)),
+                            "tempo": None,
+                            "weight_kg": rng.choice((None, 20, 40, 60, 80)),
+                            "position": position,
+                            **self.stamps(created),
+                        })
+            if not is_template:
+                group_id, _members = rng.choice(groups)
+                loader.add(assignments, {
+                    "id": loader.next_id(assignments),
+                    "workout_plan_id": plan_id,
+                    "group_id": group_id,
+                    "role": PlanAssigneeRole.athlete,
+                    "assigned_by_id": coach,
+                })
+
+
+def reset_schema(engine: Engine) -> None:
+    """Drop and recreate all tables (throwaway databases only)."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def resolve_scale(name: str, **overrides: Any) -> Scale:
+    """A preset with the given fields replaced (None = keep the preset's value)."""
+    known = {f.name for f in fields(Scale)}
+    return replace(SCALES[name], **{k: v for k, v in overrides.items() if k in known and v is not None})
+
+
+def _print(dataset: Dataset) -> None:
+    width = max(map(len, dataset.counts))
+    for table in TABLES:
+        if table.name in dataset.counts:
+            print(f"{table.name:<{width}} {dataset.counts[table.name]:>12,}")
+    print(f"{'total':<{width}} {dataset.rows:>12,}  in {dataset.seconds:.1f}s "
+          f"({dataset.rows / max(dataset.seconds, 1e-9):,.0f} rows/s)")
+    print(f"\nlog in as {EMAIL.format(id='<id>')} / {dataset.password}")
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    """--scale plus one override option per Scale field (e.g. --users, --weeks)."""
+    parser.add_argument("--scale", choices=SCALES, default="small", help="preset volume (default: small)")
+    for field in fields(Scale):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type={"int": int, "float": float}[field.type],
+            help=f"override the preset's {field.name}",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="database URL")
+    add_scale_arguments(parser)
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="rows per INSERT batch (default: 5000)")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    engine = sa.create_engine(args.url)
+    try:
+        if args.reset:
+            reset_schema(engine)
+        else:
+            Base.metadata.create_all(bind=engine)  # no-op on a migrated database
+        scale = resolve_scale(args.scale, **vars(args))
+        _print(generate(engine, scale, seed=args.seed, batch_size=args.batch_size))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
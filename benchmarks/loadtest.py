@@ -0,0 +1,562 @@
+"""
+HTTP load test: a scenario mix against the real app, with latency
+percentiles and throughput per endpoint.
+
+    python -m benchmarks.loadtest                                  # in-process, SQLite temp file, "small" dataset
+    python -m benchmarks.loadtest --url postgresql+psycopg2://... --dataset medium -c 50 -d 120
+    python -m benchmarks.loadtest --base-url http://127.0.0.1:8000 --url <the server's DATABASE_URL> --keep-data
+    python -m benchmarks.loadtest --compare before.json --report after.json
+
+The database is filled with benchmarks.datagen (dropped and recreated first,
+unless --keep-data), then personas are picked from it: athletes poll their
+dashboard, coaches take attendance, edit workout plans and request AI
+drafts. Everyone logs in at once first (the login burst), and logins stay
+in the mix.
+
+In-process (default), requests go through httpx's ASGI transport to
+app.main:app, configured from the environment like the server would be,
+inside the app's lifespan (which the transport doesn't run by itself).
+AI drafts are served by a stub model: a local HTTP server speaking the
+OpenAI Responses API (OPENAI_BASE_URL) that answers after --ai-latency-ms
+with a rule-based draft, so the AI client, quota and cache paths all run.
+--ai local uses the rule-based provider directly (AI_DRAFT_PROVIDER=local).
+With --base-url, configure the server yourself (e.g. AI_DRAFT_PROVIDER=local).
+
+The report (--report, JSON with sorted keys) and an HTML page next to it
+are meant to be kept per commit and compared with --compare.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import html
+import json
+import math
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+import sqlalchemy as sa
+
+from benchmarks.datagen import GOALS, PASSWORD, SCALES, generate, reset_schema
+from app.models.models import (
+    Membership,
+    MembershipRole,
+    Session,
+    User,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutPlanItem,
+)
+
+DEFAULT_MIX = {"dashboard": 55, "attendance": 15, "plan_edit": 15, "ai_draft": 5, "login": 10}
+PERCENTILES = (50, 95, 99)
+
+
+# ---------- stub model ----------
+
+def stub_model_response() -> bytes:
+    """A Responses API body whose output_text is a valid WorkoutPlanAIDraft."""
+    from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest
+    from app.services.rule_based_draft import RuleBasedDraftGenerator
+
+    draft = RuleBasedDraftGenerator().build(WorkoutPlanAIDraftRequest(goal="strength", duration_weeks=4, days_per_week=3))
+    return json.dumps({
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": "stub",
+        "status": "completed",
+        "output": [{
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": draft.model_dump_json(), "annotations": []}],
+        }],
+        "usage": {"input_tokens": 600, "output_tokens": 900, "total_tokens": 1500},
+    }).encode()
+
+
+class _StubModelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("content-length") or 0))
+        time.sleep(self.server.latency * random.uniform(0.5, 1.5))
+        body = self.server.body
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+def start_stub_model(latency_ms: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubModelHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000
+    server.body = stub_model_response()
+    threading.Thread(target=server.serve_forever, name="stub-model", daemon=True).start()
+    return server
+
+
+# ---------- personas ----------
+
+@dataclass
+class Persona:
+    user_id: int
+    email: str
+    club_id: int
+    token: str | None = None
+    cursor: int | None = None  # sync cursor of the dashboard
+
+
+@dataclass
+class ClubData:
+    sessions: list[int] = field(default_factory=list)  # upcoming
+    athletes: list[int] = field(default_factory=list)
+    exercises: list[tuple[int, int, int]] = field(default_factory=list)  # (plan, item, exercise)
+
+
+@dataclass
+class Fixture:
+    athletes: list[Persona]
+    coaches: list[Persona]
+    clubs: dict[int, ClubData]
+
+
+def load_fixture(engine: sa.Engine, *, athletes: int, coaches: int) -> Fixture:
+    """Random personas (so bigger clubs get more traffic) and the rows their scenarios touch."""
+    def personas(conn, roles: tuple[MembershipRole, ...], limit: int) -> list[Persona]:
+        rows = conn.execute(
+            sa.select(User.id, User.email, Membership.club_id)
+            .join(Membership, Membership.user_id == User.id)
+            .where(Membership.role.in_(roles), User.is_active.is_(True))
+            .order_by(sa.func.random())
+            .limit(limit)
+        )
+        return [Persona(user_id=row.id, email=row.email, club_id=row.club_id) for row in rows]
+
+    now = datetime.now(timezone.utc)
+    with engine.connect() as conn:
+        fixture = Fixture(
+            athletes=personas(conn, (MembershipRole.member,), athletes),
+            coaches=personas(conn, (MembershipRole.coach, MembershipRole.owner), coaches),
+            clubs={},
+        )
+        for club_id in sorted({p.club_id for p in fixture.coaches}):
+            fixture.clubs[club_id] = ClubData(
+                sessions=list(conn.scalars(
+                    sa.select(Session.id).where(Session.club_id == club_id, Session.starts_at >= now)
+                    .order_by(Session.starts_at).limit(20)
+                )),
+                athletes=list(conn.scalars(
+                    sa.select(Membership.user_id)
+                    .where(Membership.club_id == club_id, Membership.role == MembershipRole.member).limit(200)
+                )),
+                exercises=[tuple(row) for row in conn.execute(
+                    sa.select(WorkoutPlan.id, WorkoutPlanItem.id, sa.func.min(WorkoutPlanExercise.id))
+                    .join(WorkoutPlanItem, WorkoutPlanItem.plan_id == WorkoutPlan.id)
+                    .join(WorkoutPlanExercise, WorkoutPlanExercise.item_id == WorkoutPlanItem.id)
+                    .where(WorkoutPlan.club_id == club_id, WorkoutPlanItem.week_number == 1)
+                    .group_by(WorkoutPlan.id, WorkoutPlanItem.id)
+                    .limit(20)
+                )],
+            )
+    if not fixture.athletes or not fixture.coaches:
+        raise SystemExit("no athletes/coaches in the database; generate a dataset first")
+    return fixture
+
+
+# ---------- measurements ----------
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)  # endpoint -> ms
+        self.statuses: dict[str, Counter[str]] = defaultdict(Counter)
+        self.scenarios: Counter[str] = Counter()
+
+    def record(self, endpoint: str, status: str, ms: float) -> None:
+        self.latencies[endpoint].append(ms)
+        self.statuses[endpoint][status] += 1
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        endpoints = {}
+        for endpoint, values in self.latencies.items():
+            statuses = self.statuses[endpoint]
+            endpoints[endpoint] = {
+                "count": len(values),
+                "errors": sum(n for status, n in statuses.items() if not status.startswith(("2", "3"))),
+                "statuses": dict(statuses),
+                "throughput_rps": round(len(values) / seconds, 2),
+                "mean_ms": round(sum(values) / len(values), 1),
+                "max_ms": round(max(values), 1),
+                **{f"p{p}_ms": round(percentile(values, p), 1) for p in PERCENTILES},
+            }
+        count = sum(e["count"] for e in endpoints.values())
+        return {
+            "totals": {
+                "requests": count,
+                "errors": sum(e["errors"] for e in endpoints.values()),
+                "throughput_rps": round(count / seconds, 2),
+            },
+            "endpoints": endpoints,
+            "scenarios": dict(self.scenarios),
+        }
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+# ---------- scenarios ----------
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, fixture: Fixture, recorder: Recorder) -> None:
+        self.client = client
+        self.fixture = fixture
+        self.recorder = recorder
+        self.attendance_ids: dict[tuple[int, int], int] = {}  # (session, user) -> attendance id
+
+    async def request(self, endpoint: str, url: str, persona: Persona | None = None, **kwargs: Any) -> httpx.Response | None:
+        """`endpoint` is "METHOD /route/template", the report's key."""
+        method = endpoint.split(" ", 1)[0]
+        headers = kwargs.pop("headers", {})
+        if persona is not None and persona.token:
+            headers["Authorization"] = f"Bearer {persona.token}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.record(endpoint, type(exc).__name__, (time.perf_counter() - started) * 1000)
+            return None
+        self.recorder.record(endpoint, str(response.status_code), (time.perf_counter() - started) * 1000)
+        return response
+
+    async def login(self, persona: Persona, _rng: random.Random, endpoint: str = "POST /auth/login") -> None:
+        response = await self.request(endpoint, "/auth/login", data={"username": persona.email, "password": PASSWORD})
+        if response is not None and response.status_code == 200:
+            persona.token = response.json()["access_token"]
+
+    async def dashboard(self, persona: Persona, _rng: random.Random) -> None:
+        await self.request("GET /me/agenda", "/me/agenda", persona)
+        await self.request("GET /memberships/mine", "/memberships/mine", persona)
+        params = {"limit": 500} if persona.cursor is None else {"since": persona.cursor}
+        response = await self.request(
+            "GET /clubs/{club_id}/sync", f"/clubs/{persona.club_id}/sync", persona, params=params
+        )
+        if response is not None and response.status_code == 200:
+            persona.cursor = response.json().get("cursor")
+
+    async def attendance(self, persona: Persona, rng: random.Random) -> None:
+        club = self.fixture.clubs[persona.club_id]
+        if not club.sessions or not club.athletes:
+            return
+        session_id = rng.choice(club.sessions)
+        base = f"/clubs/{persona.club_id}/sessions/{session_id}/attendances"
+        template = "/clubs/{club_id}/sessions/{session_id}/attendances"
+        await self.request(f"GET {template}", base, persona)
+        for user_id in rng.sample(club.athletes, min(5, len(club.athletes))):
+            status = rng.choice(("present", "present", "present", "late", "excused"))
+            attendance_id = self.attendance_ids.get((session_id, user_id))
+            if attendance_id is None:
+                response = await self.request(
+                    f"POST {template}", base, persona, params={"user_id": user_id}, json={"status": status}
+                )
+                if response is not None and response.status_code == 201:
+                    self.attendance_ids[(session_id, user_id)] = response.json()["id"]
+            else:
+                await self.request(f"PATCH {template}/{{attendance_id}}", f"{base}/{attendance_id}", persona,
+                                   json={"status": status})
+
+    async def plan_edit(self, persona: Persona, rng: random.Random) -> None:
+        club = self.fixture.clubs[persona.club_id]
+        if not club.exercises:
+            return
+        plan_id, item_id, exercise_id = rng.choice(club.exercises)
+        plan = f"/clubs/{persona.club_id}/workout-plans/{plan_id}"
+        template = "/clubs/{club_id}/workout-plans/{plan_id}"
+        response = await self.request(f"GET {template}", plan, persona)
+        if response is None or response.status_code != 200:
+            return
+        etag = response.headers.get("etag")
+        await self.request(f"PATCH {template}", plan, persona, json={"goal": rng.choice(GOALS)},
+                           headers={"If-Match": etag} if etag else {})
+        await self.request(f"GET {template}/items", f"{plan}/items", persona)
+        await self.request(
+            f"PATCH {template}/items/{{item_id}}/exercises/{{exercise_id}}",
+            f"{plan}/items/{item_id}/exercises/{exercise_id}",
+            persona,
+            json={"sets": rng.randint(2, 5), "repetitions": rng.choice((5, 8, 10, 12))},
+        )
+
+    async def ai_draft(self, persona: Persona, rng: random.Random) -> None:
+        await self.request(
+            "POST /clubs/{club_id}/workout-plans/ai-draft",
+            f"/clubs/{persona.club_id}/workout-plans/ai-draft",
+            persona,
+            json={
+                "goal": rng.choice(GOALS),
+                "level": rng.choice(("beginner", "intermediate", "advanced")),
+                "duration_weeks": rng.randint(4, 8),
+                "days_per_week": rng.randint(2, 4),
+            },
+        )
+
+    def scenario(self, name: str) -> tuple[Callable[[Persona, random.Random], Awaitable[None]], list[Persona]]:
+        personas = self.fixture.athletes if name in ("dashboard", "login") else self.fixture.coaches
+        return getattr(self, name), personas
+
+    # ---------- driving ----------
+
+    async def login_burst(self) -> float:
+        started = time.perf_counter()
+        rng = random.Random(0)
+        personas = (*self.fixture.athletes, *self.fixture.coaches)
+        await asyncio.gather(*(self.login(p, rng, "POST /auth/login (burst)") for p in personas))
+        return time.perf_counter() - started
+
+    async def run(self, *, concurrency: int, seconds: float, mix: dict[str, int], think_ms: float, seed: int) -> float:
+        names, weights = zip(*((name, weight) for name, weight in mix.items() if weight > 0))
+        deadline = time.perf_counter() + seconds
+
+        async def worker(index: int) -> None:
+            rng = random.Random(seed * 1000 + index)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                run, personas = self.scenario(name)
+                self.recorder.scenarios[name] += 1
+                await run(rng.choice(personas), rng)
+                if think_ms:
+                    await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return time.perf_counter() - started
+
+
+# ---------- reports ----------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _delta(value: float, baseline: float | None) -> str:
+    if not baseline:
+        return ""
+    return f"{(value - baseline) / baseline * 100:+.0f}%"
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> dict[str, tuple[str, str]]:
+    """Per endpoint, the p95 and throughput change against the baseline ("" where it has no data)."""
+    base = baseline.get("endpoints", {})
+    return {
+        endpoint: (
+            _delta(e["p95_ms"], base.get(endpoint, {}).get("p95_ms")),
+            _delta(e["throughput_rps"], base.get(endpoint, {}).get("throughput_rps")),
+        )
+        for endpoint, e in report["endpoints"].items()
+    }
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None = None) -> None:
+    deltas = compare(report, baseline) if baseline else {}
+    width = max(len("endpoint"), *map(len, report["endpoints"]))
+    header = f"{'endpoint':<{width}} {'count':>7} {'err':>5} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7}"
+    if baseline:
+        header += f" {'Δp95':>6} {'Δreq/s':>7}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, e in sorted(report["endpoints"].items()):
+        line = (f"{endpoint:<{width}} {e['count']:>7} {e['errors']:>5} {e['throughput_rps']:>8.1f} "
+                f"{e['p50_ms']:>7.1f} {e['p95_ms']:>7.1f} {e['p99_ms']:>7.1f}")
+        if baseline:
+            p95, rps = deltas[endpoint]
+            line += f" {p95:>6} {rps:>7}"
+        print(line)
+    totals = report["totals"]
+    print(f"\n{totals['requests']} requests, {totals['errors']} errors, {totals['throughput_rps']:.1f} req/s; "
+          f"latencies in ms; login burst of {report['meta']['personas']} users took "
+          f"{report['meta']['login_burst_s']:.1f}s")
+
+
+def write_html(report: dict[str, Any], path: Path, baseline: dict[str, Any] | None = None) -> None:
+    deltas = compare(report, baseline) if baseline else {}
+    columns = ["count", "errors", "throughput_rps", "mean_ms", *(f"p{p}_ms" for p in PERCENTILES), "max_ms"]
+    head = "".join(f"<th>{c}</th>" for c in ["endpoint", *columns, *(["Δ p95", "Δ req/s"] if baseline else [])])
+    rows = []
+    for endpoint, e in sorted(report["endpoints"].items()):
+        cells = [f"<td>{html.escape(endpoint)}</td>", *(f"<td>{e[c]}</td>" for c in columns)]
+        if baseline:
+            cells += [f"<td>{delta}</td>" for delta in deltas[endpoint]]
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    meta = "".join(f"<li>{html.escape(k)}: {html.escape(str(v))}</li>" for k, v in sorted(report["meta"].items()))
+    totals = report["totals"]
+    path.write_text(f"""<!doctype html>
+<meta charset="utf-8">
+<title>Load test {html.escape(str(report['meta'].get('commit')))}</title>
+<style>
+  body{{font:14px system-ui,sans-serif;margin:2rem}} table{{border-collapse:collapse}}
+  td,th{{border:1px solid #ccc;padding:.3rem .6rem;text-align:right}} td:first-child{{text-align:left}}
+</style>
+<h1>Load test</h1>
+<ul>{meta}</ul>
+<p>{totals['requests']} requests, {totals['errors']} errors, {totals['throughput_rps']} req/s</p>
+<table><tr>{head}</tr>
+{chr(10).join(rows)}
+</table>
+""", encoding="utf-8")
+
+
+# ---------- main ----------
+
+def _configure_app(url: str, ai: str, stub: ThreadingHTTPServer | None) -> None:
+    # read by app.core.config when app.main is imported
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SLOW_QUERY_MS", "0")  # no EXPLAINs in the measurements (and no log on stderr)
+    os.environ["AI_DAILY_LIMIT"] = "1000000"
+    os.environ["AI_DRAFT_PROVIDER"] = "local" if ai == "local" else "openai"
+    if stub is not None:
+        host, port = stub.server_address[:2]
+        os.environ["OPENAI_BASE_URL"] = f"http://{host}:{port}/v1"
+        os.environ["OPENAI_API_KEY"] = "stub"
+
+
+@asynccontextmanager
+async def in_process(app: Any) -> AsyncIterator[httpx.ASGITransport]:
+    """
+    A transport to the app with its lifespan running, as under a server:
+    ASGITransport only sends http scopes, so startup/shutdown (background
+    workers, pools) would otherwise never happen.
+    """
+    async with app.router.lifespan_context(app):
+        yield httpx.ASGITransport(app=app, raise_app_exceptions=False)  # a crash is a 500, as with a server
+
+
+async def _drive(args: argparse.Namespace, fixture: Fixture, mix: dict[str, int]) -> tuple[Recorder, float, float]:
+    if args.base_url:
+        return await _measure(args, fixture, mix, None, args.base_url)
+    from app.main import app
+
+    async with in_process(app) as transport:
+        return await _measure(args, fixture, mix, transport, "http://loadtest")
+
+
+async def _measure(
+    args: argparse.Namespace,
+    fixture: Fixture,
+    mix: dict[str, int],
+    transport: httpx.AsyncBaseTransport | None,
+    base_url: str,
+) -> tuple[Recorder, float, float]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=max(args.concurrency, len(fixture.athletes) + len(fixture.coaches)))
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60, limits=limits) as client:
+        test = LoadTest(client, fixture, recorder)
+        burst = await test.login_burst()
+        seconds = await test.run(
+            concurrency=args.concurrency, seconds=args.duration, mix=mix, think_ms=args.think_ms, seed=args.seed
+        )
+    return recorder, burst, seconds
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, value.split(",")):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (one of {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: SQLite file in a temp dir)")
+    parser.add_argument("--base-url", help="drive a running server instead of the app in-process")
+    parser.add_argument("--dataset", choices=SCALES, default="small", help="benchmarks.datagen preset (default: small)")
+    parser.add_argument("--keep-data", action="store_true", help="use the data already in --url")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="concurrent virtual users (default: 20)")
+    parser.add_argument("-d", "--duration", type=float, default=30, help="seconds of scenario mix (default: 30)")
+    parser.add_argument("--personas", type=int, default=100, help="users logged in by the burst (default: 100)")
+    parser.add_argument("--think-ms", type=float, default=100, help="mean pause between scenarios (default: 100)")
+    parser.add_argument("--mix", type=_parse_mix, default=dict(DEFAULT_MIX),
+                        help="scenario weights, e.g. dashboard=80,ai_draft=0 (default: %(default)s)")
+    parser.add_argument("--ai", choices=("stub", "local"), default="stub", help="AI draft backend (default: stub)")
+    parser.add_argument("--ai-latency-ms", type=float, default=800, help="stub model latency (default: 800)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", type=Path, default=Path("loadtest.json"), help="JSON report (default: loadtest.json)")
+    parser.add_argument("--compare", type=Path, help="earlier JSON report to compare against")
+    args = parser.parse_args()
+    if args.base_url and not args.url:
+        parser.error("--base-url needs --url (the server's database) to pick personas")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+pysqlite:///{Path(tmp) / 'loadtest.db'}"
+        engine = sa.create_engine(url)
+        if not args.keep_data:
+            reset_schema(engine)
+            dataset = generate(engine, SCALES[args.dataset], seed=args.seed)
+            print(f"dataset {args.dataset}: {dataset.rows:,} rows in {dataset.seconds:.1f}s")
+        coaches = max(1, args.personas // 4)
+        fixture = load_fixture(engine, athletes=args.personas - coaches, coaches=coaches)
+        engine.dispose()
+
+        stub = start_stub_model(args.ai_latency_ms) if args.ai == "stub" and not args.base_url else None
+        if not args.base_url:
+            _configure_app(url, args.ai, stub)
+        try:
+            recorder, burst, seconds = asyncio.run(_drive(args, fixture, args.mix))
+        finally:
+            if stub is not None:
+                stub.shutdown()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": args.base_url or "in-process",
+            "database": sa.make_url(url).get_backend_name(),
+            "dataset": None if args.keep_data else args.dataset,
+            "concurrency": args.concurrency,
+            "duration_s": round(seconds, 1),
+            "personas": len(fixture.athletes) + len(fixture.coaches),
+            "login_burst_s": round(burst, 2),
+            "think_ms": args.think_ms,
+            "mix": args.mix,
+            "ai": f"stub {args.ai_latency_ms:g}ms" if stub is not None else args.ai,
+            "seed": args.seed,
+        },
+        **recorder.summary(seconds),
+    }
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    args.report.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    write_html(report, args.report.with_suffix(".html"), baseline)
+    print_report(report, baseline)
+    print(f"\nreport: {args.report} ({args.report.with_suffix('.html')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Write-path round trips per request: the old per-repository commit + refresh
+("before") vs. one unit of work with server values via RETURNING ("after").
+
+Each operation runs as one simulated request against a scratch database.
+"before" replays what the repositories used to do (commit, then refresh the
+returned object) on top of today's repositories, so both columns exercise
+the same SQL otherwise.
+
+    python -m benchmarks.write_path                       # SQLite file in a temp dir
+    python -m benchmarks.write_path --url postgresql+psycopg2://... -n 500
+    python -m benchmarks.write_path --dataset medium      # on top of benchmarks.datagen data
+
+The URL must point to a throwaway database: tables are dropped and recreated.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.database import build_session_maker
+from app.db.unit_of_work import transaction
+from app.models.models import Club, MembershipRole, User, UserRole
+from app.repositories.club import ClubRepository
+from app.repositories.group import GroupRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from benchmarks.datagen import SCALES, generate, reset_schema
+
+
+@dataclass
+class Counter:
+    statements: int = 0
+    selects: int = 0
+    commits: int = 0
+
+    def install(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, _conn, _cursor, statement: str, *_args) -> None:
+        self.statements += 1
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.selects += 1
+
+    def _on_commit(self, _conn) -> None:
+        self.commits += 1
+
+
+@dataclass
+class Bench:
+    """The benchmark's own owner and club, and the rows its create operations made."""
+
+    owner_id: int
+    club_id: int
+    plan_ids: list[int] = field(default_factory=list)
+    group_ids: list[int] = field(default_factory=list)
+
+
+# An operation gets the session, the bench ids, a unique number (from 1) and
+# `saved(obj)`, called where the old repositories committed and refreshed.
+Operation = Callable[[Session, Bench, int, Callable[[Any], Any]], None]
+
+
+def create_club_and_owner(db: Session, bench: Bench, i: int, saved: Callable[[Any], Any]) -> None:
+    repo = ClubRepository(db)
+    club = repo.create_club(name=f"Bench Club {i}", slug=f"bench-club-{i}")  # flushed only, also before
+    saved(repo.add_membership(user_id=bench.owner_id, club_id=club.id, role=MembershipRole.owner))
+
+
+def create_workout_plan(db: Session, bench: Bench, i: int, saved: Callable[[Any], Any]) -> None:
+    repo = WorkoutPlanRepository(db)
+    plan = saved(repo.create_plan(club_id=bench.club_id, created_by_id=bench.owner_id, data={"name": f"Plan {i}"}))
+    bench.plan_ids.append(plan.id)
+
+
+def update_workout_plan(db: Session, bench: Bench, i: int, saved: Callable[[Any], Any]) -> None:
+    plan_id = bench.plan_ids[i - 1]
+    saved(WorkoutPlanRepository(db).update_plan(club_id=bench.club_id, plan_id=plan_id, patch={"goal": f"Goal {i}"}))
+
+
+def create_group(db: Session, bench: Bench, i: int, saved: Callable[[Any], Any]) -> None:
+    repo = GroupRepository(db)
+    group = saved(repo.create(club_id=bench.club_id, name=f"Group {i}", description=None, created_by_id=bench.owner_id))
+    bench.group_ids.append(group.id)
+
+
+def update_group(db: Session, bench: Bench, i: int, saved: Callable[[Any], Any]) -> None:
+    group_id = bench.group_ids[i - 1]
+    saved(GroupRepository(db).update(club_id=bench.club_id, group_id=group_id, name=f"Group {i}*", description="renamed"))
+
+
+OPERATIONS: list[tuple[str, Operation]] = [
+    ("create club + owner", create_club_and_owner),
+    ("create workout plan", create_workout_plan),
+    ("update workout plan", update_workout_plan),
+    ("create group", create_group),
+    ("update group", update_group),
+]
+
+
+@contextmanager
+def _request(db: Session, mode: str) -> Iterator[Callable[[Any], Any]]:
+    if mode == "after":
+        with transaction(db):
+            yield lambda obj: obj
+        return
+
+    def saved(obj: Any) -> Any:
+        db.commit()
+        db.refresh(obj)
+        return obj
+
+    try:
+        yield saved
+    finally:
+        db.rollback()  # nothing left to roll back; like get_db's close() before
+
+
+def _setup(url: str, dataset: str | None):
+    maker = build_session_maker(url)
+    with maker() as db:
+        engine = db.get_bind()
+        reset_schema(engine)
+        if dataset:  # background rows, so indexes and tables have a realistic size
+            generate(engine, SCALES[dataset])
+        owner = User(name="Owner", email="owner@bench.local", password_hash="x", role=UserRole.trainer)
+        club = Club(name="Bench", slug="bench")
+        db.add_all([owner, club])
+        db.commit()
+        bench = Bench(owner_id=owner.id, club_id=club.id)
+    return maker, engine, bench
+
+
+def run(url: str, n: int, dataset: str | None = None) -> list[dict[str, Any]]:
+    results = []
+    for mode in ("before", "after"):
+        maker, engine, bench = _setup(url, dataset)
+        counter = Counter()
+        counter.install(engine)
+        for name, op in OPERATIONS:
+            start = Counter(counter.statements, counter.selects, counter.commits)
+            began = time.perf_counter()
+            for i in range(1, n + 1):
+                with maker() as db, _request(db, mode) as saved:
+                    op(db, bench, i, saved)
+            elapsed = time.perf_counter() - began
+            results.append({
+                "operation": name,
+                "mode": mode,
+                "statements": (counter.statements - start.statements) / n,
+                "selects": (counter.selects - start.selects) / n,
+                "commits": (counter.commits - start.commits) / n,
+                "ms": elapsed * 1000 / n,
+            })
+        engine.dispose()
+    return results
+
+
+def _print(results: list[dict[str, Any]]) -> None:
+    by_key = {(r["operation"], r["mode"]): r for r in results}
+    header = f"{'operation':<22} {'statements':>15} {'SELECTs':>11} {'commits':>11} {'ms/request':>15}"
+    print(header)
+    print("-" * len(header))
+    for name, _ in OPERATIONS:
+        before, after = by_key[(name, "before")], by_key[(name, "after")]
+        cells = [
+            f"{before[k]:>{w}.{p}f} → {after[k]:<{w}.{p}f}"
+            for k, w, p in (("statements", 5, 1), ("selects", 3, 1), ("commits", 3, 1), ("ms", 5, 2))
+        ]
+        print(f"{name:<22} {cells[0]:>15} {cells[1]:>11} {cells[2]:>11} {cells[3]:>15}")
+    print("\nper request, before → after; statements include the change_log rows written with each change")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="throwaway database URL (default: SQLite file in a temp dir)")
+    parser.add_argument("-n", type=int, default=200, help="requests per operation (default: 200)")
+    parser.add_argument("--dataset", choices=SCALES, help="load a benchmarks.datagen preset first (default: none)")
+    args = parser.parse_args()
+
+    if args.url:
+        _print(run(args.url, args.n, args.dataset))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        _print(run(f"sqlite+pysqlite:///{Path(tmp) / 'write_path.db'}", args.n, args.dataset))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ os.environ.setdefault("SECRET_KEY", "test-secret")     # needed by JWT
 os.environ.setdefault("ALGORITHM", "HS256")            # if your Settings requires it
 os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")  # if required
 os.environ.setdefault("ENV", "test")                   # optional, if you have it
+os.environ.setdefault("TEMPLATE_SYNC_INTERVAL_SECONDS", "0")  # no sweeper thread on the app's own engine
 
 import uuid
 import pytest
@@ -14,6 +15,7 @@ SQLITE_URL = "sqlite+pysqlite:///:memory:"
 SessionMaker = build_session_maker(SQLITE_URL)
 
 from app.db.deps import get_db
+from app.db.unit_of_work import transaction
 
 
 from fastapi.testclient import TestClient
@@ -21,7 +23,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import event
 
 from app.main import app
-from app.models.models import  PlanType
+from app.models.models import  Club, PlanType, User, UserRole
 from app.db.base import Base
 from .helpers_auth import register_user, login_and_get_token
 
@@ -68,17 +70,36 @@ def db(_sqlite_sessionmaker):
 
 @pytest.fixture(scope="function")
 def client(db: Session):
-    # Override app's get_db to use our sqlite session
+    # Override app's get_db to use our sqlite session (same unit of work: commit per request)
     def _override_get_db():
-        try:
+        with transaction(db):
             yield db
-        finally:
-            pass
     app.dependency_overrides[get_db] = _override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
 
+# ---- File-backed SQLite (repositories, threads, several connections) ----
+def _seed_users_and_clubs(s: Session, *, users=(1,), clubs=(1,), role: UserRole = UserRole.athlete) -> None:
+    """Users `u{id}@example.com` and clubs `club-{id}`, flushed."""
+    for uid in users:
+        s.add(User(id=uid, name=f"U{uid}", email=f"u{uid}@example.com", password_hash="x", role=role))
+    for cid in clubs:
+        s.add(Club(id=cid, name=f"Club {cid}", slug=f"club-{cid}"))
+    s.flush()
+
+@pytest.fixture
+def file_db_maker(tmp_path):
+    """Return make(name, users=..., clubs=...) -> sessionmaker of a fresh database file with the schema and seed rows."""
+    def _make(name: str = "test.db", **seed):
+        maker = build_session_maker(f"sqlite+pysqlite:///{tmp_path / name}")
+        with maker() as s:
+            Base.metadata.create_all(bind=s.get_bind())
+            _seed_users_and_clubs(s, **seed)
+            s.commit()
+        return maker
+    return _make
+
 # ---- Shared helpers (used by all suites) ----
 @pytest.fixture
 def auth_headers():
@@ -9,6 +9,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from app.db.deps import get_db
 from app.main import app
 from app.db.database import build_session_maker
+from app.db.unit_of_work import transaction
 
 # 1) Point to a *real* Postgres test DB (container, CI var, etc.)
 PG_URL = os.environ.get("DATABASE_URL", "")
@@ -70,12 +71,10 @@ def db(_pg_sessionmaker) -> Generator[Session, None, None]:
 
 @pytest.fixture(scope="function")
 def client(db: Session):
-    # app should use exactly this session
+    # app should use exactly this session (same unit of work as get_db)
     def _override_get_db():
-        try:
+        with transaction(db):
             yield db
-        finally:
-            pass
 
     app.dependency_overrides[get_db] = _override_get_db
     with TestClient(app) as c:
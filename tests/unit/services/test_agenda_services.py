@@ -0,0 +1,123 @@
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import InvalidTimeRange
+from app.models.models import AttendanceStatus, DayLabel
+from app.repositories.agenda import AgendaRepository
+from app.services.agenda import AgendaService, item_dates
+from app.utils.cache import TTLCache
+
+# Monday
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+END = datetime(2026, 3, 9, tzinfo=timezone.utc)
+
+
+def make_item(item_id, day_label, week_number=None, exercises=()):
+    return SimpleNamespace(
+        id=item_id,
+        day_label=day_label,
+        week_number=week_number,
+        title=f"Item {item_id}",
+        exercises=[SimpleNamespace(name=name, position=i) for i, name in enumerate(exercises)],
+    )
+
+
+def make_plan(items, duration_weeks=None):
+    return SimpleNamespace(
+        id=7, club_id=1, club=SimpleNamespace(name="FC Test"), name="Strength", duration_weeks=duration_weeks, items=items
+    )
+
+
+@pytest.fixture
+def mock_agenda_repo() -> MagicMock:
+    repo = MagicMock(spec=AgendaRepository)
+    repo.list_sessions.return_value = []
+    repo.list_assigned_workout_plans.return_value = []
+    return repo
+
+
+@pytest.fixture
+def agenda_service(mock_agenda_repo) -> AgendaService:
+    return AgendaService(mock_agenda_repo, cache=TTLCache(ttl_seconds=30, max_entries=16))
+
+
+# ---------------------------------------------------------------------------
+# item_dates
+# ---------------------------------------------------------------------------
+
+def test_item_with_week_number_happens_once():
+    item = make_item(1, DayLabel.wednesday, week_number=2)
+    plan_start = date(2026, 2, 23)
+
+    assert list(item_dates(item, plan_start=plan_start, duration_weeks=4, first=date(2026, 3, 2), last=date(2026, 3, 8))) == [
+        date(2026, 3, 4)
+    ]
+    assert list(item_dates(item, plan_start=plan_start, duration_weeks=4, first=date(2026, 3, 9), last=date(2026, 3, 15))) == []
+
+
+def test_item_without_week_repeats_until_duration_ends():
+    item = make_item(1, DayLabel.monday)
+
+    days = list(item_dates(item, plan_start=date(2026, 2, 23), duration_weeks=2, first=date(2026, 2, 1), last=date(2026, 3, 31)))
+
+    assert days == [date(2026, 2, 23), date(2026, 3, 2)]
+
+
+def test_item_without_day_label_is_not_scheduled():
+    item = make_item(1, None, week_number=1)
+
+    assert list(item_dates(item, plan_start=date(2026, 3, 2), duration_weeks=None, first=date(2026, 3, 2), last=date(2026, 3, 8))) == []
+
+
+# ---------------------------------------------------------------------------
+# get_agenda
+# ---------------------------------------------------------------------------
+
+def test_agenda_combines_sessions_and_workout_items(agenda_service, mock_agenda_repo):
+    mock_agenda_repo.list_sessions.return_value = [
+        SimpleNamespace(
+            id=3, club_id=1, club_name="FC Test", plan_id=2, name="Training",
+            starts_at=START.replace(hour=18), ends_at=START.replace(hour=19), location="Field",
+            attendance_status=AttendanceStatus.present, checked_in_at=None,
+        )
+    ]
+    plan = make_plan([make_item(10, DayLabel.friday, exercises=("Squat", "Row")), make_item(11, DayLabel.tuesday)])
+    mock_agenda_repo.list_assigned_workout_plans.return_value = [(datetime(2026, 3, 3, 12), plan)]  # naive = UTC
+
+    agenda = agenda_service.get_agenda(user_id=5, start=START, end=END)
+
+    mock_agenda_repo.list_sessions.assert_called_once_with(user_id=5, start=START, end=END)
+    assert [s.attendance_status for s in agenda.sessions] == [AttendanceStatus.present]
+    assert [(i.date, i.item_id) for i in agenda.workout_items] == [(date(2026, 3, 3), 11), (date(2026, 3, 6), 10)]
+    assert agenda.workout_items[1].exercises == ["Squat", "Row"]
+    assert agenda.workout_items[1].club_name == "FC Test"
+
+
+def test_agenda_is_cached_per_user_and_range(agenda_service, mock_agenda_repo):
+    first = agenda_service.get_agenda(user_id=5, start=START, end=END)
+    second = agenda_service.get_agenda(user_id=5, start=START, end=END)
+    agenda_service.get_agenda(user_id=6, start=START, end=END)
+
+    assert second is first
+    assert mock_agenda_repo.list_sessions.call_count == 2
+
+
+def test_agenda_defaults_to_seven_days_from_today(mock_agenda_repo):
+    agenda = AgendaService(mock_agenda_repo).get_agenda(user_id=5)
+
+    assert agenda.start.date() == datetime.now(timezone.utc).date()
+    assert (agenda.end - agenda.start).days == 7
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [(END, START), (START, datetime(2026, 5, 1, tzinfo=timezone.utc))],
+)
+def test_agenda_rejects_invalid_ranges(agenda_service, mock_agenda_repo, start, end):
+    with pytest.raises(InvalidTimeRange):
+        agenda_service.get_agenda(user_id=5, start=start, end=end)
+
+    mock_agenda_repo.list_sessions.assert_not_called()
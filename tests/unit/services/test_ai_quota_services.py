@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import RateLimitError
+from app.repositories.ai_quota import AIQuotaRepository
+from app.services.ai_quota import AIQuotaService
+
+
+@pytest.fixture
+def mock_repo() -> MagicMock:
+    repo = MagicMock(spec=AIQuotaRepository)
+    repo.try_reserve.return_value = None
+    return repo
+
+
+def make_service(repo, **overrides) -> AIQuotaService:
+    kwargs = dict(daily_limit=3, default_club_limit=None, club_limits={})
+    kwargs.update(overrides)
+    return AIQuotaService(repo, **kwargs)
+
+
+def test_reserve_passes_limits_to_repo(mock_repo):
+    svc = make_service(mock_repo, default_club_limit=20, club_limits={10: 50})
+
+    reservation = svc.reserve(user_id=1, club_id=10, feature="f")
+
+    _, kwargs = mock_repo.try_reserve.call_args
+    assert kwargs["user_limit"] == 3
+    assert kwargs["club_limit"] == 50
+    assert reservation.club_counted is True
+
+
+def test_unlimited_club_is_not_counted(mock_repo):
+    reservation = make_service(mock_repo).reserve(user_id=1, club_id=10, feature="f")
+
+    assert mock_repo.try_reserve.call_args.kwargs["club_limit"] is None
+    assert reservation.club_counted is False
+
+
+@pytest.mark.parametrize("exhausted, text", [("user", "3/day"), ("club", "club")])
+def test_reserve_raises_when_exhausted(mock_repo, exhausted, text):
+    mock_repo.try_reserve.return_value = exhausted
+    svc = make_service(mock_repo, default_club_limit=5)
+
+    with pytest.raises(RateLimitError, match=text):
+        svc.reserve(user_id=1, club_id=10, feature="f")
+
+
+def test_refund_uses_reservation_day(mock_repo):
+    svc = make_service(mock_repo, default_club_limit=5)
+    reservation = svc.reserve(user_id=1, club_id=10, feature="f")
+
+    svc.refund(reservation)
+
+    mock_repo.refund.assert_called_once_with(
+        user_id=1, club_id=10, feature="f", day=reservation.day, club=True
+    )
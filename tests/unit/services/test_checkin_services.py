@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import (
+    CheckInBusyError,
+    CoachOrOwnerRequiredError,
+    InvalidCheckInCode,
+    NotClubMember,
+    SessionNotFound,
+)
+from app.repositories.attendance import AttendanceRepository
+from app.services.checkin import CheckIn, CheckInBatcher, SelfCheckInService
+from app.services.membership import MembershipService
+
+NOW = 1_770_000_000.0
+
+
+class Clock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def mock_attendance_repo() -> MagicMock:
+    repo = MagicMock(spec=AttendanceRepository)
+    repo.session_in_club_exists.return_value = True
+    return repo
+
+
+@pytest.fixture
+def mock_membership_service() -> MagicMock:
+    return MagicMock(spec=MembershipService)
+
+
+@pytest.fixture
+def mock_batcher() -> MagicMock:
+    batcher = MagicMock(spec=CheckInBatcher)
+
+    def _submit(checkin: CheckIn) -> Future:
+        future: Future = Future()
+        future.set_result({"session_id": checkin.session_id, "user_id": checkin.user_id})
+        return future
+
+    batcher.submit.side_effect = _submit
+    return batcher
+
+
+@pytest.fixture
+def checkin_svc(mock_attendance_repo, mock_membership_service, mock_batcher, clock) -> SelfCheckInService:
+    return SelfCheckInService(
+        attendance_repo=mock_attendance_repo,
+        membership_service=mock_membership_service,
+        batcher=mock_batcher,
+        secret="s3cret",
+        code_ttl_seconds=120,
+        write_timeout_seconds=0.05,
+        clock=clock,
+    )
+
+
+def _code(svc, club_id=1, session_id=7):
+    return svc.issue_code(club_id=club_id, session_id=session_id, me_id=99)["code"]
+
+
+def test_issue_code_requires_coach_and_session_in_club(checkin_svc, mock_membership_service, mock_attendance_repo):
+    issued = checkin_svc.issue_code(club_id=1, session_id=7, me_id=99)
+
+    mock_membership_service.require_coach_or_owner_of_club.assert_called_once_with(99, 1)
+    mock_attendance_repo.session_in_club_exists.assert_called_once_with(club_id=1, session_id=7)
+    assert issued["expires_at"] == datetime.fromtimestamp(NOW + 120, tz=timezone.utc)
+    assert len(issued["code"]) < 32  # fits a small QR code
+
+    mock_attendance_repo.session_in_club_exists.return_value = False
+    with pytest.raises(SessionNotFound):
+        checkin_svc.issue_code(club_id=1, session_id=8, me_id=99)
+
+
+def test_issue_code_forbidden_for_members(checkin_svc, mock_membership_service):
+    mock_membership_service.require_coach_or_owner_of_club.side_effect = CoachOrOwnerRequiredError()
+
+    with pytest.raises(CoachOrOwnerRequiredError):
+        checkin_svc.issue_code(club_id=1, session_id=7, me_id=5)
+
+
+def test_check_in_with_valid_code_goes_through_the_batcher(checkin_svc, mock_membership_service, mock_batcher):
+    code = _code(checkin_svc)
+
+    result = checkin_svc.check_in(club_id=1, session_id=7, me_id=5, code=code)
+
+    assert result == {"session_id": 7, "user_id": 5}
+    mock_membership_service.require_member_of_club.assert_called_once_with(5, 1)
+    mock_membership_service.require_coach_or_owner_of_club.assert_called_once()  # only while issuing
+    (checkin,) = mock_batcher.submit.call_args.args
+    assert (checkin.club_id, checkin.session_id, checkin.user_id) == (1, 7, 5)
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda svc, clock: _code(svc, session_id=8),              # another session
+        lambda svc, clock: _code(svc, club_id=2),                 # another club
+        lambda svc, clock: _code(svc)[:-1] + "A",                 # forged signature
+        lambda svc, clock: "zz." + _code(svc).split(".")[1],      # garbage expiry
+    ],
+)
+def test_rejects_codes_for_other_sessions_or_forged(checkin_svc, clock, mock_batcher, tamper):
+    code = tamper(checkin_svc, clock)
+
+    with pytest.raises(InvalidCheckInCode):
+        checkin_svc.check_in(club_id=1, session_id=7, me_id=5, code=code)
+
+    mock_batcher.submit.assert_not_called()
+
+
+def test_rejects_expired_codes(checkin_svc, clock):
+    code = _code(checkin_svc)
+    clock.now += 121
+
+    with pytest.raises(InvalidCheckInCode):
+        checkin_svc.check_in(club_id=1, session_id=7, me_id=5, code=code)
+
+
+def test_non_members_cannot_check_in(checkin_svc, mock_membership_service, mock_batcher):
+    mock_membership_service.require_member_of_club.side_effect = NotClubMember()
+
+    with pytest.raises(NotClubMember):
+        checkin_svc.check_in(club_id=1, session_id=7, me_id=5, code=_code(checkin_svc))
+
+    mock_batcher.submit.assert_not_called()
+
+
+def test_slow_writer_surfaces_as_busy(checkin_svc, mock_batcher):
+    mock_batcher.submit.side_effect = lambda checkin: Future()  # never completes
+
+    with pytest.raises(CheckInBusyError):
+        checkin_svc.check_in(club_id=1, session_id=7, me_id=5, code=_code(checkin_svc))
@@ -5,6 +5,7 @@ from app.services.exercise import ExerciseService
 from app.repositories.exercise import ExerciseRepository
 from app.services.membership import MembershipService
 from app.schemas.exercise import ExerciseCreate, ExerciseUpdate
+from app.models.models import LinkMode
 from app.exceptions.base import (
     NotClubMember,
     CoachOrOwnerRequiredError,
@@ -111,6 +112,9 @@ def test_create_exercise_happy_path(
     data.repetitions = 10
     data.position = None
     data.day_label = None
+    data.is_template = False
+    data.template_id = None
+    data.link_mode = LinkMode.snapshot
 
     created = MagicMock()
     mock_exercise_repo.create_in_plan.return_value = created
@@ -131,6 +135,9 @@ def test_create_exercise_happy_path(
         repetitions=data.repetitions,
         position=data.position,
         day_label=data.day_label,
+        is_template=data.is_template,
+        template_id=data.template_id,
+        link_mode=data.link_mode,
     )
     assert result == created
 
@@ -171,6 +178,24 @@ def test_update_exercise_happy_path(
     assert result == updated
 
 
+def test_update_exercise_relinking_resets_sync_and_keeps_template(
+    exercise_service: ExerciseService,
+    mock_exercise_repo: MagicMock,
+    user,
+):
+    data = MagicMock(spec=ExerciseUpdate)
+    data.model_dump.return_value = {"template_id": 5, "link_mode": LinkMode.linked, "is_template": None}
+
+    exercise_service.update_exercise(club_id=1, plan_id=10, exercise_id=99, user_id=user.id, data=data)
+
+    mock_exercise_repo.update_in_plan.assert_called_once_with(
+        club_id=1,
+        plan_id=10,
+        exercise_id=99,
+        updates={"link_mode": LinkMode.linked, "template_version_used": None},
+    )
+
+
 def test_delete_exercise_happy_path(
     exercise_service: ExerciseService,
     mock_exercise_repo: MagicMock,
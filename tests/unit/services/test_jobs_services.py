@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.jobs.runner import JobRunner
+from app.models.models import Job, JobStatus, MembershipRole
+from app.repositories.job import JobRepository
+from app.services.job import JobService
+from app.services.membership import MembershipService
+from app.exceptions.base import (
+    JobNotFoundError,
+    MembershipNotFoundError,
+    NotClubMember,
+    UnknownJobTypeError,
+)
+
+from .factories import make_membership
+
+
+@pytest.fixture
+def mock_job_repo() -> MagicMock:
+    return MagicMock(spec=JobRepository)
+
+
+@pytest.fixture
+def mock_membership_service() -> MagicMock:
+    return MagicMock(spec=MembershipService)
+
+
+@pytest.fixture
+def mock_runner() -> MagicMock:
+    runner = MagicMock(spec=JobRunner)
+    runner.has_handler.return_value = True
+    runner.worker_id = "host:1:abc"
+    return runner
+
+
+@pytest.fixture
+def job_service(mock_job_repo, mock_membership_service, mock_runner) -> JobService:
+    return JobService(job_repo=mock_job_repo, membership_service=mock_membership_service, runner=mock_runner)
+
+
+def make_job(job_id: int = 1, *, created_by_id: int = 7, club_id: int | None = 10) -> Job:
+    return Job(
+        id=job_id,
+        job_type="workout_plan_export",
+        status=JobStatus.queued,
+        created_by_id=created_by_id,
+        club_id=club_id,
+        payload={},
+        progress=0,
+    )
+
+
+def test_enqueue_persists_then_submits(job_service, mock_job_repo, mock_membership_service, mock_runner):
+    job = make_job(5)
+    mock_job_repo.create.return_value = job
+
+    result = job_service.enqueue(
+        job_type="workout_plan_export", user_id=7, club_id=10, payload={"plan_id": 3}
+    )
+
+    assert result is job
+    mock_membership_service.require_member_of_club.assert_called_once_with(7, 10)
+    mock_job_repo.create.assert_called_once_with(
+        job_type="workout_plan_export", created_by_id=7, club_id=10, payload={"plan_id": 3}, locked_by="host:1:abc"
+    )
+    mock_runner.submit.assert_called_once_with(5, "workout_plan_export")
+
+
+def test_enqueue_requires_membership(job_service, mock_job_repo, mock_membership_service, mock_runner):
+    mock_membership_service.require_member_of_club.side_effect = NotClubMember()
+
+    with pytest.raises(NotClubMember):
+        job_service.enqueue(job_type="workout_plan_export", user_id=7, club_id=10, payload={})
+
+    mock_job_repo.create.assert_not_called()
+    mock_runner.submit.assert_not_called()
+
+
+def test_enqueue_unknown_type(job_service, mock_job_repo, mock_runner):
+    mock_runner.has_handler.return_value = False
+
+    with pytest.raises(UnknownJobTypeError):
+        job_service.enqueue(job_type="nope", user_id=7, club_id=10, payload={})
+
+    mock_job_repo.create.assert_not_called()
+
+
+def test_get_job_creator_can_read(job_service, mock_job_repo, mock_membership_service):
+    mock_job_repo.get.return_value = make_job(created_by_id=7)
+
+    assert job_service.get_job(job_id=1, user_id=7).id == 1
+    mock_membership_service.get_membership_for_user_in_club.assert_not_called()
+
+
+def test_get_job_coach_of_club_can_read(job_service, mock_job_repo, mock_membership_service):
+    mock_job_repo.get.return_value = make_job(created_by_id=7, club_id=10)
+    mock_membership_service.get_membership_for_user_in_club.return_value = make_membership(
+        1, club_id=10, user_id=8, role=MembershipRole.coach
+    )
+
+    assert job_service.get_job(job_id=1, user_id=8).id == 1
+
+
+@pytest.mark.parametrize("side_effect, role", [
+    (None, MembershipRole.member),
+    (MembershipNotFoundError(), None),
+])
+def test_get_job_hidden_from_others(job_service, mock_job_repo, mock_membership_service, side_effect, role):
+    mock_job_repo.get.return_value = make_job(created_by_id=7, club_id=10)
+    if side_effect:
+        mock_membership_service.get_membership_for_user_in_club.side_effect = side_effect
+    else:
+        mock_membership_service.get_membership_for_user_in_club.return_value = make_membership(
+            1, club_id=10, user_id=8, role=role
+        )
+
+    with pytest.raises(JobNotFoundError):
+        job_service.get_job(job_id=1, user_id=8)
@@ -10,6 +10,7 @@ from app.repositories.plan_assignment import PlanAssignmentRepository
 from app.services.membership import MembershipService
 from app.schemas.plan_assignment import PlanAssigneeCreate
 from app.exceptions.base import (
+    GroupNotFoundError,
     NotClubMember,
     CoachOrOwnerRequiredError,
     PlanNotFoundError,
@@ -17,6 +18,7 @@ from app.exceptions.base import (
     PlanAssigneeNotFound,
     UserNotClubMember,
 )
+from pydantic import ValidationError
 
 from .factories import make_user
 
@@ -172,6 +174,51 @@ def test_add_assignee_propagates_repo_conflict(
         plan_assignment_service.add_assignee(club_id=1, plan_id=10, me_id=5, data=data)
 
 
+def test_add_group_assignee_happy_path(
+    plan_assignment_service: PlanAssignmentService,
+    mock_plan_assignment_repo: MagicMock,
+    mock_membership_service: MagicMock,
+):
+    # Arrange
+    data = PlanAssigneeCreate(group_id=7, role=PlanAssigneeRole.athlete)
+    created = MagicMock()
+    mock_plan_assignment_repo.create_group_assignee.return_value = created
+
+    # Act
+    result = plan_assignment_service.add_assignee(club_id=1, plan_id=10, me_id=5, data=data)
+
+    # Assert
+    assert result == created
+    mock_membership_service.require_coach_or_owner_of_club.assert_called_once_with(5, 1)
+    mock_plan_assignment_repo.get_group_in_club.assert_called_once_with(club_id=1, group_id=7)
+    mock_plan_assignment_repo.create_group_assignee.assert_called_once_with(
+        plan_id=10, group_id=7, role=PlanAssigneeRole.athlete, assigned_by_id=5
+    )
+    mock_membership_service.require_member_of_club.assert_not_called()
+    mock_plan_assignment_repo.create_user_assignee.assert_not_called()
+
+
+def test_add_group_assignee_rejects_group_of_other_club(
+    plan_assignment_service: PlanAssignmentService,
+    mock_plan_assignment_repo: MagicMock,
+):
+    # Arrange
+    mock_plan_assignment_repo.get_group_in_club.side_effect = GroupNotFoundError()
+    data = PlanAssigneeCreate(group_id=7, role=PlanAssigneeRole.athlete)
+
+    # Act / Assert
+    with pytest.raises(GroupNotFoundError):
+        plan_assignment_service.add_assignee(club_id=1, plan_id=10, me_id=5, data=data)
+
+    mock_plan_assignment_repo.create_group_assignee.assert_not_called()
+
+
+@pytest.mark.parametrize("target", [{}, {"user_id": 1, "group_id": 2}])
+def test_assignee_create_requires_exactly_one_target(target):
+    with pytest.raises(ValidationError):
+        PlanAssigneeCreate(role=PlanAssigneeRole.athlete, **target)
+
+
 def test_remove_assignee_happy_path(
     plan_assignment_service: PlanAssignmentService,
     mock_plan_assignment_repo: MagicMock,
@@ -6,6 +6,7 @@ from app.repositories.session import SessionRepository
 from app.services.membership import MembershipService
 from app.schemas.session import SessionCreate, SessionUpdate
 from app.exceptions.base import InvalidTimeRange
+from app.models.models import LinkMode
 
 from .factories import make_user
 
@@ -110,6 +111,9 @@ def test_create_session_requires_coach_or_owner(
     data.ends_at = MagicMock()
     data.location = "Gym"
     data.note = None
+    data.is_template = False
+    data.template_id = 7
+    data.link_mode = LinkMode.linked
 
     created = MagicMock()
     mock_session_repo.create_in_plan.return_value = created
@@ -134,6 +138,9 @@ def test_create_session_requires_coach_or_owner(
         ends_at=data.ends_at,
         location=data.location,
         note=data.note,
+        is_template=data.is_template,
+        template_id=data.template_id,
+        link_mode=data.link_mode,
     )
     assert result == created
 
@@ -171,6 +178,7 @@ def test_update_session_updates_fields_when_no_time_change(
         plan_id=plan_id,
         session_id=session_id,
         updates={"location": "New Gym"},
+        expected_version=None,
     )
     assert result == updated
 
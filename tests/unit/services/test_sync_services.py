@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import NotClubMember
+from app.models.models import MembershipRole
+from app.repositories.sync import SyncRepository
+from app.services.membership import MembershipService
+from app.services.sync import ENTITIES, SyncService
+
+
+def change(cursor, entity, entity_id, op="upsert"):
+    return SimpleNamespace(cursor=cursor, entity=entity, entity_id=entity_id, op=op)
+
+
+@pytest.fixture
+def mock_repo() -> MagicMock:
+    repo = MagicMock(spec=SyncRepository)
+    repo.load.side_effect = lambda entity, club_id, ids=None, user_id=None: [{"id": i} for i in ids or []]
+    return repo
+
+
+@pytest.fixture
+def mock_membership_service() -> MagicMock:
+    svc = MagicMock(spec=MembershipService)
+    svc.require_member_of_club.return_value = SimpleNamespace(role=MembershipRole.coach)
+    return svc
+
+
+@pytest.fixture
+def sync_svc(mock_repo, mock_membership_service) -> SyncService:
+    return SyncService(mock_repo, mock_membership_service, page_size=3)
+
+
+def test_requires_membership(sync_svc, mock_membership_service, mock_repo):
+    mock_membership_service.require_member_of_club.side_effect = NotClubMember()
+
+    with pytest.raises(NotClubMember):
+        sync_svc.sync(club_id=10, user_id=42, since=0)
+
+    mock_repo.list_changes.assert_not_called()
+
+
+def test_snapshot_reads_cursor_then_every_entity(sync_svc, mock_repo):
+    mock_repo.latest_cursor.return_value = 17
+
+    result = sync_svc.sync(club_id=10, user_id=42)
+
+    assert result.full is True
+    assert result.cursor == 17
+    assert set(result.changes) == set(ENTITIES)
+    assert mock_repo.mock_calls[0][0] == "latest_cursor"  # before any data is read
+
+
+def test_delta_collapses_to_last_op_per_entity(sync_svc, mock_repo):
+    mock_repo.list_changes.return_value = [
+        change(5, "group", 1),
+        change(6, "group", 1),
+        change(7, "session", 3, "delete"),
+    ]
+
+    result = sync_svc.sync(club_id=10, user_id=42, since=4)
+
+    assert result.full is False
+    assert result.cursor == 7
+    assert result.has_more is False
+    assert result.changes == {"group": [{"id": 1}]}
+    assert result.deleted == {"session": [3]}
+    mock_repo.load.assert_called_once_with("group", club_id=10, ids=[1], user_id=None)
+    mock_repo.list_changes.assert_called_once_with(club_id=10, since=4, limit=4, user_id=None)
+
+
+def test_upserts_that_no_longer_exist_are_reported_deleted(sync_svc, mock_repo):
+    mock_repo.list_changes.return_value = [change(5, "plan", 1), change(6, "plan", 2)]
+    mock_repo.load.side_effect = lambda entity, club_id, ids=None, user_id=None: [{"id": 2}]
+
+    result = sync_svc.sync(club_id=10, user_id=42, since=4)
+
+    assert result.changes == {"plan": [{"id": 2}]}
+    assert result.deleted == {"plan": [1]}
+
+
+def test_pages_are_capped_and_flag_has_more(sync_svc, mock_repo):
+    mock_repo.list_changes.return_value = [change(i, "group", i) for i in range(1, 5)]
+
+    result = sync_svc.sync(club_id=10, user_id=42, since=0, limit=100)
+
+    assert result.has_more is True
+    assert result.cursor == 3
+    assert [row["id"] for row in result.changes["group"]] == [1, 2, 3]
+
+
+def test_empty_delta_keeps_the_cursor(sync_svc, mock_repo):
+    mock_repo.list_changes.return_value = []
+
+    result = sync_svc.sync(club_id=10, user_id=42, since=9)
+
+    assert result.cursor == 9
+    assert result.changes == {} and result.deleted == {}
+
+
+def test_members_only_see_their_own_attendances(sync_svc, mock_repo, mock_membership_service):
+    mock_membership_service.require_member_of_club.return_value = SimpleNamespace(role=MembershipRole.member)
+    mock_repo.list_changes.return_value = [change(5, "attendance", 8)]
+
+    sync_svc.sync(club_id=10, user_id=42, since=4)
+
+    assert mock_repo.list_changes.call_args.kwargs["user_id"] == 42
+    mock_repo.load.assert_called_once_with("attendance", club_id=10, ids=[8], user_id=42)
@@ -1,13 +1,23 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
-
-from app.services.workout_plan_ai import WorkoutPlanAIService, FEATURE_WORKOUTPLAN_DRAFT
+from sqlalchemy.orm import Session
+
+from app.core.ai_client import AIClient
+from app.services.workout_plan_ai import (
+    WorkoutPlanAIService,
+    FEATURE_WORKOUTPLAN_DRAFT,
+    FEATURE_WORKOUTPLAN_DRAFT_CACHED,
+    FEATURE_WORKOUTPLAN_DRAFT_LOCAL,
+)
+from app.services.workout_plan_ai_cache import WorkoutPlanDraftCache, make_draft_cache_key
 from app.services.workout_plan import WorkoutPlanService
 from app.repositories.ai_usage import AIUsageRepository
 from app.repositories.club import ClubRepository
+from app.services.ai_quota import AIQuotaService
+from app.services.draft_providers import OpenAIDraftProvider, RuleBasedDraftProvider
 from app.schemas.workout_plan_ai import WorkoutPlanAIDraftRequest, WorkoutPlanAIDraft, AIDraftItem, AIDraftExercise
-from app.exceptions.base import RateLimitError
+from app.exceptions.base import ConflictError, RateLimitError
 from .factories import make_club
 
 
@@ -27,32 +37,39 @@ def mock_ai_usage_repo() -> MagicMock:
 
 @pytest.fixture
 def mock_club_repo() -> MagicMock:
-    return MagicMock(spec=ClubRepository)
+    repo = MagicMock(spec=ClubRepository)
+    repo.get_club.return_value = make_club(club_id=10, name="FC Test")
+    return repo
 
 
 @pytest.fixture
-def ai_svc(mock_workout_plan_service, mock_ai_usage_repo, mock_club_repo):
-    with patch("app.services.workout_plan_ai.OpenAI"):
-        svc = WorkoutPlanAIService(
-            workout_plan_service=mock_workout_plan_service,
-            ai_usage_repo=mock_ai_usage_repo,
-            club_repo=mock_club_repo,
-            daily_limit=3,
-        )
-    svc.client = MagicMock()
-    return svc
+def mock_quota_service() -> MagicMock:
+    return MagicMock(spec=AIQuotaService)
 
 
-def make_draft_request(**overrides) -> WorkoutPlanAIDraftRequest:
-    return WorkoutPlanAIDraftRequest(
-        goal="Build strength",
-        level="beginner",
-        duration_weeks=4,
-        days_per_week=3,
-        **overrides,
+@pytest.fixture
+def draft_cache() -> WorkoutPlanDraftCache:
+    return WorkoutPlanDraftCache(ttl_seconds=60, max_entries=8, similarity_threshold=0.6)
+
+
+@pytest.fixture
+def ai_svc(mock_workout_plan_service, mock_ai_usage_repo, mock_club_repo, mock_quota_service, draft_cache):
+    return WorkoutPlanAIService(
+        workout_plan_service=mock_workout_plan_service,
+        ai_usage_repo=mock_ai_usage_repo,
+        club_repo=mock_club_repo,
+        quota_service=mock_quota_service,
+        provider=OpenAIDraftProvider(MagicMock(spec=AIClient)),
+        cache=draft_cache,
     )
 
 
+def make_draft_request(**overrides) -> WorkoutPlanAIDraftRequest:
+    data = dict(goal="Build strength", level="beginner", duration_weeks=4, days_per_week=3)
+    data.update(overrides)
+    return WorkoutPlanAIDraftRequest(**data)
+
+
 def make_draft_json(name: str = "4-Week Plan") -> str:
     draft = WorkoutPlanAIDraft(
         name=name,
@@ -78,28 +95,39 @@ def make_draft_json(name: str = "4-Week Plan") -> str:
 # Quota check
 # ---------------------------------------------------------------------------
 
-def test_raises_rate_limit_when_quota_exceeded(ai_svc, mock_ai_usage_repo):
-    mock_ai_usage_repo.count_today.return_value = 3  # at the limit
+def test_raises_rate_limit_when_quota_exceeded(ai_svc, mock_quota_service):
+    mock_quota_service.reserve.side_effect = RateLimitError()
 
     with pytest.raises(RateLimitError):
         ai_svc.generate_and_create_plan(
             club_id=10, user_id=42, req=make_draft_request()
         )
 
-    mock_ai_usage_repo.count_today.assert_called_once_with(
-        user_id=42, feature=FEATURE_WORKOUTPLAN_DRAFT
+    mock_quota_service.reserve.assert_called_once_with(
+        user_id=42, club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT
     )
-    ai_svc.client.responses.create.assert_not_called()
+    ai_svc.provider.client.create_response.assert_not_called()
+    mock_quota_service.refund.assert_not_called()
 
 
-def test_quota_check_uses_correct_feature_key(ai_svc, mock_ai_usage_repo):
-    mock_ai_usage_repo.count_today.return_value = 99
+def test_refunds_reservation_when_generation_fails(ai_svc, mock_quota_service):
+    ai_svc.provider.client.create_response.side_effect = Exception("OpenAI unavailable")
 
-    with pytest.raises(RateLimitError):
-        ai_svc.generate_and_create_plan(club_id=10, user_id=1, req=make_draft_request())
+    with pytest.raises(Exception, match="OpenAI unavailable"):
+        ai_svc.generate_and_create_plan(club_id=10, user_id=42, req=make_draft_request())
+
+    mock_quota_service.refund.assert_called_once_with(mock_quota_service.reserve.return_value)
 
-    _, kwargs = mock_ai_usage_repo.count_today.call_args
-    assert kwargs["feature"] == FEATURE_WORKOUTPLAN_DRAFT
+
+def test_keeps_reservation_after_success(ai_svc, mock_quota_service, mock_workout_plan_service):
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
+    mock_workout_plan_service.create_plan.return_value = MagicMock(id=1)
+    mock_workout_plan_service.create_item.return_value = MagicMock(id=5)
+
+    ai_svc.generate_and_create_plan(club_id=10, user_id=42, req=make_draft_request())
+
+    mock_quota_service.reserve.assert_called_once()
+    mock_quota_service.refund.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -109,9 +137,8 @@ def test_quota_check_uses_correct_feature_key(ai_svc, mock_ai_usage_repo):
 def test_creates_plan_and_items_and_exercises(
     ai_svc, mock_ai_usage_repo, mock_club_repo, mock_workout_plan_service
 ):
-    mock_ai_usage_repo.count_today.return_value = 0
     mock_club_repo.get_club.return_value = make_club(club_id=10, name="FC Test")
-    ai_svc.client.responses.create.return_value.output_text = make_draft_json()
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
 
     created_plan = MagicMock()
     created_plan.id = 1
@@ -130,9 +157,8 @@ def test_creates_plan_and_items_and_exercises(
 def test_records_usage_after_successful_generation(
     ai_svc, mock_ai_usage_repo, mock_club_repo, mock_workout_plan_service
 ):
-    mock_ai_usage_repo.count_today.return_value = 0
     mock_club_repo.get_club.return_value = make_club(club_id=10, name="FC Test")
-    ai_svc.client.responses.create.return_value.output_text = make_draft_json()
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
 
     created_plan = MagicMock()
     created_plan.id = 1
@@ -149,9 +175,8 @@ def test_records_usage_after_successful_generation(
 def test_does_not_record_usage_if_openai_fails(
     ai_svc, mock_ai_usage_repo, mock_club_repo
 ):
-    mock_ai_usage_repo.count_today.return_value = 0
     mock_club_repo.get_club.return_value = make_club(club_id=10, name="FC Test")
-    ai_svc.client.responses.create.side_effect = Exception("OpenAI unavailable")
+    ai_svc.provider.client.create_response.side_effect = Exception("OpenAI unavailable")
 
     with pytest.raises(Exception, match="OpenAI unavailable"):
         ai_svc.generate_and_create_plan(club_id=10, user_id=42, req=make_draft_request())
@@ -162,9 +187,8 @@ def test_does_not_record_usage_if_openai_fails(
 def test_returns_nested_plan(
     ai_svc, mock_ai_usage_repo, mock_club_repo, mock_workout_plan_service
 ):
-    mock_ai_usage_repo.count_today.return_value = 0
     mock_club_repo.get_club.return_value = make_club(club_id=10, name="FC Test")
-    ai_svc.client.responses.create.return_value.output_text = make_draft_json()
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
 
     created_plan = MagicMock()
     created_plan.id = 1
@@ -179,3 +203,208 @@ def test_returns_nested_plan(
         club_id=10, plan_id=1, user_id=42, nested=True
     )
     assert result is nested_plan
+
+
+# ---------------------------------------------------------------------------
+# Draft cache
+# ---------------------------------------------------------------------------
+
+def _prepare_plan_creation(mock_workout_plan_service):
+    mock_workout_plan_service.create_plan.return_value = MagicMock(id=1)
+    mock_workout_plan_service.create_item.return_value = MagicMock(id=5)
+
+
+def test_second_identical_request_is_served_from_cache(
+    ai_svc, mock_ai_usage_repo, mock_quota_service, mock_workout_plan_service, draft_cache
+):
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
+    _prepare_plan_creation(mock_workout_plan_service)
+
+    ai_svc.generate_and_create_plan(club_id=10, user_id=1, req=make_draft_request())
+    ai_svc.generate_and_create_plan(
+        club_id=10, user_id=2, req=make_draft_request(goal="  build STRENGTH! ")
+    )
+
+    ai_svc.provider.client.create_response.assert_called_once()
+    assert mock_workout_plan_service.create_plan.call_count == 2
+    mock_quota_service.reserve.assert_called_once()  # hit skips the quota
+    mock_ai_usage_repo.record.assert_called_with(
+        user_id=2, club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT_CACHED
+    )
+    assert draft_cache.stats()["exact_hits"] == 1
+
+
+def test_similar_request_hits_cache(ai_svc, mock_ai_usage_repo, mock_workout_plan_service, draft_cache):
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
+    _prepare_plan_creation(mock_workout_plan_service)
+
+    ai_svc.generate_and_create_plan(
+        club_id=10, user_id=1, req=make_draft_request(constraints=["knee friendly"])
+    )
+    ai_svc.generate_and_create_plan(
+        club_id=10, user_id=2, req=make_draft_request(goal="build strength", constraints=["knee-friendly", "no jumps"])
+    )
+
+    ai_svc.provider.client.create_response.assert_called_once()
+    assert draft_cache.stats()["similar_hits"] == 1
+
+
+def test_different_shape_misses_cache(ai_svc, mock_ai_usage_repo, mock_workout_plan_service, draft_cache):
+    ai_svc.provider.client.create_response.return_value.output_text = make_draft_json()
+    _prepare_plan_creation(mock_workout_plan_service)
+
+    ai_svc.generate_and_create_plan(club_id=10, user_id=1, req=make_draft_request())
+    req = WorkoutPlanAIDraftRequest(goal="Build strength", level="beginner", duration_weeks=8, days_per_week=3)
+    ai_svc.generate_and_create_plan(club_id=10, user_id=1, req=req)
+
+    assert ai_svc.provider.client.create_response.call_count == 2
+    assert draft_cache.stats()["misses"] == 2
+
+
+def test_cache_key_includes_club_sport():
+    req = make_draft_request()
+    assert make_draft_cache_key(req, sport="Football") != make_draft_cache_key(req, sport="Swimming")
+    assert make_draft_cache_key(req, sport="Football") == make_draft_cache_key(req, sport=" football ")
+
+
+def test_cache_entries_expire():
+    now = [0.0]
+    cache = WorkoutPlanDraftCache(ttl_seconds=10, max_entries=4)
+    cache._cache._clock = lambda: now[0]
+    key = make_draft_cache_key(make_draft_request(), sport=None)
+    cache.put(key, WorkoutPlanAIDraft.model_validate_json(make_draft_json()))
+
+    assert cache.get(key) is not None
+    now[0] = 11.0
+    assert cache.get(key) is None
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+def _chunks(text: str, size: int = 16) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_stream_emits_progress_then_persists_plan(
+    ai_svc, mock_ai_usage_repo, mock_workout_plan_service, monkeypatch
+):
+    ai_svc.provider.client.stream_text.return_value = iter(_chunks(make_draft_json()))
+    _prepare_plan_creation(mock_workout_plan_service)
+    monkeypatch.setattr(
+        "app.services.workout_plan_ai.WorkoutPlanReadNested.model_validate",
+        lambda plan: MagicMock(model_dump=lambda **_: {"id": 1}),
+    )
+
+    events = list(ai_svc.start_draft_stream(club_id=10, user_id=42, req=make_draft_request()))
+    kinds = [e for e, _ in events]
+
+    assert kinds.count("exercise") == 1
+    assert kinds.index("item") < kinds.index("plan") == len(kinds) - 1
+    assert "delta" in kinds
+    mock_workout_plan_service.create_plan.assert_called_once()
+    mock_ai_usage_repo.record.assert_called_once_with(
+        user_id=42, club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT
+    )
+
+
+def test_stream_commits_its_plan_and_rolls_back_failures(ai_svc, mock_workout_plan_service, monkeypatch):
+    # the request's transaction is over by the time the stream persists
+    ai_svc.db = MagicMock(spec=Session)
+    ai_svc.provider.client.stream_text.return_value = iter(_chunks(make_draft_json()))
+    _prepare_plan_creation(mock_workout_plan_service)
+    monkeypatch.setattr(
+        "app.services.workout_plan_ai.WorkoutPlanReadNested.model_validate",
+        lambda plan: MagicMock(model_dump=lambda **_: {"id": 1}),
+    )
+
+    list(ai_svc.start_draft_stream(club_id=10, user_id=42, req=make_draft_request()))
+
+    ai_svc.db.commit.assert_called_once()
+    ai_svc.db.rollback.assert_not_called()
+
+    ai_svc.db.reset_mock()
+    ai_svc.provider.client.stream_text.return_value = iter(_chunks(make_draft_json()))
+    mock_workout_plan_service.create_item.side_effect = ConflictError("WorkoutPlanItem conflict")
+
+    events = list(ai_svc.start_draft_stream(club_id=10, user_id=42, req=make_draft_request(goal="Endurance")))
+
+    assert events[-1][0] == "error"
+    ai_svc.db.rollback.assert_called_once()  # no half-written plan
+    ai_svc.db.commit.assert_not_called()
+
+
+def test_stream_does_not_persist_invalid_draft(
+    ai_svc, mock_ai_usage_repo, mock_quota_service, mock_workout_plan_service
+):
+    ai_svc.provider.client.stream_text.return_value = iter(_chunks(make_draft_json())[:-2])  # truncated
+
+    events = list(ai_svc.start_draft_stream(club_id=10, user_id=42, req=make_draft_request()))
+
+    assert events[-1] == ("error", {"status": 502, "detail": "AI returned an invalid workout plan draft"})
+    mock_workout_plan_service.create_plan.assert_not_called()
+    mock_ai_usage_repo.record.assert_not_called()
+    mock_quota_service.refund.assert_called_once_with(mock_quota_service.reserve.return_value)
+
+
+def test_stream_checks_quota_before_streaming(ai_svc, mock_quota_service, mock_workout_plan_service):
+    mock_quota_service.reserve.side_effect = RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        ai_svc.start_draft_stream(club_id=10, user_id=42, req=make_draft_request())
+
+    mock_workout_plan_service.require_can_create_plan.assert_called_once_with(club_id=10, user_id=42)
+    ai_svc.provider.client.stream_text.assert_not_called()
+
+
+def test_persist_suffixes_name_on_conflict(mock_workout_plan_service):
+    from app.exceptions.base import ConflictError
+    from app.services.workout_plan_ai import persist_draft
+
+    mock_workout_plan_service.create_plan.side_effect = [ConflictError(), MagicMock(id=1)]
+    mock_workout_plan_service.create_item.return_value = MagicMock(id=5)
+    draft = WorkoutPlanAIDraft.model_validate_json(make_draft_json(name="Strength"))
+
+    persist_draft(mock_workout_plan_service, club_id=10, user_id=42, draft=draft)
+
+    names = [c.kwargs["data"]["name"] for c in mock_workout_plan_service.create_plan.call_args_list]
+    assert names == ["Strength", "Strength (2)"]
+
+
+# ---------------------------------------------------------------------------
+# Providers / fallback
+# ---------------------------------------------------------------------------
+
+def test_local_draft_refunds_quota_and_is_not_cached(
+    mock_workout_plan_service, mock_ai_usage_repo, mock_club_repo, mock_quota_service, draft_cache
+):
+    svc = WorkoutPlanAIService(
+        workout_plan_service=mock_workout_plan_service,
+        ai_usage_repo=mock_ai_usage_repo,
+        club_repo=mock_club_repo,
+        quota_service=mock_quota_service,
+        provider=RuleBasedDraftProvider(),
+        cache=draft_cache,
+    )
+    _prepare_plan_creation(mock_workout_plan_service)
+
+    svc.generate_and_create_plan(club_id=10, user_id=42, req=make_draft_request())
+
+    mock_quota_service.refund.assert_called_once_with(mock_quota_service.reserve.return_value)
+    mock_ai_usage_repo.record.assert_called_once_with(
+        user_id=42, club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT_LOCAL
+    )
+    assert len(draft_cache._cache) == 0
+
+
+def test_quota_fallback_serves_local_draft_instead_of_429(ai_svc, mock_quota_service, mock_workout_plan_service):
+    mock_quota_service.reserve.side_effect = RateLimitError()
+    ai_svc.quota_fallback = RuleBasedDraftProvider()
+    _prepare_plan_creation(mock_workout_plan_service)
+
+    ai_svc.generate_and_create_plan(club_id=10, user_id=42, req=make_draft_request())
+
+    ai_svc.provider.client.create_response.assert_not_called()
+    mock_workout_plan_service.create_plan.assert_called_once()
+    mock_quota_service.refund.assert_not_called()
@@ -0,0 +1,256 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import AIUnavailableError, GroupMembershipNotFoundError, RateLimitError
+from app.repositories.ai_usage import AIUsageRepository
+from app.repositories.club import ClubRepository
+from app.repositories.group_membership import GroupMembershipRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from app.schemas.workout_plan_ai import (
+    AthleteDraftProfile,
+    WorkoutPlanAIDraftRequest,
+    WorkoutPlanGroupAIDraftRequest,
+)
+from app.services.ai_quota import AIQuotaService, ClubQuotaReservation
+from app.services.draft_providers import GeneratedDraft, RuleBasedDraftProvider
+from app.services.membership import MembershipService
+from app.services.workout_plan_ai import (
+    FEATURE_WORKOUTPLAN_DRAFT,
+    FEATURE_WORKOUTPLAN_DRAFT_CACHED,
+)
+from app.services.workout_plan_ai_cache import WorkoutPlanDraftCache
+from app.services.workout_plan_group_ai import WorkoutPlanGroupAIService, build_profiles
+from .factories import make_club
+
+
+def make_member(user_id: int, role: str | None = "member"):
+    return SimpleNamespace(user_id=user_id, role=role, user=SimpleNamespace(name=f"Athlete {user_id}"))
+
+
+def make_group_request(athletes=(), **overrides) -> WorkoutPlanGroupAIDraftRequest:
+    data = dict(goal="Build strength", level="beginner", duration_weeks=4, days_per_week=3)
+    data.update(overrides)
+    return WorkoutPlanGroupAIDraftRequest(
+        request=WorkoutPlanAIDraftRequest(**data),
+        athletes=list(athletes),
+    )
+
+
+class BillableLocalProvider:
+    """Rule-based drafts that pretend to be paid model calls; records concurrency."""
+
+    name = "openai"
+
+    def __init__(self, delay: float = 0.0, fail_levels=()):
+        self.local = RuleBasedDraftProvider()
+        self.delay = delay
+        self.fail_levels = set(fail_levels)
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate(self, req, *, club):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if req.level in self.fail_levels:
+                raise AIUnavailableError()
+            return GeneratedDraft(draft=self.local.generate(req, club=club).draft, provider=self.name, billable=True)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def mock_plan_repo() -> MagicMock:
+    repo = MagicMock(spec=WorkoutPlanRepository)
+    repo.existing_plan_names.return_value = set()
+    repo.bulk_create_plans.side_effect = lambda club_id, created_by_id, plans: list(range(100, 100 + len(plans)))
+    return repo
+
+
+@pytest.fixture
+def mock_gm_repo() -> MagicMock:
+    repo = MagicMock(spec=GroupMembershipRepository)
+    repo.list_for_group.return_value = [make_member(1), make_member(2), make_member(3), make_member(9, "coach")]
+    return repo
+
+
+@pytest.fixture
+def mock_quota_service() -> MagicMock:
+    quota = MagicMock(spec=AIQuotaService)
+    quota.reserve_club.side_effect = lambda club_id, feature, units: ClubQuotaReservation(
+        club_id=club_id, feature=feature, day=None, units=units
+    )
+    return quota
+
+
+@pytest.fixture
+def provider() -> BillableLocalProvider:
+    return BillableLocalProvider()
+
+
+@pytest.fixture
+def mock_ai_usage_repo() -> MagicMock:
+    return MagicMock(spec=AIUsageRepository)
+
+
+@pytest.fixture
+def group_svc(mock_plan_repo, mock_gm_repo, mock_quota_service, mock_ai_usage_repo, provider):
+    club_repo = MagicMock(spec=ClubRepository)
+    club_repo.get_club.return_value = make_club(club_id=10, name="FC Test")
+    return WorkoutPlanGroupAIService(
+        workout_plan_repo=mock_plan_repo,
+        group_membership_repo=mock_gm_repo,
+        membership_service=MagicMock(spec=MembershipService),
+        club_repo=club_repo,
+        ai_usage_repo=mock_ai_usage_repo,
+        quota_service=mock_quota_service,
+        provider=provider,
+        cache=WorkoutPlanDraftCache(ttl_seconds=60, max_entries=8, similarity_threshold=None),
+        concurrency=2,
+    )
+
+
+def _run(svc, req, progress=None):
+    return svc.generate_for_group(club_id=10, group_id=5, user_id=42, req=req, progress=progress)
+
+
+# ---------------------------------------------------------------------------
+# Profiles
+# ---------------------------------------------------------------------------
+
+def test_build_profiles_dedupes_identical_athletes():
+    req = make_group_request(
+        athletes=[
+            AthleteDraftProfile(user_id=2, constraints=["Knee friendly"]),
+            AthleteDraftProfile(user_id=3, constraints=["knee-friendly "]),  # normalizes to the same key
+            AthleteDraftProfile(user_id=4, level=None),  # None inherits the group request
+        ]
+    )
+
+    profiles = build_profiles(req, [1, 2, 3, 4], sport="football")
+
+    assert [p.user_ids for p in profiles] == [[1, 4], [2, 3]]
+    assert profiles[1].req.constraints == ["Knee friendly"]
+    assert profiles[0].req.level == "beginner"
+
+
+def test_rejects_overrides_for_users_outside_the_group(group_svc):
+    req = make_group_request(athletes=[AthleteDraftProfile(user_id=77, level="advanced")])
+
+    with pytest.raises(GroupMembershipNotFoundError):
+        group_svc.require_can_generate(club_id=10, group_id=5, user_id=42, req=req)
+
+    group_svc.memberships.require_coach_or_owner_of_club.assert_called_once_with(42, 10)
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def test_generates_once_per_distinct_profile_and_assigns_every_athlete(
+    group_svc, provider, mock_plan_repo, mock_quota_service
+):
+    req = make_group_request(athletes=[AthleteDraftProfile(user_id=3, level="advanced")])
+
+    result = _run(group_svc, req)
+
+    assert provider.calls == 2
+    mock_quota_service.reserve_club.assert_called_once_with(
+        club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT, units=2
+    )
+    mock_quota_service.refund_club.assert_not_called()
+    mock_quota_service.reserve.assert_not_called()  # the coach's own daily limit isn't touched
+
+    plans = mock_plan_repo.bulk_create_plans.call_args.kwargs["plans"]
+    assert sorted(p["assignees"][0] for p in plans) == [1, 2, 3]  # the coach is skipped
+    assert len({p["name"] for p in plans}) == 3
+    assert all(p["items"] and p["items"][0]["exercises"] for p in plans)
+    assert sorted(r["user_id"] for r in result["plans"]) == [1, 2, 3]
+    assert result["profiles"] == 2
+    assert result["sources"] == {"openai": 2}
+
+
+def test_bounded_concurrency_and_incremental_progress(group_svc, provider, mock_gm_repo):
+    mock_gm_repo.list_for_group.return_value = [make_member(i) for i in range(1, 7)]
+    provider.delay = 0.05
+    req = make_group_request(
+        athletes=[AthleteDraftProfile(user_id=i, notes=f"profile {i}") for i in range(1, 7)]
+    )
+    progress = []
+
+    _run(group_svc, req, progress=progress.append)
+
+    assert provider.calls == 6
+    assert provider.max_in_flight == 2
+    assert progress == sorted(progress)
+    assert len([p for p in progress if 10 <= p <= 90]) == 6
+    assert progress[-1] == 100
+
+
+def test_cached_profiles_skip_quota_and_model(group_svc, provider, mock_quota_service, mock_ai_usage_repo):
+    _run(group_svc, make_group_request())
+    mock_quota_service.reset_mock()
+    provider.calls = 0
+
+    result = _run(group_svc, make_group_request())
+
+    assert provider.calls == 0
+    mock_quota_service.reserve_club.assert_not_called()
+    assert result["sources"] == {"cache": 1}
+    mock_ai_usage_repo.record.assert_called_with(user_id=42, club_id=10, feature=FEATURE_WORKOUTPLAN_DRAFT_CACHED)
+
+
+def test_failed_profiles_are_reported_and_refunded(group_svc, provider, mock_quota_service, mock_plan_repo):
+    provider.fail_levels = {"advanced"}
+    req = make_group_request(athletes=[AthleteDraftProfile(user_id=3, level="advanced")])
+
+    result = _run(group_svc, req)
+
+    assert result["failed"] == [{"user_ids": [3], "detail": AIUnavailableError.detail}]
+    assert sorted(r["user_id"] for r in result["plans"]) == [1, 2]
+    reservation = mock_quota_service.refund_club.call_args.args[0]
+    assert reservation.units == 2
+    mock_quota_service.refund_club.assert_called_once_with(reservation, 1)
+
+
+def test_refunds_everything_when_persisting_fails(group_svc, mock_quota_service, mock_plan_repo):
+    mock_plan_repo.bulk_create_plans.side_effect = RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        _run(group_svc, make_group_request())
+
+    reservation = mock_quota_service.refund_club.call_args.args[0]
+    mock_quota_service.refund_club.assert_called_once_with(reservation, 1)
+
+
+def test_club_quota_exhausted_raises(group_svc, provider, mock_quota_service):
+    mock_quota_service.reserve_club.side_effect = RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        _run(group_svc, make_group_request())
+
+    assert provider.calls == 0
+
+
+def test_plan_names_avoid_existing_ones(group_svc, mock_plan_repo, mock_gm_repo):
+    mock_gm_repo.list_for_group.return_value = [make_member(1)]
+    mock_plan_repo.existing_plan_names.side_effect = lambda club_id, names: set(names)
+
+    _run(group_svc, make_group_request())
+
+    (plan,) = mock_plan_repo.bulk_create_plans.call_args.kwargs["plans"]
+    assert plan["name"].endswith("Athlete 1 (2)")
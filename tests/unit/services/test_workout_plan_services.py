@@ -6,7 +6,13 @@ from app.services.workout_plan import WorkoutPlanService
 from app.services.membership import MembershipService
 from app.repositories.workout_plan import WorkoutPlanRepository
 from app.models.models import Membership, MembershipRole, WorkoutPlan
-from app.exceptions.base import CoachOrOwnerRequiredError, WorkoutNotFoundError
+from app.exceptions.base import (
+    CoachOrOwnerRequiredError,
+    GroupNotFoundError,
+    UserNotClubMember,
+    WorkoutNotFoundError,
+    WorkoutPlanNotTemplateError,
+)
 from .factories import make_membership
 
 
@@ -125,10 +131,23 @@ def test_update_plan_allowed_for_coach_and_owner(role, svc, mock_repo, mock_memb
 
     result = svc.update_plan(club_id=10, plan_id=1, user_id=42, patch={"name": "New"})
 
-    mock_repo.update_plan.assert_called_once_with(club_id=10, plan_id=1, patch={"name": "New"})
+    mock_repo.update_plan.assert_called_once_with(
+        club_id=10, plan_id=1, patch={"name": "New"}, expected_version=None
+    )
     assert result is updated
 
 
+def test_update_plan_forwards_if_match_version(svc, mock_repo, mock_membership_service):
+    mock_repo.get_plan.return_value = make_plan(created_by_id=42)
+    mock_membership_service.get_membership_for_user_in_club.return_value = make_membership(
+        membership_id=1, club_id=10, user_id=42, role=MembershipRole.member
+    )
+
+    svc.update_plan(club_id=10, plan_id=1, user_id=42, patch={"name": "Mine"}, expected_version=3)
+
+    assert mock_repo.update_plan.call_args.kwargs["expected_version"] == 3
+
+
 def test_update_plan_allowed_for_plan_creator(svc, mock_repo, mock_membership_service):
     plan = make_plan(created_by_id=42)  # user IS the creator
     updated = make_plan()
@@ -281,3 +300,78 @@ def test_delete_exercise_denied_for_non_creator_member(svc, mock_repo, mock_memb
         svc.delete_exercise(club_id=10, plan_id=1, item_id=5, exercise_id=7, user_id=42)
 
     mock_repo.delete_exercise.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# instantiate_template
+# ---------------------------------------------------------------------------
+
+def make_template(plan_id: int = 1, club_id: int = 10, name: str = "Base"):
+    template = make_plan(plan_id=plan_id, club_id=club_id)
+    template.is_template = True
+    template.name = name
+    return template
+
+
+def test_instantiate_template_picks_the_next_free_name(svc, mock_repo, mock_membership_service):
+    mock_repo.get_plan.return_value = make_template()
+    mock_repo.existing_plan_names.return_value = {"Base (2)"}
+    copy = make_plan(plan_id=2)
+    mock_repo.instantiate_template.return_value = copy
+
+    result = svc.instantiate_template(club_id=10, plan_id=1, user_id=42)
+
+    assert result is copy
+    mock_membership_service.require_member_of_club.assert_called_once_with(club_id=10, user_id=42)
+    mock_membership_service.require_coach_or_owner_of_club.assert_not_called()
+    mock_repo.instantiate_template.assert_called_once_with(
+        club_id=10, template_id=1, created_by_id=42, name="Base (3)"
+    )
+    mock_repo.assign_members.assert_not_called()
+    mock_repo.assign_groups.assert_not_called()
+
+
+def test_instantiate_template_assigns_members_and_groups(svc, mock_repo, mock_membership_service):
+    mock_repo.get_plan.return_value = make_template()
+    mock_repo.instantiate_template.return_value = make_plan(plan_id=2)
+    mock_repo.assign_members.return_value = 2
+    mock_repo.assign_groups.return_value = 1
+
+    svc.instantiate_template(club_id=10, plan_id=1, user_id=42, name="Mine", user_ids=[5, 6, 5], group_ids=[7])
+
+    mock_membership_service.require_coach_or_owner_of_club.assert_called_once_with(user_id=42, club_id=10)
+    mock_repo.existing_plan_names.assert_not_called()
+    mock_repo.assign_members.assert_called_once_with(10, 2, {5, 6}, 42)
+    mock_repo.assign_groups.assert_called_once_with(10, 2, {7}, 42)
+
+
+def test_instantiate_template_rejects_regular_plans(svc, mock_repo):
+    plan = make_template()
+    plan.is_template = False
+    mock_repo.get_plan.return_value = plan
+
+    with pytest.raises(WorkoutPlanNotTemplateError):
+        svc.instantiate_template(club_id=10, plan_id=1, user_id=42)
+    mock_repo.instantiate_template.assert_not_called()
+
+
+def test_instantiate_template_assigning_requires_coach(svc, mock_repo, mock_membership_service):
+    mock_membership_service.require_coach_or_owner_of_club.side_effect = CoachOrOwnerRequiredError
+
+    with pytest.raises(CoachOrOwnerRequiredError):
+        svc.instantiate_template(club_id=10, plan_id=1, user_id=42, user_ids=[5])
+    mock_repo.instantiate_template.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [({"user_ids": [5, 6]}, UserNotClubMember), ({"group_ids": [7, 8]}, GroupNotFoundError)],
+)
+def test_instantiate_template_rejects_unknown_assignees(svc, mock_repo, kwargs, error):
+    mock_repo.get_plan.return_value = make_template()
+    mock_repo.instantiate_template.return_value = make_plan(plan_id=2)
+    mock_repo.assign_members.return_value = 1
+    mock_repo.assign_groups.return_value = 1
+
+    with pytest.raises(error):
+        svc.instantiate_template(club_id=10, plan_id=1, user_id=42, **kwargs)
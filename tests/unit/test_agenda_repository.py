@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models.models import (
+    Attendance,
+    AttendanceStatus,
+    DayLabel,
+    Group,
+    GroupMembership,
+    Membership,
+    MembershipRole,
+    Plan,
+    PlanAssignee,
+    PlanAssigneeRole,
+    PlanType,
+    Session as TrainingSession,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutPlanItem,
+)
+from app.repositories.agenda import AgendaRepository
+
+ME = 1
+COACH = 2
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+END = START + timedelta(days=7)
+
+
+@pytest.fixture
+def db(file_db_maker):
+    with file_db_maker("agenda.db", users=(ME, COACH), clubs=(1, 2, 3))() as s:
+        # member of clubs 1 and 2, not 3
+        s.add_all([
+            Membership(club_id=1, user_id=ME, role=MembershipRole.member),
+            Membership(club_id=2, user_id=ME, role=MembershipRole.member),
+        ])
+        for cid in (1, 2, 3):
+            s.add(Plan(id=cid, club_id=cid, name=f"Plan {cid}", plan_type=PlanType.club, created_by_id=COACH))
+        s.flush()
+        s.add_all([
+            _session(1, club_id=1, starts_at=START + timedelta(days=1, hours=18)),
+            _session(2, club_id=2, starts_at=START + timedelta(days=3, hours=18)),
+            _session(3, club_id=3, starts_at=START + timedelta(days=2, hours=18)),   # not my club
+            _session(4, club_id=1, starts_at=START + timedelta(days=9, hours=18)),   # outside the range
+        ])
+        s.flush()
+        s.add(Attendance(session_id=1, user_id=ME, status=AttendanceStatus.late))
+        s.add(Attendance(session_id=2, user_id=COACH, status=AttendanceStatus.present))  # someone else's
+
+        s.add(Group(id=1, club_id=2, name="Juniors"))
+        s.add(GroupMembership(group_id=1, user_id=ME))
+        for wid, club_id in ((1, 1), (2, 2), (3, 3)):
+            s.add(WorkoutPlan(id=wid, club_id=club_id, created_by_id=COACH, name=f"WP {wid}", is_template=False))
+            s.flush()
+            s.add(WorkoutPlanItem(id=wid, plan_id=wid, day_label=DayLabel.monday, order_index=0))
+            s.flush()
+            s.add(WorkoutPlanExercise(item_id=wid, name="Squat", position=0))
+        s.add_all([
+            _assign(1, user_id=ME),
+            _assign(2, group_id=1),
+            _assign(3, user_id=ME),  # club 3: not a member any more
+        ])
+        s.commit()
+        yield s
+
+
+def _session(sid, *, club_id, starts_at):
+    return TrainingSession(
+        id=sid, plan_id=club_id, club_id=club_id, name=f"S{sid}", starts_at=starts_at,
+        ends_at=starts_at + timedelta(hours=1), location="Field", created_by=COACH,
+    )
+
+
+def _assign(workout_plan_id, *, user_id=None, group_id=None):
+    return PlanAssignee(
+        workout_plan_id=workout_plan_id, user_id=user_id, group_id=group_id,
+        role=PlanAssigneeRole.athlete, assigned_by_id=COACH,
+    )
+
+
+def test_sessions_across_my_clubs_with_my_attendance(db):
+    rows = AgendaRepository(db).list_sessions(user_id=ME, start=START, end=END)
+
+    assert [(r.id, r.club_name, r.attendance_status) for r in rows] == [
+        (1, "Club 1", AttendanceStatus.late),
+        (2, "Club 2", None),
+    ]
+
+
+def test_assigned_workout_plans_direct_and_via_group(db):
+    plans = AgendaRepository(db).list_assigned_workout_plans(user_id=ME)
+
+    assert [plan.id for _, plan in plans] == [1, 2]
+    assert all(isinstance(assigned_at, datetime) for assigned_at, _ in plans)
+    assert [ex.name for ex in plans[0][1].items[0].exercises] == ["Squat"]
+
+
+def test_query_count_does_not_grow_with_clubs(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    db.expunge_all()
+
+    repo = AgendaRepository(db)
+    repo.list_sessions(user_id=ME, start=START, end=END)
+    repo.list_assigned_workout_plans(user_id=ME)
+
+    # sessions, plans, then one selectin load each for clubs, items and exercises
+    assert len(statements) == 5
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.ai_client import AIClient
+from app.exceptions.base import AIUnavailableError
+
+
+def _response_body(text: str) -> dict:
+    return {
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": 0,
+        "model": "stub-model",
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "id": "msg_stub",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": 11,
+            "output_tokens": 22,
+            "total_tokens": 33,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+class StubOpenAI:
+    """Tiny local stand-in for POST /v1/responses."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.fail_first = 0
+        self.delay = 0.0
+        self.stream_chunks = ['{"ok"', ': true}']
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if body.get("stream") and len(stub.requests) > stub.fail_first:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.end_headers()
+                    for n, piece in enumerate(stub.stream_chunks):
+                        event = {
+                            "type": "response.output_text.delta",
+                            "item_id": "msg_stub",
+                            "output_index": 0,
+                            "content_index": 0,
+                            "delta": piece,
+                            "logprobs": [],
+                            "sequence_number": n,
+                        }
+                        self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode())
+                        self.wfile.flush()
+                    self.close_connection = True
+                    return
+                if len(stub.requests) <= stub.fail_first:
+                    payload, status = {"error": {"message": "boom", "type": "server_error"}}, 500
+                else:
+                    payload, status = _response_body('{"ok": true}'), 200
+                raw = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    s = StubOpenAI()
+    yield s
+    s.close()
+
+
+def make_client(stub: StubOpenAI, **overrides) -> AIClient:
+    kwargs = dict(
+        api_key="test-key",
+        model="stub-model",
+        base_url=stub.base_url,
+        connect_timeout=1.0,
+        read_timeout=2.0,
+        max_retries=2,
+        backoff_base=0.01,
+        backoff_max=0.02,
+    )
+    kwargs.update(overrides)
+    return AIClient(**kwargs)
+
+
+def test_create_response_against_stub(stub):
+    client = make_client(stub)
+    try:
+        resp = client.create_response(input=[{"role": "user", "content": "hi"}])
+    finally:
+        client.close()
+
+    assert resp.output_text == '{"ok": true}'
+    assert stub.requests[0]["model"] == "stub-model"
+
+
+def test_retries_transient_errors(stub):
+    stub.fail_first = 2
+    client = make_client(stub)
+    try:
+        resp = client.create_response(input="hi")
+    finally:
+        client.close()
+
+    assert resp.output_text == '{"ok": true}'
+    assert len(stub.requests) == 3
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.fail_first = 10
+    client = make_client(stub, max_retries=1)
+    try:
+        with pytest.raises(AIUnavailableError):
+            client.create_response(input="hi")
+    finally:
+        client.close()
+
+    assert len(stub.requests) == 2
+
+
+def test_read_timeout_maps_to_unavailable(stub):
+    stub.delay = 0.5
+    client = make_client(stub, read_timeout=0.1, max_retries=0)
+    try:
+        with pytest.raises(AIUnavailableError):
+            client.create_response(input="hi")
+    finally:
+        client.close()
+
+
+def test_semaphore_rejects_when_saturated(stub):
+    stub.delay = 0.4
+    client = make_client(stub, max_concurrency=1, queue_timeout=0.05)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            slow = pool.submit(client.create_response, input="first")
+            time.sleep(0.1)  # first call now holds the only slot
+            with pytest.raises(AIUnavailableError):
+                client.create_response(input="second")
+            assert slow.result(timeout=5).output_text == '{"ok": true}'
+    finally:
+        client.close()
+
+
+def test_close_fails_calls_in_flight(stub):
+    stub.delay = 1.0
+    client = make_client(stub, max_retries=0)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        call = pool.submit(client.create_response, input="slow")
+        while not stub.requests:
+            time.sleep(0.01)
+        client.close()
+
+        with pytest.raises(AIUnavailableError):
+            call.result(timeout=0.5)
+
+    stub.delay = 0.0
+    assert client.create_response(input="again").output_text == '{"ok": true}'  # next call gets a new loop
+    client.close()
+
+
+def test_stream_text_yields_deltas(stub):
+    stub.fail_first = 1
+    client = make_client(stub)
+    try:
+        chunks = list(client.stream_text(input="hi"))
+    finally:
+        client.close()
+
+    assert chunks == ['{"ok"', ": true}"]
+    assert stub.requests[-1]["stream"] is True
+    assert len(stub.requests) == 2  # retried before anything was forwarded
+
+
+def test_missing_api_key_is_unavailable():
+    client = AIClient(api_key=None, model="x")
+    try:
+        with pytest.raises(AIUnavailableError):
+            client.create_response(input="hi")
+    finally:
+        client.close()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from sqlalchemy import select
+
+from app.exceptions.base import ConflictError
+from app.models.models import (
+    Group,
+    GroupMembership,
+    Membership,
+    MembershipRole,
+    WorkoutPlan,
+)
+from app.repositories.ai_quota import AIQuotaRepository, utc_today
+from app.repositories.ai_usage import AIUsageRepository
+from app.repositories.club import ClubRepository
+from app.repositories.group_membership import GroupMembershipRepository
+from app.repositories.membership import MembershipRepository
+from app.repositories.user import UserRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from app.schemas.workout_plan_ai import (
+    AIDraftExercise,
+    AIDraftItem,
+    WorkoutPlanAIDraft,
+    WorkoutPlanAIDraftRequest,
+    WorkoutPlanGroupAIDraftRequest,
+)
+from app.services.ai_quota import AIQuotaService
+from app.services.draft_providers import GeneratedDraft
+from app.services.membership import MembershipService
+from app.services.workout_plan import WorkoutPlanService
+from app.services.workout_plan_ai import FEATURE_WORKOUTPLAN_DRAFT, WorkoutPlanAIService
+from app.services.workout_plan_group_ai import WorkoutPlanGroupAIService
+
+COACH, ATHLETE = 1, 2
+
+
+@dataclass
+class BrokenDraftProvider:
+    """A paid draft whose exercises share a position: saving it fails on uq(item_id, position)."""
+
+    name: str = "openai"
+
+    def generate(self, req, *, club):
+        exercise = AIDraftExercise(name="Squat", sets=3, repetitions=5, position=0)
+        draft = WorkoutPlanAIDraft(
+            name="Broken",
+            items=[AIDraftItem(order_index=0, title="Day 1", exercises=[exercise, exercise.model_copy()])],
+        )
+        return GeneratedDraft(draft=draft, provider=self.name, billable=True)
+
+
+@pytest.fixture
+def db(file_db_maker):
+    with file_db_maker("refund.db", users=(COACH, ATHLETE))() as s:
+        s.add(Group(id=1, club_id=1, name="Juniors"))
+        s.flush()
+        s.add(Membership(club_id=1, user_id=COACH, role=MembershipRole.coach))
+        s.add(Membership(club_id=1, user_id=ATHLETE, role=MembershipRole.member))
+        s.add(GroupMembership(group_id=1, user_id=ATHLETE))
+        s.commit()
+        yield s
+
+
+def _quota(db) -> AIQuotaService:
+    return AIQuotaService(AIQuotaRepository(db), daily_limit=3, default_club_limit=10)
+
+
+def _membership_service(db) -> MembershipService:
+    return MembershipService(MembershipRepository(db), user_repo=UserRepository(db), club_repo=ClubRepository(db))
+
+
+def _request() -> WorkoutPlanAIDraftRequest:
+    return WorkoutPlanAIDraftRequest(goal="Build strength", level="beginner", duration_weeks=4, days_per_week=3)
+
+
+def _counts(db) -> tuple[int, int]:
+    repo = AIQuotaRepository(db)
+    return (
+        repo.get_user_count(user_id=COACH, feature=FEATURE_WORKOUTPLAN_DRAFT, day=utc_today()),
+        repo.get_club_count(club_id=1, feature=FEATURE_WORKOUTPLAN_DRAFT, day=utc_today()),
+    )
+
+
+def test_failed_save_is_rolled_back_before_the_refund(db):
+    service = WorkoutPlanAIService(
+        workout_plan_service=WorkoutPlanService(WorkoutPlanRepository(db), _membership_service(db)),
+        ai_usage_repo=AIUsageRepository(db),
+        club_repo=ClubRepository(db),
+        quota_service=_quota(db),
+        provider=BrokenDraftProvider(),
+        cache=None,
+        db=db,
+    )
+    with pytest.raises(ConflictError) as exc:
+        service.generate_and_create_plan(club_id=1, user_id=COACH, req=_request())
+
+    assert exc.value.status_code == 409
+    db.rollback()  # what the request's unit of work does with the error
+    assert _counts(db) == (0, 0)
+    assert db.execute(select(WorkoutPlan)).scalars().all() == []
+
+
+def test_failed_group_save_is_rolled_back_before_the_refund(db):
+    service = WorkoutPlanGroupAIService(
+        workout_plan_repo=WorkoutPlanRepository(db),
+        group_membership_repo=GroupMembershipRepository(db),
+        membership_service=_membership_service(db),
+        club_repo=ClubRepository(db),
+        ai_usage_repo=AIUsageRepository(db),
+        quota_service=_quota(db),
+        provider=BrokenDraftProvider(),
+        cache=None,
+        db=db,
+    )
+    req = WorkoutPlanGroupAIDraftRequest(request=_request())
+
+    with pytest.raises(ConflictError):
+        service.generate_for_group(club_id=1, group_id=1, user_id=COACH, req=req)
+
+    db.rollback()
+    assert _counts(db) == (0, 0)
+    assert db.execute(select(WorkoutPlan)).scalars().all() == []
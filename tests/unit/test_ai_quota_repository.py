@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from app.repositories.ai_quota import AIQuotaRepository
+
+DAY = date(2026, 2, 11)
+FEATURE = "workout_plan_draft"
+
+
+@pytest.fixture
+def session_factory(file_db_maker):
+    return file_db_maker("quota.db", users=(1, 2))
+
+
+def _reserve(session_factory, user_id=1, user_limit=3, club_limit=None):
+    with session_factory() as s:
+        return AIQuotaRepository(s).try_reserve(
+            user_id=user_id, club_id=1, feature=FEATURE,
+            user_limit=user_limit, club_limit=club_limit, day=DAY,
+        )
+
+
+def _counts(session_factory, user_id=1):
+    with session_factory() as s:
+        repo = AIQuotaRepository(s)
+        return (
+            repo.get_user_count(user_id=user_id, feature=FEATURE, day=DAY),
+            repo.get_club_count(club_id=1, feature=FEATURE, day=DAY),
+        )
+
+
+def test_reserve_until_user_limit(session_factory):
+    results = [_reserve(session_factory) for _ in range(4)]
+
+    assert results == [None, None, None, "user"]
+    assert _counts(session_factory) == (3, 0)
+
+
+def test_club_limit_rolls_back_user_increment(session_factory):
+    assert _reserve(session_factory, user_id=1, club_limit=1) is None
+    assert _reserve(session_factory, user_id=2, club_limit=1) == "club"
+
+    assert _counts(session_factory, user_id=2) == (0, 1)
+
+
+def test_refund_gives_unit_back(session_factory):
+    _reserve(session_factory, club_limit=5)
+    with session_factory() as s:
+        AIQuotaRepository(s).refund(user_id=1, club_id=1, feature=FEATURE, day=DAY, club=True)
+        AIQuotaRepository(s).refund(user_id=1, club_id=1, feature=FEATURE, day=DAY, club=True)  # never below 0
+
+    assert _counts(session_factory) == (0, 0)
+
+
+def test_concurrent_reservations_never_exceed_limit(session_factory):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: _reserve(session_factory, user_limit=3), range(20)))
+
+    assert results.count(None) == 3
+    assert _counts(session_factory) == (3, 0)
+
+
+def _reserve_club(session_factory, units, limit=None):
+    with session_factory() as s:
+        return AIQuotaRepository(s).try_reserve_club(
+            club_id=1, feature=FEATURE, units=units, limit=limit, day=DAY,
+        )
+
+
+def test_club_reservation_is_all_or_nothing(session_factory):
+    assert _reserve_club(session_factory, 3, limit=5) is True
+    assert _reserve_club(session_factory, 3, limit=5) is False
+    assert _reserve_club(session_factory, 6, limit=5) is False  # larger than the limit on a fresh row too
+    assert _reserve_club(session_factory, 2, limit=5) is True
+
+    assert _counts(session_factory) == (0, 5)
+
+
+def test_club_reservation_without_limit_still_counts(session_factory):
+    assert _reserve_club(session_factory, 4) is True
+    with session_factory() as s:
+        AIQuotaRepository(s).refund_club(club_id=1, feature=FEATURE, units=3, day=DAY)
+        AIQuotaRepository(s).refund_club(club_id=1, feature=FEATURE, units=3, day=DAY)  # never below 0
+
+    assert _counts(session_factory) == (0, 0)
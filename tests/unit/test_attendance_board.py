@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.endpoints import attendances
+from app.auth.jwt_utils import create_access_token
+from app.models.models import (
+    Attendance,
+    AttendanceStatus,
+    Club,
+    Membership,
+    MembershipRole,
+    Plan,
+    PlanType,
+    Session as TrainingSession,
+    User,
+    UserRole,
+)
+from app.realtime import pubsub
+from app.realtime.attendance import EVENT_CREATED, EVENT_UPDATED, attendance_channel
+from app.realtime.pubsub import Broker, LocalBackend
+
+START = datetime(2026, 3, 2, 18, tzinfo=timezone.utc)
+
+
+class RecordingBackend(LocalBackend):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        super().publish(channel, message)
+
+
+def _seed(s, *, user_ids=(1, 2), club_id=1):
+    """Club/plan/session all get id `club_id`; the first user coaches it."""
+    for uid in user_ids:
+        s.add(User(id=uid, name=f"U{uid}", email=f"board{uid}@example.com", password_hash="x", role=UserRole.athlete))
+    s.add(Club(id=club_id, name=f"Board Club {club_id}", slug=f"board-club-{club_id}"))
+    s.flush()
+    s.add(Membership(club_id=club_id, user_id=user_ids[0], role=MembershipRole.coach))
+    s.add(Plan(id=club_id, club_id=club_id, name=f"Board Plan {club_id}", plan_type=PlanType.club, created_by_id=user_ids[0]))
+    s.flush()
+    s.add(TrainingSession(
+        id=club_id, plan_id=club_id, club_id=club_id, name="S1", starts_at=START,
+        ends_at=START + timedelta(hours=1), location="Field", created_by=user_ids[0],
+    ))
+    s.commit()
+
+
+# ---------------------------------------------------------------------------
+# Broker
+# ---------------------------------------------------------------------------
+
+def test_broker_fans_out_one_publish_to_every_local_subscriber():
+    async def scenario():
+        broker = Broker(queue_size=10)
+        a, b = broker.subscribe("ch"), broker.subscribe("ch")
+        other = broker.subscribe("other")
+        await asyncio.to_thread(broker.publish, "ch", {"n": 1})  # publishers live in worker threads
+        got = await asyncio.gather(a.get(), b.get())
+        broker.unsubscribe(a)
+        assert broker.subscriber_count("ch") == 1
+        return got, other._queue.qsize()
+
+    got, other_pending = asyncio.run(scenario())
+
+    assert got == [{"n": 1}, {"n": 1}]
+    assert other_pending == 0
+
+
+def test_slow_subscribers_are_cut_off():
+    async def scenario():
+        broker = Broker(queue_size=2)
+        sub = broker.subscribe("ch")
+        for n in range(5):
+            broker.publish("ch", {"n": n})
+        await asyncio.sleep(0)
+        return [await sub.get() for _ in range(3)], sub.overflowed
+
+    messages, overflowed = asyncio.run(scenario())
+
+    assert messages == [{"n": 0}, {"n": 1}, None]
+    assert overflowed is True
+
+
+class FakeSocket:
+    """Answers the first receive() at once; the client leaves once an event got through."""
+
+    def __init__(self):
+        self.sent = []
+        self._delivered = asyncio.Event()
+        self._receives = 0
+
+    async def receive(self):
+        self._receives += 1
+        if self._receives == 1:
+            return {"type": "websocket.receive", "text": "ping"}
+        await self._delivered.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send_json(self, message):
+        self.sent.append(message)
+        self._delivered.set()
+
+
+def test_board_forwards_an_event_that_arrives_with_a_client_message():
+    async def scenario():
+        broker = Broker(queue_size=10)
+        sub = broker.subscribe("ch")
+        broker.publish("ch", {"n": 1})
+        await asyncio.sleep(0)  # queued before the pump starts: get and receive finish together
+        socket = FakeSocket()
+        await asyncio.wait_for(attendances._pump(socket, sub), timeout=5)
+        return socket.sent
+
+    assert asyncio.run(scenario()) == [{"n": 1}]
+
+
+# ---------------------------------------------------------------------------
+# Publish on commit
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def recording_broker(monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(pubsub, "_broker", Broker(backend))
+    return backend
+
+
+def test_attendance_changes_are_published_after_commit(file_db_maker, recording_broker):
+    with file_db_maker("board.db", users=(), clubs=())() as s:
+        _seed(s)
+
+        att = Attendance(session_id=1, user_id=2, status=AttendanceStatus.present)
+        s.add(att)
+        s.flush()
+        assert recording_broker.published == []  # not before the commit
+        s.commit()
+        att.status = AttendanceStatus.late
+        s.commit()
+
+        s.add(Attendance(session_id=1, user_id=1, status=AttendanceStatus.present))
+        s.flush()
+        s.rollback()
+
+    assert [(ch, m["type"], m["attendance"]["status"]) for ch, m in recording_broker.published] == [
+        (attendance_channel(1), EVENT_CREATED, "present"),
+        (attendance_channel(1), EVENT_UPDATED, "late"),
+    ]
+
+
+def test_a_new_session_maker_always_gets_the_publish_hooks(file_db_maker, recording_broker, monkeypatch):
+    # the event registry is keyed by id(); a collected maker's stale entry made a new one look hooked
+    monkeypatch.setattr(sa.event, "contains", lambda *args: True)
+    with file_db_maker("board.db", users=(), clubs=())() as s:
+        _seed(s)
+        s.add(Attendance(session_id=1, user_id=2, status=AttendanceStatus.present))
+        s.commit()
+
+    assert [m["type"] for _, m in recording_broker.published] == [EVENT_CREATED]
+
+
+# ---------------------------------------------------------------------------
+# WebSocket endpoint
+# ---------------------------------------------------------------------------
+
+def test_board_sends_snapshot_then_live_events(client, db):
+    _seed(db, user_ids=(901, 902), club_id=901)
+    db.add(Attendance(session_id=901, user_id=901, status=AttendanceStatus.present))
+    db.commit()
+    token = create_access_token(sub=901)
+
+    with client.websocket_connect(f"/clubs/901/sessions/901/attendances/live?token={token}") as ws:
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "snapshot"
+        assert [a["user_id"] for a in snapshot["attendances"]] == [901]
+
+        db.add(Attendance(session_id=901, user_id=902, status=AttendanceStatus.late))
+        db.commit()
+
+        event = ws.receive_json()
+        assert event["type"] == EVENT_CREATED
+        assert event["attendance"]["user_id"] == 902
+        assert event["attendance"]["status"] == "late"
+
+
+def test_board_rejects_non_coaches(client, db):
+    _seed(db, user_ids=(911, 912), club_id=911)
+    token = create_access_token(sub=912)  # not a member
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/clubs/911/sessions/911/attendances/live?token={token}") as ws:
+            ws.receive_json()
+
+    assert exc.value.code == 1008
@@ -0,0 +1,38 @@
+from app.utils.cache import TTLCache
+
+
+def make_cache(**kwargs):
+    now = [0.0]
+    cache = TTLCache(clock=lambda: now[0], **kwargs)
+    return cache, now
+
+
+def test_get_set_and_counters():
+    cache, _ = make_cache(ttl_seconds=10, max_entries=4)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_dropped():
+    cache, now = make_cache(ttl_seconds=10, max_entries=4)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=30)
+
+    now[0] = 15.0
+    assert cache.get("a") is None
+    assert [k for k, _ in cache.items()] == ["b"]
+
+
+def test_lru_eviction_respects_recent_reads():
+    cache, _ = make_cache(ttl_seconds=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
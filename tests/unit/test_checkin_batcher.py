@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+
+from app.exceptions.base import SessionNotFound
+from app.models.models import (
+    Attendance,
+    AttendanceStatus,
+    ChangeLog,
+    Plan,
+    PlanType,
+    Session as TrainingSession,
+)
+from app.services.checkin import CheckIn, CheckInBatcher
+
+COACH = 1
+ATHLETES = range(2, 62)
+START = datetime(2026, 3, 2, 18, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    maker = file_db_maker("checkin.db", users=(COACH, *ATHLETES))
+    with maker() as s:
+        s.add(Plan(id=1, club_id=1, name="Plan", plan_type=PlanType.club, created_by_id=COACH))
+        s.flush()
+        s.add(TrainingSession(
+            id=1, plan_id=1, club_id=1, name="S1", starts_at=START,
+            ends_at=START + timedelta(hours=1), location="Field", created_by=COACH,
+        ))
+        s.commit()
+    return maker
+
+
+@pytest.fixture
+def batcher(maker):
+    batcher = CheckInBatcher(maker, window_seconds=0.02, max_batch=100)
+    yield batcher
+    batcher.shutdown()
+
+
+def _checkin(user_id, session_id=1, at=START):
+    return CheckIn(club_id=1, session_id=session_id, user_id=user_id, checked_in_at=at)
+
+
+def test_burst_of_checkins_is_coalesced_into_few_upserts(maker, batcher):
+    barrier = threading.Barrier(len(ATHLETES))
+    results = {}
+
+    def scan(uid):
+        barrier.wait()
+        results[uid] = batcher.submit(_checkin(uid)).result(timeout=5)
+
+    threads = [threading.Thread(target=scan, args=(uid,)) for uid in ATHLETES]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == list(ATHLETES)
+    assert all(row.created for row in results.values())
+    assert batcher.batches < len(ATHLETES) // 4
+    with maker() as s:
+        assert s.scalar(sa.select(sa.func.count()).select_from(Attendance)) == len(ATHLETES)
+        logged = s.execute(sa.select(ChangeLog.entity, ChangeLog.user_id)).all()
+        assert sorted(uid for entity, uid in logged if entity == "attendance") == list(ATHLETES)
+
+
+def test_rescans_keep_first_time_and_coach_status(maker, batcher):
+    with maker() as s:
+        s.add(Attendance(session_id=1, user_id=3, status=AttendanceStatus.late))
+        s.add(Attendance(session_id=1, user_id=4, status=AttendanceStatus.absent))
+        s.commit()
+
+    first = batcher.submit(_checkin(2)).result(timeout=5)
+    again = batcher.submit(_checkin(2, at=START + timedelta(minutes=5))).result(timeout=5)
+    late = batcher.submit(_checkin(3)).result(timeout=5)
+    absent = batcher.submit(_checkin(4)).result(timeout=5)
+
+    assert first.created and not again.created
+    assert again.id == first.id
+    assert again.checked_in_at.replace(tzinfo=timezone.utc) == START
+    assert late.status == AttendanceStatus.late
+    assert absent.status == AttendanceStatus.present
+
+
+def test_a_bad_checkin_only_fails_its_own_request(batcher):
+    batcher.window_seconds = 0.2  # make sure both land in one batch
+    good = batcher.submit(_checkin(2))
+    bad = batcher.submit(_checkin(3, session_id=999))  # session deleted after the code was issued
+
+    assert good.result(timeout=5).user_id == 2
+    with pytest.raises(SessionNotFound):
+        bad.result(timeout=5)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from app.db.base import Base
+from app.models.models import Membership, MembershipRole
+from benchmarks.datagen import SCALES, TABLES, generate
+
+
+def _engine(tmp_path):
+    engine = sa.create_engine(f"sqlite+pysqlite:///{tmp_path / 'bench.db'}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _table_counts(engine) -> dict[str, int]:
+    with engine.connect() as conn:
+        return {t.name: conn.execute(sa.select(sa.func.count()).select_from(t)).scalar_one() for t in TABLES}
+
+
+def _duplicates(conn, table: sa.Table) -> list[str]:
+    """Unique constraints/indexes of the table that the data breaks."""
+    keys = [c.columns for c in table.constraints if isinstance(c, sa.UniqueConstraint)]
+    keys += [i.columns for i in table.indexes if i.unique]
+    broken = []
+    for columns in keys:
+        cols = list(columns)
+        stmt = (
+            sa.select(*cols)
+            .where(*(c.is_not(None) for c in cols))  # NULLs never collide in a unique key
+            .group_by(*cols)
+            .having(sa.func.count() > 1)
+            .limit(1)
+        )
+        if conn.execute(stmt).first() is not None:
+            broken.append(f"{table.name}({', '.join(c.name for c in cols)})")
+    return broken
+
+
+def test_tiny_preset_loads_consistent_data(tmp_path):
+    engine = _engine(tmp_path)
+    scale = SCALES["tiny"]
+
+    dataset = generate(engine, scale, seed=1)
+
+    counts = _table_counts(engine)
+    assert dataset.counts == counts  # what it reports is what's in the database
+    assert (counts["users"], counts["clubs"]) == (scale.users, scale.clubs)
+    assert counts["memberships"] >= scale.users  # everyone is in at least one club
+    assert all(counts[name] > 0 for name in ("sessions", "attendances", "workout_plan_exercises"))
+
+    with engine.connect() as conn:
+        assert [name for table in TABLES for name in _duplicates(conn, table)] == []
+        assert conn.exec_driver_sql("PRAGMA foreign_key_check").all() == []
+        owners = conn.execute(
+            sa.select(sa.func.count())
+            .where(Membership.role == MembershipRole.owner)
+            .group_by(Membership.club_id)
+        ).scalars().all()
+        assert owners == [1] * scale.clubs
+
+
+def test_the_same_seed_gives_the_same_data_and_runs_append(tmp_path):
+    engine = _engine(tmp_path)
+    first = generate(engine, SCALES["tiny"], seed=7)
+    second = generate(engine, SCALES["tiny"], seed=7)  # explicit ids continue after the current maximum
+
+    assert first.counts == second.counts
+    assert _table_counts(engine) == {name: 2 * n for name, n in first.counts.items()}
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.exceptions.base import AIBusyError, AIUnavailableError
+from app.models.models import Club
+from app.schemas.workout_plan_ai import WorkoutPlanAIDraft, WorkoutPlanAIDraftRequest
+from app.services.draft_providers import (
+    CircuitBreaker,
+    DraftStream,
+    FallbackDraftProvider,
+    GeneratedDraft,
+    RuleBasedDraftProvider,
+)
+from app.services.rule_based_draft import EXERCISE_CATALOG, RuleBasedDraftGenerator
+
+
+CLUB = Club(id=1, name="FC Test", sport="football")
+
+
+def make_request(**overrides) -> WorkoutPlanAIDraftRequest:
+    data = dict(goal="beginner strength", level="beginner", duration_weeks=8, days_per_week=3)
+    data.update(overrides)
+    return WorkoutPlanAIDraftRequest(**data)
+
+
+# ---------- rule-based generator ----------
+
+def test_generator_builds_valid_plan_quickly():
+    start = time.perf_counter()
+    draft = RuleBasedDraftGenerator().build(make_request(), club=CLUB)
+    elapsed = time.perf_counter() - start
+
+    WorkoutPlanAIDraft.model_validate_json(draft.model_dump_json())
+    assert len(draft.items) == 8 * 3
+    assert {i.order_index for i in draft.items} == {0, 1, 2}
+    assert all(i.exercises for i in draft.items)
+    assert elapsed < 0.1
+
+
+def test_generator_is_deterministic():
+    gen = RuleBasedDraftGenerator()
+    assert gen.build(make_request(), club=CLUB) == gen.build(make_request(), club=CLUB)
+
+
+def test_generator_respects_equipment_and_constraints():
+    req = make_request(equipment=["Dumbbells"], constraints=["knee friendly", "no jumping"], days_per_week=5)
+    draft = RuleBasedDraftGenerator().build(req, club=CLUB)
+
+    catalog = {e.name: e for e in EXERCISE_CATALOG}
+    used = {ex.name for item in draft.items for ex in item.exercises}
+    assert used
+    for name in used:
+        assert catalog[name].equipment <= {"dumbbell"}
+        assert not catalog[name].tags & {"knee", "impact"}
+
+
+def test_generator_handles_largest_request():
+    draft = RuleBasedDraftGenerator().build(make_request(duration_weeks=52, days_per_week=7, level="advanced"))
+    WorkoutPlanAIDraft.model_validate_json(draft.model_dump_json())
+
+
+# ---------- circuit breaker ----------
+
+def test_breaker_opens_then_half_opens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] = 11
+    assert breaker.allow()        # single trial call
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_breaker_trial_failure_reopens():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 11
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+# ---------- fallback provider ----------
+
+def _remote(**kwargs) -> MagicMock:
+    remote = MagicMock(name="remote")
+    remote.name = "openai"
+    for k, v in kwargs.items():
+        setattr(remote, k, v)
+    return remote
+
+
+def test_fallback_on_upstream_failure_and_circuit_open():
+    remote = _remote(generate=MagicMock(side_effect=AIUnavailableError()))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    provider = FallbackDraftProvider(remote, RuleBasedDraftProvider(), breaker)
+
+    first = provider.generate(make_request(), club=CLUB)
+    second = provider.generate(make_request(), club=CLUB)
+
+    assert first.provider == second.provider == "local"
+    assert first.billable is False
+    assert remote.generate.call_count == 1  # circuit open -> remote skipped
+
+
+def test_busy_falls_back_without_tripping_breaker():
+    remote = _remote(generate=MagicMock(side_effect=AIBusyError()))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    provider = FallbackDraftProvider(remote, RuleBasedDraftProvider(), breaker)
+
+    assert provider.generate(make_request(), club=CLUB).provider == "local"
+    assert breaker.state == "closed"
+
+
+def test_remote_success_passes_through():
+    draft = RuleBasedDraftGenerator().build(make_request())
+    remote = _remote(generate=MagicMock(return_value=GeneratedDraft(draft, "openai", True)))
+    provider = FallbackDraftProvider(remote, RuleBasedDraftProvider(), CircuitBreaker())
+
+    assert provider.generate(make_request(), club=CLUB).provider == "openai"
+
+
+def _failing_chunks():
+    raise AIUnavailableError()
+    yield  # pragma: no cover
+
+
+def test_stream_falls_back_before_first_chunk():
+    remote = _remote(stream=MagicMock(return_value=DraftStream(_failing_chunks(), "openai", True)))
+    provider = FallbackDraftProvider(remote, RuleBasedDraftProvider(), CircuitBreaker())
+
+    stream = provider.stream(make_request(), club=CLUB)
+
+    assert stream.provider == "local"
+    WorkoutPlanAIDraft.model_validate_json("".join(stream.chunks))
+
+
+def test_stream_failure_after_first_chunk_is_raised():
+    def chunks():
+        yield '{"name": '
+        raise AIUnavailableError()
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    remote = _remote(stream=MagicMock(return_value=DraftStream(chunks(), "openai", True)))
+    stream = FallbackDraftProvider(remote, RuleBasedDraftProvider(), breaker).stream(make_request(), club=CLUB)
+
+    assert next(stream.chunks) == '{"name": '
+    with pytest.raises(AIUnavailableError):
+        next(stream.chunks)
+    assert breaker.state == "open"
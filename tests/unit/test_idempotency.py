@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.auth.jwt_utils import create_access_token
+from app.core.idempotency import IdempotencyMiddleware
+from app.models.models import IdempotencyKey
+
+
+class Payload(BaseModel):
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    return file_db_maker("idem.db", users=(), clubs=())
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def client(maker, calls):
+    app = FastAPI()
+
+    @app.post("/things", status_code=201)
+    def create_thing(payload: Payload):
+        calls.append(payload.name)
+        time.sleep(payload.delay)
+        if payload.fail:
+            raise HTTPException(status_code=503, detail="try later")
+        return {"id": len(calls), "name": payload.name}
+
+    app.add_middleware(IdempotencyMiddleware, session_factory=maker, wait_seconds=2.0, poll_seconds=0.01)
+    with TestClient(app) as c:
+        yield c
+
+
+def _post(client, key, name="a", **kwargs):
+    headers = {"Idempotency-Key": key, **kwargs.pop("headers", {})}
+    return client.post("/things", json={"name": name, **kwargs}, headers=headers)
+
+
+def test_retry_replays_the_stored_response(client, calls):
+    first = _post(client, "k1")
+    again = _post(client, "k1")
+
+    assert calls == ["a"]
+    assert again.status_code == first.status_code == 201
+    assert again.json() == first.json()
+    assert again.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+
+def test_requests_without_a_key_are_untouched(client, calls):
+    client.post("/things", json={"name": "a"})
+    client.post("/things", json={"name": "a"})
+
+    assert calls == ["a", "a"]
+
+
+def test_reusing_a_key_for_another_request_is_rejected(client, calls):
+    _post(client, "k1", name="a")
+    r = _post(client, "k1", name="b")
+
+    assert r.status_code == 422
+    assert calls == ["a"]
+
+
+def test_keys_are_scoped_per_user(client, calls):
+    for sub in (1, 2):
+        r = _post(client, "same", headers={"Authorization": f"Bearer {create_access_token(sub=sub)}"})
+        assert r.status_code == 201
+
+    assert calls == ["a", "a"]
+
+
+def test_server_errors_are_not_stored(client, calls, maker):
+    assert _post(client, "k1", fail=True).status_code == 503
+    assert _post(client, "k1", fail=True).status_code == 503
+
+    assert len(calls) == 2
+    with maker() as s:
+        assert s.scalar(sa.select(sa.func.count()).select_from(IdempotencyKey)) == 0
+
+
+def test_concurrent_duplicates_wait_for_the_first_response(client, calls):
+    results = []
+
+    def send():
+        results.append(_post(client, "race", delay=0.3))
+
+    threads = [threading.Thread(target=send) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["a"]
+    assert [r.status_code for r in results] == [201, 201, 201]
+    assert len({r.text for r in results}) == 1
+    assert sorted(r.headers.get("idempotent-replayed", "") for r in results) == ["", "true", "true"]
+
+
+def test_expired_keys_run_again_and_are_purged(client, calls, maker):
+    _post(client, "old")
+    with maker() as s:
+        s.execute(sa.update(IdempotencyKey).values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        s.commit()
+
+    r = _post(client, "old")
+
+    assert r.status_code == 201 and "idempotent-replayed" not in r.headers
+    assert calls == ["a", "a"]
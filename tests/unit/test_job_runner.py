@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.jobs.runner import JobRunner
+from app.models.models import Job, JobStatus, UserRole
+from app.repositories.job import JobRepository
+from app.exceptions.base import UnknownJobTypeError
+
+
+@pytest.fixture
+def session_factory(file_db_maker):
+    return file_db_maker("jobs.db", users=(1,), clubs=(), role=UserRole.trainer)
+
+
+def _create_job(session_factory, job_type: str, payload: dict | None = None) -> int:
+    with session_factory() as s:
+        return JobRepository(s).create(
+            job_type=job_type, created_by_id=1, club_id=None, payload=payload or {}
+        ).id
+
+
+def _load(session_factory, job_id: int):
+    with session_factory() as s:
+        return JobRepository(s).get(job_id)
+
+
+def test_runner_marks_success_and_stores_result(session_factory):
+    runner = JobRunner(session_factory, concurrency={"echo": 1})
+
+    def _echo(ctx):
+        ctx.report_progress(50)
+        return {"echo": ctx.payload["value"]}
+
+    runner.register("echo", _echo)
+    job_id = _create_job(session_factory, "echo", {"value": 42})
+
+    runner.submit(job_id, "echo").result(timeout=5)
+    runner.shutdown()
+
+    job = _load(session_factory, job_id)
+    assert job.status == JobStatus.succeeded
+    assert job.result == {"echo": 42}
+    assert job.progress == 100
+    assert job.started_at is not None and job.finished_at is not None
+
+
+def test_runner_records_handler_failure(session_factory):
+    runner = JobRunner(session_factory)
+
+    def _boom(ctx):
+        raise ValueError("bad input")
+
+    runner.register("boom", _boom)
+    job_id = _create_job(session_factory, "boom")
+
+    runner.submit(job_id, "boom").result(timeout=5)
+    runner.shutdown()
+
+    job = _load(session_factory, job_id)
+    assert job.status == JobStatus.failed
+    assert "bad input" in job.error
+
+
+def test_runner_rejects_unknown_job_type(session_factory):
+    runner = JobRunner(session_factory)
+    with pytest.raises(UnknownJobTypeError):
+        runner.submit(1, "missing")
+
+
+def _hold(session_factory, job_id: int, *, worker: str, status: JobStatus, beat_ago: float) -> None:
+    with session_factory() as s:
+        job = s.get(Job, job_id)
+        job.status, job.locked_by = status, worker
+        job.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=beat_ago)
+        s.commit()
+
+
+def test_recover_takes_over_only_jobs_without_a_live_lease(session_factory):
+    runner = JobRunner(session_factory, lease_seconds=60)
+    runner.register("echo", lambda ctx: {"ok": True})
+
+    orphan_queued = _create_job(session_factory, "echo")  # never held by anyone
+    crashed = _create_job(session_factory, "echo")
+    _hold(session_factory, crashed, worker="gone:1:a", status=JobStatus.running, beat_ago=600)
+    busy = _create_job(session_factory, "echo")
+    _hold(session_factory, busy, worker="live:2:b", status=JobStatus.running, beat_ago=5)
+    pooled = _create_job(session_factory, "echo")
+    _hold(session_factory, pooled, worker="live:2:b", status=JobStatus.queued, beat_ago=5)
+
+    assert runner.recover() == 2
+    runner.shutdown(wait=True)
+
+    assert _load(session_factory, orphan_queued).status == JobStatus.succeeded
+    assert _load(session_factory, crashed).status == JobStatus.succeeded
+    assert _load(session_factory, crashed).locked_by == runner.worker_id
+    assert _load(session_factory, busy).status == JobStatus.running
+    assert _load(session_factory, pooled).status == JobStatus.queued
+
+
+def test_a_job_in_two_pools_runs_once(session_factory):
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def _slow(ctx):
+        calls.append(ctx.job_id)
+        started.set()
+        release.wait(5)
+
+    first, second = JobRunner(session_factory), JobRunner(session_factory)
+    first.register("slow", _slow)
+    second.register("slow", _slow)
+    job_id = _create_job(session_factory, "slow")
+
+    running = first.submit(job_id, "slow")
+    assert started.wait(5)
+    second.submit(job_id, "slow").result(timeout=5)  # claim fails, the handler never starts
+    release.set()
+    running.result(timeout=5)
+    first.shutdown()
+    second.shutdown()
+
+    assert calls == [job_id]
+    assert _load(session_factory, job_id).status == JobStatus.succeeded
+
+
+def test_running_jobs_keep_their_lease(session_factory):
+    release = threading.Event()
+    runner = JobRunner(session_factory, lease_seconds=0.15)
+    runner.register("slow", lambda ctx: release.wait(5))
+    job_id = _create_job(session_factory, "slow")
+
+    future = runner.submit(job_id, "slow")
+    claimed_at = None
+    for _ in range(100):
+        job = _load(session_factory, job_id)
+        if job.status == JobStatus.running:
+            claimed_at = claimed_at or job.heartbeat_at
+            if job.heartbeat_at > claimed_at:
+                break
+        release.wait(0.02)
+    release.set()
+    future.result(timeout=5)
+    runner.shutdown()
+
+    assert claimed_at is not None and job.heartbeat_at > claimed_at
+    assert job.locked_by == runner.worker_id
+
+
+def test_concurrency_is_per_job_type(session_factory):
+    runner = JobRunner(session_factory, concurrency={"slow": 3}, default_concurrency=1)
+    runner.register("slow", lambda ctx: None)
+    runner.register("other", lambda ctx: None)
+
+    assert runner._pool_for("slow")._max_workers == 3
+    assert runner._pool_for("other")._max_workers == 1
+    runner.shutdown()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.loadtest import Recorder, compare, in_process, percentile, print_report
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(100, 0, -1)]  # unsorted on purpose
+
+    assert [percentile(values, p) for p in (50, 95, 99, 100)] == [50.0, 95.0, 99.0, 100.0]
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([1.0, 2.0, 3.0], 0) == 1.0  # never below the first rank
+
+
+def test_summary_counts_errors_throughput_and_percentiles():
+    recorder = Recorder()
+    for ms in (10.0, 20.0, 30.0, 40.0):
+        recorder.record("GET /me/dashboard", "200", ms)
+    recorder.record("POST /auth/login", "200", 5.0)
+    recorder.record("POST /auth/login", "429", 1.0)
+    recorder.record("POST /auth/login", "ConnectError", 2.0)
+    recorder.scenarios["dashboard"] += 4
+
+    summary = recorder.summary(seconds=2.0)
+
+    assert summary["totals"] == {"requests": 7, "errors": 2, "throughput_rps": 3.5}
+    dashboard = summary["endpoints"]["GET /me/dashboard"]
+    assert (dashboard["count"], dashboard["errors"], dashboard["throughput_rps"]) == (4, 0, 2.0)
+    assert (dashboard["mean_ms"], dashboard["max_ms"]) == (25.0, 40.0)
+    assert (dashboard["p50_ms"], dashboard["p95_ms"], dashboard["p99_ms"]) == (20.0, 40.0, 40.0)
+    assert summary["endpoints"]["POST /auth/login"]["statuses"] == {"200": 1, "429": 1, "ConnectError": 1}
+    assert summary["scenarios"] == {"dashboard": 4}
+
+
+def _report(**endpoints) -> dict:
+    return {
+        "endpoints": {name: {"p95_ms": p95, "throughput_rps": rps} for name, (p95, rps) in endpoints.items()},
+    }
+
+
+def test_compare_reports_relative_changes():
+    after = _report(dashboard=(120.0, 45.0), login=(80.0, 10.0), new=(5.0, 1.0))
+    before = _report(dashboard=(100.0, 50.0), login=(80.0, 0.0))
+
+    assert compare(after, before) == {
+        "dashboard": ("+20%", "-10%"),
+        "login": ("+0%", ""),  # no throughput to compare with
+        "new": ("", ""),  # not in the baseline
+    }
+
+
+def test_print_report_shows_the_deltas(capsys):
+    recorder = Recorder()
+    recorder.record("GET /me/dashboard", "200", 30.0)
+    report = {"meta": {"personas": 1, "login_burst_s": 0.1}, **recorder.summary(seconds=1.0)}
+    baseline = {"endpoints": {"GET /me/dashboard": {"p95_ms": 20.0, "throughput_rps": 2.0}}}
+
+    print_report(report, baseline)
+
+    out = capsys.readouterr().out
+    assert "Δp95" in out
+    assert "+50%" in out and "-50%" in out
+
+
+def test_in_process_runs_the_app_lifespan():
+    events = []
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/ping")
+    def ping() -> dict:
+        return {"started": events == ["startup"]}
+
+    async def scenario():
+        async with in_process(app) as transport:
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                return (await client.get("/ping")).json()
+
+    assert asyncio.run(scenario()) == {"started": True}
+    assert events == ["startup", "shutdown"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import sqlalchemy as sa
+
+from app.core.metrics import (
+    AI_TOKENS,
+    DB_POOL_WAIT,
+    HTTP_DB_STATEMENTS,
+    HTTP_REQUESTS,
+    Counter,
+    Histogram,
+    observe_ai_call,
+)
+from app.db.database import TimedQueuePool
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    hist.observe(0.05, "/a")
+    hist.observe(0.5, "/a")
+    hist.observe(3.0, "/a")
+
+    assert hist.render() == [
+        "# HELP t_seconds Test.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{route="/a",le="0.1"} 1',
+        't_seconds_bucket{route="/a",le="1"} 2',
+        't_seconds_bucket{route="/a",le="+Inf"} 3',
+        't_seconds_sum{route="/a"} 3.55',
+        't_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("t_total", "Test.", ("path",))
+    counter.inc('a"b\\c')
+
+    assert counter.render()[-1] == 't_total{path="a\\"b\\\\c"} 1'
+
+
+def test_requests_are_counted_per_route_with_their_db_statements(client, auth_token, auth_headers):
+    route = ("GET", "/users/me")
+    before = HTTP_REQUESTS.value(*route, "200"), HTTP_DB_STATEMENTS.count(*route)
+
+    assert client.get("/users/me", headers=auth_headers(auth_token)).status_code == 200
+
+    assert HTTP_REQUESTS.value(*route, "200") == before[0] + 1
+    assert HTTP_DB_STATEMENTS.count(*route) == before[1] + 1
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/users/me",status="200"}' in body
+    assert "threadpool_threads_limit" in body
+    assert 'route="/metrics"' not in body  # scrapes aren't counted
+
+
+def test_ai_token_usage_is_counted():
+    before = AI_TOKENS.value("gpt-test", "output")
+
+    observe_ai_call("create", "ok", 1.2, model="gpt-test", usage=SimpleNamespace(input_tokens=30, output_tokens=120))
+
+    assert AI_TOKENS.value("gpt-test", "output") == before + 120
+
+
+def test_pool_checkouts_are_timed(tmp_path):
+    engine = sa.create_engine(f"sqlite+pysqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+    before = DB_POOL_WAIT.count()
+
+    with engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+
+    assert DB_POOL_WAIT.count() == before + 1
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+
+from app.api.etag import NO_MATCH, etag_for, parse_if_match
+from app.exceptions.base import PreconditionFailedError
+from app.models.models import Club, UserRole, WorkoutPlan
+from app.repositories.club import ClubRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+
+COACH = 1
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    maker = file_db_maker("occ.db", users=(COACH,), role=UserRole.trainer)
+    with maker() as s:
+        s.add(WorkoutPlan(id=1, club_id=1, name="Base", created_by_id=COACH))
+        s.commit()
+    return maker
+
+
+def test_updates_bump_the_version(maker):
+    with maker() as db:
+        repo = WorkoutPlanRepository(db)
+        assert repo.get_plan(club_id=1, plan_id=1).version_id == 1
+
+        plan = repo.update_plan(club_id=1, plan_id=1, patch={"name": "Base v2"}, expected_version=1)
+
+        assert plan.version_id == 2
+
+
+def test_stale_if_match_is_rejected_before_writing(maker):
+    with maker() as db:
+        repo = WorkoutPlanRepository(db)
+        repo.update_plan(club_id=1, plan_id=1, patch={"name": "First"})
+
+        with pytest.raises(PreconditionFailedError):
+            repo.update_plan(club_id=1, plan_id=1, patch={"name": "Lost update"}, expected_version=1)
+
+        assert repo.get_plan(club_id=1, plan_id=1).name == "First"
+
+
+def test_concurrent_write_between_read_and_commit_is_a_412(maker):
+    with maker() as a, maker() as b:
+        club = a.get(Club, 1)  # a reads version 1 ...
+        b.get(Club, 1).name = "Renamed by b"  # ... b commits version 2 in between
+        b.commit()
+
+        with pytest.raises(PreconditionFailedError):
+            ClubRepository(a).update_club(club, expected_version=1, name="Renamed by a")
+
+    with maker() as db:
+        assert db.execute(sa.select(Club.name, Club.version_id).where(Club.id == 1)).one() == ("Renamed by b", 2)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [(None, None), ("*", None), ('"4"', 4), ('W/"4"', NO_MATCH), ("4", NO_MATCH), ('"x"', NO_MATCH)],
+)
+def test_parse_if_match(header, expected):
+    assert parse_if_match(header) == expected
+
+
+def test_etag_round_trips():
+    assert parse_if_match(etag_for(7)) == 7
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.models.models import (
+    Group,
+    GroupMembership,
+    Plan,
+    PlanAssignee,
+    PlanAssigneeRole,
+    PlanType,
+)
+from app.repositories.plan import PlanRepository
+
+ME = 1
+COACH = 2
+
+
+@pytest.fixture
+def db(file_db_maker):
+    with file_db_maker("plans.db", users=(ME, COACH, 3), clubs=(1, 2))() as s:
+        s.add_all([Group(id=1, club_id=1, name="Juniors"), Group(id=2, club_id=1, name="Seniors")])
+        s.add_all([GroupMembership(group_id=1, user_id=ME), GroupMembership(group_id=2, user_id=3)])
+        for pid, club_id, name in [(1, 1, "Direct"), (2, 1, "Via group"), (3, 1, "Both"), (4, 1, "Other group"), (5, 2, "Other club")]:
+            s.add(Plan(id=pid, club_id=club_id, name=name, plan_type=PlanType.club, created_by_id=COACH))
+        s.flush()
+        s.add_all([
+            _assign(1, user_id=ME),
+            _assign(2, group_id=1),
+            _assign(3, user_id=ME, role=PlanAssigneeRole.coach),
+            _assign(3, group_id=1),
+            _assign(4, group_id=2),
+            _assign(5, user_id=ME),
+        ])
+        s.commit()
+        yield s
+
+
+def _assign(plan_id, *, user_id=None, group_id=None, role=PlanAssigneeRole.athlete):
+    return PlanAssignee(plan_id=plan_id, user_id=user_id, group_id=group_id, role=role, assigned_by_id=COACH)
+
+
+def test_assigned_plans_include_group_assignments(db):
+    plans = PlanRepository(db).list_assigned_plans(club_id=1, user_id=ME)
+
+    assert [p.name for p in plans] == ["Both", "Direct", "Via group"]
+
+
+def test_assigned_plans_role_filter_applies_to_both_paths(db):
+    repo = PlanRepository(db)
+
+    assert [p.name for p in repo.list_assigned_plans(club_id=1, user_id=ME, role=PlanAssigneeRole.coach)] == ["Both"]
+    assert [p.name for p in repo.list_assigned_plans(club_id=1, user_id=ME, role=PlanAssigneeRole.athlete)] == [
+        "Both", "Direct", "Via group",
+    ]
+
+
+def test_assigned_plans_is_a_single_query(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    PlanRepository(db).list_assigned_plans(club_id=1, user_id=ME)
+
+    assert len(statements) == 1
+    assert "UNION" in statements[0]
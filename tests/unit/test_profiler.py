@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import sqlalchemy as sa
+
+from app.core.profiler import Sampler
+from app.models.models import User, UserRole
+from tests.helpers_auth import login_and_get_token, register_user
+
+
+def _busy_profiled_work(until: float) -> None:
+    while time.perf_counter() < until:
+        sum(range(100))
+
+
+def test_samples_only_registered_threads_and_exports_speedscope():
+    sampler = Sampler(interval_ms=1)
+    done = threading.Event()
+
+    def registered():
+        sampler.enter_thread()
+        try:
+            _busy_profiled_work(time.perf_counter() + 0.1)
+        finally:
+            sampler.exit_thread()
+
+    def bystander():
+        done.wait(1)  # never registered: its stack must not show up
+
+    workers = [threading.Thread(target=registered), threading.Thread(target=bystander)]
+    sampler.start()
+    for t in workers:
+        t.start()
+    workers[0].join()
+    sampler.stop()
+    done.set()
+    workers[1].join()
+
+    report = sampler.speedscope("test")
+    frames = report["shared"]["frames"]
+    names = {frames[i]["name"] for stack in report["profiles"][0]["samples"] for i in stack}
+    assert sampler.sample_count > 0
+    assert "_busy_profiled_work" in names
+    assert "bystander" not in names
+    profile = report["profiles"][0]
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert profile["endValue"] == round(sum(profile["weights"]), 3)
+
+
+def test_nested_enter_keeps_the_thread_registered():
+    sampler = Sampler()
+    sampler.enter_thread()
+    sampler.enter_thread()
+    sampler.exit_thread()
+
+    assert threading.get_ident() in sampler._threads
+    sampler.exit_thread()
+    assert sampler._threads == {}
+
+
+def test_async_phases_are_not_sampled_and_the_profile_says_so():
+    sampler = Sampler()
+
+    async def endpoint():
+        sampler.enter_thread()  # on the event loop, next to every other request's coroutines
+        sampler.exit_thread()
+
+    asyncio.run(endpoint())
+
+    assert sampler._threads == {}
+    assert sampler.skipped_async
+    report = sampler.speedscope("GET /x")
+    assert report["name"] == report["profiles"][0]["name"] == "GET /x (async code not sampled)"
+
+
+def _admin_token(client, db, email: str) -> str:
+    register_user(client, email, "pw123456")
+    db.execute(sa.update(User).where(User.email == email).values(role=UserRole.admin))
+    db.commit()
+    return login_and_get_token(client, email, "pw123456")
+
+
+def test_admin_can_profile_a_request_and_download_the_report(client, db, auth_headers, rand_email):
+    headers = auth_headers(_admin_token(client, db, rand_email("admin")))
+
+    resp = client.get("/memberships/mine", headers={**headers, "X-Profile": "1"})
+
+    assert resp.status_code == 200
+    profile_id = int(resp.headers["x-profile-id"])
+    listed = client.get("/admin/profiles", headers=headers).json()
+    assert {"id": profile_id, "method": "GET", "path": "/memberships/mine", "status_code": 200}.items() <= listed[0].items()
+
+    report = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+    assert report.status_code == 200
+    assert "attachment" in report.headers["content-disposition"]
+    assert report.json()["profiles"][0]["type"] == "sampled"
+
+
+def test_profile_header_is_ignored_for_non_admins(client, auth_token, auth_headers):
+    resp = client.get("/memberships/mine", headers={**auth_headers(auth_token), "X-Profile": "1"})
+
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+    assert client.get("/admin/profiles", headers=auth_headers(auth_token)).status_code == 403
+    assert client.get("/admin/profiles/1", headers=auth_headers(auth_token)).status_code == 403
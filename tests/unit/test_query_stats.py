@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+
+from app.db.base import Base
+from app.db.query_stats import QueryStats, explain, instrument_engine, parameter_shape, query_stats
+from app.models.models import Club, User, UserRole
+from app.repositories.club import ClubRepository
+from sqlalchemy.orm import Session
+from tests.helpers_auth import login_and_get_token, register_user
+
+
+def _engine(tmp_path, stats: QueryStats, slow_ms: float):
+    engine = sa.create_engine(f"sqlite+pysqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as s:
+        s.add(Club(id=1, name="Club", slug="club"))
+        s.commit()
+    instrument_engine(engine, stats=stats, slow_ms=slow_ms)
+    return engine
+
+
+def test_statements_are_totalled_per_query_shape():
+    stats = QueryStats()
+    stats.record("SELECT a", 5.0)
+    stats.record("SELECT b", 2.0, caller="Repo.b")
+    stats.record("SELECT b", 4.0)
+
+    top = stats.top(1)
+
+    assert [(s.statement, s.calls, s.total_ms, s.max_ms, s.mean_ms, s.caller) for s in top] == [
+        ("SELECT b", 2, 6.0, 4.0, 3.0, "Repo.b")
+    ]
+
+
+def test_a_full_table_evicts_the_cheapest_statement():
+    stats = QueryStats(max_statements=2)
+    stats.record("expensive", 50.0)
+    stats.record("cheap", 1.0)
+    stats.record("new", 2.0)
+
+    assert [s.statement for s in stats.top(10)] == ["expensive", "new"]
+
+
+def test_parameter_shape_has_types_not_values():
+    assert parameter_shape({"email_1": "a@example.com", "id_1": 3}) == {"email_1": "str", "id_1": "int"}
+    assert parameter_shape([("a", 1), ("b", 2)], executemany=True) == {"rows": 2, "row": ["str", "int"]}
+
+
+def test_slow_statements_are_logged_with_caller_and_plan(tmp_path, caplog):
+    stats = QueryStats()
+    engine = _engine(tmp_path, stats, slow_ms=1e-6)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"), Session(engine) as db:
+        assert ClubRepository(db).get_club(1).name == "Club"
+
+    (record,) = [r for r in caplog.records if "FROM clubs" in r.statement]
+    assert record.caller == "ClubRepository.get_club"
+    assert "clubs" in record.plan  # sqlite: "SEARCH clubs USING INTEGER PRIMARY KEY (rowid=?)"
+    assert "parameters: ['int']" in record.getMessage()  # the id itself isn't logged
+    assert stats.top(1)[0].caller == "ClubRepository.get_club"
+
+
+def test_a_new_engine_is_always_instrumented(tmp_path, monkeypatch):
+    # the event registry is keyed by id(); a disposed engine's stale entry made a new one look instrumented
+    monkeypatch.setattr(sa.event, "contains", lambda *args: True)
+    stats = QueryStats()
+    engine = _engine(tmp_path, stats, slow_ms=60_000)
+
+    with engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+
+    assert [s.statement for s in stats.top()] == ["SELECT 1"]
+
+
+def test_fast_statements_are_only_counted(tmp_path, caplog):
+    stats = QueryStats()
+    engine = _engine(tmp_path, stats, slow_ms=60_000)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_queries"), engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+        conn.execute(sa.text("SELECT 1"))
+
+    assert not caplog.records
+    assert [(s.statement, s.calls) for s in stats.top()] == [("SELECT 1", 2)]
+
+
+class RecordingConnection:
+    """A Postgres DBAPI connection that logs what runs on it; EXPLAINs of `fail` raise."""
+
+    autocommit = False
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.executed: list[str] = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, parameters=None):
+        self.executed.append(sql)
+        if self.fail and sql.startswith("EXPLAIN"):
+            raise RuntimeError("column does not exist")
+
+    def fetchall(self):
+        return [("Seq Scan on clubs",)]
+
+    def close(self):
+        pass
+
+
+def _explain(conn, statement, **kwargs):
+    cursor = type("Cursor", (), {"connection": conn})()
+    return explain(cursor, "postgresql", statement, {}, **kwargs)
+
+
+def test_postgres_explain_runs_in_a_rolled_back_savepoint():
+    ok, broken = RecordingConnection(), RecordingConnection(fail=True)
+
+    assert _explain(ok, "SELECT * FROM clubs", analyze=True) == "Seq Scan on clubs"
+    assert _explain(broken, "SELECT * FROM clubs").startswith("EXPLAIN failed: RuntimeError")
+
+    for conn in (ok, broken):  # the request's transaction is usable afterwards either way
+        assert conn.executed[0] == "SAVEPOINT query_stats_explain"
+        assert conn.executed[-2:] == [
+            "ROLLBACK TO SAVEPOINT query_stats_explain", "RELEASE SAVEPOINT query_stats_explain",
+        ]
+
+
+def test_selects_with_side_effects_are_never_analyzed():
+    for statement in (
+        "SELECT * FROM clubs WHERE id = 1 FOR UPDATE",
+        "SELECT nextval('clubs_id_seq')",
+        "SELECT pg_advisory_xact_lock(1)",
+        "WITH gone AS (DELETE FROM clubs RETURNING id) SELECT * FROM gone",
+    ):
+        conn = RecordingConnection()
+        _explain(conn, statement, analyze=True)
+        assert conn.executed[1] == f"EXPLAIN {statement}"
+
+    conn = RecordingConnection()
+    _explain(conn, "SELECT * FROM clubs", analyze=True)
+    assert conn.executed[1] == "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM clubs"
+
+
+def test_query_stats_endpoint_is_admin_only(client, db, auth_headers, rand_email):
+    register_user(client, email := rand_email("admin"), "pw123456")
+    user_token = login_and_get_token(client, email, "pw123456")
+    assert client.get("/admin/query-stats", headers=auth_headers(user_token)).status_code == 403
+
+    db.execute(sa.update(User).where(User.email == email).values(role=UserRole.admin))
+    db.commit()
+    query_stats.record("SELECT slowest", 10_000.0)
+
+    resp = client.get("/admin/query-stats?limit=1", headers=auth_headers(user_token))
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == [
+        {
+            "statement": "SELECT slowest",
+            "calls": 1,
+            "total_ms": 10_000.0,
+            "mean_ms": 10_000.0,
+            "max_ms": 10_000.0,
+            "caller": None,
+        }
+    ]
+    assert client.delete("/admin/query-stats", headers=auth_headers(user_token)).status_code == 204
+    assert all(s.statement != "SELECT slowest" for s in query_stats.top(500))
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from starlette.requests import Request
+
+import app.db.deps as deps
+from app.auth.jwt_utils import create_access_token
+from app.db.database import build_session_maker
+from app.db.routing import Replica, ReplicaRouter
+from app.models.models import Club
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _maker(file_db_maker, club_name: str):
+    maker = file_db_maker(f"{club_name}.db", users=(), clubs=(1,))
+    with maker() as s:
+        s.get(Club, 1).name = club_name
+        s.commit()
+    return maker
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def router(file_db_maker, clock):
+    # each database names the club after itself, so reads show where they went
+    return ReplicaRouter(
+        _maker(file_db_maker, "primary"),
+        [
+            Replica("replica-a", _maker(file_db_maker, "replica-a")),
+            Replica("replica-b", _maker(file_db_maker, "replica-b")),
+        ],
+        eject_seconds=30,
+        pin_seconds=5,
+        clock=clock,
+    )
+
+
+def _source(db) -> str:
+    try:
+        return db.scalar(sa.select(Club.name).where(Club.id == 1))
+    finally:
+        db.close()
+
+
+def test_reads_round_robin_and_writes_use_the_primary(router):
+    reads = [_source(router.session(read_only=True)) for _ in range(4)]
+
+    assert reads == ["replica-a", "replica-b", "replica-a", "replica-b"]
+    assert _source(router.session(read_only=False)) == "primary"
+
+
+def test_failed_replica_is_ejected_then_retried(router, clock, tmp_path):
+    healthy = router.replicas[0].maker
+    router.replicas[0].maker = build_session_maker(f"sqlite+pysqlite:///{tmp_path / 'missing' / 'a.db'}")
+
+    assert [_source(router.session(read_only=True)) for _ in range(3)] == ["replica-b"] * 3
+    assert router.replicas[0].ejected_until == clock.now + 30
+
+    router.replicas[1].ejected_until = clock.now + 30
+    assert _source(router.session(read_only=True)) == "primary"  # nothing healthy left
+
+    router.replicas[0].maker = healthy
+    clock.now += 31
+    assert {_source(router.session(read_only=True)) for _ in range(2)} == {"replica-a", "replica-b"}
+
+
+def test_writer_reads_from_the_primary_for_a_while(router, clock):
+    router.record_write("user:1")
+
+    assert _source(router.session(read_only=True, principal="user:1")) == "primary"
+    assert _source(router.session(read_only=True, principal="user:2")) == "replica-a"
+    assert _source(router.session(read_only=True)) == "replica-b"
+
+    clock.now += 6
+    assert _source(router.session(read_only=True, principal="user:1")).startswith("replica")
+
+
+def test_get_db_routes_by_method_and_pins_writers(router, monkeypatch):
+    monkeypatch.setattr(deps, "db_router", router)
+    auth = [(b"authorization", f"Bearer {create_access_token(sub=7)}".encode())]
+
+    def run(method: str) -> str:
+        gen = deps.get_db(Request({"type": "http", "method": method, "headers": auth}))
+        name = next(gen).scalar(sa.select(Club.name).where(Club.id == 1))
+        with pytest.raises(StopIteration):
+            next(gen)
+        return name
+
+    assert run("GET") == "replica-a"
+    assert run("PATCH") == "primary"
+    assert router.is_pinned("user:7")
+    assert run("GET") == "primary"
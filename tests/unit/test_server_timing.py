@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from unittest.mock import MagicMock
+
+from fastapi.routing import APIRoute
+
+from app.api.routing import TimedRoute
+from app.core.request_timing import (
+    RequestTiming,
+    ServerTimingMiddleware,
+    begin_request,
+    end_request,
+    server_timing_header,
+    timed,
+)
+from app.main import app
+from app.models.models import MembershipRole
+from app.repositories.membership import MembershipRepository
+from app.services.membership import MembershipService
+
+
+def _durations(header: str) -> dict[str, float]:
+    return {name: float(dur) for name, dur in re.findall(r"(\w+);dur=([\d.]+)", header)}
+
+
+def test_phases_exclude_nested_phases_and_sql():
+    timing = RequestTiming(started=0.0)
+    timing.phases = {"auth": 0.002, "app": 0.004}
+    timing.add_statement(0.003)
+    timing.endpoint_done = (0.010, 0.001)  # 2 ms of the SQL ran after the endpoint (commit)
+
+    header = server_timing_header(timing, now=0.015)
+
+    assert header == (
+        'auth;dur=2.0, db;dur=3.0;desc="1 queries", app;dur=4.0, serialization;dur=3.0, total;dur=15.0'
+    )
+
+
+def test_timed_blocks_nest_without_double_counting():
+    timing, token = begin_request()
+    try:
+        with timed("app"):
+            with timed("membership"):
+                timing.add_statement(0.0)
+            timing.add_statement(0.0)
+    finally:
+        end_request(token)
+
+    assert set(timing.phases) == {"app", "membership"}
+    assert timing.db_statements == 2
+    assert timing._nested == []
+
+
+def test_membership_guards_are_timed():
+    repo = MagicMock(spec=MembershipRepository)
+    repo.get_by_club_and_user.return_value = MagicMock(role=MembershipRole.owner)
+    service = MembershipService(repo, MagicMock(), MagicMock())
+
+    timing, token = begin_request()
+    try:
+        service.require_coach_or_owner_of_club(1, 2)
+    finally:
+        end_request(token)
+
+    assert "membership" in timing.phases
+
+
+def test_timing_is_a_noop_outside_requests():
+    with timed("app"):
+        pass  # no RequestTiming: nothing to record, nothing raised
+
+
+def test_responses_carry_a_server_timing_breakdown(client, auth_token, auth_headers):
+    resp = client.get("/memberships/mine", headers=auth_headers(auth_token))
+
+    assert resp.status_code == 200
+    durations = _durations(resp.headers["server-timing"])
+    assert {"auth", "db", "app", "serialization", "total"} <= set(durations)
+    assert sum(v for k, v in durations.items() if k != "total") <= durations["total"] + 0.5  # rounding
+    assert resp.headers["timing-allow-origin"] == "http://localhost:5173"
+
+
+def test_every_api_route_is_timed():
+    routes = [
+        r for r in app.routes
+        if isinstance(r, APIRoute) and r.endpoint.__module__.startswith(("app.api.endpoints.", "app.auth."))
+    ]
+
+    assert len(routes) > 50 and all(isinstance(r, TimedRoute) for r in routes)
+
+
+def test_timing_allow_origin_lists_origins_comma_separated():
+    middleware = ServerTimingMiddleware(MagicMock(), allow_origins=["https://a.example", "https://b.example"])
+
+    assert middleware.allow_origins == "https://a.example, https://b.example"
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+
+from app.models.models import (
+    Attendance,
+    AttendanceStatus,
+    ChangeLog,
+    Club,
+    Group,
+    Plan,
+    PlanType,
+    Session as TrainingSession,
+    WorkoutPlan,
+)
+from app.repositories.sync import SyncRepository
+
+COACH = 1
+ATHLETE = 2
+START = datetime(2026, 3, 2, 18, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    return file_db_maker("sync.db", users=(COACH, ATHLETE), clubs=(1, 2))
+
+
+@pytest.fixture
+def db(maker):
+    with maker() as s:
+        for cid in (1, 2):
+            s.add(Plan(id=cid, club_id=cid, name=f"Plan {cid}", plan_type=PlanType.club, created_by_id=COACH))
+        s.flush()
+        s.add(TrainingSession(
+            id=1, plan_id=1, club_id=1, name="S1", starts_at=START,
+            ends_at=START + timedelta(hours=1), location="Field", created_by=COACH,
+        ))
+        s.commit()
+        yield s
+
+
+def _log(db, club_id=1):
+    return [
+        (r.entity, r.entity_id, r.op)
+        for r in db.execute(
+            sa.select(ChangeLog).where(ChangeLog.club_id == club_id).order_by(ChangeLog.id)
+        ).scalars()
+    ]
+
+
+def test_inserts_and_updates_are_logged_in_the_same_transaction(db):
+    before = len(_log(db))
+    group = Group(club_id=1, name="Juniors")
+    db.add(group)
+    db.flush()
+    group.name = "U17"
+    db.commit()
+
+    assert _log(db)[before:] == [("group", group.id, "upsert"), ("group", group.id, "upsert")]
+
+
+def test_unmodified_dirty_objects_are_not_logged(db):
+    before = len(_log(db))
+    club = db.get(Club, 1)
+    club.name = club.name  # touched, but no net change
+    db.commit()
+
+    assert len(_log(db)) == before
+
+
+def test_deletes_leave_tombstones_with_the_parent_club(db):
+    attendance = Attendance(session_id=1, user_id=ATHLETE, status=AttendanceStatus.present)
+    db.add(attendance)
+    db.commit()
+    attendance_id = attendance.id
+
+    db.delete(attendance)
+    db.commit()
+
+    assert _log(db)[-1] == ("attendance", attendance_id, "delete")
+    row = db.execute(sa.select(ChangeLog).order_by(ChangeLog.id.desc()).limit(1)).scalar_one()
+    assert row.user_id == ATHLETE
+
+
+def test_cascaded_deletes_leave_tombstones_for_every_synced_child(db):
+    group = Group(club_id=1, name="Juniors")
+    workout_plan = WorkoutPlan(club_id=1, name="Base", created_by_id=COACH)
+    attendance = Attendance(session_id=1, user_id=ATHLETE, status=AttendanceStatus.present)
+    db.add_all([group, workout_plan, attendance])
+    db.commit()
+    before = len(_log(db))
+
+    db.delete(db.get(Club, 1))  # groups and workout plans only go through ON DELETE CASCADE
+    db.commit()
+
+    tombstones = _log(db)[before:]
+    assert sorted(tombstones) == sorted([
+        ("club", 1, "delete"),
+        ("plan", 1, "delete"),
+        ("session", 1, "delete"),
+        ("attendance", attendance.id, "delete"),
+        ("group", group.id, "delete"),
+        ("workout_plan", workout_plan.id, "delete"),
+    ])
+    assert db.execute(sa.select(Group)).scalars().all() == []
+
+
+def test_a_new_session_maker_always_gets_the_hooks(file_db_maker, monkeypatch):
+    # the event registry is keyed by id(); a collected maker's stale entry made a new one look tracked
+    monkeypatch.setattr(sa.event, "contains", lambda *args: True)
+    maker = file_db_maker("fresh.db", users=(), clubs=(1,))
+    with maker() as s:
+        assert _log(s) == [("club", 1, "upsert")]
+
+
+def test_rolled_back_changes_are_not_logged(db):
+    before = len(_log(db))
+    db.add(Group(club_id=1, name="Ghosts"))
+    db.flush()
+    db.delete(db.get(TrainingSession, 1))
+    db.flush()
+    db.rollback()
+
+    assert len(_log(db)) == before
+    db.commit()  # no stale tombstones carried into the next flush
+    assert len(_log(db)) == before
+
+
+def test_list_changes_pages_in_cursor_order_and_hides_other_attendances(db):
+    repo = SyncRepository(db)
+    since = repo.latest_cursor(club_id=1)
+    db.add(Attendance(session_id=1, user_id=COACH, status=AttendanceStatus.present))
+    db.add(Group(club_id=1, name="Juniors"))
+    db.add(Group(club_id=2, name="Elsewhere"))
+    db.commit()
+
+    rows = repo.list_changes(club_id=1, since=since, limit=10)
+    assert sorted(r.entity for r in rows) == ["attendance", "group"]
+    assert [r.cursor for r in rows] == sorted(r.cursor for r in rows)
+    assert repo.latest_cursor(club_id=1) == rows[-1].cursor
+
+    mine = repo.list_changes(club_id=1, since=since, limit=10, user_id=ATHLETE)
+    assert [r.entity for r in mine] == ["group"]
+
+
+def _add_group(session, name: str, *, change_id: int) -> None:
+    # SQLite serializes writers, so give the change row the id it'd have got at insert
+    session.add(Group(club_id=1, name=name))
+    session.flush()
+    session.execute(sa.update(ChangeLog).where(ChangeLog.seq.is_(None)).values(id=change_id))
+
+
+def test_a_change_committed_after_a_higher_id_was_served_is_not_skipped(db, maker):
+    repo = SyncRepository(db)
+    since = repo.latest_cursor(club_id=1)
+    last_id = db.execute(sa.select(sa.func.max(ChangeLog.id))).scalar_one()
+
+    # slow inserts first (lower id) but commits after fast was already served
+    with maker() as slow, maker() as fast:
+        _add_group(fast, "Fast", change_id=last_id + 2)
+        fast.commit()
+        served = repo.list_changes(club_id=1, since=since, limit=10)
+        assert [r.entity_id for r in served] == [fast.execute(sa.select(Group.id).where(Group.name == "Fast")).scalar()]
+        cursor = repo.latest_cursor(club_id=1)
+        assert cursor == served[-1].cursor
+
+        _add_group(slow, "Slow", change_id=last_id + 1)
+        assert repo.list_changes(club_id=1, since=cursor, limit=10) == []  # in flight: no cursor yet
+        slow.commit()
+
+    later = repo.list_changes(club_id=1, since=cursor, limit=10)
+    slow_id = db.execute(sa.select(Group.id).where(Group.name == "Slow")).scalar_one()
+    assert [(r.entity, r.entity_id) for r in later] == [("group", slow_id)]
+    assert later[0].cursor > cursor
+
+
+def test_load_is_scoped_to_the_club_and_compact(db):
+    db.add(Attendance(session_id=1, user_id=ATHLETE, status=AttendanceStatus.late))
+    db.add(Attendance(session_id=1, user_id=COACH, status=AttendanceStatus.present))
+    db.commit()
+    repo = SyncRepository(db)
+
+    sessions = repo.load("session", club_id=1)
+    assert [s["id"] for s in sessions] == [1]
+    assert set(sessions[0]) == {
+        "id", "plan_id", "name", "starts_at", "ends_at", "location", "note", "version_id", "updated_at",
+    }
+    assert repo.load("session", club_id=2) == []
+    assert [a["user_id"] for a in repo.load("attendance", club_id=1, user_id=ATHLETE)] == [ATHLETE]
+    assert repo.load("plan", club_id=1, ids=[2]) == []  # plan 2 belongs to club 2
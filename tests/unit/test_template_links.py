@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, select
+
+from app.exceptions.base import ExerciseNotFoundError, SessionNotFound
+from app.models.models import (
+    ChangeLog,
+    Exercise,
+    LinkMode,
+    Plan,
+    PlanType,
+    Session as SessionModel,
+    UserRole,
+)
+from app.repositories.exercise import ExerciseRepository
+from app.repositories.session import SessionRepository
+from app.services.template_links import TemplateSyncSweeper
+
+START = datetime(2026, 3, 2, 18, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    maker = file_db_maker("templates.db", users=(1,), clubs=(1, 2), role=UserRole.trainer)
+    with maker() as s:
+        for pid, club_id in [(1, 1), (2, 1), (3, 2)]:
+            s.add(Plan(id=pid, club_id=club_id, name=f"Plan {pid}", plan_type=PlanType.club, created_by_id=1))
+        s.commit()
+    return maker
+
+
+@pytest.fixture
+def db(maker):
+    with maker() as s:
+        yield s
+
+
+def _session(repo: SessionRepository, plan_id: int, name: str, **kwargs) -> SessionModel:
+    return repo.create_in_plan(
+        club_id=1,
+        plan_id=plan_id,
+        created_by_id=1,
+        name=name,
+        description=None,
+        starts_at=START,
+        ends_at=START + timedelta(hours=1),
+        location="Hall",
+        note=None,
+        **kwargs,
+    )
+
+
+def _exercise(repo: ExerciseRepository, plan_id: int, name: str, **kwargs) -> Exercise:
+    return repo.create_in_plan(
+        club_id=1,
+        plan_id=plan_id,
+        name=name,
+        description=None,
+        sets=3,
+        repetitions=5,
+        position=None,
+        day_label=None,
+        **kwargs,
+    )
+
+
+def test_linked_copies_start_from_the_template(db):
+    sessions, exercises = SessionRepository(db), ExerciseRepository(db)
+    template = _session(sessions, 1, "Intervals", is_template=True)
+    linked = _session(sessions, 2, "ignored", template_id=template.id, link_mode=LinkMode.linked)
+    ex_template = _exercise(exercises, 1, "Squat", is_template=True)
+    ex_linked = _exercise(exercises, 2, "ignored", template_id=ex_template.id, link_mode=LinkMode.linked)
+
+    assert (linked.name, linked.template_version_used) == ("Intervals", 1)
+    assert (ex_linked.name, ex_linked.sets, ex_linked.template_version_used) == ("Squat", 3, 1)
+
+
+def test_snapshot_copies_take_the_template_content_once(db):
+    sessions, exercises = SessionRepository(db), ExerciseRepository(db)
+    template = _session(sessions, 1, "Intervals", is_template=True)
+    sessions.update_in_plan(club_id=1, plan_id=1, session_id=template.id, updates={"note": "bring spikes"})
+    ex_template = _exercise(exercises, 1, "Squat", is_template=True)
+    snapshot = _session(sessions, 2, "ignored", template_id=template.id)
+    ex_snapshot = _exercise(exercises, 2, "ignored", template_id=ex_template.id)
+
+    assert (snapshot.name, snapshot.note, snapshot.link_mode, snapshot.template_version_used) == (
+        "Intervals", "bring spikes", LinkMode.snapshot, 2,
+    )
+    assert (ex_snapshot.name, ex_snapshot.sets, ex_snapshot.repetitions) == ("Squat", 3, 5)
+
+    sessions.update_in_plan(club_id=1, plan_id=1, session_id=template.id, updates={"name": "Hills"})
+    exercises.update_in_plan(club_id=1, plan_id=1, exercise_id=ex_template.id, updates={"sets": 5})
+    assert (sessions.refresh_linked(), exercises.refresh_linked()) == (0, 0)  # snapshots aren't synced
+    db.expire_all()
+    assert (snapshot.name, ex_snapshot.sets) == ("Intervals", 3)
+
+
+def test_copies_need_a_template_of_the_same_club(db):
+    sessions, exercises = SessionRepository(db), ExerciseRepository(db)
+    regular = _session(sessions, 1, "Regular")
+    ex_regular = _exercise(exercises, 1, "Row")
+
+    with pytest.raises(SessionNotFound):
+        _session(sessions, 2, "Copy", template_id=regular.id)
+    with pytest.raises(ExerciseNotFoundError):
+        _exercise(exercises, 2, "Copy", template_id=ex_regular.id)
+
+    foreign = SessionModel(
+        club_id=2, plan_id=3, created_by=1, name="Foreign", starts_at=START,
+        ends_at=START + timedelta(hours=1), location="Hall", is_template=True,
+    )
+    db.add(foreign)
+    db.flush()
+    with pytest.raises(SessionNotFound):
+        _session(sessions, 2, "Copy", template_id=foreign.id)
+
+
+def test_refresh_linked_updates_stale_copies_in_one_statement(db):
+    sessions, exercises = SessionRepository(db), ExerciseRepository(db)
+    template = _session(sessions, 1, "Intervals", is_template=True)
+    linked = [_session(sessions, 2, "x", template_id=template.id, link_mode=LinkMode.linked) for _ in range(3)]
+    snapshot = _session(sessions, 2, "x", template_id=template.id)
+    ex_template = _exercise(exercises, 1, "Squat", is_template=True)
+    ex_linked = _exercise(exercises, 2, "x", template_id=ex_template.id, link_mode=LinkMode.linked)
+    db.commit()
+
+    sessions.update_in_plan(club_id=1, plan_id=1, session_id=template.id, updates={"name": "Hills", "note": "bring spikes"})
+    exercises.update_in_plan(club_id=1, plan_id=1, exercise_id=ex_template.id, updates={"sets": 5})
+    assert (template.version_id, ex_template.version_id) == (2, 2)  # edits bump the template version
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert sessions.refresh_linked() == 3
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    # one UPDATE for all copies (+ their change_log rows for delta sync)
+    assert [sql.lstrip().split()[0].upper() for sql in statements] == ["UPDATE", "INSERT"]
+    logged = db.execute(select(ChangeLog.entity_id).where(ChangeLog.entity == "session")).scalars().all()
+    assert {copy.id for copy in linked} <= set(logged)
+    assert exercises.refresh_linked() == 1
+    assert sessions.refresh_linked() == 0  # already in sync
+    db.commit()
+    db.expire_all()
+
+    for copy in linked:
+        assert (copy.name, copy.note, copy.location, copy.template_version_used, copy.version_id) == (
+            "Hills", "bring spikes", "Hall", 2, 2,
+        )
+        assert copy.plan_id == 2 and copy.starts_at.replace(tzinfo=timezone.utc) == START  # placement stays
+    assert (snapshot.name, snapshot.template_version_used) == ("Intervals", 1)
+    assert (ex_linked.sets, ex_linked.position, ex_linked.template_version_used) == (5, 0, 2)
+
+
+def test_sweeper_syncs_copies_in_its_own_session(maker, db):
+    sessions = SessionRepository(db)
+    template = _session(sessions, 1, "Intervals", is_template=True)
+    copy = _session(sessions, 2, "x", template_id=template.id, link_mode=LinkMode.linked)
+    db.commit()
+    sessions.update_in_plan(club_id=1, plan_id=1, session_id=template.id, updates={"location": "Track"})
+    db.commit()
+
+    sweeper = TemplateSyncSweeper(maker, interval_seconds=60)
+    assert sweeper.sweep() == {"sessions": 1, "exercises": 0}
+    assert sweeper.sweep() == {"sessions": 0, "exercises": 0}
+
+    db.expire_all()
+    assert db.execute(select(SessionModel.location).where(SessionModel.id == copy.id)).scalar_one() == "Track"
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event
+from starlette.requests import Request
+
+import app.db.deps as deps
+from app.db.routing import ReplicaRouter
+from app.db.unit_of_work import transaction
+from app.exceptions.base import ConflictError, MembershipExistsError
+from app.models.models import Club, Membership, MembershipRole, UserRole, WorkoutPlan
+from app.repositories.club import ClubRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+from app.schemas.club import ClubCreate
+from app.schemas.membership import MembershipCreate
+from app.services.club import ClubService
+
+OWNER = 1
+
+
+@pytest.fixture
+def maker(file_db_maker):
+    return file_db_maker("uow.db", users=(OWNER,), clubs=(), role=UserRole.trainer)
+
+
+@pytest.fixture
+def commits(maker):
+    with maker() as s:
+        engine = s.get_bind()
+    counter = {"n": 0}
+
+    def _count(_conn):
+        counter["n"] += 1
+
+    event.listen(engine, "commit", _count)
+    yield counter
+    event.remove(engine, "commit", _count)
+
+
+def _create_club(db, name: str, user_id: int = OWNER):
+    return ClubService(ClubRepository(db)).create_club_and_owner(
+        ClubCreate(name=name, country="DE", city="Berlin", sport="Rowing"),
+        MembershipCreate(email=f"u{OWNER}@example.com", role=MembershipRole.owner),
+        SimpleNamespace(id=user_id),
+    )
+
+
+def test_multi_step_flow_commits_once(maker, commits):
+    with maker() as db, transaction(db):
+        club, membership = _create_club(db, "Rowing Club")
+        assert club.id is not None and membership.club_id == club.id  # flushed, not committed
+
+    assert commits["n"] == 1
+
+
+def test_multi_step_flow_is_atomic(maker):
+    with maker() as db:
+        with pytest.raises(MembershipExistsError), transaction(db):
+            _create_club(db, "Orphan Club", user_id=999)  # FK violation on the membership
+
+    with maker() as db:
+        assert db.scalar(sa.select(sa.func.count()).select_from(Club)) == 0
+        assert db.scalar(sa.select(sa.func.count()).select_from(Membership)) == 0
+
+
+def test_savepoint_keeps_the_rest_of_the_request(maker):
+    with maker() as db, transaction(db):
+        club, _ = _create_club(db, "Savepoint Club")
+        repo = WorkoutPlanRepository(db)
+        repo.create_plan(club_id=club.id, created_by_id=OWNER, data={"name": "Base"})
+        with pytest.raises(ConflictError):
+            repo.create_plan(club_id=club.id, created_by_id=OWNER, data={"name": "Base"})
+        repo.create_plan(club_id=club.id, created_by_id=OWNER, data={"name": "Base (2)"})
+
+    with maker() as db:
+        assert db.scalars(sa.select(WorkoutPlan.name).order_by(WorkoutPlan.id)).all() == ["Base", "Base (2)"]
+        assert db.scalar(sa.select(sa.func.count()).select_from(Membership)) == 1
+
+
+def test_get_db_commits_on_success_and_rolls_back_on_error(maker, monkeypatch):
+    monkeypatch.setattr(deps, "db_router", ReplicaRouter(maker))
+    request = Request({"type": "http", "method": "POST", "headers": []})
+
+    ok = deps.get_db(request)
+    ClubRepository(next(ok)).create_club(name="Kept", slug="kept")
+    with pytest.raises(StopIteration):
+        next(ok)
+
+    failing = deps.get_db(request)
+    ClubRepository(next(failing)).create_club(name="Dropped", slug="dropped")
+    with pytest.raises(RuntimeError):
+        failing.throw(RuntimeError("endpoint failed"))
+
+    with maker() as db:
+        assert db.scalars(sa.select(Club.name)).all() == ["Kept"]
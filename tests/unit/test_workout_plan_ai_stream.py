@@ -0,0 +1,57 @@
+import json
+
+from app.services.workout_plan_ai_stream import DraftStreamParser, format_sse
+
+
+DRAFT = {
+    "name": "Plan {with} \"braces\"",
+    "description": None,
+    "goal": "strength",
+    "level": "beginner",
+    "duration_weeks": 2,
+    "items": [
+        {
+            "week_number": 1,
+            "day_label": "monday",
+            "order_index": 0,
+            "title": "Day [1]",
+            "exercises": [
+                {"name": "Squat", "sets": 3, "repetitions": 5, "position": 0},
+                {"name": "Row \\\\ \"cable\"", "sets": 3, "repetitions": 8, "position": 1},
+            ],
+        },
+        {"week_number": 2, "order_index": 1, "title": "Day 2", "exercises": []},
+    ],
+}
+
+
+def feed_all(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+def test_emits_exercises_then_items_in_order():
+    text = json.dumps(DRAFT)
+    events = feed_all(DraftStreamParser(), text, size=7)
+
+    assert [e for e, _ in events] == ["exercise", "exercise", "item", "item"]
+    assert events[1][1]["exercise"]["name"] == 'Row \\\\ "cable"'
+    assert events[1][1]["item_index"] == 0 and events[1][1]["exercise_index"] == 1
+    assert events[2][1]["item"]["title"] == "Day [1]"
+    assert events[3][1]["item_index"] == 1
+
+
+def test_single_character_chunks_match_whole_document():
+    text = json.dumps(DRAFT, indent=2)
+    assert feed_all(DraftStreamParser(), text, size=1) == DraftStreamParser().feed(text)
+
+
+def test_invalid_objects_are_skipped():
+    bad = {"name": "x", "items": [{"order_index": -1, "exercises": [{"name": "", "position": 0}]}]}
+    assert DraftStreamParser().feed(json.dumps(bad)) == []
+
+
+def test_format_sse():
+    assert format_sse("item", {"a": 1}) == 'event: item\ndata: {"a":1}\n\n'
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.unit_of_work import transaction
+from app.exceptions.base import ConflictError, WorkoutNotFoundError
+from app.models.models import (
+    Club,
+    DayLabel,
+    Group,
+    Membership,
+    MembershipRole,
+    PlanAssignee,
+    PlanAssigneeRole,
+    WorkoutPlan,
+)
+from app.repositories.workout_plan import WorkoutPlanRepository
+
+
+@pytest.fixture
+def db(file_db_maker):
+    with file_db_maker("plans.db", users=(1, 2, 3))() as s:
+        yield s
+
+
+def _plan(name: str, assignees: list[int]) -> dict:
+    return {
+        "name": name,
+        "goal": "Strength",
+        "is_template": False,
+        "items": [
+            {
+                "week_number": 1,
+                "day_label": DayLabel.monday,
+                "order_index": i,
+                "title": f"Day {i}",
+                "exercises": [
+                    {"name": "Squat", "sets": 3, "repetitions": 5, "position": 0},
+                    {"name": "Row", "sets": 3, "repetitions": 8, "position": 1},
+                ],
+            }
+            for i in range(2)
+        ],
+        "assignees": assignees,
+    }
+
+
+def test_bulk_create_plans_writes_nested_rows_and_assignees(db):
+    repo = WorkoutPlanRepository(db)
+
+    ids = repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[_plan("A", [2]), _plan("B", [3])])
+
+    assert len(ids) == 2
+    for plan_id, name in zip(ids, ("A", "B")):
+        plan = repo.get_plan_nested(club_id=1, plan_id=plan_id)
+        assert plan.name == name
+        assert [item.order_index for item in plan.items] == [0, 1]
+        assert [ex.name for ex in plan.items[0].exercises] == ["Squat", "Row"]
+
+    assignees = db.execute(select(PlanAssignee).order_by(PlanAssignee.user_id)).scalars().all()
+    assert [(a.workout_plan_id, a.user_id, a.role) for a in assignees] == [
+        (ids[0], 2, PlanAssigneeRole.athlete),
+        (ids[1], 3, PlanAssigneeRole.athlete),
+    ]
+    assert repo.existing_plan_names(1, ["A", "C"]) == {"A"}
+
+
+def test_bulk_create_plans_is_atomic(db):
+    repo = WorkoutPlanRepository(db)
+    with transaction(db):
+        repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[_plan("A", [])])
+
+    with pytest.raises(ConflictError), transaction(db):
+        repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[_plan("B", [2]), _plan("A", [3])])
+
+    assert db.execute(select(WorkoutPlan.name)).scalars().all() == ["A"]
+    assert db.execute(select(PlanAssignee)).scalars().all() == []
+
+
+def _tree(repo, plan_id: int) -> list:
+    plan = repo.get_plan_nested(club_id=1, plan_id=plan_id)
+    return [
+        (item.order_index, item.title, [(ex.name, ex.sets, ex.repetitions, ex.position) for ex in item.exercises])
+        for item in plan.items
+    ]
+
+
+def test_instantiate_template_copies_the_tree_in_three_statements(db):
+    repo = WorkoutPlanRepository(db)
+    template = _plan("Template", [])
+    template["is_template"] = True
+    template["items"][1]["exercises"].pop()
+    (template_id,) = repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[template])
+
+    inserts = []
+
+    def listener(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        copy = repo.instantiate_template(club_id=1, template_id=template_id, created_by_id=2, name="Copy")
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    # plan, items, exercises (+ the change-log row)
+    assert sum("SELECT" in sql for sql in inserts) == 3
+    assert (copy.name, copy.is_template, copy.created_by_id, copy.goal) == ("Copy", False, 2, "Strength")
+    assert _tree(repo, copy.id) == _tree(repo, template_id)
+    assert [ex.name for ex in repo.get_plan_nested(club_id=1, plan_id=copy.id).items[1].exercises] == ["Squat"]
+
+
+def test_instantiate_template_conflicts_and_missing_template(db):
+    repo = WorkoutPlanRepository(db)
+    (template_id,) = repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[_plan("Template", [])])
+
+    with pytest.raises(ConflictError):
+        repo.instantiate_template(club_id=1, template_id=template_id, created_by_id=1, name="Template")
+    with pytest.raises(WorkoutNotFoundError):
+        repo.instantiate_template(club_id=2, template_id=template_id, created_by_id=1, name="Copy")
+
+
+def test_assign_members_and_groups_only_within_the_club(db):
+    db.add(Club(id=2, name="Other", slug="other"))
+    db.add_all([
+        Membership(club_id=1, user_id=2, role=MembershipRole.member),
+        Membership(club_id=2, user_id=3, role=MembershipRole.member),
+        Group(id=1, club_id=1, name="Juniors"),
+        Group(id=2, club_id=2, name="Seniors"),
+    ])
+    db.flush()
+    repo = WorkoutPlanRepository(db)
+    (plan_id,) = repo.bulk_create_plans(club_id=1, created_by_id=1, plans=[_plan("A", [])])
+
+    assert repo.assign_members(1, plan_id, [2, 3], assigned_by_id=1) == 1
+    assert repo.assign_groups(1, plan_id, [1, 2], assigned_by_id=1) == 1
+    rows = db.execute(select(PlanAssignee).order_by(PlanAssignee.id)).scalars().all()
+    assert [(a.user_id, a.group_id, a.role, a.assigned_by_id) for a in rows] == [
+        (2, None, PlanAssigneeRole.athlete, 1),
+        (None, 1, PlanAssigneeRole.athlete, 1),
+    ]
+    with pytest.raises(ConflictError):
+        repo.assign_members(1, plan_id, [2], assigned_by_id=1)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.db.unit_of_work import transaction
+from app.models.models import MembershipRole, UserRole
+from app.repositories.club import ClubRepository
+from app.repositories.group import GroupRepository
+from app.repositories.workout_plan import WorkoutPlanRepository
+
+OWNER = 1
+
+
+@pytest.fixture
+def db(file_db_maker):
+    with file_db_maker("writes.db", users=(OWNER,), role=UserRole.trainer)() as s:
+        yield s
+
+
+@pytest.fixture
+def statements(db):
+    seen: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        seen.append(statement.split(None, 1)[0].upper())
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    yield seen
+    event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_creates_get_server_values_without_a_select(db, statements):
+    with transaction(db):
+        club = ClubRepository(db).create_club(name="New", slug="new")
+        ClubRepository(db).add_membership(user_id=OWNER, club_id=club.id, role=MembershipRole.owner)
+        group = GroupRepository(db).create(club_id=1, name="U17", description=None, created_by_id=OWNER)
+        plan = WorkoutPlanRepository(db).create_plan(club_id=1, created_by_id=OWNER, data={"name": "Base"})
+
+    # what the response models read: ids, server defaults, timestamps, versions
+    assert group.created_at is not None and group.updated_at is not None
+    assert plan.id is not None and plan.version_id == 1 and plan.created_at is not None
+    assert "SELECT" not in statements
+
+
+def test_update_returns_server_side_onupdate_values(db, statements):
+    with transaction(db):
+        group = GroupRepository(db).create(club_id=1, name="U17", description=None, created_by_id=OWNER)
+    statements.clear()
+
+    with transaction(db):
+        group.name = "U19"
+        db.flush()  # UPDATE ... RETURNING updated_at
+    assert group.updated_at is not None
+    assert statements == ["UPDATE", "INSERT", "UPDATE"]  # + its change_log row, numbered at commit